@@ -0,0 +1,50 @@
+"""Add indexes for hot query paths
+
+Revision ID: 3b8e5d1c9a47
+Revises: f49021cd2fc6
+Create Date: 2026-10-18 11:02:15.482317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e5d1c9a47'
+down_revision: Union[str, None] = 'f49021cd2fc6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_machine_updated_at_id', 'machine', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_general_created_at_id', 'general', ['created_at', 'id'], unique=False)
+    op.create_index('ix_maker_name', 'maker', ['name'], unique=False)
+    op.create_index('ix_maker_created_at_id', 'maker', ['created_at', 'id'], unique=False)
+    op.create_index('ix_resources_maker_id_id', 'resources', ['maker_id', 'id'], unique=False)
+    op.create_index('ix_certification_resources_id_maker_id', 'certification', ['resources_id', 'maker_id'], unique=False)
+    op.create_index('ix_machine_resources_machine_id_order_index', 'machine_resources', ['machine_id', 'order_index'], unique=False)
+    op.create_index('ix_price_compare_general_id', 'price_compare', ['general_id'], unique=False)
+    op.create_index('ix_quotation_general_id', 'quotation', ['general_id'], unique=False)
+    op.create_index('ix_detailed_general_id', 'detailed', ['general_id'], unique=False)
+    op.create_index('ix_price_compare_machine_machine_id', 'price_compare_machine', ['machine_id'], unique=False)
+    op.create_index('ix_price_compare_resources_machine_id', 'price_compare_resources', ['machine_id'], unique=False)
+    op.create_index('ix_account_phone_number', 'account', ['phone_number'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_account_phone_number', table_name='account')
+    op.drop_index('ix_price_compare_resources_machine_id', table_name='price_compare_resources')
+    op.drop_index('ix_price_compare_machine_machine_id', table_name='price_compare_machine')
+    op.drop_index('ix_detailed_general_id', table_name='detailed')
+    op.drop_index('ix_quotation_general_id', table_name='quotation')
+    op.drop_index('ix_price_compare_general_id', table_name='price_compare')
+    op.drop_index('ix_machine_resources_machine_id_order_index', table_name='machine_resources')
+    op.drop_index('ix_certification_resources_id_maker_id', table_name='certification')
+    op.drop_index('ix_resources_maker_id_id', table_name='resources')
+    op.drop_index('ix_maker_created_at_id', table_name='maker')
+    op.drop_index('ix_maker_name', table_name='maker')
+    op.drop_index('ix_general_created_at_id', table_name='general')
+    op.drop_index('ix_machine_updated_at_id', table_name='machine')
@@ -0,0 +1,32 @@
+"""Add version columns to machine, general and price_compare
+
+Revision ID: 5c1e9a7d3b20
+Revises: 8d2f6a4b1c3e
+Create Date: 2026-10-18 15:02:11.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e9a7d3b20'
+down_revision: Union[str, None] = '8d2f6a4b1c3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 상세 조회 ETag용 수정 카운터 (기존 행은 1부터 시작)
+VERSIONED_TABLES = ('machine', 'general', 'price_compare')
+
+
+def upgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version')
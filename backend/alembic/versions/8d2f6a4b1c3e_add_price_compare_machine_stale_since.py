@@ -0,0 +1,27 @@
+"""Add price_compare_machine.stale_since
+
+Revision ID: 8d2f6a4b1c3e
+Revises: 3b8e5d1c9a47
+Create Date: 2026-10-18 14:21:37.905126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f6a4b1c3e'
+down_revision: Union[str, None] = '3b8e5d1c9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('price_compare_machine', sa.Column('stale_since', sa.TIMESTAMP(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('price_compare_machine') as batch_op:
+        batch_op.drop_column('stale_since')
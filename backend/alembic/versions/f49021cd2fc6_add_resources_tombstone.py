@@ -0,0 +1,34 @@
+"""Add resources_tombstone
+
+Revision ID: f49021cd2fc6
+Revises: 7cbe471804a9
+Create Date: 2026-10-18 10:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f49021cd2fc6'
+down_revision: Union[str, None] = '7cbe471804a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('resources_tombstone',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('resources_id', sa.String(length=6), nullable=False),
+    sa.Column('maker_id', sa.String(length=4), nullable=False),
+    sa.Column('deleted_at', sa.TIMESTAMP(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_resources_tombstone_deleted_at', 'resources_tombstone', ['deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resources_tombstone_deleted_at', table_name='resources_tombstone')
+    op.drop_table('resources_tombstone')
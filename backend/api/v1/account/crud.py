@@ -4,6 +4,7 @@ from typing import Optional
 from backend.models.account import Account
 from backend.models.role import Role
 from backend.core.security import get_password_hash
+from backend.core.permission_cache import permission_cache
 
 # ============================================================
 # Account CRUD
@@ -44,6 +45,7 @@ def create_account(
     db.add(account)
     db.commit()
     db.refresh(account)
+    permission_cache.invalidate_account(account.id) # 미존재로 캐시된 계정 정보 제거
     return account
 
 
@@ -0,0 +1,58 @@
+# api/v1/admin/handler.py
+#
+# 운영용(로컬 전용) 관리 API 엔드포인트를 정의합니다.
+# - Prometheus 텍스트 포맷 메트릭 조회 API를 제공합니다. (요청 수/지연 시간 히스토그램/DB 풀 대기/캐시 hit 비율)
+# - 같은 PC(루프백 주소)에서 온 요청만 허용합니다.
+#
+
+import os
+from fastapi import APIRouter, HTTPException, Request # FastAPI 라우터, HTTP 예외 처리
+from fastapi.responses import Response
+from backend.core.metrics import CONTENT_TYPE_LATEST, cache_collector, registry
+from backend.core.permission_cache import permission_cache # RBAC 권한 캐시
+from backend.core.security import verified_token_cache_stats # 검증 완료 토큰 캐시
+from backend.api.v1.part.catalog import parts_catalog # 부품 카탈로그 캐시
+
+# 관리 API 접근 허용 클라이언트 주소 (쉼표 구분, 기본값: 루프백)
+ADMIN_ALLOWED_HOSTS = {
+    host.strip() for host in os.getenv("ADMIN_ALLOWED_HOSTS", "127.0.0.1,::1").split(",") if host.strip()
+}
+
+# [중요] 메트릭 수집기(Prometheus)가 토큰 없이 조회하므로 일반 APIRouter 사용 (접근은 주소로 제한)
+handler = APIRouter()
+
+# 캐시 hit 비율 수집기 등록 (메트릭 조회 시점에 각 캐시의 stats()를 읽음)
+registry.register_collector("parts_catalog", cache_collector("parts_catalog", parts_catalog.stats))
+registry.register_collector("permission_cache", cache_collector("permission_cache", permission_cache.stats))
+registry.register_collector("verified_tokens", cache_collector("verified_tokens", verified_token_cache_stats))
+
+
+def require_local_client(request: Request) -> None:
+    """
+    로컬(허용 주소) 클라이언트가 아니면 403을 발생시킵니다.
+
+    Raises:
+        HTTPException: 허용되지 않은 주소에서 요청한 경우 (403 Forbidden).
+    """
+    host = request.client.host if request.client else None
+    if host not in ADMIN_ALLOWED_HOSTS:
+        raise HTTPException(status_code=403, detail="관리 API는 로컬에서만 접근할 수 있습니다.")
+
+
+@handler.get("/metrics")
+def get_metrics(request: Request):
+    """
+    애플리케이션 메트릭을 Prometheus 텍스트 포맷으로 반환합니다.
+    - 라우트별 p95/p99: histogram_quantile(0.95, sum by (le, route) (rate(http_request_duration_seconds_bucket[5m])))
+
+    Args:
+        request (Request): 클라이언트 주소 확인용 요청 객체.
+
+    Returns:
+        Response: text/plain; version=0.0.4 메트릭 본문.
+
+    Raises:
+        HTTPException: 로컬이 아닌 주소에서 요청한 경우 (403 Forbidden).
+    """
+    require_local_client(request)
+    return Response(content=registry.render(), media_type=CONTENT_TYPE_LATEST)
@@ -3,6 +3,8 @@ from sqlalchemy.orm import Session
 from backend.database import get_db
 from backend.models.account import Account
 from backend.core import security
+from backend.core.config import settings
+from backend.core.permission_cache import permission_cache
 from .schemas import LoginRequest, Token
 
 # [중요] 로그인은 보안 검사를 받으면 안 되므로 일반 APIRouter 사용
@@ -25,8 +27,15 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
             detail="아이디 또는 비밀번호가 일치하지 않습니다.",
         )
 
-    # 3. 토큰 발급
-    access_token = security.create_access_token(subject=user.id)
+    # 3. 토큰 발급 (설정 시 역할 ID / 권한 매트릭스 버전 클레임 포함)
+    if settings.TOKEN_ROLE_CLAIMS and user.role_id:
+        access_token = security.create_access_token(
+            subject=user.id,
+            role_id=user.role_id,
+            permission_version=permission_cache.matrix_version(db)
+        )
+    else:
+        access_token = security.create_access_token(subject=user.id)
     
     # 4. Role 이름 가져오기 (없으면 GUEST)
     role_name = user.role.name if user.role else "GUEST"
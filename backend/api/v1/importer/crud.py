@@ -0,0 +1,793 @@
+# api/v1/importer/crud.py
+#
+# 카탈로그 엑셀 일괄 가져오기(제조사 → 부품 마스터 → 장비 템플릿) 엔진을 정의합니다.
+# - 행마다 API를 호출하던 등록 스크립트(tmp/register_*.py) 대신, 통합 문서 전체를 한 트랜잭션에서 일괄 INSERT/UPDATE로 반영합니다.
+# - 기존 제조사/부품은 시작 시 한 번 조회해 인메모리 정규화 인덱스(ImportIndex)로 매칭합니다. (행별 조회 없음)
+# - 읽기·파싱·매칭(1단계)은 쓰기 트랜잭션 밖에서 끝내고, 쓰기(2단계)는 모아 둔 구문만 실행합니다.
+#   (쓰기 엔진은 연결이 하나뿐이므로 큰 통합 문서를 파싱하는 동안 다른 쓰기 요청이 대기하지 않도록)
+# - 처리할 수 없는 행은 건너뛰고 (시트, 행 번호, 사유)를 오류 목록으로 보고합니다.
+# - dry_run이면 모든 검사와 쓰기를 수행한 뒤 롤백합니다. (결과 보고서만 확인)
+#
+
+import time
+from datetime import datetime
+from typing import IO, Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import bindparam, func, insert, select, update # 일괄 DML 구문
+from sqlalchemy.orm import Session # 데이터베이스 세션 관리를 위함
+from backend.models.maker import Maker # Maker 모델 임포트
+from backend.models.machine import Machine # Machine 모델 임포트
+from backend.models.resources import Resources # Resources 모델 임포트
+from backend.models.certification import Certification # Certification 모델 임포트
+from backend.api.v1.part.catalog import parts_catalog # 부품 카탈로그 캐시 (가져오기 후 무효화)
+from backend.api.v1.part.crud import restamp_parts_changes # 증분 동기화(changes since) 기준 시각 보정
+from backend.api.v1.part.search_index import normalize_text # 매칭용 문자열 정규화 (NFKC, 소문자화, 공백 정리)
+from backend.api.v1.quotation.machine.crud import (
+    build_machine_resource_rows, bulk_insert_machine_resources, sync_machine_resources
+) # 견적서 자재 일괄 저장/차분 반영
+from backend.api.v1.quotation.price_compare.crud import mark_price_compares_stale # 내정가 비교서 stale 표시
+from . import workbook
+from .workbook import clean_maker_name, clean_value, parse_flag, parse_int
+
+# 템플릿 시트로 만드는 장비 견적서의 이름 접두사/작성자 (같은 이름이 있으면 갱신)
+TEMPLATE_NAME_PREFIX = "[TEMPLATE] "
+TEMPLATE_CREATOR = "TEMPLATE"
+
+# 모델명이 비어 있을 수 있는 집계/인건비 대분류
+SUMMARY_MAJORS = {"전장/제어부 집계"}
+LABOR_MAJORS = {"인건비"}
+VIRTUAL_MAJORS = SUMMARY_MAJORS | LABOR_MAJORS
+
+# 공백 제조사 이름 (엑셀의 '공백', 집계/인건비 자재용)
+BLANK_MAKER_NAME = " "
+
+# 컬럼 길이 제한 (모델/스키마와 동일)
+PARTS_FIELD_LIMITS = {"major": 50, "minor": 50, "name": 100, "unit": 10}
+DISPLAY_FIELD_LIMITS = {
+    "display_major": 50, "display_minor": 50, "display_model_name": 100, "display_maker_name": 100, "display_unit": 10
+}
+
+# 응답에 포함할 최대 행 오류 수 (전체 개수는 error_count로 보고)
+MAX_REPORTED_ERRORS = 500
+
+PartKey = Tuple[str, str] # (maker_id, resources_id)
+
+# ============================================================
+# 인메모리 매칭 인덱스
+# ============================================================
+
+def normalize_key(value: Optional[str]) -> str:
+    """매칭용 정규화 키 (NFKC, 대소문자 무시, 연속 공백 정리)"""
+    return normalize_text(value)
+
+
+def normalize_loose(value: Optional[str]) -> str:
+    """느슨한 매칭용 키 (정규화 후 영숫자만 남김)"""
+    return "".join(ch for ch in normalize_key(value) if ch.isalnum())
+
+
+def maker_name_key(name: str) -> str:
+    """제조사명 조회 키 (공백 제조사 " "는 정규화하면 사라지므로 그대로 사용)"""
+    return normalize_key(name) if name.strip() else name
+
+
+class ImportIndex:
+    """
+    가져오기 1회 동안 사용하는 기존 제조사/부품 인덱스.
+    - 제조사 1회, 부품(⟕ 인증) 1회 조회로 적재하고, 가져오기 중 생성한 항목도 즉시 반영합니다.
+    - 부품 마스터 시트: (maker_id, Unit, 품목, 모델명) 정규화 키로 기존 부품을 찾습니다. (upsert)
+    - 템플릿 시트: 등록 스크립트와 같은 순서(제조사+모델명 → 느슨한 제조사+모델명 → 모델명 없는 Unit+품목)로 찾습니다.
+    """
+
+    def __init__(self):
+        self.maker_names: Dict[str, str] = {} # maker_id -> 제조사명
+        self.makers_by_name: Dict[str, str] = {} # 제조사명 키 -> maker_id
+        self.parts: Dict[PartKey, dict] = {} # (maker_id, resources_id) -> 부품 상태
+        self.by_exact: Dict[tuple, PartKey] = {}
+        self.by_maker_model: Dict[tuple, PartKey] = {}
+        self.by_maker_model_loose: Dict[tuple, PartKey] = {}
+        self.by_major_minor_empty_name: Dict[tuple, PartKey] = {}
+        self._max_part_number: Dict[str, int] = {} # maker_id -> 최대 부품 번호
+        self._max_maker_number = 0 # 자동 생성 제조사 ID(M001...) 최대 번호
+
+    def load_makers(self, db: Session) -> None:
+        for maker_id, name in db.query(Maker.id, Maker.name).order_by(Maker.id):
+            self.add_maker(maker_id, name)
+
+    @staticmethod
+    def fetch_parts(db: Session) -> List[dict]:
+        """기존 부품 상태를 조회합니다. (제조사명 키를 쓰므로 add_part로 인덱스에 넣는 것은 제조사 시트 반영 후)"""
+        rows = (
+            db.query(
+                Resources.id, Resources.maker_id, Resources.major, Resources.minor, Resources.name,
+                Resources.unit, Resources.solo_price, Resources.display_order,
+                Certification.id.label("certification_id"),
+                Certification.ul, Certification.ce, Certification.kc, Certification.etc
+            )
+            .outerjoin(Certification, (Resources.id == Certification.resources_id) &
+                                      (Resources.maker_id == Certification.maker_id))
+            .order_by(Resources.maker_id, Resources.id)
+        )
+        parts = []
+        for row in rows:
+            has_certification = row.certification_id is not None
+            parts.append({
+                "id": row.id,
+                "maker_id": row.maker_id,
+                "major": row.major,
+                "minor": row.minor,
+                "name": row.name,
+                "unit": row.unit,
+                "solo_price": row.solo_price,
+                "display_order": row.display_order,
+                "ul": bool(row.ul) if has_certification else False,
+                "ce": bool(row.ce) if has_certification else False,
+                "kc": bool(row.kc) if has_certification else False,
+                "etc": row.etc if has_certification else None,
+                "has_certification": has_certification
+            })
+        return parts
+
+    # --------------------------------------------------------
+    # 제조사
+    # --------------------------------------------------------
+
+    def add_maker(self, maker_id: str, name: str) -> None:
+        self.maker_names[maker_id] = name
+        self.makers_by_name.setdefault(maker_name_key(name), maker_id)
+        if maker_id.startswith("M") and maker_id[1:].isdigit():
+            self._max_maker_number = max(self._max_maker_number, int(maker_id[1:]))
+
+    def rename_maker(self, maker_id: str, name: str) -> None:
+        old_key = maker_name_key(self.maker_names[maker_id])
+        if self.makers_by_name.get(old_key) == maker_id:
+            del self.makers_by_name[old_key]
+        self.maker_names[maker_id] = name
+        self.makers_by_name.setdefault(maker_name_key(name), maker_id)
+
+    def maker_id_for(self, name: str) -> Optional[str]:
+        return self.makers_by_name.get(maker_name_key(name)) if name else None
+
+    def next_maker_id(self) -> str:
+        """자동 생성 제조사 ID (maker crud.get_next_maker_id와 같은 M001 형식)"""
+        self._max_maker_number += 1
+        return f"M{self._max_maker_number:03d}"
+
+    # --------------------------------------------------------
+    # 부품
+    # --------------------------------------------------------
+
+    def add_part(self, part: dict) -> None:
+        key = (part["maker_id"], part["id"])
+        self.parts[key] = part
+        if part["id"].isdigit():
+            self._max_part_number[part["maker_id"]] = max(self._max_part_number.get(part["maker_id"], 0), int(part["id"]))
+
+        self.by_exact.setdefault(
+            (part["maker_id"], normalize_key(part["major"]), normalize_key(part["minor"]), normalize_key(part["name"])), key
+        )
+        maker_name = self.maker_names.get(part["maker_id"], "")
+        maker_k, name_k = normalize_key(maker_name), normalize_key(part["name"])
+        if maker_k and name_k:
+            self.by_maker_model.setdefault((maker_k, name_k), key)
+            loose_key = (normalize_loose(maker_name), normalize_loose(part["name"]))
+            if all(loose_key):
+                self.by_maker_model_loose.setdefault(loose_key, key)
+        # 모델명 없는 템플릿 행은 (Unit, 품목)으로 찾습니다. 자동 생성 시 품목명으로 채운 집계/인건비 부품도 포함 (재실행 시 중복 생성 방지)
+        minor_k = normalize_key(part["minor"])
+        if not name_k or (part["major"] in VIRTUAL_MAJORS and name_k == minor_k):
+            major_minor = (normalize_key(part["major"]), minor_k)
+            if all(major_minor):
+                self.by_major_minor_empty_name.setdefault(major_minor, key)
+
+    def next_parts_id(self, maker_id: str) -> str:
+        """제조사별 다음 부품 ID (part crud.get_next_parts_id와 같은 6자리 형식)"""
+        number = self._max_part_number.get(maker_id, 0) + 1
+        self._max_part_number[maker_id] = number
+        return f"{number:06d}"
+
+    def find_exact(self, maker_id: str, major: str, minor: str, name: str) -> Optional[dict]:
+        key = self.by_exact.get((maker_id, normalize_key(major), normalize_key(minor), normalize_key(name)))
+        return self.parts[key] if key else None
+
+    def find_for_template(self, maker_name: str, major: str, minor: str, name: str) -> Optional[dict]:
+        """템플릿 행의 부품 찾기 (제조사+모델명 → 느슨한 제조사+모델명 → 모델명 없는 Unit+품목)"""
+        maker_k, name_k = normalize_key(maker_name), normalize_key(name)
+        key = None
+        if maker_k and name_k:
+            key = (
+                self.by_maker_model.get((maker_k, name_k))
+                or self.by_maker_model_loose.get((normalize_loose(maker_name), normalize_loose(name)))
+            )
+        if key is None and major and minor and not name_k:
+            key = self.by_major_minor_empty_name.get((normalize_key(major), normalize_key(minor)))
+        return self.parts[key] if key else None
+
+
+# ============================================================
+# 일괄 쓰기
+# ============================================================
+
+class _MakerWriter:
+    """제조사 INSERT·UPDATE 대상을 모아 두었다가 구문별 executemany 한 번으로 반영합니다."""
+
+    def __init__(self):
+        self._inserts: List[dict] = []
+        self._updates: List[dict] = []
+
+    def insert(self, maker_id: str, name: str) -> None:
+        self._inserts.append({"id": maker_id, "name": name})
+
+    def update(self, maker_id: str, name: str) -> None:
+        self._updates.append({"b_id": maker_id, "name": name})
+
+    def flush(self, db: Session) -> None:
+        if self._inserts:
+            db.execute(insert(Maker), self._inserts)
+        if self._updates:
+            table = Maker.__table__
+            db.execute(update(table).where(table.c.id == bindparam("b_id")), self._updates)
+        self._inserts = []
+        self._updates = []
+
+
+PART_COLUMNS = ("major", "minor", "name", "unit", "solo_price", "display_order")
+CERTIFICATION_COLUMNS = ("ul", "ce", "kc", "etc")
+
+
+class _PartWriter:
+    """
+    부품/인증 INSERT·UPDATE 대상을 모아 두었다가 구문별 executemany 한 번으로 반영합니다.
+    - 인덱스의 부품 상태 딕셔너리를 그대로 보관하므로, 반영 전에 값이 더 바뀌어도 마지막 상태가 저장됩니다.
+    """
+
+    def __init__(self):
+        self._inserts: Dict[PartKey, dict] = {}
+        self._updates: Dict[PartKey, dict] = {}
+
+    def insert(self, part: dict) -> None:
+        part["created"] = True
+        self._inserts[(part["maker_id"], part["id"])] = part
+
+    def update(self, part: dict, report: "ImportReport") -> None:
+        """부품 상태(part)를 바꾼 뒤 호출합니다. (이번 가져오기에서 만든 부품은 INSERT에 반영되거나 UPDATE로 갱신)"""
+        key = (part["maker_id"], part["id"])
+        if key in self._inserts:
+            return
+        self._updates[key] = part
+        if not part.get("created") and not part.get("updated"):
+            part["updated"] = True
+            report.parts["updated"] += 1
+
+    def flush(self, db: Session) -> None:
+        inserts = list(self._inserts.values())
+        updates = list(self._updates.values())
+        certification_inserts = [part for part in inserts + updates if not part["has_certification"]]
+        certification_updates = [part for part in updates if part["has_certification"]]
+
+        if inserts:
+            db.execute(insert(Resources), [
+                {"id": part["id"], "maker_id": part["maker_id"], **{column: part[column] for column in PART_COLUMNS}}
+                for part in inserts
+            ])
+        if updates:
+            table = Resources.__table__
+            db.execute(
+                update(table).where(table.c.id == bindparam("b_id"), table.c.maker_id == bindparam("b_maker_id")),
+                [
+                    {"b_id": part["id"], "b_maker_id": part["maker_id"], **{column: part[column] for column in PART_COLUMNS}}
+                    for part in updates
+                ]
+            )
+        if certification_inserts:
+            db.execute(insert(Certification), [
+                {"resources_id": part["id"], "maker_id": part["maker_id"],
+                 **{column: part[column] for column in CERTIFICATION_COLUMNS}}
+                for part in certification_inserts
+            ])
+        if certification_updates:
+            table = Certification.__table__
+            db.execute(
+                update(table).where(
+                    table.c.resources_id == bindparam("b_resources_id"), table.c.maker_id == bindparam("b_maker_id")
+                ),
+                [
+                    {"b_resources_id": part["id"], "b_maker_id": part["maker_id"],
+                     **{column: part[column] for column in CERTIFICATION_COLUMNS}}
+                    for part in certification_updates
+                ]
+            )
+
+        for part in certification_inserts:
+            part["has_certification"] = True
+        self._inserts.clear()
+        self._updates.clear()
+
+
+class ImportReport:
+    """가져오기 결과 집계 (행 오류는 MAX_REPORTED_ERRORS개까지만 보관)"""
+
+    def __init__(self):
+        self.makers = {"created": 0, "updated": 0, "unchanged": 0}
+        self.parts = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        self.templates: List[dict] = []
+        self.errors: List[dict] = []
+        self.error_count = 0
+
+    def error(self, sheet: str, row: Optional[int], message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"sheet": sheet, "row": row, "message": message})
+
+
+def _length_error(values: Dict[str, str], limits: Dict[str, int]) -> Optional[str]:
+    for field, limit in limits.items():
+        value = values.get(field)
+        if value and len(value) > limit:
+            return f"'{value[:30]}' 값이 너무 깁니다. ({field} 최대 {limit}자)"
+    return None
+
+
+# ============================================================
+# 시트별 가져오기
+# ============================================================
+
+def plan_makers(index: ImportIndex, makers: _MakerWriter, ws, header: Dict[str, int], report: ImportReport) -> None:
+    """제조사 시트(회사명, 회사코드)를 제조사 ID 기준 upsert 대상으로 모읍니다."""
+    seen = set()
+
+    for row_number, row in workbook.iter_sheet_rows(ws, header):
+        maker_id = clean_value(row["회사코드"])
+        name = clean_maker_name(row["회사명"])
+        if not maker_id or not name:
+            report.error(ws.title, row_number, "회사명 또는 회사코드가 비어 있습니다.")
+            continue
+        if len(maker_id) > 4 or len(name) > 100:
+            report.error(ws.title, row_number, f"회사코드(최대 4자) 또는 회사명(최대 100자)이 너무 깁니다: {maker_id}")
+            continue
+        if maker_id in seen:
+            report.error(ws.title, row_number, f"회사코드 '{maker_id}'가 시트에 중복되었습니다.")
+            continue
+        seen.add(maker_id)
+
+        current = index.maker_names.get(maker_id)
+        if current is None:
+            makers.insert(maker_id, name)
+            index.add_maker(maker_id, name)
+            report.makers["created"] += 1
+        elif current != name:
+            makers.update(maker_id, name)
+            index.rename_maker(maker_id, name)
+            report.makers["updated"] += 1
+        else:
+            report.makers["unchanged"] += 1
+
+
+def plan_parts(index: ImportIndex, writer: _PartWriter, ws, header: Dict[str, int], report: ImportReport) -> None:
+    """
+    부품 마스터 시트를 (제조사, Unit, 품목, 모델명) 정규화 키 기준 upsert 대상으로 모읍니다.
+    - 모델명이 '-'인 행은 건너뜁니다. (skipped)
+    - 표시 순서(display_order)는 시트의 행 순서입니다.
+    """
+    display_order = 0
+    for row_number, row in workbook.iter_sheet_rows(ws, header):
+        if str(row["모델명/규격"] if row["모델명/규격"] is not None else "").strip() == "-":
+            report.parts["skipped"] += 1
+            continue
+
+        maker_name = clean_maker_name(row["제조사"])
+        maker_id = index.maker_id_for(maker_name)
+        if maker_id is None:
+            report.error(ws.title, row_number, f"제조사 '{maker_name}'을(를) 찾을 수 없습니다.")
+            continue
+
+        price = parse_int(row["단가"])
+        values = {
+            "major": clean_value(row["Unit"]),
+            "minor": clean_value(row["품목"]),
+            "name": clean_value(row["모델명/규격"]),
+            "unit": clean_value(row["단위"]) or "ea",
+            "solo_price": price,
+            "display_order": display_order,
+            "ul": parse_flag(row["UL"]),
+            "ce": parse_flag(row["CE"]),
+            "kc": parse_flag(row["KC"]),
+            "etc": clean_value(row["기타"]) or None,
+        }
+        # 집계/인건비 부품은 모델명이 없으면 품목명을 사용합니다. (템플릿 자동 생성 규칙과 동일)
+        virtual_unnamed = values["major"] in VIRTUAL_MAJORS and not values["name"]
+        if virtual_unnamed:
+            values["name"] = values["minor"]
+        message = _length_error(values, PARTS_FIELD_LIMITS)
+        if message is None and price < 0:
+            message = f"단가가 음수입니다: {price}"
+        part = index.find_exact(maker_id, values["major"], values["minor"], values["name"])
+        if part is None and virtual_unnamed: # 이름 없이 등록된 기존 부품
+            part = index.find_exact(maker_id, values["major"], values["minor"], "")
+        if part is not None and values["major"] in VIRTUAL_MAJORS and price == 0:
+            values["solo_price"] = part["solo_price"] # 템플릿 단가로 채운 값을 0으로 되돌리지 않음
+        if message is None and part is not None and part.get("sheet_row") is not None:
+            message = f"{part['sheet_row']}행과 같은 부품입니다. (이 행은 무시)"
+        if message:
+            report.error(ws.title, row_number, message)
+            continue
+        display_order += 1
+
+        if part is None:
+            part = {"id": index.next_parts_id(maker_id), "maker_id": maker_id, "has_certification": False, **values}
+            index.add_part(part)
+            writer.insert(part)
+            report.parts["created"] += 1
+        elif any(part[field] != value for field, value in values.items()) or not part["has_certification"]:
+            part.update(values)
+            writer.update(part, report)
+        else:
+            report.parts["unchanged"] += 1
+        part["sheet_row"] = row_number
+
+
+def _template_part(
+    index: ImportIndex, writer: _PartWriter, makers: _MakerWriter, report: ImportReport,
+    values: dict, auto_create_parts: bool
+) -> Tuple[Optional[dict], bool]:
+    """
+    템플릿 행의 부품을 찾고, 없으면 (auto_create_parts) 마스터에 새로 만듭니다.
+
+    Returns:
+        Tuple[Optional[dict], bool]: (부품 상태 또는 None, 새로 만들었는지 여부)
+    """
+    maker_name, major, minor, name = values["maker_name"], values["major"], values["minor"], values["name"]
+    part = index.find_for_template(maker_name, major, minor, name)
+
+    # 집계/인건비 부품은 마스터의 이름이 비어 있거나 단가가 0이면 템플릿 값으로 채웁니다.
+    if part is not None and major in VIRTUAL_MAJORS:
+        changed = False
+        if not part["name"] and (name or minor):
+            part["name"] = name or minor
+            changed = True
+        if part["solo_price"] == 0 and values["solo_price"] > 0:
+            part["solo_price"] = values["solo_price"]
+            changed = True
+        if changed:
+            writer.update(part, report)
+    if part is not None or not auto_create_parts:
+        return part, False
+
+    # 집계/인건비는 제조사가 없으면 공백 제조사, 모델명이 없으면 품목명을 사용합니다. 일반 부품은 제조사/모델명이 필요합니다.
+    if major in VIRTUAL_MAJORS:
+        maker_name = maker_name or BLANK_MAKER_NAME
+        name = name or minor
+    elif not maker_name or not name:
+        return None, False
+
+    maker_id = index.maker_id_for(maker_name)
+    if maker_id is None:
+        if maker_name == BLANK_MAKER_NAME: # 공백 제조사는 ID가 정해져 있으므로 자동 생성하지 않음
+            return None, False
+        maker_id = index.next_maker_id()
+        index.add_maker(maker_id, maker_name)
+        makers.insert(maker_id, maker_name)
+        report.makers["created"] += 1
+
+    part = {
+        "id": index.next_parts_id(maker_id),
+        "maker_id": maker_id,
+        "major": major,
+        "minor": minor,
+        "name": name,
+        "unit": values["unit"] or ("M/D" if major in LABOR_MAJORS else "ea"),
+        "solo_price": values["solo_price"],
+        "display_order": 0,
+        "ul": values["ul"], "ce": values["ce"], "kc": values["kc"], "etc": values["etc"],
+        "has_certification": False,
+    }
+    if _length_error(part, PARTS_FIELD_LIMITS):
+        return None, False
+    index.add_part(part)
+    writer.insert(part)
+    report.parts["created"] += 1
+    return part, True
+
+
+def parse_template_sheet(
+    index: ImportIndex, writer: _PartWriter, makers: _MakerWriter, ws, header: Dict[str, int],
+    report: ImportReport, auto_create_parts: bool
+) -> Tuple[List[dict], int, int]:
+    """
+    템플릿 시트를 장비 견적서 자재 목록으로 변환합니다.
+    - 수량이 0 이하인 일반 부품 행, 모델명이 없거나 '-'인 행은 템플릿에 포함하지 않습니다.
+    - 같은 자재가 여러 행에 있으면 마지막 행을 사용합니다. (견적서 저장 규칙과 동일)
+
+    Returns:
+        Tuple[List[dict], int, int]: (자재 목록, 매칭 실패 행 수, 새로 만든 부품 수)
+    """
+    resources: Dict[PartKey, Tuple[int, dict]] = {}
+    missing = 0
+    created_parts = 0
+
+    for row_number, row in workbook.iter_sheet_rows(ws, header):
+        major = clean_value(row["Unit"])
+        name = clean_value(row["모델명/규격"])
+        quantity = parse_int(row["수량"])
+        if quantity <= 0 and major not in VIRTUAL_MAJORS:
+            continue
+        if (not name and major not in VIRTUAL_MAJORS) or name == "-":
+            continue
+
+        values = {
+            "maker_name": clean_maker_name(row["제조사"]),
+            "major": major,
+            "minor": clean_value(row["품목"]),
+            "name": name,
+            "unit": clean_value(row.get("단위")),
+            "solo_price": max(parse_int(row.get("단가")), 0),
+            "ul": parse_flag(row.get("UL")),
+            "ce": parse_flag(row.get("CE")),
+            "kc": parse_flag(row.get("KC")),
+            "etc": clean_value(row.get("기타")) or None,
+        }
+        part, created = _template_part(index, writer, makers, report, values, auto_create_parts)
+        created_parts += created
+        if part is None:
+            missing += 1
+            report.error(
+                ws.title, row_number,
+                f"부품을 찾을 수 없습니다: {values['maker_name']} | {major} | {values['minor']} | {name}"
+            )
+            continue
+
+        resource = {
+            "maker_id": part["maker_id"],
+            "resources_id": part["id"],
+            "solo_price": values["solo_price"] if values["solo_price"] > 0 else part["solo_price"],
+            "quantity": max(quantity, 0),
+            # 템플릿 표시값은 마스터 분류와 다를 수 있으므로 별도 저장
+            "display_major": major or None,
+            "display_minor": values["minor"] or None,
+            "display_model_name": name or None,
+            "display_maker_name": values["maker_name"] or None,
+            "display_unit": values["unit"] or None,
+        }
+        message = _length_error(resource, DISPLAY_FIELD_LIMITS)
+        if message:
+            report.error(ws.title, row_number, message)
+            continue
+
+        key = (part["maker_id"], part["id"])
+        if key in resources:
+            report.error(ws.title, resources[key][0], f"같은 자재가 {row_number}행에 다시 나와 이 행은 무시되었습니다.")
+        resources[key] = (row_number, resource) # 자재 순서는 처음 나온 위치 유지
+
+    return [resource for _, resource in resources.values()], missing, created_parts
+
+
+def _find_template_machines(db: Session, names: List[str]) -> Dict[str, Machine]:
+    """
+    템플릿 이름과 같은 기존 견적서를 한 번에 조회합니다.
+    - 같은 이름이 여러 개면 가장 최근에 수정된 것을 갱신 대상으로 쓰고, 나머지는 '[DUPLICATE] ...'로 이름을 바꿉니다.
+    """
+    if not names:
+        return {}
+    by_name: Dict[str, List[Machine]] = {}
+    for machine in db.query(Machine).filter(Machine.name.in_(names)):
+        by_name.setdefault(machine.name, []).append(machine)
+
+    keep: Dict[str, Machine] = {}
+    for name, machines in by_name.items():
+        machines.sort(key=lambda m: (m.updated_at is not None, m.updated_at), reverse=True)
+        keep[name] = machines[0]
+        for duplicate in machines[1:]:
+            duplicate.name = f"[DUPLICATE] {name[len(TEMPLATE_NAME_PREFIX):]} ({duplicate.id})"[:100]
+    return keep
+
+
+def plan_templates(
+    index: ImportIndex, writer: _PartWriter, makers: _MakerWriter, sheets: List[tuple], report: ImportReport,
+    auto_create_parts: bool
+) -> List[tuple]:
+    """
+    템플릿 시트들을 자재 목록으로 변환합니다. (자동 생성 제조사/부품은 makers/writer에 모음)
+
+    Returns:
+        List[tuple]: 시트별 (시트명, 자재 목록, 매칭 실패 행 수, 새로 만든 부품 수)
+    """
+    parsed = []
+    for ws, header in sheets:
+        resources, missing, created_parts = parse_template_sheet(
+            index, writer, makers, ws, header, report, auto_create_parts
+        )
+        parsed.append((ws.title, resources, missing, created_parts))
+    return parsed
+
+
+def apply_templates(db: Session, parsed: List[tuple], report: ImportReport, strict: bool) -> List[UUID]:
+    """
+    템플릿마다 '[TEMPLATE] 시트명' 장비 견적서를 생성하거나 자재 목록을 차분 반영합니다. (자재가 참조하는 제조사/부품은 호출 전에 반영)
+
+    Returns:
+        List[UUID]: 원가 집계가 바뀌어 stale로 표시된 내정가 비교서 ID 목록.
+    """
+    existing = _find_template_machines(db, [TEMPLATE_NAME_PREFIX + title for title, *_ in parsed])
+    stale_ids: List[UUID] = []
+    for title, resources, missing, created_parts in parsed:
+        name = TEMPLATE_NAME_PREFIX + title
+        result = {
+            "sheet": title, "name": name, "machine_id": None, "action": "skipped",
+            "resource_count": len(resources), "missing_count": missing, "created_parts": created_parts
+        }
+        report.templates.append(result)
+        if not resources or (strict and missing):
+            continue
+
+        total_price = sum(r["solo_price"] * r["quantity"] for r in resources)
+        machine = existing.get(name)
+        if machine is None:
+            machine = Machine(name=name[:100], creator=TEMPLATE_CREATOR, price=total_price)
+            db.add(machine)
+            db.flush() # machine.id 할당 (자재 행에 필요)
+            bulk_insert_machine_resources(db, build_machine_resource_rows(machine.id, resources))
+            result["action"] = "created"
+        else:
+            total_price, bom_changed, cost_changed = sync_machine_resources(db, machine.id, resources)
+            machine.price = total_price
+            if bom_changed and not db.is_modified(machine):
+                machine.updated_at = func.current_timestamp()
+            if cost_changed:
+                stale_ids.extend(mark_price_compares_stale(db, machine.id))
+            result["action"] = "updated" if bom_changed or db.is_modified(machine) else "unchanged"
+        result["machine_id"] = machine.id
+    return stale_ids
+
+
+# ============================================================
+# 읽기·매칭(1단계) / 쓰기(2단계)
+# ============================================================
+
+CatalogSnapshot = Tuple[Optional[int], ...]
+
+
+class _ImportPlan:
+    """1단계 결과: 반영할 제조사/부품 행과 템플릿 자재 목록, 결과 보고서 (아직 쓰지 않음)"""
+
+    def __init__(self, index: ImportIndex):
+        self.index = index
+        self.makers = _MakerWriter()
+        self.parts = _PartWriter()
+        self.report = ImportReport()
+        self.templates: List[tuple] = []
+
+
+def _catalog_snapshot(db: Session) -> Tuple[datetime, CatalogSnapshot]:
+    """
+    DB 현재 시각과 제조사/부품/인증 테이블의 (행 수, 최종 수정 시각) 스냅샷을 한 번에 조회합니다.
+    - 1단계에서 읽은 상태가 2단계 시작 시점에도 그대로인지 비교하는 데 씁니다.
+    """
+    columns = []
+    for model in (Maker, Resources, Certification):
+        columns.append(select(func.count()).select_from(model).scalar_subquery())
+        columns.append(select(func.max(model.updated_at)).scalar_subquery())
+    row = db.execute(select(func.current_timestamp(), *columns)).one()
+    return row[0], tuple(row[1:])
+
+
+def _load_plan_source(db: Session) -> Tuple[Optional[CatalogSnapshot], ImportIndex, List[dict]]:
+    """
+    기존 제조사(인덱스 적재)와 부품 상태를 조회합니다.
+
+    Returns:
+        Tuple: (스냅샷 — 조회와 같은 초에 수정된 행이 있으면 이후 변경을 구분할 수 없으므로 None, 인덱스, 기존 부품 목록)
+    """
+    now, snapshot = _catalog_snapshot(db)
+    index = ImportIndex()
+    index.load_makers(db)
+    parts = ImportIndex.fetch_parts(db)
+    latest = [value for value in snapshot[1::2] if value is not None]
+    return (None if any(value >= now for value in latest) else snapshot), index, parts
+
+
+def _plan_import(
+    index: ImportIndex, existing_parts: List[dict], sheets: List[tuple],
+    include_templates: bool, auto_create_parts: bool
+) -> _ImportPlan:
+    """시트를 파싱·매칭해 반영할 행을 메모리에 모읍니다. (DB 접근 없음)"""
+    plan = _ImportPlan(index)
+    for kind, ws, header in sheets:
+        if kind == workbook.SHEET_MAKERS:
+            plan_makers(index, plan.makers, ws, header, plan.report)
+    for part in existing_parts:
+        index.add_part(part)
+    for kind, ws, header in sheets:
+        if kind == workbook.SHEET_PARTS:
+            plan_parts(index, plan.parts, ws, header, plan.report)
+    if include_templates:
+        template_sheets = [(ws, header) for kind, ws, header in sheets if kind == workbook.SHEET_TEMPLATE]
+        plan.templates = plan_templates(
+            index, plan.parts, plan.makers, template_sheets, plan.report, auto_create_parts
+        )
+    return plan
+
+
+def _apply_plan(db: Session, plan: _ImportPlan, strict: bool) -> List[UUID]:
+    """모아 둔 제조사 → 부품/인증 → 템플릿 견적서를 반영합니다. (커밋은 호출 측에서 수행)"""
+    plan.makers.flush(db)
+    plan.parts.flush(db)
+    return apply_templates(db, plan.templates, plan.report, strict)
+
+
+# ============================================================
+# 진입점
+# ============================================================
+
+def import_catalog_workbook(
+    db: Session,
+    file: IO[bytes],
+    dry_run: bool = False,
+    include_templates: bool = True,
+    auto_create_parts: bool = True,
+    strict: bool = False
+) -> Tuple[dict, List[UUID]]:
+    """
+    카탈로그 엑셀 통합 문서를 가져옵니다. (제조사 → 부품 마스터 → 장비 템플릿 순서, 단일 트랜잭션)
+    - 시트 종류는 헤더로 판별합니다: 제조사(회사명, 회사코드) / 부품(… 단위, 단가) / 템플릿(… 수량)
+    - 문제가 있는 행은 건너뛰고 오류 목록에 기록하며, 나머지 행은 그대로 반영합니다.
+    - 파싱·매칭은 쓰기 트랜잭션 밖에서 하고, 그 사이 카탈로그가 바뀌었으면 쓰기 연결을 잡은 채 다시 매칭합니다.
+    - 반영한 제조사/부품/인증의 updated_at은 커밋 직전 시각으로 맞춥니다. (증분 동기화가 이 변경을 건너뛰지 않도록)
+
+    Args:
+        db (Session): SQLAlchemy 데이터베이스 세션. (쓰기 세션)
+        file (IO[bytes]): .xlsx 파일 객체.
+        dry_run (bool): True이면 결과만 계산하고 롤백합니다.
+        include_templates (bool): 템플릿 시트를 장비 견적서로 가져올지 여부.
+        auto_create_parts (bool): 템플릿 행의 부품이 마스터에 없으면 새로 만들지 여부.
+        strict (bool): True이면 매칭 실패 행이 있는 템플릿은 등록하지 않습니다.
+
+    Returns:
+        Tuple[dict, List[UUID]]: (결과 보고서, 재계산이 필요한 내정가 비교서 ID 목록 — 커밋된 경우만)
+
+    Raises:
+        HTTPException: 엑셀 파일을 읽을 수 없는 경우 400 Bad Request.
+    """
+    started = time.perf_counter()
+    wb = workbook.open_workbook(file)
+    try:
+        sheets = workbook.classify_sheets(wb)
+
+        # ========== 1단계: 읽기·매칭 ==========
+        # 기존 행을 읽은 뒤 바로 연결을 반환하고 파싱합니다. (쓰기 엔진의 단일 연결을 파싱 동안 점유하지 않음)
+        snapshot, index, existing_parts = _load_plan_source(db)
+        db.rollback()
+        plan = _plan_import(index, existing_parts, sheets, include_templates, auto_create_parts)
+
+        # ========== 2단계: 쓰기 ==========
+        write_started_at, current = _catalog_snapshot(db)
+        if snapshot is None or current != snapshot:
+            # 1단계 이후 다른 쓰기가 있었으면 부품 ID 충돌/오래된 값 덮어쓰기를 막기 위해 연결을 잡은 채 다시 읽고 매칭합니다.
+            _, index, existing_parts = _load_plan_source(db)
+            plan = _plan_import(index, existing_parts, sheets, include_templates, auto_create_parts)
+        stale_ids = _apply_plan(db, plan, strict)
+        restamp_parts_changes(db, write_started_at)
+
+        report = plan.report
+        if dry_run:
+            db.rollback()
+            stale_ids = []
+        else:
+            db.commit()
+            if report.makers["created"] or report.makers["updated"] or report.parts["created"] or report.parts["updated"]:
+                parts_catalog.invalidate() # 대량 변경이므로 다음 조회 시 전체 재적재
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        wb.close()
+
+    return {
+        "dry_run": dry_run,
+        "sheets": [{"name": ws.title, "kind": kind} for kind, ws, _ in sheets],
+        "makers": report.makers,
+        "parts": report.parts,
+        "templates": report.templates,
+        "error_count": report.error_count,
+        "errors": report.errors,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+    }, list(dict.fromkeys(stale_ids))
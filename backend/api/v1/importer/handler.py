@@ -0,0 +1,67 @@
+# api/v1/importer/handler.py
+#
+# 카탈로그 엑셀 가져오기 API 엔드포인트를 정의합니다.
+# - 제조사/부품 마스터/장비 템플릿 시트가 담긴 .xlsx 파일 하나를 한 번의 요청, 단일 트랜잭션으로 반영합니다.
+# - 기존 등록 스크립트(tmp/register_*.py)처럼 행마다 API를 호출하지 않습니다.
+#
+
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Query, UploadFile # FastAPI 라우터, 백그라운드 작업, 의존성 주입, 업로드 파일, 쿼리 파라미터
+from sqlalchemy.orm import Session # 데이터베이스 세션 관리를 위함
+from backend.database import get_db # 데이터베이스 세션 의존성 주입
+from backend.api.v1.quotation.price_compare.crud import refresh_stale_price_compares # 내정가 비교서 증분 재계산
+from . import crud, schemas # 가져오기 엔진 및 스키마(DTO) 임포트
+
+# API 라우터 인스턴스 생성
+handler = APIRouter()
+
+# ============================================================
+# Import Endpoints (엑셀 가져오기 API)
+# ============================================================
+
+@handler.post("/catalog", response_model=schemas.CatalogImportResponse)
+def import_catalog(
+    background_tasks: BackgroundTasks, # 응답 후 내정가 비교서 재계산
+    file: UploadFile = File(..., description="카탈로그 엑셀(.xlsx) 파일"),
+    dry_run: bool = Query(False, description="True이면 결과만 계산하고 반영하지 않음"),
+    include_templates: bool = Query(True, description="템플릿 시트를 '[TEMPLATE] 시트명' 장비 견적서로 가져올지 여부"),
+    auto_create_parts: bool = Query(True, description="템플릿 행의 부품이 마스터에 없으면 새로 등록"),
+    strict: bool = Query(False, description="매칭 실패 행이 있는 템플릿은 등록하지 않음"),
+    db: Session = Depends(get_db) # DB 세션 의존성 주입
+):
+    """
+    카탈로그 엑셀 통합 문서를 가져오는 API 엔드포인트입니다.
+    - 시트 종류는 첫 행 헤더로 판별합니다. (제조사 → 부품 마스터 → 템플릿 순서로 반영)
+    - 제조사는 회사코드 기준, 부품은 (제조사, Unit, 품목, 모델명) 기준으로 생성/수정/유지합니다.
+    - 문제가 있는 행은 건너뛰고 errors에 엑셀 행 번호와 사유를 담아 반환합니다.
+    - 템플릿 견적서의 원가가 바뀌면 참조 내정가 비교서를 응답 후 재계산합니다.
+
+    Args:
+        background_tasks (BackgroundTasks): 응답 후 실행할 백그라운드 작업 목록.
+        file (UploadFile): 업로드한 .xlsx 파일.
+        dry_run (bool): 미리보기 여부.
+        include_templates (bool): 템플릿 시트 반영 여부.
+        auto_create_parts (bool): 템플릿 부품 자동 등록 여부.
+        strict (bool): 매칭 실패 템플릿 제외 여부.
+        db (Session): SQLAlchemy 데이터베이스 세션.
+
+    Returns:
+        schemas.CatalogImportResponse: 시트별 반영 건수, 템플릿 결과, 행 오류 목록.
+
+    Raises:
+        HTTPException: 엑셀 파일을 읽을 수 없는 경우 400 Bad Request.
+    """
+    # 동기 엔드포인트는 스레드풀에서 실행되므로 파싱/반영 중에도 이벤트 루프를 막지 않습니다.
+    result, stale_ids = crud.import_catalog_workbook(
+        db,
+        file.file,
+        dry_run=dry_run,
+        include_templates=include_templates,
+        auto_create_parts=auto_create_parts,
+        strict=strict
+    )
+
+    # ========== 참조 내정가 비교서 재계산 (응답 후) ==========
+    if stale_ids:
+        background_tasks.add_task(refresh_stale_price_compares, stale_ids)
+
+    return result
@@ -0,0 +1,43 @@
+# api/v1/importer/schemas.py
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from uuid import UUID
+
+class ImportSheet(BaseModel):
+    """가져온 시트 (헤더로 판별한 종류)"""
+    name: str
+    kind: str = Field(..., description="makers / parts / template")
+
+class ImportCounts(BaseModel):
+    """제조사/부품 반영 건수"""
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+
+class ImportRowError(BaseModel):
+    """건너뛴 행과 사유"""
+    sheet: str
+    row: Optional[int] = Field(None, description="엑셀 행 번호 (시트 전체 오류면 None)")
+    message: str
+
+class TemplateImportResult(BaseModel):
+    """템플릿 시트별 장비 견적서 반영 결과"""
+    sheet: str
+    name: str
+    machine_id: Optional[UUID] = None
+    action: str = Field(..., description="created / updated / unchanged / skipped")
+    resource_count: int
+    missing_count: int = Field(..., description="마스터에서 찾지 못한 행 수")
+    created_parts: int = Field(..., description="템플릿 행으로 새로 만든 부품 수")
+
+class CatalogImportResponse(BaseModel):
+    """카탈로그 엑셀 가져오기 결과"""
+    dry_run: bool
+    sheets: List[ImportSheet]
+    makers: ImportCounts
+    parts: ImportCounts
+    templates: List[TemplateImportResult]
+    error_count: int
+    errors: List[ImportRowError] = Field(..., description="앞쪽 최대 500건")
+    elapsed_ms: float
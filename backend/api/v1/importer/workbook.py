@@ -0,0 +1,123 @@
+# api/v1/importer/workbook.py
+#
+# 카탈로그 엑셀(.xlsx) 통합 문서를 스트리밍으로 읽는 헬퍼를 정의합니다.
+# - openpyxl read_only 모드로 행을 하나씩 읽으므로 통합 문서 크기와 무관하게 메모리 사용량이 일정합니다.
+# - 시트 순서/이름 대신 첫 행(헤더)으로 시트 종류(제조사/부품/템플릿)를 판별합니다.
+# - 셀 값 정리 규칙('공백', 'nan' 처리 등)은 기존 등록 스크립트(tmp/register_*.py)와 같습니다.
+#
+
+import zipfile
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+from fastapi import HTTPException # 잘못된 파일 처리
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+# 시트 종류 (첫 행 헤더로 판별)
+SHEET_MAKERS = "makers"
+SHEET_PARTS = "parts"
+SHEET_TEMPLATE = "template"
+
+# 시트 종류별 필수 헤더
+MAKER_COLUMNS = ("회사명", "회사코드")
+PARTS_COLUMNS = ("Unit", "품목", "모델명/규격", "제조사", "UL", "CE", "KC", "기타", "단위", "단가")
+TEMPLATE_COLUMNS = ("Unit", "품목", "모델명/규격", "제조사", "수량")
+
+
+def clean_value(value) -> str:
+    """셀 값을 문자열로 정리합니다. ('공백', 'nan', 'None', 빈 값 → "")"""
+    if value is None:
+        return ""
+    cleaned = str(value).strip()
+    if cleaned in ("공백", "nan", "None"):
+        return ""
+    return cleaned
+
+
+def clean_maker_name(value) -> str:
+    """제조사명 셀 값을 정리합니다. ('공백'은 공백 제조사 " "로 유지)"""
+    if value is None:
+        return ""
+    cleaned = str(value).strip()
+    if cleaned == "공백":
+        return " "
+    if cleaned in ("nan", "None"):
+        return ""
+    return cleaned
+
+
+def parse_int(value, default: int = 0) -> int:
+    """숫자 셀 값(천 단위 쉼표 포함 문자열 허용)을 정수로 변환합니다. 변환할 수 없으면 default."""
+    if value is None or isinstance(value, bool):
+        return default
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip().replace(",", "")
+    if not text:
+        return default
+    try:
+        return int(float(text))
+    except ValueError:
+        return default
+
+
+def parse_flag(value) -> bool:
+    """인증 여부 셀 값('O')을 bool로 변환합니다."""
+    return clean_value(value) == "O"
+
+
+def open_workbook(file: IO[bytes]):
+    """
+    엑셀 파일을 read_only 모드로 엽니다. (호출자가 close() 해야 합니다)
+
+    Raises:
+        HTTPException: 엑셀(.xlsx) 파일이 아닌 경우 400 Bad Request.
+    """
+    try:
+        return load_workbook(file, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, InvalidFileException, KeyError, OSError):
+        raise HTTPException(status_code=400, detail="엑셀(.xlsx) 파일을 읽을 수 없습니다.")
+
+
+def read_header(ws) -> Dict[str, int]:
+    """첫 행을 헤더로 읽어 {컬럼명: 인덱스}를 반환합니다. (같은 이름은 앞쪽 컬럼 사용)"""
+    for row in ws.iter_rows(min_row=1, max_row=1, values_only=True):
+        header: Dict[str, int] = {}
+        for index, value in enumerate(row):
+            name = str(value).strip() if value is not None else ""
+            if name:
+                header.setdefault(name, index)
+        return header
+    return {}
+
+
+def classify_sheet(header: Dict[str, int]) -> Optional[str]:
+    """헤더로 시트 종류를 판별합니다. (제조사 / 부품 마스터 / 장비 템플릿, 해당 없으면 None)"""
+    if all(column in header for column in MAKER_COLUMNS):
+        return SHEET_MAKERS
+    if all(column in header for column in TEMPLATE_COLUMNS):
+        return SHEET_TEMPLATE
+    if all(column in header for column in PARTS_COLUMNS):
+        return SHEET_PARTS
+    return None
+
+
+def classify_sheets(wb) -> List[Tuple[str, object, Dict[str, int]]]:
+    """통합 문서의 시트를 (종류, 시트, 헤더) 목록으로 분류합니다. (종류를 알 수 없는 시트는 제외, 문서 순서 유지)"""
+    sheets = []
+    for ws in wb.worksheets:
+        header = read_header(ws)
+        kind = classify_sheet(header)
+        if kind is not None:
+            sheets.append((kind, ws, header))
+    return sheets
+
+
+def iter_sheet_rows(ws, header: Dict[str, int]) -> Iterator[Tuple[int, Dict[str, object]]]:
+    """
+    헤더 다음 행부터 (엑셀 행 번호, {컬럼명: 원본 값})을 하나씩 반환합니다.
+    - 모든 셀이 비어 있는 행은 건너뜁니다. (read_only 모드에서 서식만 있는 끝부분 행 포함)
+    """
+    for row_number, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+        if all(value is None or (isinstance(value, str) and not value.strip()) for value in row):
+            continue
+        yield row_number, {name: (row[index] if index < len(row) else None) for name, index in header.items()}
@@ -8,6 +8,8 @@ from sqlalchemy.orm import Session # 데이터베이스 세션 관리를 위함
 from sqlalchemy import func # SQLAlchemy 함수 (예: max, count) 임포트
 from typing import List, Optional, Tuple # 타입 힌트 (선택적 인자, 리스트, 튜플)
 from backend.models import Maker # Maker 모델 임포트
+from backend.api.v1.part.catalog import parts_catalog # 부품 카탈로그 캐시 (제조사명 포함, 쓰기 시 무효화)
+from backend.core.pagination import decode_datetime_cursor, desc_keyset_filter, estimate_row_count # 커서 페이지네이션 헬퍼
 
 # ============================================================
 # 헬퍼 함수
@@ -67,14 +69,17 @@ def create_maker(
     db.add(maker) # 세션에 객체 추가
     db.commit() # 트랜잭션 커밋
     db.refresh(maker) # 객체 새로고침
+    parts_catalog.invalidate() # 부품 카탈로그 캐시 무효화
     return maker
 
 
 def get_makers(
     db: Session,
     skip: int = 0, # 조회 시작 지점 (OFFSET)
-    limit: int = 100 # 조회할 최대 개수 (LIMIT)
-) -> Tuple[int, List[Maker]]:
+    limit: int = 100, # 조회할 최대 개수 (LIMIT)
+    cursor: Optional[str] = None, # 이전 페이지 마지막 행 기준 커서 (지정 시 skip 무시)
+    count: str = "exact" # 총 개수 계산 방식 (exact | estimate | none)
+) -> Tuple[Optional[int], List[Maker]]:
     """
     데이터베이스에서 모든 제조사(Maker) 목록을 조회합니다.
     페이징 기능을 지원하며, 총 제조사 개수와 목록을 반환합니다.
@@ -83,14 +88,28 @@ def get_makers(
         db (Session): SQLAlchemy 데이터베이스 세션.
         skip (int): 건너뛸 레코드 수.
         limit (int): 가져올 레코드 최대 수.
+        cursor (Optional[str]): (created_at, id) Keyset 커서.
+        count (str): 총 개수 계산 방식.
         
     Returns:
-        Tuple[int, List[Maker]]: (총 제조사 개수, 제조사 객체 리스트).
+        Tuple[Optional[int], List[Maker]]: (총 제조사 개수 또는 None, 제조사 객체 리스트).
     """
-    total = db.query(func.count(Maker.id)).scalar() # 총 제조사 개수 조회
+    if count == "exact":
+        total = db.query(func.count(Maker.id)).scalar() # 총 제조사 개수 조회
+    elif count == "estimate":
+        total = estimate_row_count(db, Maker.__tablename__) # rowid 기반 근사치
+    else:
+        total = None
+
+    query = db.query(Maker)
+    if cursor:
+        last_created_at, last_id = decode_datetime_cursor(cursor)
+        query = query.filter(desc_keyset_filter(Maker.created_at, Maker.id, last_created_at, last_id))
+        skip = 0 # 커서 사용 시 OFFSET 미사용
+
     makers = (
-        db.query(Maker)
-        .order_by(Maker.created_at.desc()) # 생성일시 기준으로 내림차순 정렬
+        query
+        .order_by(Maker.created_at.desc(), Maker.id.desc()) # 생성일시 내림차순 (동일 시각은 ID로 고정 정렬)
         .offset(skip) # 지정된 수만큼 건너뛰기
         .limit(limit) # 지정된 수만큼 가져오기
         .all() # 모든 결과 반환
@@ -180,6 +199,7 @@ def update_maker(
     maker.name = name # 제조사 이름 업데이트
     db.commit() # 트랜잭션 커밋
     db.refresh(maker) # 객체 새로고침
+    parts_catalog.invalidate() # 캐시된 부품의 제조사명이 바뀌므로 카탈로그 무효화
     return maker
 
 
@@ -201,4 +221,5 @@ def delete_maker(db: Session, maker_id: str) -> bool:
     
     db.delete(maker) # 세션에서 객체 삭제
     db.commit() # 트랜잭션 커밋
+    parts_catalog.invalidate() # 부품 카탈로그 캐시 무효화
     return True
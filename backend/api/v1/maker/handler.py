@@ -4,10 +4,13 @@
 # - 제조사 생성, 목록 조회, 검색, 상세 조회, 수정, 삭제 API를 제공합니다.
 #
 
-from fastapi import APIRouter, Depends, HTTPException, Query # FastAPI 라우터, 의존성 주입, HTTP 예외 처리, 쿼리 파라미터
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response # FastAPI 라우터, 의존성 주입, HTTP 예외 처리, 쿼리 파라미터, 요청/응답 헤더
 from sqlalchemy.orm import Session # 데이터베이스 세션 관리를 위함
 from typing import Optional, List # 타입 힌트 (선택적 인자, 리스트)
-from backend.database import get_db
+from backend.database import get_db, get_read_db
+from backend.core.pagination import COUNT_MODE_PATTERN, next_cursor_for # 커서 페이지네이션 헬퍼
+from backend.core.http_cache import not_modified_response # 조건부 요청(304) 헬퍼
+from backend.api.v1.part.catalog import catalog_cache_headers # 제조사 쓰기도 카탈로그 버전을 올리므로 같은 ETag 사용
 from . import crud, schemas # Maker CRUD 함수 및 스키마(DTO) 임포트
 
 # API 라우터 인스턴스 생성
@@ -94,25 +97,41 @@ def create_maker(
 
 @handler.get("")
 def get_makers(
+    request: Request, # 조건부 요청 헤더 확인용
+    response: Response, # 검증 헤더(ETag) 설정용
     include_schema: bool = Query(False, description="응답에 스키마 정의를 포함할지 여부"),
     skip: int = Query(0, ge=0, description="건너뛸 레코드 수"),
     limit: int = Query(100, ge=1, le=1000, description="가져올 최대 레코드 수"),
-    db: Session = Depends(get_db) # DB 세션 의존성 주입
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (지정 시 skip 무시)"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN, description="총 개수 계산 방식 (exact | estimate | none)"),
+    db: Session = Depends(get_read_db) # DB 세션 의존성 주입
 ):
     """
     모든 제조사 목록을 조회하는 API 엔드포인트입니다.
-    - 페이징 및 스키마 포함 옵션을 지원합니다.
+    - 페이징(skip 또는 cursor) 및 스키마 포함 옵션을 지원합니다.
+    - If-None-Match가 현재 카탈로그 버전과 같으면 DB 조회 없이 304를 반환합니다.
     
     Args:
+        request (Request): 요청 객체 (If-None-Match 헤더 확인용).
+        response (Response): 응답 헤더 설정용 객체.
         include_schema (bool): 응답에 스키마 정의를 포함할지 여부.
         skip (int): 건너뛸 레코드 수.
         limit (int): 가져올 레코드 최대 수.
+        cursor (Optional[str]): 다음 페이지 조회용 커서.
+        count (str): 총 개수 계산 방식.
         db (Session): SQLAlchemy 데이터베이스 세션.
         
     Returns:
-        dict: 제조사 목록과 페이징 정보를 담은 딕셔너리. 스키마 포함 시 스키마 정의도 포함.
+        dict: 제조사 목록과 페이징 정보(next_cursor 포함)를 담은 딕셔너리. 스키마 포함 시 스키마 정의도 포함.
     """
-    total, makers = crud.get_makers(db, skip=skip, limit=limit)
+    cache_headers = catalog_cache_headers()
+    cached = not_modified_response(request, cache_headers)
+    if cached:
+        return cached
+    
+    total, makers = crud.get_makers(db, skip=skip, limit=limit, cursor=cursor, count=count)
+    response.headers.update(cache_headers)
+    next_cursor = next_cursor_for(makers, limit, lambda m: m.created_at, lambda m: m.id)
     
     # Maker 객체 리스트를 DTO 형식의 딕셔너리 리스트로 변환합니다.
     items = [
@@ -131,31 +150,38 @@ def get_makers(
             "total": total,
             "items": items,
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
     
     return {
         "total": total,
         "items": items,
         "skip": skip,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": next_cursor
     }
 
 
 @handler.get("/search")
 def search_makers(
+    request: Request, # 조건부 요청 헤더 확인용
+    response: Response, # 검증 헤더(ETag) 설정용
     query: str = Query(..., min_length=1, description="제조사 이름에서 검색할 문자열"),
     include_schema: bool = Query(False, description="응답에 스키마 정의를 포함할지 여부"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db) # DB 세션 의존성 주입
+    db: Session = Depends(get_read_db) # DB 세션 의존성 주입
 ):
     """
     검색어를 사용하여 제조사 목록을 조회하는 API 엔드포인트입니다.
     - 제조사 이름에 대한 부분 매칭을 수행합니다.
     - 페이징 및 스키마 포함 옵션을 지원합니다.
+    - If-None-Match가 현재 카탈로그 버전과 같으면 DB 조회 없이 304를 반환합니다.
     
     Args:
+        request (Request): 요청 객체 (If-None-Match 헤더 확인용).
+        response (Response): 응답 헤더 설정용 객체.
         query (str): 제조사 이름에서 검색할 문자열 (최소 1자).
         include_schema (bool): 응답에 스키마 정의를 포함할지 여부.
         skip (int): 건너뛸 레코드 수.
@@ -168,7 +194,13 @@ def search_makers(
     Raises:
         HTTPException: 쿼리가 너무 짧을 경우 (FastAPI의 Query 검증이 처리).
     """
+    cache_headers = catalog_cache_headers()
+    cached = not_modified_response(request, cache_headers)
+    if cached:
+        return cached
+    
     total, makers = crud.search_makers(db, query, skip=skip, limit=limit)
+    response.headers.update(cache_headers)
     
     # Maker 객체 리스트를 DTO 형식의 딕셔너리 리스트로 변환합니다.
     items = [
@@ -201,13 +233,18 @@ def search_makers(
 @handler.get("/{maker_id}")
 def get_maker(
     maker_id: str, # 경로 파라미터로 제조사 ID를 받음
-    db: Session = Depends(get_db) # DB 세션 의존성 주입
+    request: Request, # 조건부 요청 헤더 확인용
+    response: Response, # 검증 헤더(ETag) 설정용
+    db: Session = Depends(get_read_db) # DB 세션 의존성 주입
 ):
     """
     특정 제조사(Maker)의 상세 정보를 조회하는 API 엔드포인트입니다.
+    - If-None-Match가 현재 카탈로그 버전과 같으면 DB 조회 없이 304를 반환합니다.
     
     Args:
         maker_id (str): 조회할 제조사 ID.
+        request (Request): 요청 객체 (If-None-Match 헤더 확인용).
+        response (Response): 응답 헤더 설정용 객체.
         db (Session): SQLAlchemy 데이터베이스 세션.
         
     Returns:
@@ -216,9 +253,15 @@ def get_maker(
     Raises:
         HTTPException: 제조사 ID를 찾지 못한 경우 404 Not Found.
     """
+    cache_headers = catalog_cache_headers()
+    cached = not_modified_response(request, cache_headers)
+    if cached:
+        return cached
+    
     maker = crud.get_maker_by_id(db, maker_id) # CRUD 함수를 통해 제조사 조회
     if not maker:
         raise HTTPException(status_code=404, detail="제조사를 찾을 수 없습니다.")
+    response.headers.update(cache_headers)
     
     # Maker 객체를 딕셔너리로 변환하여 반환
     return {
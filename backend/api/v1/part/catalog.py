@@ -0,0 +1,482 @@
+# api/v1/part/catalog.py
+#
+# 부품 카탈로그(Resources + Maker + Certification) 인메모리 캐시를 정의합니다.
+# - (maker_id, id) 키로 부품 응답 딕셔너리를 보관하고, 목록/필터/검색/단건 조회를 DB 없이 처리합니다.
+# - 부품/제조사 쓰기(create/update/delete) 시 write-through로 캐시를 갱신하거나 무효화합니다.
+# - 변경될 때마다 증가하는 버전(version)과 hit/miss 카운터를 제공합니다.
+# - 부분 문자열 필터/검색은 n-gram 역색인(search_index.py)으로 후보를 좁힌 뒤 검증합니다.
+#
+
+import bisect
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from backend.models.resources import Resources
+from backend.models.maker import Maker
+from backend.models.certification import Certification
+from backend.core.http_cache import validator_headers
+from .schemas import PartsFilter
+from .search_index import NgramIndex, normalize_text
+
+CatalogKey = Tuple[str, str] # (maker_id, parts_id)
+
+# 검색 가능한 필드 (PartsSearchRequest.search_fields 값)
+SEARCH_FIELDS = ("name", "id", "maker_name", "major", "minor")
+
+# 관련도 검색(ranked) 필드 가중치
+RANK_FIELD_WEIGHTS = {"name": 3, "id": 3, "maker_name": 2, "major": 1, "minor": 1}
+
+# 관련도 검색(ranked) 매칭 유형 점수: 필드 전체 일치 > 단어 전체 일치 > 필드 앞부분 일치 > 단어 앞부분 일치 > 부분 일치
+RANK_EXACT = 10
+RANK_WORD = 8
+RANK_PREFIX = 6
+RANK_WORD_PREFIX = 4
+RANK_CONTAINS = 2
+
+# 단어 경계로 취급할 문자 (단어 앞부분 일치 판정용)
+WORD_BOUNDARIES = " -_/()[],."
+
+
+class CatalogEntry:
+    """카탈로그 한 항목 (응답 딕셔너리 + 필터/검색용 보조 정보)"""
+    __slots__ = ("item", "has_certification", "search_text")
+
+    def __init__(self, item: dict, has_certification: bool):
+        self.item = item
+        self.has_certification = has_certification # Certification 행 존재 여부 (인증 필터는 Inner Join 의미를 유지)
+        # 필드별 정규화 검색 문자열 (ilike 부분 매칭 대체)
+        self.search_text = {
+            "id": normalize_text(item["id"]),
+            "name": normalize_text(item["name"]),
+            "maker_name": normalize_text(item["maker_name"]),
+            "major": normalize_text(item["major_category"]),
+            "minor": normalize_text(item["minor_category"]),
+        }
+
+
+def _match_score(text: str, term: str) -> int:
+    """한 필드 문자열에 대한 검색어 매칭 점수 (불일치 시 0, 여러 위치에서 일치하면 최고 점수)"""
+    if text == term:
+        return RANK_EXACT
+    best = 0
+    position = text.find(term)
+    while position >= 0 and best < RANK_WORD:
+        end = position + len(term)
+        starts_word = position == 0 or text[position - 1] in WORD_BOUNDARIES
+        ends_word = end == len(text) or text[end] in WORD_BOUNDARIES
+        if starts_word and ends_word:
+            score = RANK_WORD
+        elif position == 0:
+            score = RANK_PREFIX
+        elif starts_word:
+            score = RANK_WORD_PREFIX
+        else:
+            score = RANK_CONTAINS
+        best = max(best, score)
+        position = text.find(term, position + 1)
+    return best
+
+
+def _catalog_query(db: Session):
+    """카탈로그 적재용 단일 조인 쿼리 (Resources ⋈ Maker ⟕ Certification)"""
+    return (
+        db.query(
+            Resources.id,
+            Resources.maker_id,
+            Resources.major,
+            Resources.minor,
+            Resources.name,
+            Resources.unit,
+            Resources.solo_price,
+            Resources.display_order,
+            Resources.created_at,
+            Resources.updated_at,
+            Maker.name.label("maker_name"),
+            Certification.id.label("certification_id"),
+            Certification.ul,
+            Certification.ce,
+            Certification.kc,
+            Certification.etc,
+        )
+        .join(Maker, Resources.maker_id == Maker.id)
+        .outerjoin(Certification, (Resources.id == Certification.resources_id) &
+                                  (Resources.maker_id == Certification.maker_id))
+    )
+
+
+def _row_to_item(row) -> dict:
+    """조회 행을 `convert_to_parts_response`와 동일한 형식의 부품 딕셔너리로 변환합니다."""
+    return {
+        "item_code": f"{row.maker_id}-{row.id}",
+        "id": row.id,
+        "maker_id": row.maker_id,
+        "maker_name": row.maker_name,
+        "major_category": row.major,
+        "minor_category": row.minor,
+        "name": row.name,
+        "unit": row.unit,
+        "solo_price": row.solo_price,
+        "display_order": row.display_order,
+        "ul": row.ul if row.certification_id is not None else False,
+        "ce": row.ce if row.certification_id is not None else False,
+        "kc": row.kc if row.certification_id is not None else False,
+        "etc": row.etc if row.certification_id is not None else None,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at
+    }
+
+
+def _row_to_entry(row) -> CatalogEntry:
+    """조회 행을 카탈로그 항목으로 변환합니다."""
+    return CatalogEntry(_row_to_item(row), row.certification_id is not None)
+
+
+def iter_catalog_items(db: Session, batch_size: int = 500) -> Iterator[dict]:
+    """
+    캐시를 거치지 않고 DB에서 전체 카탈로그를 품목코드 순으로 스트리밍 조회합니다.
+    - yield_per로 batch_size 행씩 가져오므로 카탈로그 크기와 무관하게 메모리 사용량이 일정합니다.
+    """
+    query = (
+        _catalog_query(db)
+        .order_by(Resources.maker_id, Resources.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for row in query:
+        yield _row_to_item(row)
+
+
+def query_changed_items(db: Session, since) -> List[dict]:
+    """
+    since 이후 부품 자체, 제조사(제조사명), 인증 정보 중 하나라도 변경된 부품을 품목코드 순으로 조회합니다.
+
+    Args:
+        since: updated_at 비교 기준값 (컬럼 저장 형식과 같은 타입/형식이어야 함).
+    """
+    query = (
+        _catalog_query(db)
+        .filter(or_(
+            Resources.updated_at >= since,
+            Maker.updated_at >= since,
+            Certification.updated_at >= since
+        ))
+        .order_by(Resources.maker_id, Resources.id)
+    )
+    return [_row_to_item(row) for row in query]
+
+
+class PartsCatalog:
+    """
+    부품 카탈로그 인메모리 캐시.
+    - 최초 접근(또는 무효화 이후 첫 접근) 시 단일 쿼리로 전체 카탈로그를 적재합니다. (miss)
+    - 이후 조회는 메모리에서 처리합니다. (hit)
+    - 반환되는 딕셔너리는 캐시 원본의 얕은 복사본입니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: Dict[CatalogKey, CatalogEntry] = {}
+        self._sorted_keys: List[CatalogKey] = [] # 품목코드(maker_id, id) 순 정렬 키
+        self._index = NgramIndex() # 부분 문자열 검색용 n-gram 역색인
+        self._loaded = False
+        self._version = 0 # 카탈로그가 변경될 때마다 증가
+        self._epoch = uuid.uuid4().hex[:8] # 프로세스 식별자 (재시작 후 같은 버전 번호로 ETag가 겹치지 않도록)
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+        self.last_rebuild_at: Optional[float] = None
+        self.last_rebuild_seconds: Optional[float] = None
+
+    # --------------------------------------------------------
+    # 버전 / 적재
+    # --------------------------------------------------------
+
+    @property
+    def version(self) -> int:
+        """카탈로그 버전 (부품/제조사 쓰기마다 증가)"""
+        return self._version
+
+    @property
+    def etag(self) -> str:
+        """현재 카탈로그 버전에 대한 ETag 값 (따옴표 포함)"""
+        return f'"parts-{self._epoch}-{self._version}"'
+
+    def rebuild(self, db: Session) -> None:
+        """DB에서 전체 카탈로그를 다시 적재합니다. (강제 재적재에도 사용)"""
+        with self._lock:
+            started = time.perf_counter()
+            entries = {(row.maker_id, row.id): _row_to_entry(row) for row in _catalog_query(db)}
+            self._entries = entries
+            self._sorted_keys = sorted(entries)
+            self._reindex()
+            self._loaded = True
+            self.rebuilds += 1
+            self.last_rebuild_at = time.time()
+            self.last_rebuild_seconds = time.perf_counter() - started
+
+    def invalidate(self) -> None:
+        """캐시를 무효화합니다. 다음 조회 시 전체 카탈로그를 다시 적재합니다."""
+        with self._lock:
+            self._loaded = False
+            self._entries = {}
+            self._sorted_keys = []
+            self._index.clear()
+            self._version += 1
+
+    def _reindex(self) -> None:
+        """현재 항목 전체로 n-gram 역색인을 다시 만듭니다. (tombstone 정리 포함)"""
+        self._index.clear()
+        for key in self._sorted_keys:
+            self._index.add(key, self._entries[key].search_text.values())
+
+    def _ensure_loaded(self, db: Session) -> None:
+        if self._loaded:
+            self.hits += 1
+            return
+        self.misses += 1
+        self.rebuild(db)
+
+    # --------------------------------------------------------
+    # Write-through 갱신
+    # --------------------------------------------------------
+
+    def refresh_part(self, db: Session, maker_id: str, parts_id: str) -> None:
+        """
+        부품 한 건의 생성/수정 내용을 캐시에 반영합니다.
+        - 캐시가 적재되어 있지 않으면 버전만 올립니다. (다음 조회 시 전체 적재)
+        - DB에서 사라진 부품이면 캐시에서도 제거합니다.
+        """
+        with self._lock:
+            self._version += 1
+            if not self._loaded:
+                return
+            row = (
+                _catalog_query(db)
+                .filter(Resources.maker_id == maker_id, Resources.id == parts_id)
+                .first()
+            )
+            key = (maker_id, parts_id)
+            if row is None:
+                self._remove_key(key)
+                return
+            if key not in self._entries:
+                bisect.insort(self._sorted_keys, key)
+            entry = self._entries[key] = _row_to_entry(row)
+            self._index.add(key, entry.search_text.values())
+            if self._index.needs_compaction:
+                self._reindex()
+
+    def remove_part(self, maker_id: str, parts_id: str) -> None:
+        """삭제된 부품을 캐시에서 제거합니다."""
+        with self._lock:
+            self._version += 1
+            if self._loaded:
+                self._remove_key((maker_id, parts_id))
+
+    def _remove_key(self, key: CatalogKey) -> None:
+        if self._entries.pop(key, None) is not None:
+            index = bisect.bisect_left(self._sorted_keys, key)
+            if index < len(self._sorted_keys) and self._sorted_keys[index] == key:
+                del self._sorted_keys[index]
+            self._index.remove(key)
+            if self._index.needs_compaction:
+                self._reindex()
+
+    # --------------------------------------------------------
+    # 조회
+    # --------------------------------------------------------
+
+    def get(self, db: Session, maker_id: str, parts_id: str) -> Optional[dict]:
+        """(maker_id, parts_id)로 부품 한 건을 조회합니다."""
+        with self._lock:
+            self._ensure_loaded(db)
+            entry = self._entries.get((maker_id, parts_id))
+            return dict(entry.item) if entry else None
+
+    def _iter_sorted(
+        self,
+        candidates: Optional[Set[CatalogKey]] = None,
+        after: Optional[CatalogKey] = None
+    ) -> Iterable[CatalogEntry]:
+        """
+        품목코드 순으로 항목을 순회합니다. 후보 키 집합이 주어지면 해당 항목만 순회합니다.
+        - after가 주어지면 해당 키 다음 항목부터 순회합니다. (커서 페이지네이션)
+        """
+        keys = self._sorted_keys if candidates is None else sorted(candidates)
+        start = bisect.bisect_right(keys, after) if after is not None else 0
+        for index in range(start, len(keys)):
+            yield self._entries[keys[index]]
+
+    def _candidates(self, needles: Iterable[Optional[str]]) -> Optional[Set[CatalogKey]]:
+        """
+        정규화된 부분 문자열 조건들로 n-gram 색인 후보를 구합니다. (조건 간 AND)
+        - 색인으로 좁힐 수 있는 조건이 하나도 없으면 None (전체 순회)
+        """
+        result: Optional[Set[CatalogKey]] = None
+        for needle in needles:
+            if not needle:
+                continue
+            found = self._index.candidates(needle)
+            if found is None:
+                continue
+            result = found if result is None else result & found
+            if not result:
+                break
+        return result
+
+    def get_parts_list(
+        self,
+        db: Session,
+        filters: PartsFilter,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[CatalogKey] = None,
+        with_total: bool = True
+    ) -> Tuple[List[dict], Optional[int]]:
+        """
+        `crud.get_parts_list`와 동일한 필터/정렬/페이징 의미로 카탈로그에서 부품 목록을 조회합니다.
+
+        Args:
+            after (Optional[CatalogKey]): 이전 페이지 마지막 품목코드. 지정 시 skip 대신 해당 키 이후부터 조회합니다.
+            with_total (bool): False면 총 개수를 계산하지 않고 페이지가 채워지는 즉시 순회를 멈춥니다.
+
+        Returns:
+            Tuple[List[dict], Optional[int]]: (부품 딕셔너리 리스트, 총 필터링된 개수 또는 None).
+        """
+        id_like = normalize_text(filters.id) if filters.id is not None else None
+        name_like = normalize_text(filters.name) if filters.name is not None else None
+        major_like = normalize_text(filters.major) if filters.major is not None else None
+        minor_like = normalize_text(filters.minor) if filters.minor is not None else None
+        cert_filtered = filters.ul is not None or filters.ce is not None or filters.kc is not None
+
+        def matches(entry: CatalogEntry) -> bool:
+            item, text = entry.item, entry.search_text
+            if id_like is not None and id_like not in text["id"]:
+                return False
+            if filters.maker_id is not None and item["maker_id"] != filters.maker_id:
+                return False
+            if name_like is not None and name_like not in text["name"]:
+                return False
+            if filters.unit is not None and item["unit"] != filters.unit:
+                return False
+            if filters.min_price is not None and item["solo_price"] < filters.min_price:
+                return False
+            if filters.max_price is not None and item["solo_price"] > filters.max_price:
+                return False
+            if major_like is not None and major_like not in text["major"]:
+                return False
+            if minor_like is not None and minor_like not in text["minor"]:
+                return False
+            if cert_filtered:
+                if not entry.has_certification:
+                    return False
+                if filters.ul is not None and item["ul"] != filters.ul:
+                    return False
+                if filters.ce is not None and item["ce"] != filters.ce:
+                    return False
+                if filters.kc is not None and item["kc"] != filters.kc:
+                    return False
+            return True
+
+        with self._lock:
+            self._ensure_loaded(db)
+            candidates = self._candidates((id_like, name_like, major_like, minor_like))
+            if after is not None:
+                skip = 0 # 커서 사용 시 OFFSET 미사용
+            if not with_total:
+                page: List[CatalogEntry] = []
+                for entry in self._iter_sorted(candidates, after):
+                    if matches(entry):
+                        page.append(entry)
+                        if len(page) >= skip + limit:
+                            break
+                return [dict(entry.item) for entry in page[skip:skip + limit]], None
+            matched = [entry for entry in self._iter_sorted(candidates, after) if matches(entry)]
+        return [dict(entry.item) for entry in matched[skip:skip + limit]], len(matched)
+
+    def search_parts(
+        self,
+        db: Session,
+        query: str,
+        search_fields: List[str],
+        skip: int = 0,
+        limit: int = 20,
+        mode: str = "contains"
+    ) -> Tuple[List[dict], int]:
+        """
+        여러 필드에 대해 OR 조건으로 부품을 검색합니다.
+        - contains: `crud.search_parts`와 동일하게 검색어 전체의 부분 매칭, 품목코드 순 정렬.
+        - ranked: 공백으로 나눈 검색어를 모두 포함(AND)하는 부품을 관련도 순으로 정렬하고, 항목에 score를 포함합니다.
+          (필드 전체 일치 > 앞부분 일치 > 단어 앞부분 일치 > 부분 일치, 필드별 가중치 적용)
+
+        Returns:
+            Tuple[List[dict], int]: (검색된 부품 딕셔너리 리스트, 총 검색 결과 개수).
+        """
+        fields = [field for field in SEARCH_FIELDS if field in search_fields]
+        needle = normalize_text(query)
+
+        with self._lock:
+            self._ensure_loaded(db)
+            if not fields:
+                # 검색 필드가 없으면 필터 없이 전체 (crud와 동일)
+                matched = list(self._iter_sorted())
+                return [dict(entry.item) for entry in matched[skip:skip + limit]], len(matched)
+
+            if mode == "ranked":
+                terms = needle.split() or [needle]
+                scored = []
+                for entry in self._iter_sorted(self._candidates(terms)):
+                    score = 0
+                    for term in terms:
+                        term_score = max(
+                            _match_score(entry.search_text[field], term) * RANK_FIELD_WEIGHTS[field]
+                            for field in fields
+                        )
+                        if not term_score:
+                            break
+                        score += term_score
+                    else:
+                        scored.append((score, entry))
+                # 점수 내림차순 (동점은 품목코드 순 유지: 안정 정렬)
+                scored.sort(key=lambda pair: pair[0], reverse=True)
+                items = [dict(entry.item, score=score) for score, entry in scored[skip:skip + limit]]
+                return items, len(scored)
+
+            matched = [
+                entry for entry in self._iter_sorted(self._candidates((needle,)))
+                if any(needle in entry.search_text[field] for field in fields)
+            ]
+        return [dict(entry.item) for entry in matched[skip:skip + limit]], len(matched)
+
+    def stats(self) -> dict:
+        """캐시 상태 및 hit/miss 카운터를 반환합니다."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self._version,
+                "etag": self.etag,
+                "loaded": self._loaded,
+                "size": len(self._entries),
+                "index_postings": self._index.posting_count,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else None,
+                "rebuilds": self.rebuilds,
+                "last_rebuild_at": self.last_rebuild_at,
+                "last_rebuild_seconds": self.last_rebuild_seconds
+            }
+
+
+# 프로세스 전역 카탈로그 인스턴스
+parts_catalog = PartsCatalog()
+
+
+def catalog_cache_headers() -> dict:
+    """
+    카탈로그 기반 조회(부품 목록/단건, 제조사 조회) 응답의 검증 헤더를 만듭니다.
+    - 부품/제조사 쓰기는 모두 카탈로그 버전을 올리므로, 버전 기반 약한 ETag로 304 판단에 DB 조회가 필요 없습니다.
+    - 데이터 조회 전에 만들어야 합니다. (조회 중 변경이 생기면 다음 요청이 304가 아닌 전체 응답을 받도록)
+    """
+    return validator_headers("W/" + parts_catalog.etag)
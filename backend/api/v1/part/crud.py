@@ -2,15 +2,27 @@
 #
 # 부품(Resources) 데이터베이스 작업을 위한 CRUD(Create, Read, Update, Delete) 함수를 정의합니다.
 # - 부품 ID 생성, 부품 및 인증 정보 생성/조회/검색/수정/삭제 기능을 제공합니다.
+# - 삭제 기록(tombstone)을 남기고, 동기화 토큰 이후 변경분(upserts/deletes)을 조회하는 기능을 제공합니다.
 #
 
+from datetime import datetime, timedelta # 증분 동기화 기준 시각 계산
+from fastapi import HTTPException # 잘못된 동기화 토큰 처리
 from sqlalchemy.orm import Session # 데이터베이스 세션 관리를 위함
-from sqlalchemy import and_, or_, func # SQLAlchemy AND, OR 조건 및 함수 사용을 위함
+from sqlalchemy import and_, or_, func, select, literal, update, String # SQLAlchemy AND, OR 조건 및 함수 사용을 위함
 from typing import List, Tuple, Optional # 타입 힌트
 from backend.models.resources import Resources # Resources 모델 임포트
+from backend.models.resources_tombstone import ResourcesTombstone # 삭제된 부품 기록 (증분 동기화용)
 from backend.models.maker import Maker # Maker 모델 임포트
 from backend.models.certification import Certification # Certification 모델 임포트
 from .schemas import PartsFilter # 부품 필터링 스키마 임포트
+from backend.core.pagination import TIMESTAMP_FORMAT, encode_cursor, decode_string_cursor # 동기화 토큰 인코딩
+from .catalog import parts_catalog, iter_catalog_items, query_changed_items # 부품 카탈로그 인메모리 캐시 (쓰기 시 write-through 갱신)
+
+# 삭제 기록(tombstone) 보존 기간. 이보다 오래된 토큰으로 요청하면 전체 재동기화(reset)로 응답합니다.
+TOMBSTONE_RETENTION_DAYS = 30
+
+# 동기화 토큰 안전 구간(초). 타임스탬프가 초 단위이므로 경계 시점의 변경을 놓치지 않도록 여유를 둡니다.
+CHANGES_SAFETY_WINDOW_SECONDS = 2
 
 # ============================================================
 # 헬퍼 함수
@@ -111,6 +123,7 @@ def create_parts(
     
     db.commit() 
     db.refresh(resource) 
+    parts_catalog.refresh_part(db, maker_id, parts_id) # 카탈로그 캐시에 신규 부품 반영
     return resource
 
 
@@ -287,6 +300,7 @@ def update_parts(
     
     db.commit() # 트랜잭션 커밋
     db.refresh(resource) # 객체 새로고침
+    parts_catalog.refresh_part(db, maker_id, parts_id) # 카탈로그 캐시에 수정 내용 반영
     return resource
 
 
@@ -312,5 +326,149 @@ def delete_parts(db: Session, parts_id: str, maker_id: str) -> bool:
         db.commit() # Certification 삭제 커밋
 
     db.delete(resource) # Resources 삭제
+    record_parts_tombstone(db, parts_id, maker_id) # 증분 동기화용 삭제 기록 (같은 트랜잭션)
     db.commit() # 트랜잭션 커밋
-    return True
\ No newline at end of file
+    parts_catalog.remove_part(maker_id, parts_id) # 카탈로그 캐시에서 제거
+    return True
+
+
+# ============================================================
+# 증분 동기화 (changes since)
+# ============================================================
+
+def record_parts_tombstone(db: Session, parts_id: str, maker_id: str) -> None:
+    """
+    부품 삭제를 tombstone 로그에 기록하고, 보존 기간이 지난 기록을 정리합니다. (커밋은 호출 측에서 수행)
+    
+    Args:
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        parts_id (str): 삭제된 부품 ID.
+        maker_id (str): 삭제된 부품의 제조사 ID.
+    """
+    db.add(ResourcesTombstone(resources_id=parts_id, maker_id=maker_id))
+    horizon = _db_now(db) - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+    db.query(ResourcesTombstone).filter(
+        ResourcesTombstone.deleted_at < _timestamp_param(horizon)
+    ).delete(synchronize_session=False)
+
+
+def restamp_parts_changes(db: Session, started_at: datetime) -> None:
+    """
+    이 트랜잭션에서 started_at 이후 기록한 부품/제조사/인증의 updated_at을 지금(커밋 직전) 시각으로 다시 맞춥니다. (커밋은 호출 측에서 수행)
+    - 변경은 커밋해야 보이므로, 오래 걸린 일괄 쓰기의 updated_at이 커밋 시각보다 안전 구간 이상 이르면
+      그 사이에 발급된 동기화 토큰(next_since)이 이 변경을 건너뛸 수 있습니다.
+    - 쓰기 연결은 하나뿐이므로 트랜잭션 중 started_at 이후 수정된 행은 모두 이 트랜잭션이 쓴 것입니다.
+
+    Args:
+        db (Session): SQLAlchemy 데이터베이스 세션. (쓰기 트랜잭션 진행 중)
+        started_at (datetime): 쓰기 트랜잭션을 시작한 DB 시각.
+    """
+    if _db_now(db) <= started_at: # 같은 초 안에 끝났으면 그대로 둡니다.
+        return
+    since_param = _timestamp_param(started_at)
+    for model in (Maker, Resources, Certification):
+        table = model.__table__
+        db.execute(update(table).where(table.c.updated_at >= since_param).values(updated_at=func.current_timestamp()))
+
+
+def _db_now(db: Session) -> datetime:
+    """DB 기준 현재 시각 (updated_at과 같은 시계를 사용)"""
+    now = db.execute(select(func.current_timestamp())).scalar()
+    return now if isinstance(now, datetime) else datetime.strptime(now, TIMESTAMP_FORMAT)
+
+
+def _timestamp_param(value: datetime):
+    """타임스탬프 컬럼 비교용 바인드 값 (CURRENT_TIMESTAMP 저장 형식 문자열)"""
+    return literal(value.strftime(TIMESTAMP_FORMAT), String())
+
+
+def encode_changes_token(value: datetime) -> str:
+    """동기화 기준 시각을 불투명한 토큰 문자열로 인코딩합니다."""
+    return encode_cursor(value.strftime(TIMESTAMP_FORMAT))
+
+
+def decode_changes_token(token: str) -> datetime:
+    """
+    동기화 토큰을 기준 시각으로 디코딩합니다.
+    
+    Raises:
+        HTTPException: 토큰 형식이 올바르지 않을 경우 400 Bad Request.
+    """
+    (value,) = decode_string_cursor(token, 1)
+    try:
+        return datetime.strptime(value, TIMESTAMP_FORMAT)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="유효하지 않은 동기화 토큰입니다.")
+
+
+def current_changes_token(db: Session) -> str:
+    """
+    지금 시점의 전체 스냅샷(예: NDJSON 내보내기) 이후 변경분을 받기 위한 동기화 토큰을 반환합니다.
+    - 같은 초 안에 커밋된 변경을 놓치지 않도록 안전 구간만큼 이전 시각을 기준으로 합니다. (중복은 허용)
+    """
+    return encode_changes_token(_db_now(db) - timedelta(seconds=CHANGES_SAFETY_WINDOW_SECONDS))
+
+
+def get_parts_changes(db: Session, since: Optional[str] = None) -> dict:
+    """
+    동기화 토큰 이후 변경된 부품(upserts)과 삭제된 부품(deletes)을 조회합니다.
+    - 부품, 제조사(제조사명), 인증 정보 중 하나라도 변경되면 해당 부품 전체를 upsert로 반환합니다.
+    - 토큰이 없거나 tombstone 보존 기간보다 오래되었으면 reset=True와 함께 전체 부품을 upserts로 반환합니다.
+      (클라이언트는 로컬 인덱스를 비우고 upserts로 다시 채워야 합니다.)
+    - 경계 구간의 변경은 다음 응답에서 다시 내려올 수 있으므로, 클라이언트는 키 기준으로 멱등하게 반영해야 합니다.
+    
+    Args:
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        since (Optional[str]): 이전 응답의 next_since 토큰.
+        
+    Returns:
+        dict: {"since", "next_since", "reset", "upserts", "deletes"} 형식의 변경분.
+    """
+    now = _db_now(db)
+    next_since = encode_changes_token(now - timedelta(seconds=CHANGES_SAFETY_WINDOW_SECONDS))
+    since_at = decode_changes_token(since) if since else None
+    
+    # 토큰이 없거나 보존 기간이 지난 경우: 전체 스냅샷으로 재동기화
+    if since_at is None or since_at < now - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+        return {
+            "since": since,
+            "next_since": next_since,
+            "reset": True,
+            "upserts": list(iter_catalog_items(db)),
+            "deletes": []
+        }
+    
+    since_param = _timestamp_param(since_at)
+    upserts = query_changed_items(db, since_param)
+    
+    # 삭제 후 같은 키로 다시 생성된 부품은 upsert만 반환합니다.
+    live_keys = {(item["maker_id"], item["id"]) for item in upserts}
+    tombstones = (
+        db.query(
+            ResourcesTombstone.maker_id,
+            ResourcesTombstone.resources_id,
+            func.max(ResourcesTombstone.deleted_at).label("deleted_at")
+        )
+        .filter(ResourcesTombstone.deleted_at >= since_param)
+        .group_by(ResourcesTombstone.maker_id, ResourcesTombstone.resources_id)
+        .order_by(ResourcesTombstone.maker_id, ResourcesTombstone.resources_id)
+        .all()
+    )
+    deletes = [
+        {
+            "item_code": f"{row.maker_id}-{row.resources_id}",
+            "id": row.resources_id,
+            "maker_id": row.maker_id,
+            "deleted_at": row.deleted_at
+        }
+        for row in tombstones
+        if (row.maker_id, row.resources_id) not in live_keys
+    ]
+    
+    return {
+        "since": since,
+        "next_since": next_since,
+        "reset": False,
+        "upserts": upserts,
+        "deletes": deletes
+    }
\ No newline at end of file
@@ -0,0 +1,53 @@
+# api/v1/part/export.py
+#
+# 부품 카탈로그 전체를 NDJSON(줄 단위 JSON)으로 스트리밍 내보내기 위한 헬퍼를 정의합니다.
+# - DB에서 배치 단위로 읽어 바로 직렬화하므로 카탈로그 크기와 무관하게 메모리 사용량이 일정합니다.
+# - gzip 요청 시 스트림을 그대로 압축해 내보냅니다.
+#
+
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Iterator
+from backend.database import ReadSessionLocal
+from .catalog import iter_catalog_items
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# 한 번에 DB에서 가져와 직렬화할 행 수
+EXPORT_BATCH_SIZE = 500
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def iter_parts_ndjson(batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    전체 부품을 품목코드 순 NDJSON 청크(batch_size 줄 단위)로 생성합니다.
+    - 스트리밍 도중 요청 세션이 닫혀도 영향이 없도록 전용 세션을 열고 종료 시 닫습니다.
+    """
+    db = ReadSessionLocal()
+    try:
+        lines = []
+        for item in iter_catalog_items(db, batch_size):
+            lines.append(json.dumps(item, ensure_ascii=False, default=_json_default))
+            if len(lines) >= batch_size:
+                yield ("\n".join(lines) + "\n").encode("utf-8")
+                lines = []
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+    finally:
+        db.close()
+
+
+def gzip_stream(chunks: Iterator[bytes], level: int = 6) -> Iterator[bytes]:
+    """바이트 청크 스트림을 gzip 형식으로 압축하며 그대로 흘려보냅니다."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS) # wbits 16+: gzip 헤더/트레일러 포함
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
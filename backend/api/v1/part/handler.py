@@ -5,11 +5,18 @@
 # - DTO(Pydantic 스키마)와 CRUD(데이터베이스 작업) 계층을 연결하는 컨트롤러 역할을 합니다.
 #
 
-from fastapi import APIRouter, Depends, Query, HTTPException # FastAPI 라우터, 의존성 주입, 쿼리 파라미터, HTTP 예외 처리
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response # FastAPI 라우터, 의존성 주입, 쿼리 파라미터, HTTP 예외 처리, 요청 헤더, 응답 헤더
+from fastapi.responses import StreamingResponse # 스트리밍 응답 (NDJSON 내보내기)
 from sqlalchemy.orm import Session # 데이터베이스 세션 관리를 위함
 from typing import Optional, List # 타입 힌트 (선택적 인자, 리스트)
-from backend.database import get_db # 데이터베이스 세션 의존성 주입
+from backend.database import get_db, get_read_db # 데이터베이스 세션 의존성 주입
+from backend.core.db_runner import ReadRunner, get_read_runner # 조회용 DB 실행기 (비동기/동기 경로)
 from . import crud, schemas # Part CRUD 함수 및 스키마(DTO) 임포트
+from backend.core.pagination import COUNT_MODE_PATTERN, decode_string_cursor, next_cursor_for # 커서 페이지네이션 헬퍼
+from backend.core.http_cache import etag_matches, not_modified, not_modified_response # ETag 조건부 요청 헬퍼
+from backend.core.responses import FastJSONResponse # orjson 응답 (대용량 목록 직렬화)
+from .catalog import catalog_cache_headers, parts_catalog # 부품 카탈로그 인메모리 캐시 (목록/검색/단건 조회용) 및 버전 기반 검증 헤더
+from .export import NDJSON_MEDIA_TYPE, gzip_stream, iter_parts_ndjson # NDJSON 스트리밍 내보내기
 
 # API 라우터 인스턴스 생성
 handler = APIRouter()
@@ -169,8 +176,9 @@ def create_parts(
     return convert_to_parts_response(resource) # 생성된 자원 객체를 응답 DTO로 변환하여 반환
 
 
-@handler.get("")
-def get_parts_list(
+@handler.get("", response_class=FastJSONResponse)
+async def get_parts_list(
+    request: Request, # 조건부 요청 헤더 확인용
     include_schema: bool = Query(False, description="응답에 스키마 정의를 포함할지 여부"),
     skip: int = Query(0, ge=0, description="건너뛸 레코드 수"),
     limit: int = Query(100, ge=1, le=1000, description="가져올 최대 레코드 수"),
@@ -185,76 +193,193 @@ def get_parts_list(
     ul: Optional[bool] = Query(None, description="UL 인증 여부로 필터링"),
     ce: Optional[bool] = Query(None, description="CE 인증 여부로 필터링"),
     kc: Optional[bool] = Query(None, description="KC 인증 여부로 필터링"),
-    db: Session = Depends(get_db) # DB 세션 의존성 주입
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (지정 시 skip 무시)"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN, description="총 개수 계산 방식 (exact | estimate | none)"),
+    runner: ReadRunner = Depends(get_read_runner) # 조회용 DB 실행기 의존성 주입
 ):
     """
     모든 부품(Parts) 목록을 조회하고 다양한 필터링 및 페이징을 지원하는 API 엔드포인트입니다.
+    - cursor 지정 시 품목코드(maker_id, id) 기준 Keyset 페이지네이션으로 조회합니다.
+    - 카탈로그 캐시에서는 개수 계산 비용이 작으므로 estimate는 exact와 동일하게 처리합니다.
+    - If-None-Match가 현재 카탈로그 버전과 같으면 본문 없이 304를 반환합니다.
     
     Args:
+        request (Request): 요청 객체 (If-None-Match 헤더 확인용).
         (위에 정의된 쿼리 파라미터들)
-        db (Session): SQLAlchemy 데이터베이스 세션.
+        runner (ReadRunner): 읽기 전용 세션 실행기 (비동기 또는 스레드풀 경로).
         
     Returns:
-        dict: 부품 목록과 페이징 정보를 담은 딕셔너리. 스키마 포함 시 스키마 정의도 포함.
+        dict: 부품 목록과 페이징 정보(next_cursor 포함)를 담은 딕셔너리. 스키마 포함 시 스키마 정의도 포함. (변경 없음이면 304 응답)
     """
+    cache_headers = catalog_cache_headers()
+    cached = not_modified_response(request, cache_headers)
+    if cached:
+        return cached
+    
     # 쿼리 파라미터를 기반으로 필터 객체를 생성합니다.
     filters = schemas.PartsFilter(
         id=id, maker_id=maker_id, name=name, unit=unit, min_price=min_price, max_price=max_price,
         major=major, minor=minor, ul=ul, ce=ce, kc=kc
     )
     
-    parts_list, total = crud.get_parts_list(db, filters, skip=skip, limit=limit)
-    
-    # Resources 객체 리스트를 DTO 형식으로 변환합니다.
-    items = [convert_to_parts_response(part) for part in parts_list]
+    # 카탈로그 캐시에서 필터링/페이징된 부품 목록(DTO 형식)을 조회합니다. (캐시 락/적재는 작업 스레드에서)
+    after = decode_string_cursor(cursor, 2) if cursor else None
+    items, total = await runner.run_in_thread(
+        parts_catalog.get_parts_list, filters, skip=skip, limit=limit, after=after, with_total=(count != "none")
+    )
+    next_cursor = next_cursor_for(items, limit, lambda p: p["maker_id"], lambda p: p["id"])
     
-    # 스키마 포함 옵션에 따라 응답을 구성합니다.
+    # 스키마 포함 옵션에 따라 응답을 구성합니다. (카탈로그 DTO는 검증된 내부 dict이므로 jsonable_encoder 변환 없이 바로 직렬화)
     if include_schema:
-        return {
+        return FastJSONResponse({
             "schema": get_parts_schema(),
             "total": total,
             "items": items,
             "skip": skip,
-            "limit": limit
-        }
+            "limit": limit,
+            "next_cursor": next_cursor
+        }, headers=cache_headers)
     else:
-        return {
+        return FastJSONResponse({
             "total": total,
             "items": items,
             "skip": skip,
-            "limit": limit
-        }
+            "limit": limit,
+            "next_cursor": next_cursor
+        }, headers=cache_headers)
+
+
+@handler.get("/catalog/stats")
+def get_catalog_stats():
+    """
+    부품 카탈로그 캐시 상태를 조회하는 API 엔드포인트입니다.
+    - 버전, 적재 여부, 항목 수, hit/miss 카운터 등을 반환합니다.
+    
+    Returns:
+        dict: 카탈로그 캐시 상태 정보.
+    """
+    return parts_catalog.stats()
+
+
+@handler.post("/catalog/rebuild")
+def rebuild_catalog(
+    db: Session = Depends(get_db) # DB 세션 의존성 주입
+):
+    """
+    부품 카탈로그 캐시를 DB에서 강제로 다시 적재하는 API 엔드포인트입니다.
+    - API를 거치지 않고 DB가 직접 변경된 경우 등에 사용합니다.
+    
+    Args:
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        
+    Returns:
+        dict: 재적재 후 카탈로그 캐시 상태 정보.
+    """
+    parts_catalog.invalidate()
+    parts_catalog.rebuild(db)
+    return parts_catalog.stats()
+
+
+@handler.get("/export")
+def export_parts(
+    request: Request,
+    db: Session = Depends(get_read_db) # DB 세션 의존성 주입 (동기화 토큰 계산용)
+):
+    """
+    전체 부품 카탈로그를 NDJSON(한 줄에 부품 하나, 품목코드 순)으로 스트리밍하는 API 엔드포인트입니다.
+    - 각 줄은 목록 API의 항목과 같은 형식입니다.
+    - Accept-Encoding에 gzip이 있으면 gzip으로 압축해 전송합니다.
+    - ETag는 카탈로그 버전 기반이며, If-None-Match가 일치하면 본문 없이 304를 반환합니다.
+    - X-Changes-Token 헤더로 이후 변경분을 `/changes?since=`로 받을 수 있는 동기화 토큰을 제공합니다.
+    
+    Args:
+        request (Request): 요청 객체 (Accept-Encoding, If-None-Match 헤더 확인용).
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        
+    Returns:
+        StreamingResponse: NDJSON 스트림 (변경 없음이면 304 응답).
+    """
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
+    
+    # 압축 여부에 따라 본문 바이트가 다르므로 표현(representation)별로 ETag를 구분합니다.
+    etag = parts_catalog.etag
+    if use_gzip:
+        etag = etag[:-1] + '-gzip"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache", # 매번 ETag로 재검증
+        "Vary": "Accept-Encoding"
+    }
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, {"Cache-Control": headers["Cache-Control"], "Vary": headers["Vary"]})
+    
+    headers["X-Changes-Token"] = crud.current_changes_token(db) # 스트리밍 시작 전 시점 기준
+    chunks = iter_parts_ndjson()
+    if use_gzip:
+        chunks = gzip_stream(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+@handler.get("/changes")
+def get_parts_changes(
+    since: Optional[str] = Query(None, description="이전 응답의 next_since (또는 내보내기 응답의 X-Changes-Token)"),
+    db: Session = Depends(get_read_db) # DB 세션 의존성 주입
+):
+    """
+    동기화 토큰 이후 변경된 부품(upserts)과 삭제된 부품(deletes)을 조회하는 API 엔드포인트입니다.
+    - 로컬에 카탈로그를 캐시하는 클라이언트가 전체를 다시 받지 않고 변경분만 반영할 수 있습니다.
+    - since가 없거나 너무 오래된 경우 reset=True와 전체 부품 목록을 반환합니다.
+    
+    Args:
+        since (Optional[str]): 동기화 토큰.
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        
+    Returns:
+        dict: since, next_since, reset, upserts(목록 API 항목 형식), deletes(item_code/id/maker_id/deleted_at).
+    """
+    return crud.get_parts_changes(db, since=since)
 
 
 @handler.get("/{parts_id}/{maker_id}")
 def get_parts_detail(
     parts_id: str, # 경로 파라미터: 부품 ID
     maker_id: str, # 경로 파라미터: 제조사 ID
+    request: Request, # 조건부 요청 헤더 확인용
+    response: Response, # 검증 헤더(ETag) 설정용
     include_schema: bool = Query(False, description="응답에 스키마 정의를 포함할지 여부"),
-    db: Session = Depends(get_db) # DB 세션 의존성 주입
+    db: Session = Depends(get_read_db) # DB 세션 의존성 주입
 ):
     """
     특정 부품(Parts)의 상세 정보를 조회하는 API 엔드포인트입니다.
     - 부품 ID와 제조사 ID를 사용하여 고유한 부품을 식별합니다.
+    - If-None-Match가 현재 카탈로그 버전과 같으면 본문 없이 304를 반환합니다.
     
     Args:
         parts_id (str): 조회할 부품 ID.
         maker_id (str): 조회할 제조사 ID.
+        request (Request): 요청 객체 (If-None-Match 헤더 확인용).
+        response (Response): 응답 헤더 설정용 객체.
         include_schema (bool): 응답에 스키마 정의를 포함할지 여부.
         db (Session): SQLAlchemy 데이터베이스 세션.
         
     Returns:
-        dict: 조회된 부품 상세 정보.
+        dict: 조회된 부품 상세 정보. (변경 없음이면 304 응답)
         
     Raises:
         HTTPException: 부품을 찾을 수 없는 경우 404 Not Found.
     """
-    parts = crud.get_parts_by_id(db, parts_id, maker_id) # CRUD 함수를 통해 부품 조회
+    cache_headers = catalog_cache_headers()
+    cached = not_modified_response(request, cache_headers)
+    if cached:
+        return cached
     
-    if not parts:
-        raise HTTPException(status_code=404, detail="부품을 찾을 수 없습니다.")
+    item = parts_catalog.get(db, maker_id, parts_id) # 카탈로그 캐시에서 부품 조회 (DTO 형식)
     
-    item = convert_to_parts_response(parts) # Resources 객체를 응답 DTO로 변환
+    if not item:
+        raise HTTPException(status_code=404, detail="부품을 찾을 수 없습니다.")
+    response.headers.update(cache_headers)
     
     # 스키마 포함 옵션에 따라 응답을 구성합니다.
     if include_schema:
@@ -266,49 +391,50 @@ def get_parts_detail(
         return item
 
 
-@handler.post("/search")
-def search_parts(
+@handler.post("/search", response_class=FastJSONResponse)
+async def search_parts(
     search_request: schemas.PartsSearchRequest, # 요청 바디는 PartsSearchRequest 스키마를 따름
-    db: Session = Depends(get_db) # DB 세션 의존성 주입
+    runner: ReadRunner = Depends(get_read_runner) # 조회용 DB 실행기 의존성 주입
 ):
     """
     다양한 필드(이름, ID, 제조사명, 대분류, 중분류)를 사용하여 부품을 검색하는 API 엔드포인트입니다.
     - 여러 검색 필드에 대해 OR 조건을 적용하여 검색을 수행합니다.
+    - n-gram 색인으로 후보를 좁히므로 카탈로그 전체를 순회하지 않습니다.
+    - mode="ranked"이면 공백으로 나뉜 검색어를 모두 포함하는 부품을 관련도(score) 순으로 반환합니다.
     
     Args:
         search_request (schemas.PartsSearchRequest): 검색어, 검색 필드 목록 등을 담은 DTO.
-        db (Session): SQLAlchemy 데이터베이스 세션.
+        runner (ReadRunner): 읽기 전용 세션 실행기 (비동기 또는 스레드풀 경로).
         
     Returns:
         dict: 검색된 부품 목록과 페이징 정보를 담은 딕셔너리. 스키마 포함 옵션도 지원.
     """
-    total, parts_list = crud.search_parts(
-        db=db,
+    # 카탈로그 캐시에서 검색된 부품 목록(DTO 형식)을 조회합니다. (캐시 락/적재는 작업 스레드에서)
+    items, total = await runner.run_in_thread(
+        parts_catalog.search_parts,
         query=search_request.query,
         search_fields=search_request.search_fields,
         skip=search_request.skip,
-        limit=search_request.limit
+        limit=search_request.limit,
+        mode=search_request.mode
     )
     
-    # Resources 객체 리스트를 DTO 형식으로 변환합니다.
-    items = [convert_to_parts_response(part) for part in parts_list]
-    
-    # 스키마 포함 옵션에 따라 응답을 구성합니다.
+    # 스키마 포함 옵션에 따라 응답을 구성합니다. (카탈로그 DTO는 검증된 내부 dict이므로 jsonable_encoder 변환 없이 바로 직렬화)
     if search_request.include_schema:
-        return {
+        return FastJSONResponse({
             "schema": get_parts_schema(),
             "total": total,
             "items": items,
             "skip": search_request.skip,
             "limit": search_request.limit
-        }
+        })
     else:
-        return {
+        return FastJSONResponse({
             "total": total,
             "items": items,
             "skip": search_request.skip,
             "limit": search_request.limit
-        }
+        })
 
 
 @handler.put("/{parts_id}/{maker_id}")
@@ -75,6 +75,7 @@ class PartsSearchRequest(BaseModel):
     include_schema: bool = False
     skip: int = 0
     limit: int = 20
+    mode: str = Field("contains", pattern="^(contains|ranked)$", description="contains: 부분 일치(품목코드 순), ranked: 관련도 순")
 
 
 class PartsDetailWithSchemaResponse(BaseModel):
@@ -0,0 +1,119 @@
+# api/v1/part/search_index.py
+#
+# 부품 카탈로그 검색용 인메모리 n-gram 역색인을 정의합니다.
+# - 필드 문자열을 NFKC 정규화 + 소문자화한 뒤 2-gram/3-gram 단위로 색인합니다. (한글 포함 부분 문자열 검색 지원)
+# - 포스팅 리스트는 array('i') 기반의 append-only 구조이며, 갱신/삭제는 tombstone 처리 후 주기적으로 압축합니다.
+#
+
+import unicodedata
+from array import array
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+# 색인할 n-gram 길이 (2-gram: 두 글자 한글 단어 검색용, 3-gram: 일반 부분 문자열 검색용)
+MIN_GRAM = 2
+MAX_GRAM = 3
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """검색용 문자열 정규화 (NFKC, 소문자화, 연속 공백 정리)"""
+    if not value:
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", value).lower().split())
+
+
+def _grams(text: str, size: int) -> Set[str]:
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def query_grams(needle: str) -> Set[str]:
+    """
+    검색어 후보 조회에 사용할 n-gram 집합을 반환합니다.
+    - 3글자 이상: 3-gram, 2글자: 2-gram 그대로, 1글자 이하: 빈 집합 (색인으로 후보를 좁힐 수 없음)
+    """
+    if len(needle) >= MAX_GRAM:
+        return _grams(needle, MAX_GRAM)
+    if len(needle) >= MIN_GRAM:
+        return {needle}
+    return set()
+
+
+class NgramIndex:
+    """
+    문서 키(예: (maker_id, parts_id)) 단위의 n-gram 역색인.
+    - 후보 조회 결과는 n-gram을 모두 포함하는 문서의 상위 집합이므로, 호출 측에서 실제 부분 문자열 검증이 필요합니다.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self._postings: Dict[str, array] = {} # n-gram -> 문서 번호 배열 (오름차순)
+        self._doc_keys: List[Optional[Hashable]] = [] # 문서 번호 -> 문서 키 (삭제된 문서는 None)
+        self._key_doc: Dict[Hashable, int] = {} # 문서 키 -> 현재 문서 번호
+        self._dead = 0 # tombstone 처리된 문서 수
+
+    def __len__(self) -> int:
+        return len(self._key_doc)
+
+    @property
+    def posting_count(self) -> int:
+        """전체 포스팅 수 (메모리 사용량 지표)"""
+        return sum(len(postings) for postings in self._postings.values())
+
+    def add(self, key: Hashable, texts: Iterable[str]) -> None:
+        """문서를 색인합니다. 이미 색인된 키면 기존 문서를 tombstone 처리하고 새로 색인합니다."""
+        self.remove(key)
+        doc = len(self._doc_keys)
+        self._doc_keys.append(key)
+        self._key_doc[key] = doc
+
+        grams: Set[str] = set()
+        for text in texts:
+            for size in range(MIN_GRAM, MAX_GRAM + 1):
+                grams |= _grams(text, size)
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array("i")
+            postings.append(doc) # 문서 번호가 단조 증가하므로 정렬 상태 유지
+
+    def remove(self, key: Hashable) -> None:
+        """문서를 tombstone 처리합니다. (포스팅은 압축 시 정리)"""
+        doc = self._key_doc.pop(key, None)
+        if doc is not None:
+            self._doc_keys[doc] = None
+            self._dead += 1
+
+    @property
+    def needs_compaction(self) -> bool:
+        """tombstone 비율이 높아 재색인이 필요한지 여부"""
+        return self._dead > max(1000, len(self._key_doc) // 4)
+
+    def candidates(self, needle: str) -> Optional[Set[Hashable]]:
+        """
+        정규화된 검색어를 포함할 수 있는 문서 키 후보 집합을 반환합니다.
+
+        Returns:
+            Optional[Set]: 후보 문서 키 집합. 검색어가 짧아 색인으로 좁힐 수 없으면 None.
+        """
+        grams = query_grams(needle)
+        if not grams:
+            return None
+
+        posting_lists = []
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                return set() # 한 n-gram이라도 없으면 일치 문서 없음
+            posting_lists.append(postings)
+
+        # 가장 짧은 포스팅부터 교집합을 구합니다.
+        posting_lists.sort(key=len)
+        docs = set(posting_lists[0])
+        for postings in posting_lists[1:]:
+            if not docs:
+                break
+            docs.intersection_update(postings)
+
+        doc_keys = self._doc_keys
+        return {doc_keys[doc] for doc in docs if doc_keys[doc] is not None}
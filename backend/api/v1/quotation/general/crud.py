@@ -1,8 +1,15 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, literal, select, true, union_all
 from uuid import UUID
 from typing import List, Optional, Tuple
 from backend.models.general import General
+from backend.models.price_compare import PriceCompare
+from backend.models.quotation import Quotation
+from backend.models.detailed import Detailed
+from backend.core.pagination import decode_datetime_cursor, desc_keyset_filter, estimate_row_count, next_cursor_for
+
+# 연관 문서 기본 페이지 크기 (General 상세 조회)
+RELATED_DOCUMENTS_LIMIT = 100
 
 # ============================================================
 # CRUD Functions
@@ -29,12 +36,27 @@ def create_general(
 def get_generals(
     db: Session,
     skip: int = 0,
-    limit: int = 100
-) -> Tuple[int, List[General]]:
-    total = db.query(func.count(General.id)).scalar()
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    count: str = "exact"
+) -> Tuple[Optional[int], List[General]]:
+    if count == "exact":
+        total = db.query(func.count(General.id)).scalar()
+    elif count == "estimate":
+        total = estimate_row_count(db, General.__tablename__)
+    else:
+        total = None
+
+    query = db.query(General)
+    if cursor:
+        # (created_at, id) Keyset 커서: 지정 시 OFFSET 대신 마지막 행 이후 조건 사용
+        last_created_at, last_id = decode_datetime_cursor(cursor, UUID)
+        query = query.filter(desc_keyset_filter(General.created_at, General.id, last_created_at, last_id))
+        skip = 0
+
     generals = (
-        db.query(General)
-        .order_by(desc(General.created_at))
+        query
+        .order_by(desc(General.created_at), desc(General.id))
         .offset(skip)
         .limit(limit)
         .all()
@@ -65,53 +87,111 @@ def update_general(
     db.refresh(general)
     return general
 
-def get_general_with_relations(db: Session, general_id: UUID) -> Optional[dict]:
+def get_related_documents(
+    db: Session,
+    general_id: UUID,
+    limit: int = RELATED_DOCUMENTS_LIMIT,
+    cursor: Optional[str] = None
+) -> List[dict]:
     """
-    General 상세 조회 (연관 테이블 포함)
-    PriceCompare, Quotation, Detailed 데이터를 통합하여 related_documents로 반환
+    General에 연결된 PriceCompare, Quotation, Detailed를 UNION ALL 한 번으로 통합 조회합니다.
+    - 각 테이블은 general_id 인덱스로 조회하고, 최신 수정순(updated_at DESC, id DESC) 정렬과 LIMIT은 DB에서 처리합니다.
+    - cursor 지정 시 이전 페이지 마지막 문서 이후부터 조회합니다. (Keyset)
     """
-    general = get_general_by_id(db, general_id)
-    if not general:
-        return None
+    price_compares = select(
+        PriceCompare.id,
+        literal("비교 견적서").label("category"),
+        func.coalesce(func.nullif(PriceCompare.description, ""), "내정가 비교").label("title"), # 제목이 없으면 기본 문구
+        PriceCompare.creator,
+        PriceCompare.updated_at
+    ).where(PriceCompare.general_id == general_id)
+    
+    quotations = select(
+        Quotation.id,
+        literal("견적서(갑)"),
+        Quotation.title,
+        Quotation.creator,
+        Quotation.updated_at
+    ).where(Quotation.general_id == general_id)
+    
+    detaileds = select(
+        Detailed.id,
+        literal("상세 견적서"),
+        func.coalesce(func.nullif(Detailed.description, ""), "상세 내역"),
+        Detailed.creator,
+        Detailed.updated_at
+    ).where(Detailed.general_id == general_id)
     
-    # 통합 목록 생성
-    related_docs = []
+    related = union_all(price_compares, quotations, detaileds).subquery("related")
     
-    # 1. PriceCompare (비교 견적)
-    if general.price_compares:
-        for pc in general.price_compares:
-            related_docs.append({
-                "id": pc.id,
-                "category": "비교 견적서",
-                "title": pc.description if pc.description else "내정가 비교", # 제목이 없으면 비고 사용
-                "creator": pc.creator,
-                "updated_at": pc.updated_at
-            })
+    query = select(related)
+    if cursor:
+        last_updated_at, last_id = decode_datetime_cursor(cursor, UUID)
+        query = query.where(desc_keyset_filter(related.c.updated_at, related.c.id, last_updated_at, last_id))
     
-    # 2. Quotation (견적서 갑지) - 모델이 있다면
-    if hasattr(general, 'quotations') and general.quotations:
-        for q in general.quotations:
-            related_docs.append({
-                "id": q.id,
-                "category": "견적서(갑)",
-                "title": q.title,
-                "creator": q.creator,
-                "updated_at": q.updated_at
-            })
+    rows = db.execute(
+        query
+        .order_by(desc(related.c.updated_at), desc(related.c.id))
+        .limit(limit)
+    ).mappings().all()
+    return [dict(row) for row in rows]
 
-    # 3. Detailed (상세 견적) - 모델이 있다면
-    if hasattr(general, 'detaileds') and general.detaileds:
-        for d in general.detaileds:
-            related_docs.append({
-                "id": d.id,
-                "category": "상세 견적서",
-                "title": d.description if d.description else "상세 내역",
-                "creator": d.creator,
-                "updated_at": d.updated_at
-            })
+def _related_documents_stats(general_id: UUID):
+    """
+    연관 문서 수, 가장 최근 수정 시각, 수정 카운터 합계를 구하는 서브쿼리 (한 행, general_id 인덱스 사용)
+    - 수정 카운터(version)는 내정가 비교서에만 있습니다. (견적서/상세 견적은 이 API에서 수정 경로가 없음)
+    """
+    related = union_all(
+        select(PriceCompare.updated_at, PriceCompare.version).where(PriceCompare.general_id == general_id),
+        select(Quotation.updated_at, literal(0)).where(Quotation.general_id == general_id),
+        select(Detailed.updated_at, literal(0)).where(Detailed.general_id == general_id)
+    ).subquery("related")
+    return select(
+        func.max(related.c.updated_at).label("related_updated_at"),
+        func.count().label("related_total"),
+        func.coalesce(func.sum(related.c.version), 0).label("related_version")
+    ).subquery("related_stats")
+
+def get_general_version(db: Session, general_id: UUID):
+    """
+    조건부 조회(ETag) 판단용 버전 정보를 연관 문서 적재 없이 조회합니다.
+    - 연관 문서 수정/추가/삭제도 상세 응답을 바꾸므로 General.version과 함께 연관 문서 통계를 봅니다.
+
+    Returns:
+        Optional[Row]: (version, related_updated_at, related_total, related_version) 행. General이 없으면 None.
+    """
+    stats = _related_documents_stats(general_id)
+    return (
+        db.query(General.version, stats.c.related_updated_at, stats.c.related_total, stats.c.related_version)
+        .join(stats, true())
+        .filter(General.id == general_id)
+        .first()
+    )
+
+def get_general_with_relations(
+    db: Session,
+    general_id: UUID,
+    limit: int = RELATED_DOCUMENTS_LIMIT,
+    cursor: Optional[str] = None
+) -> Optional[dict]:
+    """
+    General 상세 조회 (연관 테이블 포함)
+    PriceCompare, Quotation, Detailed 데이터를 통합하여 related_documents로 반환
+    - 연관 문서는 관계 지연 로딩 없이 get_related_documents() 쿼리 한 번으로 적재합니다. (General 포함 총 2회)
+    - related_total/related_updated_at/related_version은 페이지와 무관한 전체 연관 문서 기준입니다. (페이징 UI 및 ETag용)
+    """
+    stats = _related_documents_stats(general_id)
+    found = (
+        db.query(General, stats.c.related_updated_at, stats.c.related_total, stats.c.related_version)
+        .join(stats, true())
+        .filter(General.id == general_id)
+        .first()
+    )
+    if not found:
+        return None
+    general, related_updated_at, related_total, related_version = found
     
-    # 최신 수정순 정렬
-    related_docs.sort(key=lambda x: x['updated_at'], reverse=True)
+    related_docs = get_related_documents(db, general_id, limit=limit, cursor=cursor)
     
     # Pydantic Schema(GeneralResponse) 구조에 맞게 Dict 리턴
     return {
@@ -122,7 +202,12 @@ def get_general_with_relations(db: Session, general_id: UUID) -> Optional[dict]:
         "description": general.description,
         "created_at": general.created_at,
         "updated_at": general.updated_at,
-        "related_documents": related_docs  # 💡 여기가 핵심
+        "related_documents": related_docs,  # 💡 여기가 핵심
+        "related_next_cursor": next_cursor_for(related_docs, limit, lambda d: d["updated_at"], lambda d: d["id"]),
+        "related_total": related_total,
+        "related_updated_at": related_updated_at,
+        "version": general.version,
+        "related_version": related_version
     }
 
 def delete_general(db: Session, general_id: UUID) -> bool:
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
 from uuid import UUID
-from backend.database import get_db
+from typing import Optional
+from backend.database import get_db, get_read_db
+from backend.core.db_runner import ReadRunner, get_read_runner
+from backend.core.pagination import COUNT_MODE_PATTERN, next_cursor_for
+from backend.core.responses import FastJSONResponse
+from backend.core.http_cache import has_if_none_match, not_modified_response, validator_headers, weak_etag
 from . import crud, schemas
 
 handler = APIRouter()
@@ -45,9 +50,12 @@ def get_generals(
     include_schema: bool = Query(False, description="스키마 포함 여부"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (지정 시 skip 무시)"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN, description="총 개수 계산 방식 (exact | estimate | none)"),
+    db: Session = Depends(get_read_db)
 ):
-    total, generals = crud.get_generals(db, skip=skip, limit=limit)
+    total, generals = crud.get_generals(db, skip=skip, limit=limit, cursor=cursor, count=count)
+    next_cursor = next_cursor_for(generals, limit, lambda g: g.created_at, lambda g: g.id)
     
     items = [
         {
@@ -69,40 +77,60 @@ def get_generals(
             "total": total,
             "items": items,
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
     
     return {
         "total": total,
         "items": items,
         "skip": skip,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": next_cursor
     }
 
-@handler.get("/{general_id}", response_model=schemas.GeneralResponse)
-def get_general(
+def general_cache_headers(general_id: UUID, version: int, related_updated_at, related_total: int, related_version: int) -> dict:
+    """
+    General 상세 조회 검증 헤더 (연관 문서 수정/추가/삭제도 버전에 반영)
+    - updated_at은 초 단위라 같은 초 안의 연속 수정을 구분하지 못하므로 수정 카운터(version)로 ETag를 만들고,
+      Last-Modified는 보내지 않습니다. (If-Modified-Since만으로는 304를 반환하지 않음)
+    """
+    return validator_headers(weak_etag("general", general_id, version, related_updated_at, related_total, related_version))
+
+@handler.get("/{general_id}", response_model=schemas.GeneralResponse, response_class=FastJSONResponse)
+async def get_general(
     general_id: UUID,
+    request: Request,
     include_schema: bool = Query(False, description="연관 테이블 스키마 포함 여부"), # 💡 파라미터 추가
-    db: Session = Depends(get_db)
+    related_limit: int = Query(crud.RELATED_DOCUMENTS_LIMIT, ge=1, le=1000, description="연관 문서 페이지 크기"),
+    related_cursor: Optional[str] = Query(None, description="이전 응답의 related_next_cursor"),
+    runner: ReadRunner = Depends(get_read_runner)
 ):
-    # 1. 데이터 조회
-    result = crud.get_general_with_relations(db, general_id)
+    # 1. 조건부 요청: 변경 없으면 연관 문서 조회 없이 304 (버전 조회 1회)
+    if has_if_none_match(request):
+        version = await runner.run(crud.get_general_version, general_id)
+        if version is not None:
+            cached = not_modified_response(request, general_cache_headers(general_id, *version))
+            if cached:
+                return cached
+    
+    # 2. 데이터 조회 (연관 문서까지 dict로 적재되므로 세션 밖에서 지연 로딩 없음)
+    result = await runner.run(crud.get_general_with_relations, general_id, related_limit, related_cursor)
     
     if not result:
         raise HTTPException(status_code=404, detail="General quotation not found")
     
-    # 2. 스키마 포함 요청 시 추가 💡
+    # 3. 스키마 포함 요청 시 추가 💡
+    # 프론트엔드(loadRelationsData)는 response.json()에 schema가 있기를 기대함.
+    # result는 GeneralResponse 규격대로 만든 dict이므로 재검증(model_validate/model_dump) 없이 응답 객체로 바로 직렬화합니다.
+    # (응답 객체를 직접 반환하면 response_model 필터링도 생략되어 schema 필드가 그대로 전달됨)
     if include_schema:
-        # Pydantic 모델에는 'schema' 필드가 없으므로, 
-        # 임시로 dict로 변환해서 넣어주거나 프론트엔드에서 처리해야 함.
-        # 하지만 프론트엔드 코드(loadRelationsData)를 보니 response.json()에 schema가 있기를 기대함.
-        
-        # 방법: Pydantic 모델을 우회하여 dict 반환 (가장 빠름)
-        response_data = schemas.GeneralResponse.model_validate(result).model_dump()
-        response_data['schema'] = get_general_relations_schema()
-        return response_data
+        result['schema'] = get_general_relations_schema()
         
-    return result
+    cache_headers = general_cache_headers(
+        result["id"], result["version"], result["related_updated_at"], result["related_total"], result["related_version"]
+    )
+    return FastJSONResponse(result, headers=cache_headers)
 
 @handler.put("/{general_id}", response_model=schemas.GeneralResponse)
 def update_general(
@@ -41,6 +41,11 @@ class GeneralResponse(BaseModel):
     
     # 💡 [추가] 연관된 문서 리스트 (기본값 빈 리스트)
     related_documents: List[RelatedDocumentItem] = Field(default_factory=list)
+    related_next_cursor: Optional[str] = Field(None, description="연관 문서 다음 페이지 커서 (related_cursor로 전달)")
+    related_total: int = Field(0, description="전체 연관 문서 수")
+    related_updated_at: Optional[datetime] = Field(None, description="연관 문서 중 가장 최근 수정 시각")
+    version: int = Field(1, description="견적서 수정 카운터 (수정마다 증가)")
+    related_version: int = Field(0, description="연관 문서 수정 카운터 합계 (연관 문서 수정마다 증가)")
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -55,15 +60,17 @@ class GeneralListItem(BaseModel):
     description: Optional[str]
 
 class GeneralListResponse(BaseModel):
-    total: int
+    total: Optional[int]
     items: list[GeneralListItem]
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 class GeneralListWithSchemaResponse(BaseModel):
     model_config = ConfigDict(protected_namespaces=())
     schema_data: dict = Field(..., alias="schema")
-    total: int
+    total: Optional[int]
     items: list[GeneralListItem]
     skip: int
-    limit: int
\ No newline at end of file
+    limit: int
+    next_cursor: Optional[str] = None
\ No newline at end of file
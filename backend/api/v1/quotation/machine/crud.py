@@ -5,15 +5,202 @@
 # - 특히 견적서에 포함된 자재 상세 정보를 처리하는 로직을 포함합니다.
 #
 
-from sqlalchemy.orm import Session, joinedload # 데이터베이스 세션 및 관계된 객체 미리 로드
-from sqlalchemy import func, desc # SQLAlchemy 함수 (예: count, 내림차순 정렬) 임포트
+import sqlite3 # SQLite 라이브러리 버전 (바인딩 변수 제한)
+from sqlalchemy.orm import Session # 데이터베이스 세션 관리를 위함
+from sqlalchemy import func, desc, tuple_, insert, update, delete # SQLAlchemy 함수 (예: count, 내림차순 정렬, 복합 키 IN 조건) 및 일괄 DML 구문 임포트
 from uuid import UUID # UUID 타입 사용 (견적서 ID)
-from typing import List, Optional, Tuple # 타입 힌트
+from typing import Iterator, List, Optional, Tuple # 타입 힌트
 from backend.models.machine import Machine # Machine 모델 임포트
 from backend.models.machine_resources import MachineResources # MachineResources 모델 임포트
 from backend.models.resources import Resources # Resources 모델 임포트 (자재 마스터)
 from backend.models.maker import Maker # Maker 모델 임포트 (제조사)
 from backend.models.certification import Certification # Certification 모델 임포트 (인증 정보)
+from backend.core.pagination import decode_datetime_cursor, desc_keyset_filter, estimate_row_count # 커서 페이지네이션 헬퍼
+from backend.api.v1.quotation.price_compare.crud import mark_price_compares_stale # 내정가 비교서 stale 표시
+
+# 마스터(Resources)에 등록되지 않는 가상 자재의 제조사 ID (SUMMARY: 집계, LABOR: 인건비, T000: 특수 목적)
+VIRTUAL_MAKER_IDS = ("SUMMARY", "LABOR", "T000")
+
+# 복합 키 IN 조건 한 번에 넣을 최대 (maker_id, resources_id) 쌍 수 (SQLite 바인딩 변수 제한 대비)
+# - 쌍 하나에 변수 2개이므로 제한(3.32 이상 32766, 이전 999)의 절반보다 작게 잡습니다. (견적서 ID 등 다른 조건 포함)
+# - 일반적인 자재 수는 한 번에 조회되어, 자재 수와 무관하게 저장 요청의 쿼리 수가 같습니다.
+RESOURCE_LOOKUP_CHUNK_SIZE = 16000 if sqlite3.sqlite_version_info >= (3, 32, 0) else 400
+
+# ============================================================
+# 헬퍼 함수
+# ============================================================
+
+def find_missing_resources(db: Session, resources: List[dict]) -> List[Tuple[str, str]]:
+    """
+    견적서 자재 목록 중 Resources 마스터에 존재하지 않는 (maker_id, resources_id) 쌍을 찾습니다.
+    - SUMMARY/LABOR/T000 가상 자재는 검증 대상에서 제외합니다.
+    - 자재별 개별 조회 대신 복합 키 IN 조건으로 일괄 조회합니다. (청크 단위)
+    
+    Args:
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        resources (List[dict]): 'maker_id', 'resources_id' 키를 가진 자재 딕셔너리 리스트.
+        
+    Returns:
+        List[Tuple[str, str]]: 마스터에 없는 (maker_id, resources_id) 쌍 리스트 (요청 순서 유지, 중복 제거).
+    """
+    # 검증 대상 키를 요청 순서대로 중복 없이 수집합니다.
+    requested = list(dict.fromkeys(
+        (r['maker_id'], r['resources_id'])
+        for r in resources
+        if r['maker_id'] not in VIRTUAL_MAKER_IDS
+    ))
+    if not requested:
+        return []
+    
+    existing = set()
+    for start in range(0, len(requested), RESOURCE_LOOKUP_CHUNK_SIZE):
+        chunk = requested[start:start + RESOURCE_LOOKUP_CHUNK_SIZE]
+        rows = (
+            db.query(Resources.maker_id, Resources.id)
+            .filter(tuple_(Resources.maker_id, Resources.id).in_(chunk))
+            .all()
+        )
+        existing.update((row.maker_id, row.id) for row in rows)
+    
+    return [key for key in requested if key not in existing]
+
+
+# MachineResources에서 PK를 제외한 데이터 컬럼 (변경 여부 비교 대상)
+MACHINE_RESOURCE_DATA_COLUMNS = (
+    "solo_price",
+    "quantity",
+    "order_index",
+    "display_major",
+    "display_minor",
+    "display_model_name",
+    "display_maker_name",
+    "display_unit",
+)
+
+# 내정가 비교서 원가 집계(calculate_initial_resources)에 영향을 주는 컬럼 (바뀌면 참조 비교서를 stale로 표시)
+PRICE_COMPARE_SOURCE_COLUMNS = (
+    "solo_price",
+    "quantity",
+    "display_major",
+    "display_minor",
+)
+
+
+def build_machine_resource_rows(machine_id: UUID, resources: List[dict]) -> List[dict]:
+    """
+    요청된 자재 목록을 machine_resources 테이블에 바로 쓸 수 있는 행 딕셔너리 리스트로 변환합니다.
+    - order_index는 요청 목록의 순서대로 0부터 다시 매깁니다.
+    
+    Args:
+        machine_id (UUID): 자재가 속할 견적서 ID.
+        resources (List[dict]): 요청된 자재 딕셔너리 리스트.
+        
+    Returns:
+        List[dict]: machine_resources 행 딕셔너리 리스트.
+    """
+    return [
+        {
+            "machine_id": machine_id,
+            "maker_id": resource['maker_id'],
+            "resources_id": resource['resources_id'],
+            "solo_price": resource['solo_price'],
+            "quantity": resource['quantity'],
+            "order_index": index, # 목록 내 표시 순서
+            # 견적서 화면 표시용 스냅샷 데이터
+            "display_major": resource.get("display_major"),
+            "display_minor": resource.get("display_minor"),
+            "display_model_name": resource.get("display_model_name"),
+            "display_maker_name": resource.get("display_maker_name"),
+            "display_unit": resource.get("display_unit"),
+        }
+        for index, resource in enumerate(resources)
+    ]
+
+
+def bulk_insert_machine_resources(db: Session, rows: List[dict]) -> None:
+    """
+    machine_resources 행들을 단일 INSERT 구문(executemany)으로 일괄 저장합니다.
+    - 행마다 ORM 객체를 만들고 `db.add` 하는 대신 Core 수준의 일괄 INSERT를 사용합니다.
+    
+    Args:
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        rows (List[dict]): `build_machine_resource_rows`로 만든 행 딕셔너리 리스트.
+    """
+    if rows:
+        db.execute(insert(MachineResources), rows)
+
+
+def sync_machine_resources(db: Session, machine_id: UUID, resources: List[dict]) -> Tuple[int, bool, bool]:
+    """
+    견적서의 구성 자재(MachineResources)를 요청된 목록과 일치하도록 차분(diff) 반영합니다.
+    - 기존 행과 (maker_id, resources_id) 기준으로 비교하여
+      값이 바뀐 행만 UPDATE, 빠진 행만 DELETE, 새로 추가된 행만 INSERT 합니다.
+    - order_index는 요청 목록 순서대로 다시 매기며, 순서만 바뀐 행도 UPDATE 대상이 됩니다.
+    - 같은 키가 목록에 중복되면 마지막 항목을 사용합니다.
+    
+    Args:
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        machine_id (UUID): 대상 견적서 ID.
+        resources (List[dict]): 요청된 자재 딕셔너리 리스트.
+        
+    Returns:
+        Tuple[int, bool, bool]: (반영된 자재 기준으로 재계산한 견적서 총액, 자재 행 변경이 있었는지 여부,
+            내정가 원가 집계에 영향을 주는 변경이 있었는지 여부)
+    """
+    # 요청 목록을 키 기준 딕셔너리로 변환합니다.
+    new_rows = {
+        (row['maker_id'], row['resources_id']): row
+        for row in build_machine_resource_rows(machine_id, resources)
+    }
+    
+    # 현재 저장된 행을 ORM 객체가 아닌 단순 튜플로 조회합니다.
+    stored_rows = {
+        (row.maker_id, row.resources_id): row
+        for row in db.query(
+            MachineResources.maker_id,
+            MachineResources.resources_id,
+            *[getattr(MachineResources, column) for column in MACHINE_RESOURCE_DATA_COLUMNS]
+        ).filter(MachineResources.machine_id == machine_id)
+    }
+    
+    removed_keys = [key for key in stored_rows if key not in new_rows]
+    inserted_rows = [row for key, row in new_rows.items() if key not in stored_rows]
+    changed_rows = [
+        row for key, row in new_rows.items()
+        if key in stored_rows and any(
+            getattr(stored_rows[key], column) != row[column]
+            for column in MACHINE_RESOURCE_DATA_COLUMNS
+        )
+    ]
+    
+    # 1. 빠진 자재 삭제 (복합 키 IN 조건, 청크 단위)
+    for start in range(0, len(removed_keys), RESOURCE_LOOKUP_CHUNK_SIZE):
+        chunk = removed_keys[start:start + RESOURCE_LOOKUP_CHUNK_SIZE]
+        db.execute(
+            delete(MachineResources)
+            .where(MachineResources.machine_id == machine_id)
+            .where(tuple_(MachineResources.maker_id, MachineResources.resources_id).in_(chunk))
+            .execution_options(synchronize_session=False)
+        )
+    
+    # 2. 값이 바뀐 자재만 PK 기준 일괄 UPDATE
+    if changed_rows:
+        db.execute(update(MachineResources), changed_rows)
+    
+    # 3. 새 자재 일괄 INSERT
+    bulk_insert_machine_resources(db, inserted_rows)
+    
+    # 행 추가/삭제 또는 단가·수량·표시 분류 변경만 원가 집계에 영향을 줍니다. (표시 순서/이름만 바뀐 경우 제외)
+    cost_changed = bool(removed_keys or inserted_rows) or any(
+        getattr(stored_rows[(row['maker_id'], row['resources_id'])], column) != row[column]
+        for row in changed_rows
+        for column in PRICE_COMPARE_SOURCE_COLUMNS
+    )
+    
+    bom_changed = bool(removed_keys or inserted_rows or changed_rows)
+    
+    return sum(row['solo_price'] * row['quantity'] for row in new_rows.values()), bom_changed, cost_changed
+
 
 # ============================================================
 # Machine CRUD 함수
@@ -53,35 +240,45 @@ def create_machine(
     db.add(machine) # 세션에 Machine 객체 추가
     db.flush()  # machine.id를 즉시 할당받기 위해 플러시합니다. (MachineResources 생성에 필요)
     
-    # 전달받은 자재 목록(resources)을 바탕으로 MachineResources들을 생성합니다.
+    # 전달받은 자재 목록(resources)을 바탕으로 MachineResources들을 일괄 INSERT 합니다.
     # 인건비, SUMMARY 항목 (Local 자재, 운영 PC), 일반 부품 등 모든 타입의 자재가 포함됩니다.
-    for index, resource in enumerate(resources):
-        machine_resource = MachineResources(
-            machine_id=machine.id, # 위에서 생성된 Machine의 ID
-            maker_id=resource['maker_id'],
-            resources_id=resource['resources_id'],
-            solo_price=resource['solo_price'],
-            quantity=resource['quantity'],
-            order_index=index, # 목록 내 표시 순서
-            # 견적서 화면 표시용 스냅샷 데이터
-            display_major=resource.get("display_major"),
-            display_minor=resource.get("display_minor"),
-            display_model_name=resource.get("display_model_name"),
-            display_maker_name=resource.get("display_maker_name"),
-            display_unit=resource.get("display_unit"),
-        )
-        db.add(machine_resource) # 세션에 MachineResources 객체 추가
+    bulk_insert_machine_resources(db, build_machine_resource_rows(machine.id, resources))
     
     db.commit() # 트랜잭션 커밋 (DB에 모든 변경사항 반영)
     db.refresh(machine) # Machine 객체를 최신 상태로 새로고침
     return machine
 
 
+def _paginate_machines(
+    query,
+    skip: int,
+    limit: int,
+    cursor: Optional[str]
+) -> List[Machine]:
+    """
+    수정일(updated_at) 내림차순(동일 시 id 내림차순)으로 견적서 목록 한 페이지를 조회합니다.
+    - cursor가 주어지면 OFFSET 대신 커서 이후 조건(Keyset)을 사용하며 skip은 무시합니다.
+    """
+    if cursor:
+        last_updated_at, last_id = decode_datetime_cursor(cursor, UUID)
+        query = query.filter(desc_keyset_filter(Machine.updated_at, Machine.id, last_updated_at, last_id))
+        skip = 0
+    return (
+        query
+        .order_by(desc(Machine.updated_at), desc(Machine.id))
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
 def get_machines(
     db: Session,
     skip: int = 0, # 조회 시작 지점 (OFFSET)
-    limit: int = 100 # 조회할 최대 개수 (LIMIT)
-) -> Tuple[int, List[Machine]]:
+    limit: int = 100, # 조회할 최대 개수 (LIMIT)
+    cursor: Optional[str] = None, # 이전 페이지의 next_cursor (Keyset 페이지네이션)
+    count: str = "exact" # 총 개수 계산 방식 (exact | estimate | none)
+) -> Tuple[Optional[int], List[Machine]]:
     """
     데이터베이스에서 모든 견적서(Machine) 목록을 조회합니다.
     페이징 기능을 지원하며, 총 견적서 개수와 목록을 반환합니다.
@@ -89,22 +286,22 @@ def get_machines(
     
     Args:
         db (Session): SQLAlchemy 데이터베이스 세션.
-        skip (int): 건너뛸 레코드 수.
+        skip (int): 건너뛸 레코드 수. (cursor가 있으면 무시)
         limit (int): 가져올 레코드 최대 수.
+        cursor (Optional[str]): 커서 문자열. 주어지면 해당 위치 이후부터 조회합니다.
+        count (str): 총 개수 계산 방식.
         
     Returns:
-        Tuple[int, List[Machine]]: (총 견적서 개수, Machine 객체 리스트).
+        Tuple[Optional[int], List[Machine]]: (총 견적서 개수 또는 None, Machine 객체 리스트).
     """
-    total = db.query(func.count(Machine.id)).scalar() # 총 견적서 개수 조회
+    total = None
+    if count == "exact":
+        total = db.query(func.count(Machine.id)).scalar() # 총 견적서 개수 조회
+    elif count == "estimate":
+        total = estimate_row_count(db, Machine.__tablename__) # 근사 개수 (전체 스캔 회피)
     
     # 수정일(updated_at) 기준 내림차순으로 정렬하여 견적서 목록을 페이징하여 조회합니다.
-    machines = (
-        db.query(Machine)
-        .order_by(desc(Machine.updated_at))
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    machines = _paginate_machines(db.query(Machine), skip, limit, cursor)
     
     return total, machines
 
@@ -113,8 +310,10 @@ def search_machines(
     db: Session,
     search: str, # 검색어
     skip: int = 0,
-    limit: int = 100
-) -> Tuple[int, List[Machine]]:
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    count: str = "exact"
+) -> Tuple[Optional[int], List[Machine]]:
     """
     견적서(Machine) 이름을 사용하여 견적서 목록을 검색합니다.
     부분 매칭 및 페이징 기능을 지원합니다.
@@ -122,26 +321,22 @@ def search_machines(
     Args:
         db (Session): SQLAlchemy 데이터베이스 세션.
         search (str): 견적서 이름에서 검색할 문자열.
-        skip (int): 건너뛸 레코드 수.
+        skip (int): 건너뛸 레코드 수. (cursor가 있으면 무시)
         limit (int): 가져올 레코드 최대 수.
+        cursor (Optional[str]): 커서 문자열. 주어지면 해당 위치 이후부터 조회합니다.
+        count (str): 총 개수 계산 방식. (검색 결과는 근사할 수 없으므로 estimate는 exact와 동일)
         
     Returns:
-        Tuple[int, List[Machine]]: (총 검색 결과 개수, 검색된 Machine 객체 리스트).
+        Tuple[Optional[int], List[Machine]]: (총 검색 결과 개수 또는 None, 검색된 Machine 객체 리스트).
     """
     query = db.query(Machine).filter(
         Machine.name.ilike(f"%{search}%") # 견적서 이름 부분 매칭 (대소문자 구분 없음)
     )
     
-    total = query.count() # 검색 결과의 총 개수
+    total = query.count() if count != "none" else None # 검색 결과의 총 개수
     
     # 수정일(updated_at) 기준 내림차순으로 정렬하여 검색된 견적서 목록을 페이징하여 조회합니다.
-    machines = (
-        query
-        .order_by(desc(Machine.updated_at))
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    machines = _paginate_machines(query, skip, limit, cursor)
     
     return total, machines
 
@@ -149,7 +344,8 @@ def search_machines(
 def get_machine_by_id(db: Session, machine_id: UUID) -> Optional[Machine]:
     """
     견적서 ID를 사용하여 데이터베이스에서 단일 견적서(Machine) 상세 정보를 조회합니다.
-    - `joinedload(Machine.machine_resources)`를 사용하여 MachineResources를 한 번의 쿼리로 함께 로드합니다.
+    - 구성 자재는 `get_machine_resources_detail`에서 일괄 조회하므로 여기서는 Machine 본체만 로드합니다.
+      (`machine.machine_resources` 접근 시에는 지연 로딩됩니다.)
     
     Args:
         db (Session): SQLAlchemy 데이터베이스 세션.
@@ -160,16 +356,158 @@ def get_machine_by_id(db: Session, machine_id: UUID) -> Optional[Machine]:
     """
     return (
         db.query(Machine)
-        .options(joinedload(Machine.machine_resources)) # MachineResources 관계를 Eager Loading
         .filter(Machine.id == machine_id) # 견적서 ID로 필터링
         .first() # 첫 번째 결과 반환
     )
 
 
+def find_missing_machine_ids(db: Session, machine_ids: List[UUID]) -> List[UUID]:
+    """
+    견적서 ID 목록 중 존재하지 않는 ID를 찾습니다. (IN 조건 1회 조회)
+
+    Args:
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        machine_ids (List[UUID]): 확인할 견적서 ID 목록.
+
+    Returns:
+        List[UUID]: 존재하지 않는 견적서 ID 리스트 (요청 순서 유지).
+    """
+    existing = {row.id for row in db.query(Machine.id).filter(Machine.id.in_(machine_ids))}
+    return [machine_id for machine_id in machine_ids if machine_id not in existing]
+
+
+# SUMMARY 항목의 기본 표시 이름 (display_model_name이 없을 때 사용)
+SUMMARY_ITEM_NAME_MAP = {
+    "LOCAL_MAT": "Local 자재",
+    "OPERATION_PC": "운영 PC/주액 PC",
+    # "CABLE_ETC"도 여기에 추가될 수 있음
+}
+
+
+def build_machine_resource_detail(row) -> Optional[dict]:
+    """
+    BOM 조회 결과 한 행(MachineResources + Resources/Maker/Certification 컬럼)을 응답용 딕셔너리로 변환합니다.
+    - SUMMARY/T000 및 LABOR 항목은 마스터 정보 없이 가상 데이터로 구성합니다.
+    - 일반 부품은 display_* 스냅샷을 우선 사용하고, 없으면 Resources 마스터 정보를 사용합니다.
+
+    Args:
+        row: `get_machine_resources_detail`의 조회 결과 행.
+
+    Returns:
+        Optional[dict]: 자재 상세 정보 딕셔너리. 마스터에 없는 일반 부품이면 None.
+    """
+    # --- SUMMARY 타입 (Local 자재, 운영 PC 등) 처리 ---
+    # 이 항목들은 실제 Resources 테이블에 매핑되지 않고, 가상으로 생성됩니다.
+    if row.maker_id == "SUMMARY" or row.maker_id == "T000": # T000도 SUMMARY처럼 처리될 수 있음 (관례)
+        return {
+            'item_code': f"{row.maker_id}-{row.resources_id}",
+            'maker_id': row.maker_id,
+            'resources_id': row.resources_id,
+            'model_name': row.display_model_name or SUMMARY_ITEM_NAME_MAP.get(row.resources_id, row.resources_id), # 화면 표시용 이름
+            'unit': row.display_unit or 'ea',
+            'category_major': row.display_major or '집계',
+            'category_minor': row.display_minor or '수동입력',
+            'maker_name': row.display_maker_name or '-',
+            'ul': False,
+            'ce': False,
+            'kc': False,
+            'etc': None, # SUMMARY 항목은 기타 인증/비고 없음
+            'solo_price': row.solo_price,
+            'quantity': row.quantity,
+            'subtotal': row.solo_price * row.quantity
+        }
+
+    # --- LABOR 타입 (인건비) 처리 ---
+    # 인건비 항목 역시 가상으로 데이터를 생성합니다.
+    if row.maker_id == "LABOR":
+        # resources_id가 "LABOR_0", "LABOR_1"과 같은 형식일 경우 "인건비 " 접두사를 붙여 이름 생성
+        labor_name = row.display_model_name or row.resources_id.replace("LABOR_", "인건비 ")
+
+        return {
+            'item_code': f"{row.maker_id}-{row.resources_id}",
+            'maker_id': row.maker_id,
+            'resources_id': row.resources_id,
+            'model_name': labor_name,
+            'unit': row.display_unit or 'M/D',
+            'category_major': row.display_major or '인건비',
+            'category_minor': row.display_minor or '인건비',
+            'maker_name': row.display_maker_name or '-',
+            'ul': False,
+            'ce': False,
+            'kc': False,
+            'etc': None, # 인건비는 기타 인증/비고 없음
+            'solo_price': row.solo_price,
+            'quantity': row.quantity,
+            'subtotal': row.solo_price * row.quantity
+        }
+
+    # --- 일반 부품 처리 ---
+    # Resources 마스터와 매칭되지 않은 부품(삭제된 부품 등)은 기존과 동일하게 결과에서 제외합니다.
+    if row.master_name is None:
+        return None
+
+    # MachineResources에 저장된 display_* 필드를 우선 사용하고, 없으면 Resources 마스터의 정보를 사용합니다.
+    return {
+        'item_code': f"{row.maker_id}-{row.resources_id}",
+        'maker_id': row.maker_id,
+        'resources_id': row.resources_id,
+        'model_name': row.display_model_name or row.master_name,
+        'unit': row.display_unit or row.master_unit,
+        'category_major': row.display_major or row.master_major,
+        'category_minor': row.display_minor or row.master_minor,
+        'maker_name': row.display_maker_name or row.master_maker_name,
+        'ul': row.ul or False,
+        'ce': row.ce or False,
+        'kc': row.kc or False,
+        'etc': row.etc,
+        'solo_price': row.solo_price,
+        'quantity': row.quantity,
+        'subtotal': row.solo_price * row.quantity # 소계 계산
+    }
+
+
+def _machine_resources_detail_query(db: Session, machine_id: UUID):
+    """
+    BOM 상세 조회 쿼리 (MachineResources ⟕ Resources/Maker/Certification, order_index 순)
+    - SUMMARY/LABOR 항목은 Resources와 매칭되지 않으므로 Outer Join을 사용합니다.
+    """
+    return (
+        db.query(
+            MachineResources.maker_id,
+            MachineResources.resources_id,
+            MachineResources.solo_price,
+            MachineResources.quantity,
+            MachineResources.display_major,
+            MachineResources.display_minor,
+            MachineResources.display_model_name,
+            MachineResources.display_maker_name,
+            MachineResources.display_unit,
+            Resources.name.label('master_name'), # Resources 마스터의 이름
+            Resources.unit.label('master_unit'), # Resources 마스터의 단위
+            Resources.major.label('master_major'), # Resources 마스터의 대분류
+            Resources.minor.label('master_minor'), # Resources 마스터의 중분류
+            Maker.name.label('master_maker_name'), # Maker의 이름
+            Certification.ul, # 인증 정보
+            Certification.ce,
+            Certification.kc,
+            Certification.etc
+        )
+        .outerjoin(Resources, (MachineResources.maker_id == Resources.maker_id) &
+                              (MachineResources.resources_id == Resources.id))
+        .outerjoin(Maker, Resources.maker_id == Maker.id)
+        .outerjoin(Certification, (Resources.id == Certification.resources_id) & # 인증 정보가 없을 수도 있음
+                                  (Resources.maker_id == Certification.maker_id))
+        .filter(MachineResources.machine_id == machine_id)
+        .filter(MachineResources.quantity > 0) # 수량이 0보다 큰 항목만 포함
+        .order_by(MachineResources.order_index.asc()) # 표시 순서대로 정렬
+    )
+
+
 def get_machine_resources_detail(db: Session, machine_id: UUID) -> List[dict]:
     """
     특정 견적서(Machine)에 포함된 자재(Resources)의 상세 정보를 조회합니다.
-    - MachineResources 테이블의 정보를 기반으로, 실제 Resources 및 Maker, Certification 정보를 조인하여 반환합니다.
+    - MachineResources를 Resources, Maker, Certification과 Outer Join하여 BOM 전체를 단일 쿼리로 가져옵니다.
+    - 자재 수와 관계없이 쿼리 수가 일정합니다. (자재별 개별 조회 없음)
     - SUMMARY(집계) 및 LABOR(인건비) 항목은 가상 데이터를 생성하여 반환합니다.
     
     Args:
@@ -179,133 +517,38 @@ def get_machine_resources_detail(db: Session, machine_id: UUID) -> List[dict]:
     Returns:
         List[dict]: 견적서에 포함된 자재들의 상세 정보 딕셔너리 리스트.
     """
-    # 주어진 machine_id에 해당하는 모든 MachineResources를 order_index 순으로 조회합니다.
-    machine_resources = (
-        db.query(MachineResources)
-        .filter(MachineResources.machine_id == machine_id)
-        .filter(MachineResources.quantity > 0) # 수량이 0보다 큰 항목만 포함
-        .order_by(MachineResources.order_index.asc()) # 표시 순서대로 정렬
-        .all()
-    )
+    rows = _machine_resources_detail_query(db, machine_id).all()
     
     resources = [] # 최종 반환될 자재 상세 정보 리스트
-    
-    for mr in machine_resources:
-        # --- SUMMARY 타입 (Local 자재, 운영 PC 등) 처리 ---
-        # 이 항목들은 실제 Resources 테이블에 매핑되지 않고, 가상으로 생성됩니다.
-        if mr.maker_id == "SUMMARY" or mr.maker_id == "T000": # T000도 SUMMARY처럼 처리될 수 있음 (관례)
-            item_name_map = {
-                "LOCAL_MAT": "Local 자재",
-                "OPERATION_PC": "운영 PC/주액 PC",
-                # "CABLE_ETC"도 여기에 추가될 수 있음
-            }
-            
-            resources.append({
-                'item_code': f"{mr.maker_id}-{mr.resources_id}",
-                'maker_id': mr.maker_id,
-                'resources_id': mr.resources_id,
-                'model_name': mr.display_model_name or item_name_map.get(mr.resources_id, mr.resources_id), # 화면 표시용 이름
-                'unit': mr.display_unit or 'ea',
-                'category_major': mr.display_major or '집계',
-                'category_minor': mr.display_minor or '수동입력',
-                'maker_name': mr.display_maker_name or '-',
-                'ul': False,
-                'ce': False,
-                'kc': False,
-                'etc': None, # SUMMARY 항목은 기타 인증/비고 없음
-                'solo_price': mr.solo_price,
-                'quantity': mr.quantity,
-                'subtotal': mr.solo_price * mr.quantity
-            })
-            
-        # --- LABOR 타입 (인건비) 처리 ---
-        # 인건비 항목 역시 가상으로 데이터를 생성합니다.
-        elif mr.maker_id == "LABOR" or mr.maker_id == "T000": # T000이 LABOR로도 쓰일 수 있음
-            # resources_id가 "LABOR_0", "LABOR_1"과 같은 형식일 경우 "인건비 " 접두사를 붙여 이름 생성
-            labor_name = mr.display_model_name or mr.resources_id.replace("LABOR_", "인건비 ")
-            
-            resources.append({
-                'item_code': f"{mr.maker_id}-{mr.resources_id}",
-                'maker_id': mr.maker_id,
-                'resources_id': mr.resources_id,
-                'model_name': labor_name,
-                'unit': mr.display_unit or 'M/D',
-                'category_major': mr.display_major or '인건비',
-                'category_minor': mr.display_minor or '인건비',
-                'maker_name': mr.display_maker_name or '-',
-                'ul': False,
-                'ce': False,
-                'kc': False,
-                'etc': None, # 인건비는 기타 인증/비고 없음
-                'solo_price': mr.solo_price,
-                'quantity': mr.quantity,
-                'subtotal': mr.solo_price * mr.quantity
-            })
-            
-        # --- 일반 부품 처리 ---
-        # 실제 Resources 테이블과 Maker, Certification 테이블을 조인하여 상세 정보를 가져옵니다.
-        else:
-            result = (
-                db.query(
-                    MachineResources.maker_id,
-                    MachineResources.resources_id,
-                    MachineResources.solo_price,
-                    MachineResources.quantity,
-                    MachineResources.display_major,
-                    MachineResources.display_minor,
-                    MachineResources.display_model_name,
-                    MachineResources.display_maker_name,
-                    MachineResources.display_unit,
-                    Resources.name.label('model_name'), # Resources 마스터의 이름
-                    Resources.unit, # Resources 마스터의 단위
-                    Resources.major.label('category_major'), # Resources 마스터의 대분류
-                    Resources.minor.label('category_minor'), # Resources 마스터의 중분류
-                    Maker.name.label('maker_name'), # Maker의 이름
-                    Certification.ul, # 인증 정보
-                    Certification.ce,
-                    Certification.kc,
-                    Certification.etc
-                )
-                .join(Resources, (MachineResources.maker_id == Resources.maker_id) & # Resources와 조인
-                                 (MachineResources.resources_id == Resources.id))
-                .join(Maker, Resources.maker_id == Maker.id) # Maker와 조인
-                .outerjoin(Certification, (Resources.id == Certification.resources_id) & # Certification과 Outer Join (인증 정보가 없을 수도 있음)
-                                           (Resources.maker_id == Certification.maker_id))
-                .filter(MachineResources.machine_id == machine_id) # 해당 견적서의 자재만 필터링
-                .filter(MachineResources.maker_id == mr.maker_id) # 현재 처리 중인 MachineResources와 일치하는 자재
-                .filter(MachineResources.resources_id == mr.resources_id)
-                .first() # 단일 결과 반환
-            )
-            
-            if result:
-                # MachineResources에 저장된 display_* 필드를 우선 사용하고, 없으면 Resources 마스터의 정보를 사용합니다.
-                model_name = mr.display_model_name or result.model_name
-                unit = mr.display_unit or result.unit
-                category_major = mr.display_major or result.category_major
-                category_minor = mr.display_minor or result.category_minor
-                maker_name = mr.display_maker_name or result.maker_name
-                
-                resources.append({
-                    'item_code': f"{result.maker_id}-{result.resources_id}",
-                    'maker_id': result.maker_id,
-                    'resources_id': result.resources_id,
-                    'model_name': model_name,
-                    'unit': unit,
-                    'category_major': category_major,
-                    'category_minor': category_minor,
-                    'maker_name': maker_name,
-                    'ul': result.ul or False,
-                    'ce': result.ce or False,
-                    'kc': result.kc or False,
-                    'etc': result.etc,
-                    'solo_price': result.solo_price,
-                    'quantity': result.quantity,
-                    'subtotal': result.solo_price * result.quantity # 소계 계산
-                })
+    for row in rows:
+        detail = build_machine_resource_detail(row)
+        if detail is not None:
+            resources.append(detail)
     
     return resources
 
 
+def iter_machine_resources_detail(db: Session, machine_id: UUID, batch_size: int = 500) -> Iterator[dict]:
+    """
+    get_machine_resources_detail과 같은 자재 상세를 batch_size 행씩 가져오며 하나씩 반환합니다. (엑셀 내보내기용)
+    - 전체 BOM을 리스트로 만들지 않으므로 자재 수와 무관하게 메모리 사용량이 일정합니다.
+    """
+    for row in _machine_resources_detail_query(db, machine_id).yield_per(batch_size):
+        detail = build_machine_resource_detail(row)
+        if detail is not None:
+            yield detail
+
+
+def get_machine_version(db: Session, machine_id: UUID) -> Optional[int]:
+    """
+    견적서의 수정 카운터만 PK 인덱스 조회로 가져옵니다. (조건부 조회 판단용, 자재 적재 없음)
+    
+    Returns:
+        Optional[int]: 수정 카운터(version), 견적서가 없으면 None.
+    """
+    return db.query(Machine.version).filter(Machine.id == machine_id).scalar()
+
+
 def update_machine(
     db: Session,
     machine_id: UUID, # 업데이트할 견적서 ID
@@ -314,11 +557,11 @@ def update_machine(
     client: Optional[str] = None,
     description: Optional[str] = None,
     resources: Optional[List[dict]] = None # 업데이트할 자재 목록
-) -> Optional[Machine]:
+) -> Tuple[Optional[Machine], List[UUID]]:
     """
     기존 견적서(Machine) 정보를 업데이트합니다.
     - 견적서의 기본 정보(이름, 장비사 등)를 수정합니다.
-    - 견적서 구성 자재(MachineResources)를 완전히 대체합니다.
+    - 견적서 구성 자재(MachineResources)를 요청 목록과 일치하도록 차분 반영합니다. (`sync_machine_resources` 참고)
     
     Args:
         db (Session): SQLAlchemy 데이터베이스 세션.
@@ -326,11 +569,12 @@ def update_machine(
         (위에 정의된 인자들)
         
     Returns:
-        Optional[Machine]: 업데이트된 Machine 객체, 없으면 None.
+        Tuple[Optional[Machine], List[UUID]]: (업데이트된 Machine 객체 — 없으면 None,
+            이 수정으로 stale 표시된 내정가 비교서 ID 목록 — 응답 후 백그라운드 재계산용)
     """
     machine = db.query(Machine).filter(Machine.id == machine_id).first() # 견적서 조회
     if not machine:
-        return None
+        return None, []
     
     # Machine 기본 정보 수정
     if name is not None:
@@ -343,37 +587,25 @@ def update_machine(
         machine.description = description
     
     # MachineResources 수정
+    stale_ids: List[UUID] = []
     if resources is not None:
-        # 기존 MachineResources를 모두 삭제합니다.
-        db.query(MachineResources).filter(
-            MachineResources.machine_id == machine_id
-        ).delete()
-        
-        # 새 MachineResources를 추가하고, 견적서 총액을 재계산합니다.
-        total_price = 0
-        for index, resource in enumerate(resources):
-            machine_resource = MachineResources(
-                machine_id=machine_id,
-                maker_id=resource['maker_id'],
-                resources_id=resource['resources_id'],
-                solo_price=resource['solo_price'],
-                quantity=resource['quantity'],
-                order_index=index,
-                display_major=resource.get("display_major"),
-                display_minor=resource.get("display_minor"),
-                display_model_name=resource.get("display_model_name"),
-                display_maker_name=resource.get("display_maker_name"),
-                display_unit=resource.get("display_unit"),
-            )
-            db.add(machine_resource)
-            total_price += resource['solo_price'] * resource['quantity']
+        # 기존 MachineResources와 비교하여 변경된 행만 UPDATE/DELETE/INSERT 하고, 견적서 총액을 재계산합니다.
+        total_price, bom_changed, cost_changed = sync_machine_resources(db, machine_id, resources)
         
         # 견적서 총액을 업데이트합니다.
         machine.price = total_price
+        
+        # 총액이 같아도 자재가 바뀌었으면 수정 시각을 갱신합니다. (UPDATE가 발생해 version도 증가 → 상세 조회 ETag 기준)
+        if bom_changed and not db.is_modified(machine):
+            machine.updated_at = func.current_timestamp()
+        
+        # 원가 집계가 바뀌었으면 이 장비를 참조하는 내정가 비교서를 stale로 표시합니다. (같은 트랜잭션)
+        if cost_changed:
+            stale_ids = mark_price_compares_stale(db, machine_id)
     
     db.commit() # 트랜잭션 커밋
     db.refresh(machine) # Machine 객체 새로고침
-    return machine
+    return machine, stale_ids
 
 
 def delete_machine(db: Session, machine_id: UUID) -> bool:
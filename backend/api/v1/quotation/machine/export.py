@@ -0,0 +1,154 @@
+# api/v1/quotation/machine/export.py
+#
+# 장비 견적서(Machine) BOM을 엑셀(.xlsx)로 스트리밍 내보내기 위한 헬퍼를 정의합니다.
+# - 견적서 하나는 시트 하나(기본 정보 + 자재 표 + 합계)이며, 여러 견적서를 내보내면 첫 시트에 요약을 추가합니다.
+# - 자재는 DB에서 배치 단위로 읽어 바로 시트에 기록하므로(write_only) BOM 크기와 무관하게 메모리 사용량이 일정합니다.
+# - 통합 문서 생성은 backend.core.xlsx_export의 작업 스레드에서 실행됩니다.
+#
+
+from datetime import datetime
+from functools import partial
+from typing import Iterator, List, Set
+from uuid import UUID
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from backend.database import ReadSessionLocal
+from backend.models.machine import Machine
+from backend.core.xlsx_export import header_cell, number_cell, sheet_title, stream_workbook, text_cell
+from . import crud
+
+# 한 번에 DB에서 가져와 시트에 기록할 자재 행 수
+EXPORT_BATCH_SIZE = 500
+
+# 자재 표 컬럼: (자재 상세 키, 헤더, 너비) — 상세 화면 자재 테이블과 같은 순서
+BOM_COLUMNS = [
+    ("item_code", "품목코드", 16),
+    ("maker_name", "Maker", 18),
+    ("category_major", "Unit", 20),
+    ("category_minor", "품목", 20),
+    ("model_name", "모델명/규격", 36),
+    ("ul", "UL", 5),
+    ("ce", "CE", 5),
+    ("kc", "KC", 5),
+    ("etc", "기타", 12),
+    ("unit", "단위", 8),
+    ("solo_price", "금액", 14),
+    ("quantity", "수량", 8),
+    ("subtotal", "합계 금액", 16),
+]
+NUMBER_KEYS = {"solo_price", "quantity", "subtotal"}
+FLAG_KEYS = {"ul", "ce", "kc"}
+
+# 일괄 내보내기 요약 시트 컬럼: (헤더, 너비)
+SUMMARY_SHEET_TITLE = "요약"
+SUMMARY_COLUMNS = [("장비명", 36), ("장비 제조사", 18), ("고객사", 18), ("작성자", 12), ("수정일", 18), ("자재 수", 10), ("총액", 16), ("시트", 24)]
+
+DATETIME_FORMAT = "yyyy-mm-dd hh:mm"
+COLUMN_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def _datetime_cell(ws, value) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=value)
+    if isinstance(value, datetime):
+        cell.number_format = DATETIME_FORMAT
+    return cell
+
+
+def _set_widths(ws, widths: List[int]) -> None:
+    for letter, width in zip(COLUMN_LETTERS, widths):
+        ws.column_dimensions[letter].width = width
+
+
+def write_machine_sheet(wb: Workbook, db, machine: Machine, used_titles: Set[str]) -> dict:
+    """
+    견적서 하나를 시트로 기록합니다. (기본 정보 → 자재 표 → 합계)
+
+    Returns:
+        dict: 요약 정보 {"title": 시트 이름, "resource_count": 자재 수, "total_price": 총액}
+    """
+    title = sheet_title(machine.name, used_titles, default="장비")
+    ws = wb.create_sheet(title)
+    _set_widths(ws, [width for _, _, width in BOM_COLUMNS])
+
+    # --- 기본 정보 ---
+    for label, value in (
+        ("장비명", machine.name),
+        ("장비 제조사", machine.manufacturer),
+        ("고객사", machine.client),
+        ("작성자", machine.creator),
+        ("수정일", machine.updated_at),
+        ("비고", machine.description),
+    ):
+        ws.append([header_cell(ws, label), _datetime_cell(ws, value) if label == "수정일" else text_cell(ws, value)])
+    ws.append([])
+
+    # --- 자재 표 ---
+    ws.append([header_cell(ws, header) for _, header, _ in BOM_COLUMNS])
+    resource_count = 0
+    total_price = 0
+    for item in crud.iter_machine_resources_detail(db, machine.id, EXPORT_BATCH_SIZE):
+        row = []
+        for key, _, _ in BOM_COLUMNS:
+            value = item[key]
+            if key in NUMBER_KEYS:
+                row.append(number_cell(ws, value))
+            elif key in FLAG_KEYS:
+                row.append("O" if value else "")
+            else:
+                row.append(text_cell(ws, value))
+        ws.append(row)
+        resource_count += 1
+        total_price += item["subtotal"]
+
+    # --- 합계 ---
+    ws.append([header_cell(ws, "합계")] + [None] * (len(BOM_COLUMNS) - 2) + [number_cell(ws, total_price, bold=True)])
+    return {"title": title, "resource_count": resource_count, "total_price": total_price}
+
+
+def _write_machines(machine_ids: List[UUID], wb: Workbook) -> None:
+    """요청한 견적서들을 순서대로 시트로 기록합니다. (작업 스레드에서 실행, 전용 읽기 세션 사용)"""
+    db = ReadSessionLocal()
+    try:
+        machines = {m.id: m for m in db.query(Machine).filter(Machine.id.in_(machine_ids))}
+        used_titles: Set[str] = set()
+
+        # 여러 견적서면 첫 시트에 요약 (write_only 시트는 서로 독립된 임시 파일이므로 마지막에 채워도 첫 시트로 저장됨)
+        summary = None
+        if len(machine_ids) > 1:
+            summary = wb.create_sheet(sheet_title(SUMMARY_SHEET_TITLE, used_titles))
+            _set_widths(summary, [width for _, width in SUMMARY_COLUMNS])
+            summary.append([header_cell(summary, header) for header, _ in SUMMARY_COLUMNS])
+
+        grand_total = 0
+        for machine_id in machine_ids:
+            machine = machines.get(machine_id)
+            if machine is None: # 요청 검증 후 삭제된 견적서
+                continue
+            result = write_machine_sheet(wb, db, machine, used_titles)
+            grand_total += result["total_price"]
+            if summary is not None:
+                summary.append([
+                    text_cell(summary, machine.name),
+                    text_cell(summary, machine.manufacturer),
+                    text_cell(summary, machine.client),
+                    text_cell(summary, machine.creator),
+                    _datetime_cell(summary, machine.updated_at),
+                    number_cell(summary, result["resource_count"]),
+                    number_cell(summary, result["total_price"]),
+                    result["title"],
+                ])
+
+        if summary is not None:
+            summary.append([header_cell(summary, "합계")] + [None] * 5 + [number_cell(summary, grand_total, bold=True)])
+    finally:
+        db.close()
+
+
+def iter_machines_xlsx(machine_ids: List[UUID]) -> Iterator[bytes]:
+    """
+    견적서들의 BOM 통합 문서(.xlsx)를 청크 단위로 생성합니다. (StreamingResponse 본문용)
+
+    Args:
+        machine_ids (List[UUID]): 내보낼 견적서 ID 목록 (시트 순서).
+    """
+    return stream_workbook(partial(_write_machines, list(machine_ids)))
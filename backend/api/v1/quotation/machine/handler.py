@@ -5,13 +5,22 @@
 # - 견적서에 포함되는 자재(Resources)의 검증 및 상세 정보 처리를 포함합니다.
 #
 
-from fastapi import APIRouter, Depends, HTTPException, Query # FastAPI 라우터, 의존성 주입, HTTP 예외 처리, 쿼리 파라미터
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request # FastAPI 라우터, 백그라운드 작업, 의존성 주입, HTTP 예외 처리, 쿼리 파라미터, 요청 헤더
 from sqlalchemy.orm import Session # 데이터베이스 세션 관리를 위함
-from typing import Optional, Union # 타입 힌트 (선택적 인자, Union 타입)
+from typing import List, Optional, Union # 타입 힌트 (리스트, 선택적 인자, Union 타입)
 from uuid import UUID # UUID 타입 (경로 파라미터 등)
-from backend.database import get_db # 데이터베이스 세션 의존성 주입
+from datetime import datetime # 일괄 내보내기 파일명 날짜
+from backend.database import get_db, get_read_db # 데이터베이스 세션 의존성 주입
+from backend.core.db_runner import ReadRunner, get_read_runner # 조회용 DB 실행기 (비동기/동기 경로)
 from backend.api.v1.quotation.machine import schemas, crud # Machine 스키마(DTO) 및 CRUD 함수 임포트
-from backend.models.resources import Resources # Resources 모델 임포트 (자재 존재 여부 검증용)
+from backend.core.pagination import COUNT_MODE_PATTERN, next_cursor_for # 커서 페이지네이션 헬퍼
+from backend.core.responses import FastJSONResponse # orjson 응답 (response_model 재검증 생략)
+from backend.core.http_cache import has_if_none_match, not_modified_response, validator_headers, weak_etag # 조건부 요청(ETag) 헬퍼
+from backend.api.v1.part.catalog import parts_catalog # 부품 카탈로그 (버전: 마스터 정보 변경 감지)
+from backend.api.v1.quotation.price_compare.crud import refresh_stale_price_compares # 내정가 비교서 증분 재계산
+from backend.core.xlsx_export import XLSX_MEDIA_TYPE, xlsx_download_headers # 엑셀 스트리밍 내보내기 헬퍼
+from fastapi.responses import StreamingResponse # 엑셀 파일 스트리밍 응답
+from .export import iter_machines_xlsx # 견적서 BOM 엑셀 생성 (작업 스레드)
 
 # API 라우터 인스턴스 생성
 handler = APIRouter()
@@ -126,6 +135,35 @@ def get_machine_resources_schema() -> dict:
         }
     }
 
+# ============================================================
+# 검증 헬퍼 함수
+# ============================================================
+
+def validate_machine_resources(db: Session, resources: List[dict]) -> None:
+    """
+    견적서에 포함된 자재들이 Resources 마스터에 모두 등록되어 있는지 일괄 검증합니다.
+    - SUMMARY/LABOR/T000 가상 자재는 검증을 스킵합니다.
+    - 첫 번째 누락에서 멈추지 않고, 누락된 모든 품목코드를 한 번에 반환합니다.
+    
+    Args:
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        resources (List[dict]): 요청된 자재 딕셔너리 리스트.
+        
+    Raises:
+        HTTPException: 마스터에 없는 자재가 하나라도 있을 경우 404 Not Found (누락 품목코드 목록 포함).
+    """
+    missing = crud.find_missing_resources(db, resources)
+    if missing:
+        missing_codes = [f"{maker_id}-{resources_id}" for maker_id, resources_id in missing]
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "message": f"자재를 찾을 수 없습니다: {', '.join(missing_codes)}",
+                "missing_count": len(missing_codes),
+                "missing_item_codes": missing_codes
+            }
+        )
+
 # ============================================================
 # Machine Endpoints (견적서 관련 API)
 # ============================================================
@@ -150,29 +188,14 @@ def register_machine(
     Raises:
         HTTPException: 견적서에 포함된 자재 중 마스터에 없는 것이 있을 경우 404 Not Found.
     """
+    # Pydantic 모델의 리소스 목록을 딕셔너리 리스트로 변환하여 CRUD 함수에 전달합니다.
+    resources_data = [r.dict() for r in machine.resources]
+    
     # ========== 실제 부품 존재 여부 검증 ==========
-    # 견적서에 포함된 자재 목록을 순회하며, 각 자재가 Resources 마스터에 실제로 등록되어 있는지 확인합니다.
-    for resource in machine.resources:
-        # SUMMARY (집계 항목) 또는 LABOR (인건비 항목)은 마스터에 직접 등록된 자재가 아니므로 검증을 스킵합니다.
-        if resource.maker_id in ["SUMMARY", "LABOR", "T000"]: # 'T000'도 특수 목적으로 사용될 수 있으므로 포함
-            continue
-        
-        # Resources 테이블에서 해당 maker_id와 resources_id를 가진 실제 부품이 있는지 조회합니다.
-        existing_resource = db.query(Resources).filter(
-            Resources.maker_id == resource.maker_id,
-            Resources.id == resource.resources_id
-        ).first()
-        
-        if not existing_resource:
-            # 마스터에 없는 부품이 포함된 경우 에러를 발생시킵니다.
-            raise HTTPException(
-                status_code=404,
-                detail=f"자재를 찾을 수 없습니다: {resource.maker_id}-{resource.resources_id}"
-            )
+    # 견적서에 포함된 모든 자재가 Resources 마스터에 실제로 등록되어 있는지 일괄 확인합니다.
+    validate_machine_resources(db, resources_data)
     
     # ========== Machine 생성 ==========
-    # Pydantic 모델의 리소스 목록을 딕셔너리 리스트로 변환하여 CRUD 함수에 전달합니다.
-    resources_data = [r.dict() for r in machine.resources]
     db_machine = crud.create_machine(
         db=db,
         name=machine.name,
@@ -211,23 +234,29 @@ def get_machines(
     include_schema: bool = Query(False, description="응답에 스키마 정의를 포함할지 여부"),
     skip: int = Query(0, ge=0, description="건너뛸 레코드 수"),
     limit: int = Query(100, ge=1, le=100, description="가져올 최대 레코드 수"),
-    db: Session = Depends(get_db) # DB 세션 의존성 주입
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (지정 시 skip 무시)"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN, description="총 개수 계산 방식 (exact | estimate | none)"),
+    db: Session = Depends(get_read_db) # DB 세션 의존성 주입
 ):
     """
     모든 장비 견적서(Machine) 목록을 조회하는 API 엔드포인트입니다.
     - 최신 수정일 기준으로 정렬되며, 페이징 및 스키마 포함 옵션을 지원합니다.
+    - cursor를 사용하면 깊은 페이지도 첫 페이지와 같은 비용으로 조회됩니다. (Keyset 페이지네이션)
     
     Args:
         include_schema (bool): 응답에 스키마 정의를 포함할지 여부.
         skip (int): 건너뛸 레코드 수.
         limit (int): 가져올 레코드 최대 수.
+        cursor (Optional[str]): 다음 페이지 조회용 커서.
+        count (str): 총 개수 계산 방식.
         db (Session): SQLAlchemy 데이터베이스 세션.
         
     Returns:
         Union[schemas.MachineListWithSchemaResponse, schemas.MachineListResponse]:
-            견적서 목록과 페이징 정보를 담은 응답 DTO.
+            견적서 목록과 페이징 정보(next_cursor 포함)를 담은 응답 DTO.
     """
-    total, machines = crud.get_machines(db, skip=skip, limit=limit)
+    total, machines = crud.get_machines(db, skip=skip, limit=limit, cursor=cursor, count=count)
+    next_cursor = next_cursor_for(machines, limit, lambda m: m.updated_at, lambda m: m.id)
     
     # Machine 객체 리스트를 DTO 형식의 딕셔너리 리스트로 변환합니다.
     items = [
@@ -250,14 +279,16 @@ def get_machines(
             "total": total,
             "items": items,
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
     else:
         return {
             "total": total,
             "items": items,
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
 
 
@@ -267,25 +298,30 @@ def search_machines(
     include_schema: bool = Query(False, description="응답에 스키마 정의를 포함할지 여부"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db) # DB 세션 의존성 주입
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (지정 시 skip 무시)"),
+    count: str = Query("exact", pattern=COUNT_MODE_PATTERN, description="총 개수 계산 방식 (exact | estimate | none)"),
+    db: Session = Depends(get_read_db) # DB 세션 의존성 주입
 ):
     """
     검색어를 사용하여 장비 견적서(Machine) 목록을 조회하는 API 엔드포인트입니다.
     - 견적서 이름에 대한 부분 매칭을 수행합니다.
-    - 페이징 및 스키마 포함 옵션을 지원합니다.
+    - 페이징(skip 또는 cursor) 및 스키마 포함 옵션을 지원합니다.
     
     Args:
         search (str): 견적서 이름에서 검색할 문자열 (최소 1자).
         include_schema (bool): 응답에 스키마 정의를 포함할지 여부.
         skip (int): 건너뛸 레코드 수.
         limit (int): 가져올 레코드 최대 수.
+        cursor (Optional[str]): 다음 페이지 조회용 커서.
+        count (str): 총 개수 계산 방식.
         db (Session): SQLAlchemy 데이터베이스 세션.
         
     Returns:
         Union[schemas.MachineListWithSchemaResponse, schemas.MachineListResponse]:
-            검색된 견적서 목록과 페이징 정보를 담은 응답 DTO.
+            검색된 견적서 목록과 페이징 정보(next_cursor 포함)를 담은 응답 DTO.
     """
-    total, machines = crud.search_machines(db, search=search, skip=skip, limit=limit)
+    total, machines = crud.search_machines(db, search=search, skip=skip, limit=limit, cursor=cursor, count=count)
+    next_cursor = next_cursor_for(machines, limit, lambda m: m.updated_at, lambda m: m.id)
     
     # Machine 객체 리스트를 DTO 형식의 딕셔너리 리스트로 변환합니다.
     items = [
@@ -308,50 +344,152 @@ def search_machines(
             "total": total,
             "items": items,
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
     else:
         return {
             "total": total,
             "items": items,
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
 
 
-@handler.get("/{machine_id}", response_model=schemas.MachineDetailResponse)
-def get_machine(
+# ============================================================
+# Export Endpoints (엑셀 내보내기 API)
+# ============================================================
+
+@handler.post("/export")
+def export_machines(
+    export_request: schemas.MachineExportRequest, # 요청 바디는 MachineExportRequest 스키마를 따름
+    db: Session = Depends(get_read_db) # DB 세션 의존성 주입 (존재 확인용)
+):
+    """
+    여러 장비 견적서의 BOM을 하나의 엑셀(.xlsx) 파일로 내보내는 API 엔드포인트입니다.
+    - 첫 시트는 견적서별 자재 수/총액 요약, 이후 견적서마다 시트 하나(요청 순서)입니다.
+    - 통합 문서는 작업 스레드에서 생성하며, 완성된 부분부터 청크 단위로 전송합니다. (견적서 수/자재 수와 무관한 메모리 사용량)
+    
+    Args:
+        export_request (schemas.MachineExportRequest): 내보낼 견적서 ID 목록을 담은 DTO.
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        
+    Returns:
+        StreamingResponse: .xlsx 파일 스트림.
+        
+    Raises:
+        HTTPException: 없는 견적서가 포함된 경우 404 Not Found.
+    """
+    machine_ids = list(dict.fromkeys(export_request.machine_ids)) # 중복 제거 (순서 유지)
+    
+    # 스트림 시작 후에는 오류 응답을 보낼 수 없으므로 존재 여부를 먼저 확인합니다.
+    missing = crud.find_missing_machine_ids(db, machine_ids)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"견적서를 찾을 수 없습니다: {', '.join(str(m) for m in missing)}")
+    
+    filename = f"장비견적서_{len(machine_ids)}건_{datetime.now():%Y%m%d}.xlsx"
+    return StreamingResponse(iter_machines_xlsx(machine_ids), media_type=XLSX_MEDIA_TYPE, headers=xlsx_download_headers(filename))
+
+
+@handler.get("/{machine_id}/export")
+def export_machine(
     machine_id: UUID, # 경로 파라미터로 견적서 ID를 받음
+    db: Session = Depends(get_read_db) # DB 세션 의존성 주입 (존재 확인용)
+):
+    """
+    장비 견적서 하나의 BOM(기본 정보 + 자재 표 + 합계)을 엑셀(.xlsx) 파일로 내보내는 API 엔드포인트입니다.
+    - 자재는 배치 단위로 읽어 바로 기록하므로 BOM 크기와 무관하게 메모리 사용량이 일정합니다.
+    
+    Args:
+        machine_id (UUID): 내보낼 견적서 ID.
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        
+    Returns:
+        StreamingResponse: .xlsx 파일 스트림 (파일명: 견적서명.xlsx).
+        
+    Raises:
+        HTTPException: 견적서를 찾을 수 없는 경우 404 Not Found.
+    """
+    machine = crud.get_machine_by_id(db, machine_id)
+    if not machine:
+        raise HTTPException(status_code=404, detail="견적서를 찾을 수 없습니다.")
+    
+    return StreamingResponse(iter_machines_xlsx([machine.id]), media_type=XLSX_MEDIA_TYPE, headers=xlsx_download_headers(f"{machine.name}.xlsx"))
+
+
+def load_machine_detail(db: Session, machine_id: UUID):
+    """
+    견적서 본체와 구성 자재 상세 정보를 함께 조회합니다. (ReadRunner 실행용)
+    
+    Returns:
+        tuple: (Machine 또는 None, 자재 상세 딕셔너리 리스트).
+    """
+    machine = crud.get_machine_by_id(db, machine_id)
+    if not machine:
+        return None, []
+    # Resources 상세 정보 (SUMMARY/LABOR 항목 포함하여 가공된 데이터)를 단일 쿼리로 일괄 조회합니다.
+    return machine, crud.get_machine_resources_detail(db, machine_id)
+
+
+def machine_cache_headers(machine_id: UUID, version: int, catalog_etag: str) -> dict:
+    """
+    장비 상세 조회 검증 헤더를 만듭니다.
+    - 표시 정보(display_*)가 비어 있는 자재는 부품 마스터 값을 보여주므로 카탈로그 ETag(프로세스 epoch + 버전)도 ETag에 포함합니다.
+      (버전 번호만 쓰면 재시작 후 같은 번호로 돌아왔을 때 이전 ETag가 다시 일치함)
+    - 견적서 자체는 수정 카운터(version)로 구분합니다. (updated_at은 초 단위라 같은 초 안의 연속 수정을 구분하지 못함)
+    - machine.updated_at은 부품/제조사/인증 마스터 변경을 반영하지 않으므로 Last-Modified는 보내지 않습니다.
+      (If-Modified-Since만으로는 304를 반환하지 않음)
+    """
+    return validator_headers(weak_etag("machine", machine_id, version, catalog_etag))
+
+
+@handler.get("/{machine_id}", response_model=schemas.MachineDetailResponse, response_class=FastJSONResponse)
+async def get_machine(
+    machine_id: UUID, # 경로 파라미터로 견적서 ID를 받음
+    request: Request, # 조건부 요청 헤더 확인용
     include_schema: bool = Query(False, description="응답에 스키마 정의를 포함할지 여부"),
-    db: Session = Depends(get_db) # DB 세션 의존성 주입
+    runner: ReadRunner = Depends(get_read_runner) # 조회용 DB 실행기 의존성 주입
 ):
     """
     특정 장비 견적서(Machine)의 상세 정보를 조회하는 API 엔드포인트입니다.
     - 견적서의 기본 정보와 구성 자재(MachineResources) 상세 정보를 함께 반환합니다.
+    - 자재 상세는 MachineDetailResponse 규격대로 만든 내부 dict이므로 response_model 재검증 없이 바로 직렬화합니다. (대형 BOM)
+    - If-None-Match가 현재 버전과 같으면 자재를 조회하지 않고 304를 반환합니다. (PK 조회 1회)
     
     Args:
         machine_id (UUID): 조회할 견적서 ID.
+        request (Request): 요청 객체 (If-None-Match 헤더 확인용).
         include_schema (bool): 응답에 스키마 정의를 포함할지 여부.
-        db (Session): SQLAlchemy 데이터베이스 세션.
+        runner (ReadRunner): 읽기 전용 세션 실행기 (비동기 또는 스레드풀 경로).
         
     Returns:
-        schemas.MachineDetailResponse: 조회된 견적서 상세 정보 및 자재 목록을 담은 DTO.
+        schemas.MachineDetailResponse: 조회된 견적서 상세 정보 및 자재 목록을 담은 DTO. (변경 없음이면 304 응답)
         
     Raises:
         HTTPException: 견적서를 찾을 수 없는 경우 404 Not Found.
     """
-    machine = crud.get_machine_by_id(db, machine_id) # CRUD 함수를 통해 Machine 조회 (MachineResources 함께 로드)
+    catalog_etag = parts_catalog.etag # 자재 조회 전 시점의 카탈로그 ETag
+    
+    # ========== 조건부 요청: 변경 없으면 BOM 조립 전에 304 (If-None-Match만 사용) ==========
+    if has_if_none_match(request):
+        version = await runner.run(crud.get_machine_version, machine_id)
+        if version is not None:
+            cached = not_modified_response(request, machine_cache_headers(machine_id, version, catalog_etag))
+            if cached:
+                return cached
+    
+    machine, resources_detail = await runner.run(load_machine_detail, machine_id) # Machine 본체 + 자재 상세 조회
     if not machine:
         raise HTTPException(status_code=404, detail="견적서를 찾을 수 없습니다.")
     
-    # Resources 상세 정보 (SUMMARY/LABOR 항목 포함하여 가공된 데이터)를 조회합니다.
-    resources_detail = crud.get_machine_resources_detail(db, machine_id)
     # 조회된 자재 상세 정보에서 각 자재의 소계(subtotal)를 합산하여 최종 총액을 계산합니다.
     total_price = sum(r['subtotal'] for r in resources_detail)
+    cache_headers = machine_cache_headers(machine.id, machine.version, catalog_etag)
     
     # 스키마 포함 옵션에 따라 응답을 구성합니다.
     if include_schema:
-        return {
+        return FastJSONResponse({
             "id": machine.id,
             "name": machine.name,
             "manufacturer": machine.manufacturer,
@@ -367,10 +505,10 @@ def get_machine(
                 "schema": get_machine_resources_schema(),
                 "items": resources_detail
             }
-        }
+        }, headers=cache_headers)
     
     # 스키마를 포함하지 않는 경우의 응답
-    return {
+    return FastJSONResponse({
         "id": machine.id,
         "name": machine.name,
         "manufacturer": machine.manufacturer,
@@ -383,23 +521,26 @@ def get_machine(
         "total_price": total_price, # 계산된 총액 추가
         "resource_count": len(resources_detail), # 자재 개수 추가
         "resources": resources_detail # 스키마 없이 자재 리스트만 반환
-    }
+    }, headers=cache_headers)
 
 
 @handler.put("/{machine_id}", response_model=schemas.MachineUpdateResponse)
 def update_machine(
     machine_id: UUID, # 경로 파라미터로 견적서 ID를 받음
     machine_update: schemas.MachineUpdate, # 요청 바디는 MachineUpdate 스키마를 따름
+    background_tasks: BackgroundTasks, # 응답 후 내정가 비교서 재계산
     db: Session = Depends(get_db) # DB 세션 의존성 주입
 ):
     """
     특정 장비 견적서(Machine)의 정보를 업데이트하는 API 엔드포인트입니다.
     - 견적서의 기본 정보와 구성 자재(MachineResources)를 업데이트합니다.
-    - 구성 자재는 기존 것을 모두 삭제하고 새로 받은 자재 목록으로 대체합니다.
+    - 구성 자재는 새로 받은 자재 목록과 비교하여 변경된 행만 반영합니다. (추가/수정/삭제)
+    - 원가 집계가 바뀌면 이 장비를 참조하는 내정가 비교서를 stale로 표시하고, 응답 후 해당 장비 원가 행만 재계산합니다.
     
     Args:
         machine_id (UUID): 업데이트할 견적서 ID.
         machine_update (schemas.MachineUpdate): 업데이트할 견적서 정보를 담은 DTO.
+        background_tasks (BackgroundTasks): 응답 후 실행할 백그라운드 작업 목록.
         db (Session): SQLAlchemy 데이터베이스 세션.
         
     Returns:
@@ -408,35 +549,18 @@ def update_machine(
     Raises:
         HTTPException: 견적서를 찾을 수 없거나 자재 중 마스터에 없는 것이 있을 경우 404 Not Found.
     """
-    # ========== 실제 부품 존재 여부 검증 ==========
-    # 업데이트 요청에 자재 목록이 포함된 경우, 각 자재가 Resources 마스터에 실제로 등록되어 있는지 확인합니다.
-    if machine_update.resources:
-        for resource in machine_update.resources:
-            # SUMMARY 또는 LABOR 항목은 마스터에 직접 등록된 자재가 아니므로 검증을 스킵합니다.
-            if resource.maker_id in ["SUMMARY", "LABOR", "T000"]:
-                continue
-            
-            # Resources 테이블에서 해당 maker_id와 resources_id를 가진 실제 부품이 있는지 조회합니다.
-            existing_resource = db.query(Resources).filter(
-                Resources.maker_id == resource.maker_id,
-                Resources.id == resource.resources_id
-            ).first()
-            
-            if not existing_resource:
-                # 마스터에 없는 부품이 포함된 경우 에러를 발생시킵니다.
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"자재를 찾을 수 없습니다: {resource.maker_id}-{resource.resources_id}"
-                )
-    
     # ========== Resources 데이터 변환 ==========
     # Pydantic 모델의 리소스 목록을 딕셔너리 리스트로 변환하여 CRUD 함수에 전달합니다.
     resources_data = None
     if machine_update.resources: # resources 필드가 제공되었을 경우에만 변환
         resources_data = [r.dict() for r in machine_update.resources]
+        
+        # ========== 실제 부품 존재 여부 검증 ==========
+        # 업데이트 요청에 포함된 모든 자재가 Resources 마스터에 실제로 등록되어 있는지 일괄 확인합니다.
+        validate_machine_resources(db, resources_data)
     
     # ========== 견적서 업데이트 (CRUD 호출) ==========
-    updated_machine = crud.update_machine(
+    updated_machine, stale_ids = crud.update_machine(
         db=db,
         machine_id=machine_id,
         name=machine_update.name,
@@ -449,6 +573,11 @@ def update_machine(
     if not updated_machine:
         raise HTTPException(status_code=404, detail="견적서를 찾을 수 없습니다.")
     
+    # ========== 참조 내정가 비교서 재계산 (응답 후) ==========
+    # 실패하거나 서버가 먼저 종료되어도 stale 표시가 남아 있어 비교서 조회 시 재계산됩니다.
+    if stale_ids:
+        background_tasks.add_task(refresh_stale_price_compares, stale_ids)
+    
     # ========== 업데이트된 Resources 상세 정보 조회 및 총액 계산 ==========
     # 업데이트된 Machine의 ID를 사용하여 자재 상세 정보(MachineResources, Resources 조인)를 다시 조회합니다.
     resources_detail = crud.get_machine_resources_detail(db, machine_id)
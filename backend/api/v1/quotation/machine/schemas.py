@@ -72,20 +72,22 @@ class MachineListItem(BaseModel):
 
 class MachineListResponse(BaseModel):
     """Machine 목록 조회 응답 (schema 없음)"""
-    total: int
+    total: Optional[int]
     items: List[MachineListItem]
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 class MachineListWithSchemaResponse(BaseModel):
     """Machine 목록 조회 응답 (schema 있음)"""
     model_config = ConfigDict(protected_namespaces=())
     
     schema_data: dict = Field(..., alias="schema")
-    total: int
+    total: Optional[int]
     items: List[MachineListItem]
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 class MachineResourcesWithSchemaResponse(BaseModel):
     """Machine 리소스 응답 (schema 있음)"""
@@ -136,3 +138,14 @@ class MachineUpdateResponse(BaseModel):
     total_price: int
     resource_count: int
     resources: List[MachineResourceDetail]
+
+# ============================================================
+# Export Schemas
+# ============================================================
+
+# 한 번에 내보낼 수 있는 최대 견적서 수 (일괄 엑셀 내보내기)
+MAX_EXPORT_MACHINES = 100
+
+class MachineExportRequest(BaseModel):
+    """Machine 일괄 엑셀 내보내기 요청"""
+    machine_ids: List[UUID] = Field(..., min_length=1, max_length=MAX_EXPORT_MACHINES, description="내보낼 견적서 ID 목록 (시트 순서)")
@@ -1,6 +1,8 @@
+import math
+from sqlalchemy import case, exists, func, or_, tuple_, insert, update, delete
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import List, Dict, Tuple
+from typing import Iterable, List, Optional
 
 # Models Import
 from backend.models.price_compare import PriceCompare
@@ -8,9 +10,25 @@ from backend.models.price_compare_machine import PriceCompareMachine
 from backend.models.price_compare_resources import PriceCompareResources
 from backend.models.machine_resources import MachineResources
 from backend.models.machine import Machine # 💡 장비명 조회를 위해 필수
+from backend.database import SessionLocal # 백그라운드 재계산용 세션
 
 from . import schemas
 
+# PriceCompareResources에서 PK(price_compare_id, machine_id, major, minor)를 제외한 데이터 컬럼 (변경 여부 비교 대상)
+PRICE_COMPARE_RESOURCE_DATA_COLUMNS = (
+    "cost_solo_price",
+    "cost_unit",
+    "cost_compare",
+    "quotation_solo_price",
+    "quotation_unit",
+    "quotation_compare",
+    "upper",
+    "description",
+)
+
+# 복합 키 IN 조건 한 번에 넣을 최대 키 수 (SQLite 바인딩 변수 제한 고려)
+RESOURCE_KEY_CHUNK_SIZE = 300
+
 # ============================================================
 # Helper Logic: 초기 리소스 자동 계산 (BOM Aggregation)
 # ============================================================
@@ -19,66 +37,59 @@ def calculate_initial_resources(db: Session, machine_ids: List[UUID]) -> List[di
     선택된 장비들의 BOM을 집계합니다.
     - Key: (machine_id, major, minor) -> 장비별/항목별 분리
     - description: 장비명(Machine.name) 자동 입력
+    - 분류/합계는 GROUP BY 한 번으로 DB에서 계산하므로 BOM 행을 ORM 객체로 적재하지 않습니다.
     """
-    
-    # 1. 리소스 + 장비명 조인 조회
-    results = (
-        db.query(MachineResources, Machine.name)
+    if not machine_ids:
+        return []
+
+    # 1. 인건비/자재비 분류 규칙 (CASE)
+    # - 인건비: maker_id == "LABOR" 또는 display_major에 "인건비" 포함 → 중분류는 display_minor (없으면 "인건비 합계")
+    # - 자재비: 그 외 → 중분류는 display_major (없으면 "기타 자재")
+    is_labor = or_(
+        MachineResources.maker_id == "LABOR",
+        MachineResources.display_major.contains("인건비", autoescape=True)
+    )
+    major = case((is_labor, "인건비"), else_="자재비").label("major")
+    minor = case(
+        (is_labor, func.coalesce(func.nullif(MachineResources.display_minor, ""), "인건비 합계")),
+        else_=func.coalesce(func.nullif(MachineResources.display_major, ""), "기타 자재")
+    ).label("minor")
+
+    # 2. 장비별/항목별 합계 (장비 안에서는 BOM 표시 순서상 처음 나온 항목 순)
+    rows = (
+        db.query(
+            MachineResources.machine_id,
+            major,
+            minor,
+            func.sum(MachineResources.solo_price * MachineResources.quantity).label("price"),
+            Machine.name
+        )
         .join(Machine, MachineResources.machine_id == Machine.id)
         .filter(MachineResources.machine_id.in_(machine_ids))
+        .group_by(MachineResources.machine_id, major, minor)
+        .order_by(MachineResources.machine_id, func.min(MachineResources.order_index))
         .all()
     )
-    
-    # 2. 메모리 상에서 집계
-    # Key: (Machine_ID, Major, Minor) -> Value: {price, machine_name}
-    aggregated: Dict[Tuple[UUID, str, str], Dict] = {}
-    
-    for res, machine_name in results:
-        # 2-1. 대분류/중분류 결정
-        is_labor = (res.maker_id == "LABOR") or (res.display_major and "인건비" in res.display_major)
-        
-        if is_labor:
-            major = "인건비"
-            minor = res.display_minor if res.display_minor else "인건비 합계"
-        else:
-            major = "자재비"
-            minor = res.display_major if res.display_major else "기타 자재"
-            
-        # 2-2. 가격 계산
-        total_price = res.solo_price * res.quantity
-        
-        # 2-3. 집계 (Key에 machine_id 포함 -> 장비별 분리!)
-        key = (res.machine_id, major, minor)
-        
-        if key not in aggregated:
-            aggregated[key] = {
-                'price': 0,
-                'machine_name': machine_name # 장비명 저장
-            }
-            
-        aggregated[key]['price'] += total_price
-            
+
     # 3. 결과 리스트 변환
-    initial_data = []
-    
-    for (m_id, major, minor), data in aggregated.items():
-        initial_data.append({
+    return [
+        {
             "machine_id": m_id,  # 💡 DB에 저장될 machine_id
             "major": major,
             "minor": minor,
-            "cost_solo_price": data['price'],
+            "cost_solo_price": price,
             "cost_unit": "식",
             "cost_compare": 1,
-            "quotation_solo_price": data['price'],
+            "quotation_solo_price": price,
             "quotation_unit": "식",
             "quotation_compare": 1,
             "upper": 0,
-            
+
             # 💡 비고에 장비명 입력 (예: "주액기")
-            "description": data['machine_name'] 
-        })
-        
-    return initial_data
+            "description": machine_name
+        }
+        for m_id, major, minor, price, machine_name in rows
+    ]
 
 # ============================================================
 # CRUD Functions
@@ -131,12 +142,139 @@ def get_price_compare(db: Session, pc_id: UUID) -> PriceCompare:
     return db.query(PriceCompare).filter(PriceCompare.id == pc_id).first()
 
 
+def get_price_compare_version(db: Session, pc_id: UUID):
+    """
+    조건부 조회(ETag/Last-Modified) 판단용 버전 정보를 항목 적재 없이 조회합니다.
+
+    Returns:
+        Optional[Row]: (version, stale) 행. stale은 재계산 대기 중인 장비가 있는지 여부. 비교서가 없으면 None.
+    """
+    stale = exists().where(
+        PriceCompareMachine.price_compare_id == PriceCompare.id,
+        PriceCompareMachine.stale_since.isnot(None)
+    )
+    return (
+        db.query(PriceCompare.version, stale.label("stale"))
+        .filter(PriceCompare.id == pc_id)
+        .first()
+    )
+
+
+def sync_price_compare_machines(db: Session, pc_id: UUID, machine_ids: List[UUID]) -> bool:
+    """
+    비교서에 연결된 장비(PriceCompareMachine)를 요청 목록과 일치하도록 차분 반영합니다.
+    - 빠진 장비 연결만 DELETE, 새 장비 연결만 INSERT 합니다.
+
+    Returns:
+        bool: 변경이 있었는지 여부.
+    """
+    requested = list(dict.fromkeys(machine_ids)) # 중복 제거 (요청 순서 유지)
+    stored = {
+        row.machine_id
+        for row in db.query(PriceCompareMachine.machine_id).filter(PriceCompareMachine.price_compare_id == pc_id)
+    }
+    removed = [m_id for m_id in stored if m_id not in set(requested)]
+    added = [m_id for m_id in requested if m_id not in stored]
+
+    if removed:
+        db.execute(
+            delete(PriceCompareMachine)
+            .where(PriceCompareMachine.price_compare_id == pc_id)
+            .where(PriceCompareMachine.machine_id.in_(removed))
+            .execution_options(synchronize_session=False)
+        )
+    if added:
+        db.execute(insert(PriceCompareMachine), [{"price_compare_id": pc_id, "machine_id": m_id} for m_id in added])
+    return bool(removed or added)
+
+
+def sync_price_compare_resources(db: Session, pc_id: UUID, items: List[dict]) -> bool:
+    """
+    비교서 항목(PriceCompareResources)을 요청된 목록과 일치하도록 차분(diff) 반영합니다.
+    - 기존 행과 (machine_id, major, minor) 기준으로 비교하여
+      값이 바뀐 행만 UPDATE, 빠진 행만 DELETE, 새로 추가된 행만 INSERT 합니다.
+    - 같은 키가 목록에 중복되면 마지막 항목을 사용합니다.
+
+    Args:
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        pc_id (UUID): 대상 비교서 ID.
+        items (List[dict]): ResourceItem 형식의 항목 딕셔너리 리스트.
+
+    Returns:
+        bool: 변경이 있었는지 여부.
+    """
+    new_rows = {
+        (item['machine_id'], item['major'], item['minor']): {
+            "price_compare_id": pc_id,
+            "machine_id": item['machine_id'],
+            "major": item['major'],
+            "minor": item['minor'],
+            **{column: item.get(column) for column in PRICE_COMPARE_RESOURCE_DATA_COLUMNS}
+        }
+        for item in items
+    }
+
+    # 현재 저장된 행을 ORM 객체가 아닌 단순 튜플로 조회합니다.
+    stored_rows = {
+        (row.machine_id, row.major, row.minor): row
+        for row in db.query(
+            PriceCompareResources.machine_id,
+            PriceCompareResources.major,
+            PriceCompareResources.minor,
+            *[getattr(PriceCompareResources, column) for column in PRICE_COMPARE_RESOURCE_DATA_COLUMNS]
+        ).filter(PriceCompareResources.price_compare_id == pc_id)
+    }
+
+    removed_keys = [key for key in stored_rows if key not in new_rows]
+    inserted_rows = [row for key, row in new_rows.items() if key not in stored_rows]
+    changed_rows = [
+        row for key, row in new_rows.items()
+        if key in stored_rows and any(
+            getattr(stored_rows[key], column) != row[column]
+            for column in PRICE_COMPARE_RESOURCE_DATA_COLUMNS
+        )
+    ]
+
+    # 1. 빠진 항목 삭제 (복합 키 IN 조건, 청크 단위)
+    for start in range(0, len(removed_keys), RESOURCE_KEY_CHUNK_SIZE):
+        chunk = removed_keys[start:start + RESOURCE_KEY_CHUNK_SIZE]
+        db.execute(
+            delete(PriceCompareResources)
+            .where(PriceCompareResources.price_compare_id == pc_id)
+            .where(tuple_(PriceCompareResources.machine_id, PriceCompareResources.major, PriceCompareResources.minor).in_(chunk))
+            .execution_options(synchronize_session=False)
+        )
+
+    # 2. 값이 바뀐 항목만 PK 기준 일괄 UPDATE
+    if changed_rows:
+        db.execute(update(PriceCompareResources), changed_rows)
+
+    # 3. 새 항목 일괄 INSERT
+    if inserted_rows:
+        db.execute(insert(PriceCompareResources), inserted_rows)
+
+    return bool(removed_keys or inserted_rows or changed_rows)
+
+
+def touch_price_compare(db: Session, pc_id: UUID) -> None:
+    """항목/장비 연결만 바뀐 경우에도 비교서의 수정 시각(updated_at)과 수정 카운터(version, onupdate)를 갱신합니다."""
+    db.execute(
+        update(PriceCompare)
+        .where(PriceCompare.id == pc_id)
+        .values(updated_at=func.current_timestamp())
+        .execution_options(synchronize_session=False)
+    )
+
+
 def update_price_compare_overwrite(
     db: Session, 
     pc_id: UUID, 
     request: schemas.PriceCompareUpdate
 ) -> PriceCompare:
-    """수정 (Overwrite)"""
+    """
+    수정 (요청 내용으로 덮어쓰기)
+    - 장비 연결과 항목은 전체 삭제 후 재삽입하지 않고, 기존 행과 비교해 바뀐 부분만 반영합니다.
+    """
     pc = get_price_compare(db, pc_id)
     if not pc: return None
         
@@ -144,44 +282,215 @@ def update_price_compare_overwrite(
     pc.creator = request.creator
     pc.description = request.description
     
-    # 2. Machine Links Re-insert
-    db.query(PriceCompareMachine).filter(PriceCompareMachine.price_compare_id == pc_id).delete()
-    for m_id in request.machine_ids:
-        db.add(PriceCompareMachine(price_compare_id=pc_id, machine_id=m_id))
+    # 2. Machine Links (차분 반영)
+    links_changed = sync_price_compare_machines(db, pc_id, request.machine_ids)
         
-    # 3. Resources Re-insert
-    db.query(PriceCompareResources).filter(PriceCompareResources.price_compare_id == pc_id).delete()
-    
-    target_data = []
-    
+    # 3. Resources (차분 반영)
     if request.price_compare_resources is not None:
         # Case A: 수동 덮어쓰기 (프론트에서 machine_id, description 다 받음)
         target_data = [res.model_dump() for res in request.price_compare_resources]
     else:
-        # Case B: 자동 재계산 (장비명, machine_id 자동 생성)
+        # Case B: 자동 재계산 (장비명, machine_id 자동 생성) → 모든 장비가 최신 BOM 기준이 되므로 stale 해제
         target_data = calculate_initial_resources(db, request.machine_ids)
+        clear_stale_machines(db, pc_id)
+    resources_changed = sync_price_compare_resources(db, pc_id, target_data)
 
-    # 4. Save
-    for item in target_data:
-        new_res = PriceCompareResources(
-            price_compare_id=pc_id,
-            
-            # 💡 machine_id 저장
-            machine_id=item['machine_id'],
-            
-            major=item['major'],
-            minor=item['minor'],
-            cost_solo_price=item['cost_solo_price'],
-            cost_unit=item['cost_unit'],
-            cost_compare=item['cost_compare'],
-            quotation_solo_price=item['quotation_solo_price'],
-            quotation_unit=item['quotation_unit'],
-            quotation_compare=item['quotation_compare'],
-            upper=item['upper'],
-            description=item.get('description')
-        )
-        db.add(new_res)
-        
+    # 4. Save (헤더가 그대로여도 하위 행이 바뀌었으면 수정 시각 갱신)
+    if (links_changed or resources_changed) and not db.is_modified(pc):
+        touch_price_compare(db, pc_id)
     db.commit()
     db.refresh(pc)
-    return pc
\ No newline at end of file
+    return pc
+
+
+def patch_price_compare_resource(
+    db: Session,
+    pc_id: UUID,
+    request: schemas.ResourcePatch
+) -> Optional[PriceCompareResources]:
+    """
+    비교서 항목 한 행만 수정합니다. (셀 단위 편집용)
+    - 요청에 포함된 필드만 변경하며, 값이 같으면 UPDATE 하지 않습니다.
+
+    Args:
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        pc_id (UUID): 대상 비교서 ID.
+        request (schemas.ResourcePatch): 항목 키(machine_id, major, minor)와 변경할 필드.
+
+    Returns:
+        Optional[PriceCompareResources]: 수정된 항목 (비교서 또는 항목이 없으면 None).
+    """
+    resource = db.get(PriceCompareResources, (pc_id, request.machine_id, request.major, request.minor))
+    if resource is None:
+        return None
+
+    changes = request.model_dump(exclude_unset=True, include=set(PRICE_COMPARE_RESOURCE_DATA_COLUMNS))
+    changed = False
+    for column, value in changes.items():
+        if getattr(resource, column) != value:
+            setattr(resource, column, value)
+            changed = True
+
+    if changed:
+        touch_price_compare(db, pc_id)
+        db.commit()
+        db.refresh(resource)
+    return resource
+
+
+# ============================================================
+# 장비 BOM 변경 추적 (stale 표시 및 증분 재계산)
+# ============================================================
+
+def mark_price_compares_stale(db: Session, machine_id: UUID) -> List[UUID]:
+    """
+    장비 BOM이 바뀌었을 때, 그 장비를 참조하는 비교서 연결(PriceCompareMachine)을 stale로 표시합니다.
+    - PriceCompareMachine을 장비 → 비교서 역방향 간선으로 사용합니다. (machine_id 인덱스)
+    - 커밋은 호출자(장비 수정 트랜잭션)에서 합니다.
+
+    Returns:
+        List[UUID]: stale로 표시된 비교서 ID 목록.
+    """
+    rows = db.execute(
+        update(PriceCompareMachine)
+        .where(PriceCompareMachine.machine_id == machine_id)
+        .values(stale_since=func.current_timestamp())
+        .returning(PriceCompareMachine.price_compare_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    return [row.price_compare_id for row in rows]
+
+
+def clear_stale_machines(db: Session, pc_id: UUID, machine_ids: Optional[List[UUID]] = None) -> None:
+    """비교서의 장비 연결 stale 표시를 해제합니다. (machine_ids가 None이면 전체)"""
+    query = (
+        update(PriceCompareMachine)
+        .where(PriceCompareMachine.price_compare_id == pc_id)
+        .where(PriceCompareMachine.stale_since.isnot(None))
+    )
+    if machine_ids is not None:
+        query = query.where(PriceCompareMachine.machine_id.in_(machine_ids))
+    db.execute(query.values(stale_since=None).execution_options(synchronize_session=False))
+
+
+def round_half_up(value: float) -> int:
+    """
+    화면(Math.round)과 같은 반올림. (.5는 항상 올림)
+    - 파이썬 round()는 .5를 짝수 쪽으로 보내므로(52.5 → 52) 화면 계산(53)과 어긋납니다.
+    """
+    return math.floor(value + 0.5)
+
+
+def _quote_price(cost: int, upper: Optional[float]) -> int:
+    """원가에 상승률(%)을 적용한 견적가 (화면 계산과 동일)"""
+    return round_half_up(cost * (1 + (upper or 0) / 100))
+
+
+def _follows_cost(row, old_cost: int) -> bool:
+    """견적가가 원가(+상승률)를 그대로 따르는 행인지 (수동으로 고친 견적가가 아닌지) 확인합니다."""
+    return row.quotation_solo_price == _quote_price(old_cost, row.upper)
+
+
+def recompute_machine_costs(db: Session, pc_id: UUID, machine_ids: List[UUID]) -> None:
+    """
+    비교서에서 지정한 장비들의 원가(cost_*) 행만 최신 BOM 기준으로 다시 계산합니다.
+    - 수동으로 고친 견적가(quotation_*), 상승률(upper), 비고(description)는 유지합니다.
+    - 견적가가 원가(+상승률)를 그대로 따르던 행은 새 원가에 맞춰 함께 갱신합니다.
+    - BOM에서 사라진 항목은 삭제하되, 견적가를 수동으로 고친 행은 원가 0으로 남깁니다.
+    - 새로 생긴 항목은 생성 시와 같은 기본값으로 추가합니다.
+
+    Args:
+        db (Session): SQLAlchemy 데이터베이스 세션.
+        pc_id (UUID): 대상 비교서 ID.
+        machine_ids (List[UUID]): BOM이 바뀐 장비 ID 목록.
+    """
+    fresh = {
+        (item['machine_id'], item['major'], item['minor']): item
+        for item in calculate_initial_resources(db, machine_ids)
+    }
+    stored_rows = db.query(
+        PriceCompareResources.machine_id,
+        PriceCompareResources.major,
+        PriceCompareResources.minor,
+        PriceCompareResources.cost_solo_price,
+        PriceCompareResources.cost_unit,
+        PriceCompareResources.cost_compare,
+        PriceCompareResources.quotation_solo_price,
+        PriceCompareResources.upper
+    ).filter(
+        PriceCompareResources.price_compare_id == pc_id,
+        PriceCompareResources.machine_id.in_(machine_ids)
+    ).all()
+
+    changed_rows, removed_keys = [], []
+    for row in stored_rows:
+        key = (row.machine_id, row.major, row.minor)
+        item = fresh.pop(key, None)
+        new_cost = item['cost_solo_price'] if item else 0
+        if item is None and _follows_cost(row, row.cost_solo_price):
+            removed_keys.append(key) # BOM에서 사라졌고 수동 수정도 없는 행
+            continue
+        if row.cost_solo_price == new_cost and row.cost_unit == "식" and row.cost_compare == 1:
+            continue # 원가 변동 없음
+        values = {
+            "price_compare_id": pc_id, "machine_id": row.machine_id, "major": row.major, "minor": row.minor,
+            "cost_solo_price": new_cost, "cost_unit": "식", "cost_compare": 1
+        }
+        if _follows_cost(row, row.cost_solo_price):
+            values["quotation_solo_price"] = _quote_price(new_cost, row.upper)
+        changed_rows.append(values)
+
+    for start in range(0, len(removed_keys), RESOURCE_KEY_CHUNK_SIZE):
+        chunk = removed_keys[start:start + RESOURCE_KEY_CHUNK_SIZE]
+        db.execute(
+            delete(PriceCompareResources)
+            .where(PriceCompareResources.price_compare_id == pc_id)
+            .where(tuple_(PriceCompareResources.machine_id, PriceCompareResources.major, PriceCompareResources.minor).in_(chunk))
+            .execution_options(synchronize_session=False)
+        )
+    if changed_rows:
+        db.execute(update(PriceCompareResources), changed_rows)
+    if fresh:
+        db.execute(insert(PriceCompareResources), [{"price_compare_id": pc_id, **item} for item in fresh.values()])
+
+
+def refresh_stale_price_compare(db: Session, pc_id: UUID) -> bool:
+    """
+    비교서에 stale 표시된 장비가 있으면 그 장비의 원가 행만 재계산하고 표시를 해제합니다.
+
+    Returns:
+        bool: 재계산을 수행했는지 여부.
+    """
+    stale_ids = [
+        row.machine_id
+        for row in db.query(PriceCompareMachine.machine_id).filter(
+            PriceCompareMachine.price_compare_id == pc_id,
+            PriceCompareMachine.stale_since.isnot(None)
+        )
+    ]
+    if not stale_ids:
+        return False
+
+    recompute_machine_costs(db, pc_id, stale_ids)
+    clear_stale_machines(db, pc_id, stale_ids)
+    touch_price_compare(db, pc_id)
+    db.commit()
+    return True
+
+
+def refresh_stale_price_compares(pc_ids: Iterable[UUID]) -> None:
+    """
+    백그라운드 작업: 장비 수정 응답 후 stale 표시된 비교서들을 재계산합니다.
+    - 요청 세션이 닫힌 뒤 실행되므로 새 쓰기 세션을 엽니다.
+    - 실패해도 stale 표시가 남아 있으므로 다음 조회 시 다시 재계산됩니다.
+    """
+    db = SessionLocal()
+    try:
+        for pc_id in dict.fromkeys(pc_ids):
+            try:
+                refresh_stale_price_compare(db, pc_id)
+            except Exception as e:
+                db.rollback()
+                print(f"[PriceCompare Warning] stale recompute failed for {pc_id}: {e}")
+    finally:
+        db.close()
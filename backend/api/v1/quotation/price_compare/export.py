@@ -0,0 +1,199 @@
+# api/v1/quotation/price_compare/export.py
+#
+# 내정가 비교서(PriceCompare)를 엑셀(.xlsx)로 스트리밍 내보내기 위한 헬퍼를 정의합니다.
+# - 상세 화면(price_compare_detail.js)의 비교표와 같은 구성입니다: Unit별 항목 + 소계 → Sub Total → 관리비 → TOTAL → 이익률
+#   (Unit 묶음 순서도 화면과 같음: 저장된 행 순서에서 Unit이 처음 나타난 순서, 빈 Unit은 '기타')
+# - 항목은 DB에서 배치 단위로 읽어 바로 기록하므로(write_only) 항목 수와 무관하게 메모리 사용량이 일정합니다.
+# - 관리비 비율은 저장되지 않는 화면 입력값이므로 요청 파라미터로 받습니다. (기본값은 화면과 같음)
+#
+
+from functools import partial
+from typing import Iterator, Optional
+from uuid import UUID
+from openpyxl import Workbook
+from sqlalchemy import case, func
+from backend.database import ReadSessionLocal
+from backend.models.general import General
+from backend.models.price_compare import PriceCompare
+from backend.models.price_compare_resources import PriceCompareResources
+from backend.core.xlsx_export import header_cell, number_cell, stream_workbook, text_cell
+from .crud import round_half_up
+
+# 한 번에 DB에서 가져와 시트에 기록할 항목 행 수
+EXPORT_BATCH_SIZE = 500
+
+# 관리비 기본 비율(%) — 상세 화면 기본값과 같음
+DEFAULT_MANAGEMENT_RATE = 6
+DEFAULT_PROFIT_RATE = 4
+
+SHEET_TITLE = "내정가 비교"
+
+# Unit이 비어 있는 항목의 묶음 이름 (화면 groupByMajor와 같음)
+EMPTY_MAJOR_LABEL = "기타"
+
+# 상세 화면이 받는 항목 순서 (PriceCompare.price_compare_resources 적재 순서와 같음)
+RESOURCE_ORDER = (PriceCompareResources.machine_id, PriceCompareResources.major, PriceCompareResources.minor)
+
+# 비교표 컬럼: (헤더, 너비)
+COLUMNS = [
+    ("Unit", 20), ("품목", 24),
+    ("내정 수량", 10), ("단위", 8), ("내정 단가", 14), ("내정 금액", 16),
+    ("견적 수량", 10), ("단위", 8), ("견적 단가", 14), ("상승률(%)", 10), ("견적 금액", 16),
+    ("비고", 30),
+]
+COLUMN_LETTERS = "ABCDEFGHIJKL"
+COST_AMOUNT_INDEX = 5
+QUOTE_AMOUNT_INDEX = 10
+DIFFERENCE_INDEX = 11 # 소계/합계 행의 차액(견적 - 내정)은 비고 열에 기록
+
+
+def _group_label(major: Optional[str]) -> str:
+    return major or EMPTY_MAJOR_LABEL
+
+
+def _js_key_order(label: str, first_seen: int) -> tuple:
+    """
+    화면의 묶음 객체(Object.keys) 순서와 같은 정렬 키.
+    - 정수 형태의 키("0", "12" 등)는 값 순서로 먼저, 나머지는 처음 나타난 순서
+    """
+    if label.isdecimal() and label.isascii() and (label == "0" or not label.startswith("0")) and int(label) < 2 ** 32 - 1:
+        return (0, int(label))
+    return (1, first_seen)
+
+
+def _group_order(db, price_compare_id: UUID) -> dict:
+    """Unit 묶음 이름 → 출력 순서. (화면과 같은 행 순서에서 처음 나타난 순서)"""
+    pairs = (
+        db.query(PriceCompareResources.major)
+        .filter(PriceCompareResources.price_compare_id == price_compare_id)
+        .group_by(PriceCompareResources.machine_id, PriceCompareResources.major)
+        .order_by(PriceCompareResources.machine_id, PriceCompareResources.major)
+    )
+    first_seen = {}
+    for (major,) in pairs:
+        first_seen.setdefault(_group_label(major), len(first_seen))
+    labels = sorted(first_seen, key=lambda label: _js_key_order(label, first_seen[label]))
+    return {label: rank for rank, label in enumerate(labels)}
+
+
+def _total_row(ws, label: str, cost: Optional[int], quote: Optional[int], difference: Optional[int]) -> list:
+    row = [None] * len(COLUMNS)
+    row[0] = header_cell(ws, label)
+    if cost is not None:
+        row[COST_AMOUNT_INDEX] = number_cell(ws, cost, bold=True)
+    if quote is not None:
+        row[QUOTE_AMOUNT_INDEX] = number_cell(ws, quote, bold=True)
+    if difference is not None:
+        row[DIFFERENCE_INDEX] = number_cell(ws, difference, bold=True)
+    return row
+
+
+def _write_price_compare(price_compare_id: UUID, management_rate: float, profit_rate: float, wb: Workbook) -> None:
+    """비교서 하나를 시트로 기록합니다. (작업 스레드에서 실행, 전용 읽기 세션 사용)"""
+    db = ReadSessionLocal()
+    try:
+        header = (
+            db.query(PriceCompare, General.name.label("general_name"), General.client.label("general_client"))
+            .join(General, PriceCompare.general_id == General.id)
+            .filter(PriceCompare.id == price_compare_id)
+            .first()
+        )
+        if header is None: # 요청 검증 후 삭제된 비교서
+            return
+        pc = header.PriceCompare
+
+        ws = wb.create_sheet(SHEET_TITLE)
+        for letter, (_, width) in zip(COLUMN_LETTERS, COLUMNS):
+            ws.column_dimensions[letter].width = width
+
+        # --- 기본 정보 ---
+        for label, value in (
+            ("견적명", header.general_name),
+            ("고객사", header.general_client),
+            ("작성자", pc.creator),
+            ("비고", pc.description),
+        ):
+            ws.append([header_cell(ws, label), text_cell(ws, value)])
+        ws.append([])
+        ws.append([header_cell(ws, title) for title, _ in COLUMNS])
+
+        # --- Unit별 항목 + 소계 ---
+        # 묶음 순서(첫 등장 순)로 정렬해 한 번에 스트리밍 — 묶음 안에서는 화면과 같은 행 순서
+        group_order = _group_order(db, price_compare_id)
+        group_expr = func.coalesce(func.nullif(PriceCompareResources.major, ""), EMPTY_MAJOR_LABEL)
+        query = db.query(PriceCompareResources).filter(PriceCompareResources.price_compare_id == price_compare_id)
+        if len(group_order) > 1:
+            query = query.order_by(case(group_order, value=group_expr))
+        rows = query.order_by(*RESOURCE_ORDER).yield_per(EXPORT_BATCH_SIZE)
+
+        total_cost = total_quote = 0
+        major, major_cost, major_quote = None, 0, 0
+        for item in rows:
+            label = _group_label(item.major)
+            if label != major:
+                if major is not None:
+                    ws.append(_total_row(ws, f"{major} 소계", major_cost, major_quote, major_quote - major_cost))
+                major, major_cost, major_quote = label, 0, 0
+
+            cost_amount = item.cost_compare * item.cost_solo_price
+            quote_amount = item.quotation_compare * item.quotation_solo_price
+            major_cost += cost_amount
+            major_quote += quote_amount
+            total_cost += cost_amount
+            total_quote += quote_amount
+            ws.append([
+                text_cell(ws, label),
+                text_cell(ws, item.minor),
+                number_cell(ws, item.cost_compare),
+                text_cell(ws, item.cost_unit),
+                number_cell(ws, item.cost_solo_price),
+                number_cell(ws, cost_amount),
+                number_cell(ws, item.quotation_compare),
+                text_cell(ws, item.quotation_unit),
+                number_cell(ws, item.quotation_solo_price),
+                item.upper,
+                number_cell(ws, quote_amount),
+                text_cell(ws, item.description),
+            ])
+        if major is not None:
+            ws.append(_total_row(ws, f"{major} 소계", major_cost, major_quote, major_quote - major_cost))
+
+        # --- 합계 (화면 계산과 동일: 관리비는 견적 금액 기준, 내정 TOTAL에는 포함하지 않음) ---
+        management = round_half_up(total_quote * management_rate / 100)
+        profit = round_half_up(total_quote * profit_rate / 100)
+        final_quote = total_quote + management + profit
+        ws.append(_total_row(ws, "Sub Total", total_cost, total_quote, total_quote - total_cost))
+        ws.append(_total_row(ws, f"일반관리비 ({management_rate:g}%)", None, management, None))
+        ws.append(_total_row(ws, f"기업이윤 ({profit_rate:g}%)", None, profit, None))
+        ws.append(_total_row(ws, "TOTAL", total_cost, final_quote, final_quote - total_cost))
+        margin = round((final_quote - total_cost) / final_quote * 100, 1) if final_quote > 0 else 0
+        ws.append([header_cell(ws, "이익률(%)")] + [None] * (QUOTE_AMOUNT_INDEX - 1) + [margin])
+    finally:
+        db.close()
+
+
+def iter_price_compare_xlsx(
+    price_compare_id: UUID,
+    management_rate: float = DEFAULT_MANAGEMENT_RATE,
+    profit_rate: float = DEFAULT_PROFIT_RATE
+) -> Iterator[bytes]:
+    """
+    내정가 비교서 통합 문서(.xlsx)를 청크 단위로 생성합니다. (StreamingResponse 본문용)
+
+    Args:
+        price_compare_id (UUID): 내보낼 비교서 ID.
+        management_rate (float): 일반관리비 비율(%).
+        profit_rate (float): 기업이윤 비율(%).
+    """
+    return stream_workbook(partial(_write_price_compare, price_compare_id, management_rate, profit_rate))
+
+
+def get_export_filename(db, price_compare_id: UUID) -> Optional[str]:
+    """다운로드 파일명 (견적명 기준, 비교서가 없으면 None)"""
+    row = (
+        db.query(General.name)
+        .join(PriceCompare, PriceCompare.general_id == General.id)
+        .filter(PriceCompare.id == price_compare_id)
+        .first()
+    )
+    return f"내정가비교_{row.name}.xlsx" if row else None
@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
-from backend.database import get_db
+from typing import Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from backend.database import SessionLocal, get_db, get_read_db
+from backend.core.db_runner import ReadRunner, get_read_runner
+from backend.core.http_cache import has_if_none_match, not_modified_response, validator_headers, weak_etag
+from backend.core.xlsx_export import XLSX_MEDIA_TYPE, xlsx_download_headers
 from . import schemas, crud
+from .export import DEFAULT_MANAGEMENT_RATE, DEFAULT_PROFIT_RATE, get_export_filename, iter_price_compare_xlsx
 
 handler = APIRouter()
 
@@ -30,35 +37,83 @@ def create_price_compare(
     return new_pc
 
 
+def load_price_compare_response(db: Session, price_compare_id: UUID) -> Tuple[Optional[schemas.PriceCompareResponse], bool]:
+    """
+    비교서와 연관 자재/장비를 세션 안에서 모두 적재해 응답 DTO로 변환합니다. (ReadRunner 실행용)
+    - 비동기 세션에서는 응답 직렬화 시점의 지연 로딩이 불가능하므로 DTO로 미리 변환합니다.
+    
+    Returns:
+        Tuple[Optional[schemas.PriceCompareResponse], bool]: (응답 DTO, 장비 BOM 변경으로 재계산이 필요한지 여부)
+    """
+    pc = crud.get_price_compare(db, price_compare_id)
+    if not pc:
+        return None, False
+    
+    # Response Model 매핑
+    pc.machine_ids = [pm.machine_id for pm in pc.price_compare_machines]
+    stale = any(pm.stale_since is not None for pm in pc.price_compare_machines)
+    
+    return schemas.PriceCompareResponse.model_validate(pc), stale
+
+
+def refresh_and_load_price_compare_response(price_compare_id: UUID) -> Optional[schemas.PriceCompareResponse]:
+    """stale 표시된 장비의 원가 행을 쓰기 세션에서 재계산한 뒤 응답 DTO를 다시 만듭니다. (스레드풀 실행용)"""
+    db = SessionLocal()
+    try:
+        crud.refresh_stale_price_compare(db, price_compare_id)
+        return load_price_compare_response(db, price_compare_id)[0]
+    finally:
+        db.close()
+
+
+def price_compare_cache_headers(price_compare_id: UUID, version: int) -> dict:
+    """
+    비교서 상세 조회 검증 헤더 (항목/장비 연결 변경 시에도 version이 증가함)
+    - updated_at은 초 단위라 같은 초 안의 연속 수정을 구분하지 못하므로 Last-Modified는 보내지 않습니다.
+    """
+    return validator_headers(weak_etag("price_compare", price_compare_id, version))
+
+
 @handler.get(
     "/{price_compare_id}", 
     response_model=schemas.PriceCompareResponse,
     summary="내정가 비교서 상세 조회"
 )
-def get_price_compare(
+async def get_price_compare(
     price_compare_id: UUID, 
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    runner: ReadRunner = Depends(get_read_runner)
 ):
     """
     **내정가 비교서 상세 조회**
+    - 참조 장비의 BOM이 바뀌었는데 아직 재계산되지 않았으면(백그라운드 작업 전/실패), 조회 시 해당 장비 원가 행만 재계산합니다.
+    - If-None-Match가 현재 버전과 같으면 항목을 적재하지 않고 304를 반환합니다. (재계산 대기 중이면 제외)
     """
-    pc = crud.get_price_compare(db, price_compare_id)
+    if has_if_none_match(request):
+        version = await runner.run(crud.get_price_compare_version, price_compare_id)
+        if version is not None and not version.stale:
+            cached = not_modified_response(request, price_compare_cache_headers(price_compare_id, version.version))
+            if cached:
+                return cached
+    
+    pc, stale = await runner.run(load_price_compare_response, price_compare_id)
+    if stale:
+        pc = await run_in_threadpool(refresh_and_load_price_compare_response, price_compare_id)
     if not pc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="Price compare document not found"
         )
     
-    # Response Model 매핑
-    pc.machine_ids = [pm.machine_id for pm in pc.price_compare_machines]
-    
+    response.headers.update(price_compare_cache_headers(pc.id, pc.version))
     return pc
 
 
 @handler.put(
     "/{price_compare_id}", 
     response_model=schemas.PriceCompareResponse,
-    summary="내정가 비교서 수정 (전체 덮어쓰기)"
+    summary="내정가 비교서 수정 (덮어쓰기, 변경분만 반영)"
 )
 def update_price_compare(
     price_compare_id: UUID, 
@@ -71,6 +126,7 @@ def update_price_compare(
       변경된 장비 구성을 기준으로 BOM을 **자동 재계산(초기화)**합니다.
     - `price_compare_resources` 리스트 **전송** 시: 
       수동으로 입력된 값들을 **그대로 덮어쓰기(Overwrite)**합니다.
+    - 저장 시 기존 행과 `(machine_id, major, minor)` 기준으로 비교하여 바뀐 행만 INSERT/UPDATE/DELETE 합니다.
     """
     updated_pc = crud.update_price_compare_overwrite(db, price_compare_id, request)
     if not updated_pc:
@@ -82,4 +138,68 @@ def update_price_compare(
     # Response Model 매핑
     updated_pc.machine_ids = [pm.machine_id for pm in updated_pc.price_compare_machines]
     
-    return updated_pc
\ No newline at end of file
+    return updated_pc
+
+
+@handler.patch(
+    "/{price_compare_id}/resources",
+    response_model=schemas.ResourceItem,
+    summary="내정가 비교서 항목 한 행 수정"
+)
+def patch_price_compare_resource(
+    price_compare_id: UUID,
+    request: schemas.ResourcePatch,
+    db: Session = Depends(get_db)
+):
+    """
+    **내정가 비교서 항목 수정 (셀 단위)**
+    - `(machine_id, major, minor)`로 지정한 한 행에서 전송된 필드만 변경합니다.
+    - 전체 비교서를 다시 보내지 않으므로 저장 비용이 변경된 행 수에 비례합니다.
+    """
+    resource = crud.patch_price_compare_resource(db, price_compare_id, request)
+    if not resource:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Price compare resource not found"
+        )
+
+    return resource
+
+
+@handler.get(
+    "/{price_compare_id}/export",
+    response_class=StreamingResponse,
+    summary="내정가 비교서 엑셀 다운로드"
+)
+def export_price_compare(
+    price_compare_id: UUID,
+    management_rate: float = Query(DEFAULT_MANAGEMENT_RATE, ge=0, le=100, description="일반관리비 비율(%)"),
+    profit_rate: float = Query(DEFAULT_PROFIT_RATE, ge=0, le=100, description="기업이윤 비율(%)"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    **내정가 비교서 엑셀(.xlsx) 다운로드**
+    - 상세 화면 비교표와 같은 구성(Unit별 소계, Sub Total, 관리비, TOTAL, 이익률)으로 내보냅니다.
+    - 존재 확인/파일명 조회는 읽기 세션으로 처리합니다.
+    - 재계산 대기 중인 장비가 있을 때만 쓰기 세션을 열어 해당 장비 원가 행을 재계산합니다. (상세 조회와 같은 결과)
+    - 통합 문서는 작업 스레드에서 생성하며 청크 단위로 전송합니다. (항목 수와 무관한 메모리 사용량)
+    """
+    version = crud.get_price_compare_version(db, price_compare_id)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Price compare document not found"
+        )
+    if version.stale:
+        write_db = SessionLocal()
+        try:
+            crud.refresh_stale_price_compare(write_db, price_compare_id)
+        finally:
+            write_db.close()
+
+    filename = get_export_filename(db, price_compare_id) or "price_compare.xlsx"
+    return StreamingResponse(
+        iter_price_compare_xlsx(price_compare_id, management_rate, profit_rate),
+        media_type=XLSX_MEDIA_TYPE,
+        headers=xlsx_download_headers(filename)
+    )
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
@@ -40,6 +40,33 @@ class PriceCompareUpdate(BaseModel):
     # Optional로 설정하여, 값을 안 보내면(None) 자동 재계산 로직이 돌도록 함 💡
     price_compare_resources: Optional[List[ResourceItem]] = Field(None)
 
+# --- Patch Request (항목 한 행 수정) ---
+class ResourcePatch(BaseModel):
+    # 수정할 항목 키 (PK)
+    machine_id: UUID = Field(..., description="장비 ID (PK)")
+    major: str = Field(..., max_length=30, description="대분류 (PK)")
+    minor: str = Field(..., max_length=50, description="중분류 (PK)")
+
+    # 변경할 필드만 전송 (미전송 필드는 그대로 유지)
+    cost_solo_price: Optional[int] = Field(None, description="내정 단가")
+    cost_unit: Optional[str] = Field(None, max_length=10, description="내정 단위")
+    cost_compare: Optional[int] = Field(None, description="내정 수량")
+
+    quotation_solo_price: Optional[int] = Field(None, description="견적 단가")
+    quotation_unit: Optional[str] = Field(None, max_length=10, description="견적 단위")
+    quotation_compare: Optional[int] = Field(None, description="견적 수량")
+
+    upper: Optional[float] = Field(None, description="상승 반영율(%)")
+    description: Optional[str] = Field(None, description="비고")
+
+    @model_validator(mode="after")
+    def check_not_null(self):
+        # 비고(description) 외의 필드는 DB에서 NOT NULL이므로 null로 변경할 수 없습니다.
+        nulls = [name for name in self.model_fields_set if name != "description" and getattr(self, name) is None]
+        if nulls:
+            raise ValueError(f"null로 변경할 수 없는 필드입니다: {', '.join(sorted(nulls))}")
+        return self
+
 # --- Response ---
 class PriceCompareResponse(BaseModel):
     id: UUID
@@ -48,6 +75,7 @@ class PriceCompareResponse(BaseModel):
     description: Optional[str]
     created_at: datetime
     updated_at: datetime
+    version: int = Field(1, description="비교서 수정 카운터 (수정마다 증가, ETag 기준)")
     
     price_compare_resources: List[ResourceItem] = Field(default_factory=list)
     
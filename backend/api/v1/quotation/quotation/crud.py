@@ -1,9 +1,16 @@
 # api/v1/general/crud.py
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, literal, select, union_all
 from uuid import UUID
 from typing import List, Optional, Tuple
 from models.general import General
+from models.price_compare import PriceCompare
+from models.quotation import Quotation
+from models.detailed import Detailed
+from core.pagination import decode_datetime_cursor, desc_keyset_filter, next_cursor_for
+
+# 연관 문서 기본 페이지 크기
+RELATED_DOCUMENTS_LIMIT = 100
 
 # ============================================================
 # CRUD Functions
@@ -81,48 +88,41 @@ def update_general(
     return general
 
 
-def get_general_with_relations(db: Session, general_id: UUID) -> Optional[dict]:
+def get_general_with_relations(
+    db: Session,
+    general_id: UUID,
+    limit: int = RELATED_DOCUMENTS_LIMIT,
+    cursor: Optional[str] = None
+) -> Optional[dict]:
     """
     General 상세 조회 (연관 테이블 포함)
     
     반환 필드: table_name, id, creator, updated_at, description
+    - 연관 테이블은 UNION ALL 한 번으로 조회하며, 최신 수정순 정렬/LIMIT/커서는 DB에서 처리합니다.
     """
     general = get_general_by_id(db, general_id)
     if not general:
         return None
     
     # 통합 목록 (모든 연관 테이블)
-    items = []
-    
-    # PriceCompare 목록
-    for pc in general.price_compares:
-        items.append({
-            "table_name": "가격 비교",
-            "id": str(pc.id),
-            "creator": pc.creator,
-            "updated_at": pc.updated_at,
-            "description": pc.description
-        })
+    related = union_all(
+        select(literal("가격 비교").label("table_name"), PriceCompare.id, PriceCompare.creator, PriceCompare.updated_at, PriceCompare.description)
+        .where(PriceCompare.general_id == general_id),
+        select(literal("상세 견적"), Detailed.id, Detailed.creator, Detailed.updated_at, Detailed.description)
+        .where(Detailed.general_id == general_id),
+        select(literal("견적서"), Quotation.id, Quotation.creator, Quotation.updated_at, Quotation.description_1) # description_1 사용
+        .where(Quotation.general_id == general_id)
+    ).subquery("related")
     
-    # Detailed 목록
-    for d in general.detaileds:
-        items.append({
-            "table_name": "상세 견적",
-            "id": str(d.id),
-            "creator": d.creator,
-            "updated_at": d.updated_at,
-            "description": d.description
-        })
+    query = select(related)
+    if cursor:
+        last_updated_at, last_id = decode_datetime_cursor(cursor, UUID)
+        query = query.where(desc_keyset_filter(related.c.updated_at, related.c.id, last_updated_at, last_id))
     
-    # Quotation 목록
-    for q in general.quotations:
-        items.append({
-            "table_name": "견적서",
-            "id": str(q.id),
-            "creator": q.creator,
-            "updated_at": q.updated_at,
-            "description": q.description_1  # description_1 사용
-        })
+    rows = db.execute(
+        query.order_by(desc(related.c.updated_at), desc(related.c.id)).limit(limit)
+    ).mappings().all()
+    items = [{**row, "id": str(row["id"])} for row in rows]
     
     return {
         "general": {
@@ -134,7 +134,8 @@ def get_general_with_relations(db: Session, general_id: UUID) -> Optional[dict]:
             "created_at": general.created_at,
             "updated_at": general.updated_at
         },
-        "items": items
+        "items": items,
+        "next_cursor": next_cursor_for(rows, limit, lambda r: r["updated_at"], lambda r: r["id"])
     }
 
 
@@ -2,6 +2,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from uuid import UUID
+from typing import Optional
 from database import get_db
 from . import crud, schemas
 
@@ -161,13 +162,15 @@ def get_general(
     general_id: UUID,
     include_relations: bool = Query(False, description="연관 테이블 포함 여부"),
     include_schema: bool = Query(False, description="스키마 포함 여부"),
+    related_limit: int = Query(crud.RELATED_DOCUMENTS_LIMIT, ge=1, le=1000, description="연관 목록 페이지 크기"),
+    related_cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
     db: Session = Depends(get_db)
 ):
     """
     General 단일 조회
     
     - general_id: General ID (UUID)
-    - include_relations: true면 PriceCompare, Detailed, Quotation 목록 포함
+    - include_relations: true면 PriceCompare, Detailed, Quotation 목록 포함 (최신 수정순, related_limit 단위)
     - include_schema: true면 연관 테이블 스키마 포함
     
     반환 필드: table_name(구분), id, creator, updated_at, description
@@ -175,7 +178,7 @@ def get_general(
     """
     if include_relations:
         # 연관 테이블 포함
-        result = crud.get_general_with_relations(db, general_id)
+        result = crud.get_general_with_relations(db, general_id, related_limit, related_cursor)
         if not result:
             raise HTTPException(status_code=404, detail="General not found")
         
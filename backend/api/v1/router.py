@@ -5,6 +5,8 @@ from .part.handler import handler as part_handler
 from .account.handler import handler as account_handler
 from .auth.handler import handler as auth_handler
 from .quotation.router import router as quotation_router
+from .admin.handler import handler as admin_handler
+from .importer.handler import handler as importer_handler
 
 router = APIRouter()
 
@@ -16,4 +18,8 @@ router.include_router(auth_handler, prefix="/auth", tags=["Authenticator"])
 
 router.include_router(account_handler, prefix="/account", tags=["Account"])
 
-router.include_router(quotation_router, prefix="/quotation")
\ No newline at end of file
+router.include_router(quotation_router, prefix="/quotation")
+
+router.include_router(admin_handler, prefix="/admin", tags=["Admin"])
+
+router.include_router(importer_handler, prefix="/import", tags=["Import"])
\ No newline at end of file
@@ -0,0 +1,235 @@
+# backend/core/compression.py
+#
+# 응답 본문 압축(Content-Encoding 협상)을 정의합니다.
+# - Accept-Encoding에 따라 brotli(br) 또는 gzip으로 압축합니다. (brotli 모듈이 없으면 gzip만 사용)
+# - 임계값(COMPRESSION_MIN_SIZE) 이상인 텍스트 계열 응답(JSON/HTML/JS/CSS/NDJSON 등)만 압축합니다.
+# - 이미 인코딩된 응답(부품 NDJSON gzip 내보내기, 사전 압축 정적 파일 등), 304/206 응답은 그대로 통과시킵니다.
+# - 정적 파일 핸들러(static_files.py)와 빌드 스크립트가 같은 협상/압축 함수를 사용합니다.
+#
+
+import gzip
+import os
+import zlib
+from typing import List, Optional
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError: # 선택 의존성: brotli 또는 brotlicffi (둘 다 없으면 gzip만 사용)
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# 응답 압축 사용 여부 (비활성 시 미들웨어가 요청을 그대로 통과시킵니다)
+COMPRESSION_ENABLED = os.getenv("COMPRESSION", "true").lower() in ("1", "true", "yes")
+
+# 이 크기(바이트) 미만의 응답은 압축하지 않습니다. (헤더/CPU 비용이 절감량보다 큼)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# 요청마다 압축하는 동적 응답용 압축 수준 (속도 우선). 정적 파일은 빌드 시 최고 수준으로 미리 압축합니다.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+# 서버가 선호하는 순서 (같은 q 값이면 앞쪽 우선)
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# 압축 대상 Content-Type (이미지/폰트/동영상 등 이미 압축된 형식은 제외)
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/x-ndjson",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def is_compressible(content_type: str) -> bool:
+    """압축 효과가 있는 Content-Type인지 여부"""
+    return content_type.lower().startswith(COMPRESSIBLE_TYPES)
+
+
+def negotiate_encoding(accept_encoding: str, available=SUPPORTED_ENCODINGS) -> Optional[str]:
+    """
+    Accept-Encoding 헤더에서 사용할 인코딩을 고릅니다.
+    - q 값이 가장 큰 인코딩을 고르고, 같으면 available 순서(br → gzip)를 따릅니다.
+    - q=0은 거부, `*`는 명시되지 않은 인코딩 전체에 적용됩니다.
+
+    Args:
+        accept_encoding (str): 요청의 Accept-Encoding 헤더 값.
+        available (tuple): 서버가 제공할 수 있는 인코딩 (선호 순).
+
+    Returns:
+        Optional[str]: "br" / "gzip", 압축하지 않아야 하면 None.
+    """
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip()] = q
+
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """한 번에 압축 (level 미지정 시 동적 응답용 수준)"""
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY if level is None else level)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL if level is None else level, mtime=0)
+
+
+class _StreamCompressor:
+    """스트리밍 응답용 점진 압축기 (청크마다 flush하여 NDJSON 등이 지연 없이 전달되도록 함)"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS) # wbits 16+: gzip 헤더/트레일러 포함
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def _add_vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary", "")
+    if "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+
+
+# ============================================================
+# 미들웨어
+# ============================================================
+
+class CompressionMiddleware:
+    """
+    Accept-Encoding에 따라 응답 본문을 br/gzip으로 압축하는 ASGI 미들웨어.
+    - 본문이 한 번에 오는 일반 응답은 임계값 이상일 때만 압축하고 Content-Length를 다시 계산합니다.
+    - 스트리밍 응답(more_body)은 Content-Length를 제거하고 청크 단위로 압축합니다.
+    - 압축된 표현은 원본과 바이트가 다르므로 강한 ETag는 약한 ETag(W/)로 바꿉니다.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not COMPRESSION_ENABLED or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingSender(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingSender:
+    """응답 시작 메시지를 첫 본문 청크까지 보류했다가 압축 여부를 결정하는 send 래퍼"""
+
+    def __init__(self, send, encoding: str, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message: Optional[dict] = None
+        self.passthrough = False
+        self.compressor: Optional[_StreamCompressor] = None
+
+    async def send(self, message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message.get("headers", []))
+            status = message["status"]
+            if (
+                status < 200 or status in (204, 206, 304)
+                or "content-encoding" in headers
+                or "content-range" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            ):
+                self.passthrough = True
+                await self._send(message)
+                return
+            self.start_message = message # 첫 본문 청크를 보고 결정
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is not None: # 스트리밍 압축 진행 중
+            data = self.compressor.chunk(body) if body else b""
+            if not more_body:
+                data += self.compressor.finish()
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        start = self.start_message
+        self.start_message = None
+        headers = MutableHeaders(raw=list(start.get("headers", [])))
+        _add_vary(headers)
+
+        if not more_body: # 본문이 한 번에 온 일반 응답
+            if len(body) >= self.minimum_size:
+                body = compress(body, self.encoding)
+                self._mark_encoded(headers)
+                headers["Content-Length"] = str(len(body))
+            await self._send({**start, "headers": headers.raw})
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        # 스트리밍 응답: 전체 크기를 알 수 없으므로 청크 단위로 압축
+        self.compressor = _StreamCompressor(self.encoding)
+        self._mark_encoded(headers)
+        if "content-length" in headers:
+            del headers["content-length"]
+        await self._send({**start, "headers": headers.raw})
+        await self._send({"type": "http.response.body", "body": self.compressor.chunk(body), "more_body": True})
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+
+
+def encodings_for(accept_encoding: str, available=("br", "gzip")) -> List[str]:
+    """
+    Accept-Encoding이 허용하는 인코딩을 선호 순으로 나열합니다. (사전 압축 정적 파일 선택용)
+    - 미리 만들어 둔 .br 파일은 brotli 모듈 없이도 그대로 보낼 수 있으므로 기본값에 br을 포함합니다.
+    """
+    remaining = list(available)
+    ordered = []
+    while remaining:
+        coding = negotiate_encoding(accept_encoding, tuple(remaining))
+        if coding is None:
+            break
+        ordered.append(coding)
+        remaining.remove(coding)
+    return ordered
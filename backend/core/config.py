@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from fastapi.templating import Jinja2Templates
+from backend.core.static_files import install_static_url_for
 
 class Settings:
     # [보안] 실무에서는 반드시 환경변수나 .env 파일에서 가져와야 합니다.
@@ -8,6 +9,8 @@ class Settings:
     SECRET_KEY: str = os.getenv("SECRET_KEY", "dhH%@)$#*0yhdilKDJ!)*#$)AyuodfYD)*08308740)*&D)*D7087sd087f)D&F)&03uEH")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 1일 (24시간)
+    # 로그인 토큰에 역할 ID/권한 버전 클레임 포함 여부 (포함 시 역할 재배정·권한 변경 후 발급 전 토큰은 재로그인 필요)
+    TOKEN_ROLE_CLAIMS: bool = os.getenv("TOKEN_ROLE_CLAIMS", "true").lower() in ("1", "true", "yes")
 
 settings = Settings()
 
@@ -16,4 +19,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent
 FRONTEND_DIR = BASE_DIR / "frontend"
 
 # 템플릿 설정 단일화
-templates = Jinja2Templates(directory=str(FRONTEND_DIR))
\ No newline at end of file
+templates = Jinja2Templates(directory=str(FRONTEND_DIR))
+
+# url_for('static', path=...)가 콘텐츠 해시 지문 URL을 생성하도록 설정 (PrecompressedStaticFiles 마운트 대상)
+install_static_url_for(templates)
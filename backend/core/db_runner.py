@@ -0,0 +1,66 @@
+# backend/core/db_runner.py
+#
+# 조회 핸들러용 DB 작업 실행기를 정의합니다.
+# - 비동기 경로: AsyncSession.run_sync로 동기 ORM 코드를 실행하며, 쿼리 대기 중 이벤트 루프를 양보합니다.
+# - 동기 경로: 기존 읽기 전용 Session을 스레드풀에서 실행합니다. (DB_ASYNC_HANDLERS=false, 부하 비교용)
+# - 핸들러는 같은 CRUD 함수를 두 경로에서 그대로 재사용합니다.
+# - 스레드 락을 잡거나 CPU 작업이 긴 코드(부품 카탈로그 캐시)는 경로와 무관하게 작업 스레드에서 실행합니다. (run_in_thread)
+#   run_sync는 이벤트 루프 스레드에서 실행되므로, 락을 잡은 채 쿼리 대기로 양보하면 같은 스레드의 다른 요청이
+#   RLock에 재진입하고(중복 적재), 메모리 작업 동안에는 이벤트 루프가 멈춥니다.
+#
+
+from typing import Any, Callable
+from fastapi import Depends
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from backend.database import ASYNC_READ_HANDLERS, ReadSessionLocal, get_async_db, get_read_db
+
+
+class ReadRunner:
+    """
+    읽기 전용 세션에서 `fn(db, *args, **kwargs)`를 실행하는 실행기.
+    - fn은 반환 전에 응답에 필요한 모든 값을 적재해야 합니다. (세션 밖 지연 로딩 불가)
+    """
+
+    def __init__(self, async_db: AsyncSession = None, sync_db: Session = None):
+        self.async_db = async_db
+        self.sync_db = sync_db
+
+    @property
+    def is_async(self) -> bool:
+        return self.async_db is not None
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        if self.async_db is not None:
+            return await self.async_db.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self.sync_db, *args, **kwargs)
+
+    async def run_in_thread(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        `fn(db, *args, **kwargs)`를 항상 작업 스레드에서 동기 읽기 세션으로 실행합니다. (이벤트 루프 차단 방지)
+        - 비동기 경로에서는 작업 스레드 안에서 읽기 세션을 열고 닫습니다. (연결은 실제 쿼리 시에만 사용)
+        """
+        if self.sync_db is not None:
+            return await run_in_threadpool(fn, self.sync_db, *args, **kwargs)
+        return await run_in_threadpool(_run_with_read_session, fn, *args, **kwargs)
+
+
+def _run_with_read_session(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    db = ReadSessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+async def _get_async_runner(db: AsyncSession = Depends(get_async_db)):
+    yield ReadRunner(async_db=db)
+
+
+def _get_sync_runner(db: Session = Depends(get_read_db)):
+    yield ReadRunner(sync_db=db)
+
+
+# 주요 조회 핸들러용 실행기 의존성 (DB_ASYNC_HANDLERS 설정에 따라 비동기/동기 경로 선택)
+get_read_runner = _get_async_runner if ASYNC_READ_HANDLERS else _get_sync_runner
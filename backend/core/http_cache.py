@@ -0,0 +1,107 @@
+# backend/core/http_cache.py
+#
+# HTTP 조건부 요청(ETag / If-None-Match, Last-Modified / If-Modified-Since) 처리 헬퍼를 정의합니다.
+# - 클라이언트가 보낸 ETag가 현재 리소스 버전과 같으면 본문 없이 304 Not Modified로 응답합니다.
+# - 문서(장비/비교서/견적) 조회는 id + 수정 카운터(version) 기반 약한(W/) ETag만 사용합니다.
+#   (updated_at은 초 단위라 같은 초 안의 연속 수정을 구분하지 못하므로 Last-Modified/If-Modified-Since로는 판단하지 않음)
+# - 부품 카탈로그 조회는 카탈로그 버전 기반 ETag를 사용합니다.
+#
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+from fastapi import Request, Response
+
+# 조건부 요청 응답의 캐시 정책 (브라우저가 캐시를 쓰되 매번 ETag/Last-Modified로 재검증)
+REVALIDATE = "no-cache"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match 헤더 값이 주어진 ETag와 일치하는지 확인합니다. (약한 비교, 쉼표 구분 목록 및 "*" 지원)
+
+    Args:
+        if_none_match (Optional[str]): 요청의 If-None-Match 헤더 값.
+        etag (str): 현재 리소스의 ETag (따옴표 포함).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+
+def not_modified(etag: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """본문 없는 304 Not Modified 응답을 만듭니다. (ETag 및 캐시 관련 헤더 유지)"""
+    response_headers = {"ETag": etag}
+    if headers:
+        response_headers.update(headers)
+    return Response(status_code=304, headers=response_headers)
+
+
+def weak_etag(*parts: Any) -> str:
+    """
+    버전을 이루는 값들(예: 문서 종류, id, updated_at)로 약한 ETag를 만듭니다.
+    - 압축 여부 등 표현이 달라도 의미상 같은 문서이므로 약한 비교(W/)를 사용합니다.
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def http_date(value: datetime) -> str:
+    """DB 타임스탬프(UTC, CURRENT_TIMESTAMP)를 HTTP 날짜 형식으로 변환합니다."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """조건부 요청 검증용 응답 헤더 (ETag, Last-Modified, Cache-Control)"""
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def has_if_none_match(request: Request) -> bool:
+    """요청에 If-None-Match 헤더가 있는지 확인합니다. (ETag 조건부 조회 전 버전 조회 여부 판단)"""
+    return "if-none-match" in request.headers
+
+
+def _not_modified_since(if_modified_since: Optional[str], last_modified: Optional[str]) -> bool:
+    if not if_modified_since or not last_modified:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False # 형식이 잘못된 헤더는 무시 (RFC 9110)
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return parsedate_to_datetime(last_modified) <= since
+
+
+def not_modified_response(request: Request, headers: Dict[str, str]) -> Optional[Response]:
+    """
+    조건부 요청이 현재 버전과 일치하면 304 응답을, 아니면 None을 반환합니다.
+    - If-None-Match가 있으면 ETag만으로 판단하고 If-Modified-Since는 무시합니다. (RFC 9110 우선순위)
+
+    Args:
+        request (Request): 요청 객체.
+        headers (Dict[str, str]): validator_headers()로 만든 현재 버전의 헤더.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        matched = etag_matches(if_none_match, headers["ETag"])
+    else:
+        matched = _not_modified_since(request.headers.get("if-modified-since"), headers.get("Last-Modified"))
+    if not matched:
+        return None
+    return not_modified(headers["ETag"], {k: v for k, v in headers.items() if k != "ETag"})
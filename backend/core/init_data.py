@@ -1,13 +1,14 @@
 import sys
 import os
 
-# [핵심 수정] 현재 파일(init_data.py)의 부모의 부모 경로(/app)를 시스템 경로에 추가
-# 이렇게 해야 'database'와 'models'를 찾을 수 있습니다.
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# [핵심 수정] 현재 파일(init_data.py)의 backend 상위 경로(프로젝트 루트)를 시스템 경로에 추가
+# 이렇게 해야 스크립트로 직접 실행해도 서버와 같은 'backend.' 패키지 경로로 모듈을 찾을 수 있습니다.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from sqlalchemy.orm import Session
-from database import SessionLocal
-from models import Role, Permission 
+from backend.database import SessionLocal
+from backend.models import Role, Permission 
+from backend.core.permission_cache import permission_cache
 
 def init_db():
     db = SessionLocal()
@@ -86,6 +87,7 @@ def init_db():
             print("   -> USER에게 Read/Create 권한 부여 완료.")
 
         db.commit()
+        permission_cache.invalidate() # 역할/권한 변경 반영 (같은 프로세스의 권한 캐시)
         print("🎉 초기 데이터 주입 성공!")
 
     except Exception as e:
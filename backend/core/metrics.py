@@ -0,0 +1,366 @@
+# backend/core/metrics.py
+#
+# 애플리케이션 메트릭(카운터/게이지/히스토그램)과 Prometheus 텍스트 포맷 출력을 정의합니다.
+# - 요청 수, 처리 중 요청 수, 라우트 템플릿별 지연 시간 히스토그램, 요청/응답 본문 크기를 기록합니다.
+# - DB 연결 풀 대기 시간은 database.py의 풀 클래스가 db_pool_checkout_seconds에 기록합니다.
+# - 캐시 hit 비율 등 조회 시점에 계산하는 값은 수집기(register_collector)로 등록합니다.
+# - 외부 의존성(prometheus_client) 없이 동작하며, 출력은 Prometheus text exposition format 0.0.4를 따릅니다.
+#
+
+import bisect
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 메트릭 수집 사용 여부 (비활성 시 미들웨어가 요청을 그대로 통과시킵니다)
+METRICS_ENABLED = os.getenv("METRICS", "true").lower() in ("1", "true", "yes")
+
+# 지연 시간 버킷(초): 일반 요청 ~ 대용량 BOM 저장/엑셀 내보내기까지
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+# 연결 풀 대기 시간 버킷(초): 대부분 즉시 반환되므로 아래쪽을 촘촘하게
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+# 본문 크기 버킷(바이트)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# ============================================================
+# 메트릭 타입
+# ============================================================
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock() # 스레드풀/aiosqlite 스레드에서도 기록됨
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """증감 가능한 현재 값"""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """
+    누적 버킷 히스토그램.
+    - p95/p99는 Prometheus에서 histogram_quantile(0.95, rate(<name>_bucket[5m]))로 계산합니다.
+    - quantile()은 같은 선형 보간 방식의 근사치를 반환합니다. (스크립트/점검용)
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, list] = {} # key -> [버킷별 개수(+Inf 포함), 합계]
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value) # value <= bucket 인 첫 버킷 (없으면 +Inf)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return sum(series[0]) if series else 0
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """버킷 경계 사이를 선형 보간한 분위수 근사치 (관측값이 없으면 None)"""
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            counts = list(series[0]) if series else []
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.buckets[-1] # +Inf 버킷: 마지막 경계로 근사
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(series[0]), series[1])) for key, series in self._series.items())
+        lines = self.header()
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# ============================================================
+# 레지스트리
+# ============================================================
+
+# 수집기: 조회 시점에 (이름, 타입, 설명, [(레이블 dict, 값)]) 목록을 반환하는 함수
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+
+class Registry:
+    """메트릭과 수집기를 모아 Prometheus 텍스트 포맷으로 출력합니다."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: Dict[str, Collector] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, name: str, collector: Collector) -> None:
+        """수집기를 등록합니다. (같은 이름으로 다시 등록하면 교체)"""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors.items())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+
+        # 수집기 결과는 같은 메트릭 이름끼리 묶어 HELP/TYPE를 한 번만 출력합니다.
+        families: Dict[str, Tuple[str, str, List[str]]] = {}
+        for collector_name, collector in collectors:
+            try:
+                samples = list(collector())
+            except Exception as e: # 수집기 하나의 오류로 전체 조회가 실패하지 않도록
+                print(f"[Metrics Warning] collector '{collector_name}' failed: {e}")
+                continue
+            for name, kind, documentation, values in samples:
+                family = families.setdefault(name, (kind, documentation, []))
+                for labels, value in values:
+                    if value is None:
+                        continue
+                    family[2].append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        for name, (kind, documentation, samples) in families.items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# Prometheus 텍스트 포맷 Content-Type
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "Total HTTP requests by method, route template and status code.",
+    ("method", "route", "status")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being processed.", ("method",)
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds by route template.",
+    ("method", "route"), LATENCY_BUCKETS
+))
+http_request_size_bytes = registry.register(Histogram(
+    "http_request_size_bytes", "HTTP request body size in bytes by route template.",
+    ("method", "route"), SIZE_BUCKETS
+))
+http_response_size_bytes = registry.register(Histogram(
+    "http_response_size_bytes", "HTTP response body size in bytes by route template.",
+    ("method", "route"), SIZE_BUCKETS
+))
+db_pool_checkout_seconds = registry.register(Histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a database connection from the pool.",
+    ("pool",), POOL_WAIT_BUCKETS
+))
+db_pool_checkout_timeouts_total = registry.register(Counter(
+    "db_pool_checkout_timeouts_total", "Database connection checkouts that failed (pool timeout).", ("pool",)
+))
+
+
+def cache_collector(cache_name: str, stats: Callable[[], dict]) -> Collector:
+    """
+    hits/misses 카운터를 가진 캐시의 stats() 함수를 hit 비율 수집기로 감쌉니다.
+
+    Args:
+        cache_name (str): 출력 레이블 cache="..." 값.
+        stats (Callable[[], dict]): "hits", "misses" 키를 포함한 딕셔너리를 반환하는 함수.
+    """
+    def collect():
+        current = stats()
+        hits, misses = current.get("hits", 0), current.get("misses", 0)
+        labels = {"cache": cache_name}
+        return [
+            ("cache_hits_total", "counter", "Cache lookups served from memory.", [(labels, hits)]),
+            ("cache_misses_total", "counter", "Cache lookups that fell through to the database.", [(labels, misses)]),
+            ("cache_hit_ratio", "gauge", "Cache hit ratio since process start.",
+             [(labels, hits / (hits + misses) if hits + misses else None)]),
+        ]
+    return collect
+
+
+# ============================================================
+# 미들웨어
+# ============================================================
+
+def route_template(scope) -> str:
+    """
+    메트릭 레이블로 쓸 라우트 템플릿 (예: /api/v1/quotation/machine/{machine_id})
+    - 실제 경로 대신 템플릿을 사용하여 ID별로 시계열이 늘어나지 않도록 합니다.
+    - 정적 파일 마운트는 마운트 경로로, 매칭되지 않은 요청은 하나의 레이블로 묶습니다.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    root_path = scope.get("root_path") or ""
+    app_root_path = scope.get("app_root_path") or ""
+    if len(root_path) > len(app_root_path): # Mount(StaticFiles 등)로 전달된 요청
+        return f"{root_path[len(app_root_path):]}/{{path}}"
+    return "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    요청 수, 처리 중 요청 수, 지연 시간, 요청/응답 본문 크기를 기록하는 ASGI 미들웨어.
+    - 라우트 템플릿은 라우팅 이후 scope["route"]에서 읽으므로 요청 처리가 끝난 뒤 기록합니다.
+    - 지연 시간은 응답 본문 전송 완료(스트리밍 응답 포함)까지입니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500 # 응답 시작 전에 예외가 나면 500으로 기록
+        request_bytes = 0
+        response_bytes = 0
+
+        async def receive_with_size():
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_with_size(message):
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_flight.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive_with_size, send_with_size)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec(method=method)
+            route = route_template(scope)
+            http_requests_total.inc(method=method, route=route, status=str(status))
+            http_request_duration_seconds.observe(elapsed, method=method, route=route)
+            http_request_size_bytes.observe(request_bytes, method=method, route=route)
+            http_response_size_bytes.observe(response_bytes, method=method, route=route)
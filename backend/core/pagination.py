@@ -0,0 +1,117 @@
+# backend/core/pagination.py
+#
+# 목록 API 공통 커서(Keyset) 페이지네이션 헬퍼를 정의합니다.
+# - 커서는 마지막 행의 정렬 키 값을 JSON으로 직렬화한 뒤 base64url로 인코딩한 불투명(opaque) 문자열입니다.
+# - OFFSET 대신 "마지막 정렬 키 이후" 조건을 사용하므로 깊은 페이지도 첫 페이지와 같은 비용으로 조회됩니다.
+#
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional
+from uuid import UUID
+from fastapi import HTTPException
+from sqlalchemy import String, and_, literal, or_, text
+from sqlalchemy.orm import Session
+
+# 총 개수 계산 방식 (목록 API의 count 쿼리 파라미터)
+# - exact: COUNT(*)로 정확한 개수 계산
+# - estimate: 필터가 없는 목록에 한해 max(rowid)로 근사치 계산 (삭제가 있었다면 실제보다 클 수 있음)
+# - none: 개수 계산 생략 (total = None)
+COUNT_MODES = ("exact", "estimate", "none")
+COUNT_MODE_PATTERN = "^(exact|estimate|none)$"
+
+# DB 타임스탬프 저장 형식 (server_default=func.current_timestamp())
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """정렬 키 값들을 불투명한 커서 문자열로 인코딩합니다."""
+    raw = json.dumps([_to_json_value(v) for v in values], separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    커서 문자열을 정렬 키 값 리스트로 디코딩합니다.
+
+    Raises:
+        HTTPException: 커서 형식이 올바르지 않을 경우 400 Bad Request.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="유효하지 않은 커서입니다.")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="유효하지 않은 커서입니다.")
+    return values
+
+
+def decode_datetime_cursor(cursor: str, id_parser: Callable[[Any], Any] = str) -> tuple:
+    """
+    (datetime, ID) 형식의 커서를 디코딩합니다. (updated_at/created_at DESC 정렬 목록용)
+
+    Args:
+        cursor (str): 커서 문자열.
+        id_parser (Callable): ID 값 변환 함수 (예: UUID).
+    """
+    timestamp, row_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(timestamp), id_parser(row_id)
+    except (TypeError, ValueError, AttributeError):
+        raise HTTPException(status_code=400, detail="유효하지 않은 커서입니다.")
+
+
+def decode_string_cursor(cursor: str, size: int) -> tuple:
+    """문자열 키 튜플 커서를 디코딩합니다. (예: 부품 품목코드 (maker_id, parts_id) 정렬 목록용)"""
+    values = decode_cursor(cursor, size)
+    if not all(isinstance(v, str) for v in values):
+        raise HTTPException(status_code=400, detail="유효하지 않은 커서입니다.")
+    return tuple(values)
+
+
+def desc_keyset_filter(sort_column, id_column, last_sort_value, last_id):
+    """
+    `ORDER BY sort_column DESC, id_column DESC` 정렬에서 커서 이후 행만 남기는 조건식을 만듭니다.
+    - 타임스탬프 컬럼은 CURRENT_TIMESTAMP 문자열("YYYY-MM-DD HH:MM:SS")로 저장되므로,
+      datetime 커서 값도 같은 형식의 문자열로 바인딩해 ORDER BY와 동일한 기준으로 비교합니다.
+    - 선행 조건 `sort_column <= 커서 값`은 (sort_column, id) 인덱스의 범위 탐색(SEARCH)에 사용됩니다.
+    """
+    if isinstance(last_sort_value, datetime):
+        last_sort_value = literal(last_sort_value.strftime(TIMESTAMP_FORMAT), String())
+    return and_(
+        sort_column <= last_sort_value,
+        or_(
+            sort_column < last_sort_value,
+            and_(sort_column == last_sort_value, id_column < last_id)
+        )
+    )
+
+
+def next_cursor_for(items: list, limit: int, *key_getters) -> Optional[str]:
+    """
+    조회된 페이지가 가득 찼으면 마지막 행의 정렬 키로 다음 커서를 만듭니다. (아니면 None)
+
+    Args:
+        items (list): 조회된 행 목록.
+        limit (int): 페이지 크기.
+        key_getters: 행에서 정렬 키 값을 꺼내는 함수들 (정렬 순서대로).
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(*(getter(last) for getter in key_getters))
+
+
+def estimate_row_count(db: Session, table_name: str) -> int:
+    """SQLite rowid 최대값으로 테이블 행 수를 근사합니다. (COUNT(*) 전체 스캔 회피)"""
+    return db.execute(text(f"SELECT COALESCE(MAX(rowid), 0) FROM {table_name}")).scalar()
@@ -0,0 +1,178 @@
+# backend/core/permission_cache.py
+#
+# RBAC 인가 검사용 인메모리 권한 캐시를 정의합니다.
+# - Role → {(resource, action)} 권한 매트릭스를 단일 조인 쿼리로 한 번 적재합니다.
+# - Account → Role 조회 결과를 TTL + LRU 방식으로 캐시합니다.
+# - 역할/권한/계정 변경 시 무효화하며, 다른 프로세스에서의 변경은 TTL이 지나면 반영됩니다.
+#
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.orm import Session
+from backend.models import Account, Permission, role_permission
+
+# 권한 매트릭스 TTL(초). 프로세스 밖(스크립트, 다른 워커)에서 권한이 바뀐 경우의 최대 반영 지연입니다.
+MATRIX_TTL_SECONDS = 300
+
+# 계정 → 역할 캐시 TTL(초) 및 최대 항목 수 (초과 시 가장 오래 사용하지 않은 계정부터 제거)
+ACCOUNT_TTL_SECONDS = 60
+ACCOUNT_CACHE_SIZE = 1024
+
+PermissionKey = Tuple[str, str] # (resource, action)
+
+
+class PermissionCache:
+    """
+    RBAC 권한 캐시.
+    - 권한 확인은 캐시 적재 후 딕셔너리/집합 조회만으로 처리합니다. (요청당 DB 쿼리 0회)
+    - 존재하지 않거나 역할이 없는 계정도 None으로 캐시합니다. (계정 생성 시 무효화)
+    """
+
+    def __init__(
+        self,
+        matrix_ttl: float = MATRIX_TTL_SECONDS,
+        account_ttl: float = ACCOUNT_TTL_SECONDS,
+        account_cache_size: int = ACCOUNT_CACHE_SIZE
+    ):
+        self._lock = threading.RLock()
+        self.matrix_ttl = matrix_ttl
+        self.account_ttl = account_ttl
+        self.account_cache_size = account_cache_size
+        self._matrix: Dict[UUID, FrozenSet[PermissionKey]] = {}
+        self._matrix_expires_at = 0.0 # 0이면 미적재 상태
+        self._matrix_version: Optional[str] = None # 매트릭스 내용 지문 (토큰 pv 클레임과 비교)
+        self._accounts: "OrderedDict[str, Tuple[Optional[UUID], float]]" = OrderedDict() # account_id -> (role_id, 만료 시각)
+        self._version = 0 # 무효화될 때마다 증가
+        self.hits = 0
+        self.misses = 0
+        self.matrix_loads = 0
+
+    # --------------------------------------------------------
+    # 적재
+    # --------------------------------------------------------
+
+    @property
+    def version(self) -> int:
+        """권한 캐시 버전 (무효화마다 증가)"""
+        return self._version
+
+    def _load_matrix(self, db: Session) -> None:
+        """role_permission ⋈ Permission 단일 쿼리로 전체 권한 매트릭스를 적재합니다."""
+        rows = (
+            db.query(role_permission.c.role_id, Permission.resource, Permission.action)
+            .join(Permission, role_permission.c.permission_id == Permission.id)
+            .all()
+        )
+        matrix: Dict[UUID, set] = {}
+        for role_id, resource, action in rows:
+            matrix.setdefault(role_id, set()).add((resource, action))
+        self._matrix = {role_id: frozenset(perms) for role_id, perms in matrix.items()}
+        self._matrix_version = hashlib.sha1(
+            repr(sorted((str(role_id), sorted(perms)) for role_id, perms in matrix.items())).encode("utf-8")
+        ).hexdigest()[:12]
+        self._matrix_expires_at = time.monotonic() + self.matrix_ttl
+        self.matrix_loads += 1
+
+    def _ensure_matrix(self, db: Session) -> None:
+        if time.monotonic() >= self._matrix_expires_at:
+            self._load_matrix(db)
+
+    # --------------------------------------------------------
+    # 조회
+    # --------------------------------------------------------
+
+    def get_account_role(self, db: Session, account_id: str) -> Optional[UUID]:
+        """
+        계정의 역할 ID를 조회합니다. (계정이 없거나 역할이 없으면 None)
+
+        Args:
+            db (Session): 캐시 miss 시 사용할 SQLAlchemy 데이터베이스 세션.
+            account_id (str): 계정 ID.
+        """
+        with self._lock:
+            now = time.monotonic()
+            cached = self._accounts.get(account_id)
+            if cached is not None and cached[1] > now:
+                self._accounts.move_to_end(account_id) # LRU 갱신
+                self.hits += 1
+                return cached[0]
+
+            self.misses += 1
+            role_id = db.query(Account.role_id).filter(Account.id == account_id).scalar()
+            self._accounts[account_id] = (role_id, now + self.account_ttl)
+            self._accounts.move_to_end(account_id)
+            while len(self._accounts) > self.account_cache_size:
+                self._accounts.popitem(last=False) # 가장 오래 사용하지 않은 계정 제거
+            return role_id
+
+    def role_has_permission(self, db: Session, role_id: UUID, resource: str, action: str) -> bool:
+        """역할에 (resource, action) 권한이 있는지 확인합니다."""
+        with self._lock:
+            self._ensure_matrix(db)
+            return (resource, action) in self._matrix.get(role_id, frozenset())
+
+    def matrix_version(self, db: Session) -> str:
+        """
+        권한 매트릭스 내용의 지문을 반환합니다.
+        - 내용 기반이므로 프로세스 재시작이나 워커 간에도 같은 구성이면 같은 값입니다.
+        - 역할/권한 구성이 바뀌면 값이 달라져, 이전 값이 담긴 토큰은 재로그인이 필요해집니다.
+        """
+        with self._lock:
+            self._ensure_matrix(db)
+            return self._matrix_version
+
+    def get_role_permissions(self, db: Session, role_id: UUID) -> FrozenSet[PermissionKey]:
+        """역할의 전체 (resource, action) 권한 집합을 반환합니다."""
+        with self._lock:
+            self._ensure_matrix(db)
+            return self._matrix.get(role_id, frozenset())
+
+    # --------------------------------------------------------
+    # 무효화
+    # --------------------------------------------------------
+
+    def invalidate_roles(self) -> None:
+        """역할/권한/역할-권한 매핑 변경 시 호출합니다. 다음 검사 시 매트릭스를 다시 적재합니다."""
+        with self._lock:
+            self._matrix = {}
+            self._matrix_expires_at = 0.0
+            self._version += 1
+
+    def invalidate_account(self, account_id: Optional[str] = None) -> None:
+        """계정 생성/역할 변경/삭제 시 호출합니다. account_id가 없으면 모든 계정 캐시를 비웁니다."""
+        with self._lock:
+            if account_id is None:
+                self._accounts.clear()
+            else:
+                self._accounts.pop(account_id, None)
+            self._version += 1
+
+    def invalidate(self) -> None:
+        """권한 매트릭스와 계정 캐시를 모두 무효화합니다."""
+        with self._lock:
+            self.invalidate_roles()
+            self.invalidate_account()
+
+    def stats(self) -> dict:
+        """캐시 상태 및 hit/miss 카운터를 반환합니다."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self._version,
+                "matrix_version": self._matrix_version,
+                "matrix_loaded": self._matrix_expires_at > time.monotonic(),
+                "roles": len(self._matrix),
+                "accounts": len(self._accounts),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else None,
+                "matrix_loads": self.matrix_loads
+            }
+
+
+# 프로세스 전역 권한 캐시 인스턴스
+permission_cache = PermissionCache()
@@ -0,0 +1,44 @@
+# backend/core/responses.py
+#
+# 대용량 목록/BOM 응답용 빠른 JSON 응답 클래스를 정의합니다.
+# - 핸들러가 응답 객체를 직접 반환하면 FastAPI는 response_model 재검증과 jsonable_encoder 변환을 건너뜁니다.
+# - CRUD/카탈로그가 만든 신뢰할 수 있는 내부 dict를 orjson으로 바로 직렬화합니다. (opt-in: 필요한 엔드포인트만 사용)
+# - orjson이 설치되지 않았거나 FAST_JSON=false이면 기존과 같은 jsonable_encoder + 표준 json 경로로 직렬화합니다.
+#
+
+import json
+import os
+from typing import Any
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError: # 선택 의존성: 없으면 표준 json 경로 사용
+    orjson = None
+
+# 빠른 직렬화 사용 여부 (문제가 생기면 FAST_JSON=false로 즉시 기존 경로로 되돌릴 수 있음)
+FAST_JSON_ENABLED = orjson is not None and os.getenv("FAST_JSON", "true").lower() in ("1", "true", "yes")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson 기반 JSON 응답.
+    - UUID/datetime/dict/list 등 기본 타입은 orjson이 C 수준에서 바로 직렬화합니다.
+    - Pydantic 모델, Decimal 등 orjson이 모르는 값은 jsonable_encoder로 넘겨 기존 응답과 같은 형식을 유지합니다.
+    - 출력 형식(구분자 공백 없음, 비ASCII 문자 그대로)은 Starlette JSONResponse와 같습니다.
+
+    Example:
+        return FastJSONResponse({"items": items, "total": total})
+    """
+
+    def render(self, content: Any) -> bytes:
+        if FAST_JSON_ENABLED:
+            return orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            jsonable_encoder(content),
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":")
+        ).encode("utf-8")
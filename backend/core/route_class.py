@@ -2,10 +2,10 @@ from fastapi import Request, HTTPException
 from fastapi.routing import APIRoute
 from typing import Callable
 
-# [수정] app. 접두사 제거 (현재 환경에 맞춤)
-from database import SessionLocal
-from models import role_permission, Permission, Account
-from core.security import verify_token
+from backend.database import ReadSessionLocal
+from uuid import UUID
+from backend.core.security import decode_access_token
+from backend.core.permission_cache import permission_cache # 역할 권한 매트릭스 / 계정 역할 캐시
 
 class RBACRoute(APIRoute):
     def get_route_handler(self) -> Callable:
@@ -33,9 +33,10 @@ class RBACRoute(APIRoute):
                 return await original_route_handler(request)
 
             # ---------------------------------------------------------
-            # 2. DB 세션 생성 (Middleware 레벨이라 직접 생성)
+            # 2. 읽기 전용 DB 세션 생성 (Middleware 레벨이라 직접 생성)
+            # - 세션은 실제 쿼리 시점에 연결하므로, 권한 캐시 hit 시에는 DB 연결이 발생하지 않습니다.
             # ---------------------------------------------------------
-            db = SessionLocal()
+            db = ReadSessionLocal()
             
             try:
                 # ---------------------------------------------------------
@@ -46,14 +47,20 @@ class RBACRoute(APIRoute):
                     raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
                 
                 token = auth_header.split(" ")[1]
-                user_id = verify_token(token) # 토큰에서 user_id 추출
+                claims = decode_access_token(token) # 토큰 검증 (검증 완료 토큰은 LRU 캐시)
+                user_id = claims.get("sub") if claims else None # 토큰에서 user_id 추출
                 
                 if not user_id:
                     raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다.")
                 
-                # 사용자 및 역할 조회
-                user = db.query(Account).filter(Account.id == user_id).first()
-                if not user or not user.role_id:
+                # 사용자 역할 조회 (권한 캐시: TTL + LRU, 역할 변경 시 무효화)
+                role_id = permission_cache.get_account_role(db, user_id)
+                if claims.get("rid"):
+                    # 역할 클레임 토큰: 발급 이후 계정의 역할이 재배정되었거나 권한 구성이 바뀌었으면 재로그인 요구
+                    if (role_id is None or UUID(claims["rid"]) != role_id
+                            or claims.get("pv") != permission_cache.matrix_version(db)):
+                        raise HTTPException(status_code=401, detail="권한 정보가 변경되었습니다. 다시 로그인해주세요.")
+                if not role_id:
                     raise HTTPException(status_code=403, detail="권한이 없는 사용자입니다.")
 
                 # ---------------------------------------------------------
@@ -68,22 +75,13 @@ class RBACRoute(APIRoute):
                     raise HTTPException(status_code=403, detail="접근 권한이 없는 리소스입니다.")
                 
                 # ---------------------------------------------------------
-                # 5. [권한 검사] DB 조회
+                # 5. [권한 검사] 권한 매트릭스 조회 (캐시)
                 # "이 유저의 Role이 해당 Resource에 대해 Action 권한이 있는가?"
                 # ---------------------------------------------------------
-                has_permission = (
-                    db.query(role_permission)
-                    .join(Permission, role_permission.c.permission_id == Permission.id) # [핵심 수정] .c 사용
-                    .filter(
-                        role_permission.c.role_id == user.role_id,  # [핵심 수정] .c 사용
-                        Permission.resource == resource,
-                        Permission.action == action
-                    )
-                    .first()
-                )
+                has_permission = permission_cache.role_has_permission(db, role_id, resource, action)
 
                 if not has_permission:
-                    print(f"[Access Denied] User: {user.id}, Role: {user.role_id}, Target: {resource}:{action}")
+                    print(f"[Access Denied] User: {user_id}, Role: {role_id}, Target: {resource}:{action}")
                     raise HTTPException(status_code=403, detail="접근 권한이 없습니다.")
 
             except HTTPException as he:
@@ -1,3 +1,6 @@
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional, Union, Any
 from jose import jwt, JWTError
@@ -7,6 +10,14 @@ from .config import settings
 # bcrypt 설정 (단방향 해싱)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# 검증 완료 토큰 LRU 캐시 크기 (같은 토큰의 반복 요청은 HMAC 서명 검증을 생략)
+VERIFIED_TOKEN_CACHE_SIZE = 1024
+
+_verified_tokens: "OrderedDict[str, dict]" = OrderedDict() # token -> claims
+_verified_tokens_lock = threading.Lock()
+_verified_token_hits = 0
+_verified_token_misses = 0
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """비밀번호 검증 (입력받은 평문 vs DB에 저장된 해시)"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -15,22 +26,70 @@ def get_password_hash(password: str) -> str:
     """비밀번호 해싱 (회원가입 시 사용)"""
     return pwd_context.hash(password)
 
-def create_access_token(subject: Union[str, Any]) -> str:
-    """JWT 액세스 토큰 생성"""
+def create_access_token(
+    subject: Union[str, Any],
+    role_id: Optional[Any] = None,
+    permission_version: Optional[str] = None
+) -> str:
+    """
+    JWT 액세스 토큰 생성
+    - role_id가 주어지면 역할 ID(rid)와 권한 매트릭스 버전(pv)을 클레임에 포함합니다.
+      (RBACRoute는 계정 캐시의 현재 역할과 rid를, 현재 권한 매트릭스 버전과 pv를 비교해 하나라도 다르면 재로그인을 요구합니다.)
+    """
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     # Payload 구성 (sub: 사용자 ID)
     to_encode = {"exp": expire, "sub": str(subject)}
+    if role_id is not None:
+        to_encode["rid"] = str(role_id)
+        to_encode["pv"] = permission_version
     
     # 서명 (Signing)
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[str]:
-    """토큰 검증 및 사용자 ID 추출 (RBACRoute에서 사용)"""
+def decode_access_token(token: str) -> Optional[dict]:
+    """
+    토큰 검증 및 클레임 반환 (실패 시 None)
+    - 검증에 성공한 토큰은 LRU 캐시에 보관하고, 이후 요청은 만료 시각만 확인합니다.
+    """
+    global _verified_token_hits, _verified_token_misses
+    with _verified_tokens_lock:
+        claims = _verified_tokens.get(token)
+        if claims is not None:
+            if claims["exp"] > time.time():
+                _verified_tokens.move_to_end(token)
+                _verified_token_hits += 1
+                return claims
+            del _verified_tokens[token] # 만료된 토큰 제거
+        _verified_token_misses += 1
+
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        return user_id
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+    if not isinstance(claims.get("exp"), (int, float)):
+        return claims # 만료 시각이 없는 토큰은 캐시하지 않음
+
+    with _verified_tokens_lock:
+        _verified_tokens[token] = claims
+        _verified_tokens.move_to_end(token)
+        while len(_verified_tokens) > VERIFIED_TOKEN_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    return claims
+
+def verified_token_cache_stats() -> dict:
+    """검증 완료 토큰 캐시 상태 및 hit/miss 카운터를 반환합니다."""
+    with _verified_tokens_lock:
+        lookups = _verified_token_hits + _verified_token_misses
+        return {
+            "size": len(_verified_tokens),
+            "hits": _verified_token_hits,
+            "misses": _verified_token_misses,
+            "hit_ratio": (_verified_token_hits / lookups) if lookups else None
+        }
+
+def verify_token(token: str) -> Optional[str]:
+    """토큰 검증 및 사용자 ID 추출"""
+    claims = decode_access_token(token)
+    return claims.get("sub") if claims else None
\ No newline at end of file
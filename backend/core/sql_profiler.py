@@ -0,0 +1,212 @@
+# backend/core/sql_profiler.py
+#
+# 요청 단위 SQL 프로파일러를 정의합니다.
+# - SQLAlchemy before/after_cursor_execute 이벤트로 요청마다 쿼리 수, DB 시간, 반복 쿼리 지문을 기록합니다.
+# - 응답에 Server-Timing 헤더(db, app)를 추가합니다. (브라우저 개발자 도구 Network > Timing에서 확인 가능)
+# - 같은 지문의 쿼리가 임계값 이상 반복되면 N+1 의심으로 경고를 출력합니다.
+# - 테스트/스크립트에서 쿼리 예산을 고정할 수 있도록 query_budget() 검사 헬퍼를 제공합니다.
+#
+
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 프로파일러 사용 여부 (비활성 시 미들웨어가 요청을 그대로 통과시킵니다)
+SQL_PROFILER_ENABLED = os.getenv("SQL_PROFILER", "true").lower() in ("1", "true", "yes")
+
+# 한 요청에서 같은 지문의 쿼리가 이 횟수 이상 실행되면 N+1 의심으로 봅니다.
+N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "10"))
+
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)") # IN (?, ?, ?) -> IN (?)
+_POSTCOMPILE = re.compile(r"\(?\[POSTCOMPILE_\w+\]\)?") # 확장 전 IN 파라미터
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """바인딩 값과 IN 목록 길이를 무시한 쿼리 지문 (같은 모양의 쿼리는 같은 지문)"""
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _POSTCOMPILE.sub("(?)", normalized)
+    return _IN_LIST.sub("(?)", normalized)
+
+
+class QueryProfile:
+    """한 요청(또는 검사 블록)에서 실행된 쿼리 기록"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.fingerprints: Counter = Counter()
+        self.started = time.perf_counter()
+        self._lock = threading.Lock() # 스레드풀/aiosqlite 스레드에서 동시에 기록될 수 있음
+
+    def record(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.statements += 1
+            self.db_seconds += seconds
+            self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[tuple]:
+        """임계값 이상 반복된 (지문, 횟수) 목록 (많은 순)"""
+        with self._lock:
+            return [(fp, n) for fp, n in self.fingerprints.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (db: 쿼리 시간/수, app: 요청 처리 전체 시간)"""
+        app_ms = (time.perf_counter() - self.started) * 1000
+        return (
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.statements} queries", '
+            f"app;dur={app_ms:.2f}"
+        )
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "label": self.label,
+                "statements": self.statements,
+                "db_ms": round(self.db_seconds * 1000, 3),
+                "top": self.fingerprints.most_common(5)
+            }
+
+
+# 현재 요청의 프로파일 (요청 밖에서는 None → 기록하지 않음)
+# - 스레드풀/run_sync 실행 시에도 컨텍스트가 복사되므로 같은 QueryProfile 객체에 기록됩니다.
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("sql_profile", default=None)
+
+# 요청 처리가 끝날 때마다 호출되는 관찰자 (query_budget 검사용)
+_observers: List[Callable[[QueryProfile], None]] = []
+_observers_lock = threading.Lock()
+
+
+def current_profile() -> Optional[QueryProfile]:
+    return _current_profile.get()
+
+
+# ============================================================
+# SQLAlchemy 이벤트 (모든 엔진: 쓰기/읽기/비동기 읽기의 sync_engine 포함)
+# ============================================================
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    started = conn.info.get("query_started")
+    if profile is None or not started:
+        return
+    profile.record(statement, time.perf_counter() - started.pop())
+
+
+# ============================================================
+# 미들웨어
+# ============================================================
+
+class SQLProfilerMiddleware:
+    """
+    요청마다 QueryProfile을 만들어 쿼리를 기록하고, 응답 시작 시 Server-Timing 헤더를 추가하는 ASGI 미들웨어.
+    - 스트리밍 응답은 헤더 전송 시점까지의 쿼리만 헤더에 반영됩니다. (N+1 검사는 응답 완료 후 전체 기준)
+    """
+
+    def __init__(self, app, threshold: int = N_PLUS_ONE_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not SQL_PROFILER_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile(f"{scope['method']} {scope['path']}")
+        token = _current_profile.set(profile)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+            _finish(profile, self.threshold)
+
+
+def _finish(profile: QueryProfile, threshold: int) -> None:
+    """요청 종료 처리: N+1 의심 쿼리 경고 출력 및 관찰자 통지"""
+    for statement, count in profile.repeated(threshold):
+        print(f"[SQL N+1] {profile.label}: {count}x {statement[:200]}")
+    with _observers_lock:
+        observers = list(_observers)
+    for observer in observers:
+        observer(profile)
+
+
+# ============================================================
+# 테스트 헬퍼
+# ============================================================
+
+@contextmanager
+def collect_profiles():
+    """
+    블록 안에서 처리가 끝난 요청들의 QueryProfile을 순서대로 모읍니다. (벤치마크/검사 스크립트용)
+
+    Example:
+        with collect_profiles() as profiles:
+            client.get("/api/v1/parts")
+        print(profiles[0].statements)
+    """
+    profiles: List[QueryProfile] = []
+    with _observers_lock:
+        _observers.append(profiles.append)
+    try:
+        yield profiles
+    finally:
+        with _observers_lock:
+            _observers.remove(profiles.append)
+
+
+@contextmanager
+def query_budget(max_statements: int, max_repeats: Optional[int] = None):
+    """
+    블록 안에서 처리된 각 요청(및 블록에서 직접 실행한 쿼리)의 쿼리 수가 예산을 넘으면 AssertionError를 발생시킵니다.
+    - TestClient 요청은 미들웨어가 만든 요청별 프로파일로, 직접 호출한 CRUD 함수는 블록 프로파일로 검사합니다.
+
+    Args:
+        max_statements (int): 요청당 허용 쿼리 수.
+        max_repeats (Optional[int]): 같은 지문 쿼리의 허용 반복 횟수. (N+1 고정용)
+
+    Example:
+        with query_budget(3):
+            client.get("/api/v1/parts/000001/M001")
+    """
+    block = QueryProfile("query_budget block")
+    with collect_profiles() as profiles:
+        token = _current_profile.set(block)
+        try:
+            yield profiles
+        finally:
+            _current_profile.reset(token)
+
+    errors = []
+    for profile in ([block] if block.statements else []) + profiles:
+        if profile.statements > max_statements:
+            errors.append(f"{profile.label}: {profile.statements} queries (budget {max_statements})")
+        if max_repeats is not None:
+            for statement, count in profile.repeated(max_repeats + 1):
+                errors.append(f"{profile.label}: {count}x repeated (budget {max_repeats}) {statement[:200]}")
+    if errors:
+        details = "\n".join(f"  {profile.summary()}" for profile in ([block] if block.statements else []) + profiles)
+        raise AssertionError("query budget exceeded:\n  " + "\n  ".join(errors) + "\n" + details)
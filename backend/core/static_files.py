@@ -0,0 +1,257 @@
+# backend/core/static_files.py
+#
+# 정적 파일(/static, /assets) 제공 핸들러를 정의합니다.
+# - 빌드 시 만들어 둔 사전 압축 파일(.br/.gz)이 있으면 Accept-Encoding에 맞춰 그대로 보냅니다. (요청마다 압축하지 않음)
+# - 콘텐츠 해시 지문이 붙은 URL(js/common.<hash>.js)은 원본 파일로 연결하고 Cache-Control: immutable로 응답합니다.
+# - 지문 없는 URL은 no-cache(ETag/Last-Modified 재검증)로 응답하므로 ES 모듈 상대 import 등 기존 경로도 그대로 동작합니다.
+# - 템플릿의 url_for('static', path=...)는 install_static_url_for()로 지문 URL을 생성합니다.
+# - 사전 압축 파일 생성: python tmp/build_static.py
+#
+
+import hashlib
+import os
+import posixpath
+import re
+import stat
+import threading
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import anyio
+from jinja2 import pass_context
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.routing import Mount
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from backend.core.compression import COMPRESSION_MIN_SIZE, brotli, compress, encodings_for, is_compressible
+from backend.core.http_cache import REVALIDATE
+
+# 지문 URL 응답의 캐시 정책 (내용이 바뀌면 URL이 바뀌므로 1년간 재검증 없이 사용)
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# 사전 압축 파일 확장자
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+# 콘텐츠 해시 길이 (sha256 16진수 앞부분)
+FINGERPRINT_LENGTH = 12
+
+# "css/style.0123456789ab.css" → stem="css/style", digest="0123456789ab", ext=".css"
+_FINGERPRINTED = re.compile(rf"^(?P<stem>.+)\.(?P<digest>[0-9a-f]{{{FINGERPRINT_LENGTH}}})(?P<ext>\.[^./\\]+)$")
+
+
+class _ResolvedFile(NamedTuple):
+    """요청 경로를 해석한 결과 (실제로 보낼 파일과 헤더 정보)"""
+    full_path: str
+    stat_result: os.stat_result
+    media_type: str
+    encoding: Optional[str] # 사전 압축 파일을 보내면 "br"/"gzip"
+    cache_control: str
+    vary: bool # 인코딩별 표현이 있을 수 있는 형식인지 여부
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    사전 압축 파일과 콘텐츠 해시 지문 URL을 지원하는 StaticFiles.
+    - 원본보다 오래된 .br/.gz 파일(원본 수정 후 재빌드 안 함)은 무시합니다. 이 경우 CompressionMiddleware가 요청 시 압축합니다.
+    - 지문 해시는 (mtime, 크기)가 바뀔 때만 다시 계산합니다. (서버 실행 중 파일을 수정해도 새 URL이 생성됨)
+    - 디렉터리/html 모드/404 처리는 StaticFiles 기본 동작을 따릅니다.
+
+    Example:
+        app.mount("/static", PrecompressedStaticFiles(directory="frontend/static"), name="static")
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._digests: Dict[str, Tuple[int, int, str]] = {} # full_path -> (mtime_ns, size, digest)
+        self._digests_lock = threading.Lock()
+
+    # ============================================================
+    # 콘텐츠 해시 지문
+    # ============================================================
+
+    def digest(self, path: str) -> Optional[str]:
+        """정적 파일의 콘텐츠 해시 (파일이 없으면 None)"""
+        full_path, stat_result = self.lookup_path(path)
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            return None
+
+        key = (stat_result.st_mtime_ns, stat_result.st_size)
+        with self._digests_lock:
+            cached = self._digests.get(full_path)
+        if cached is not None and cached[:2] == key:
+            return cached[2]
+
+        with open(full_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:FINGERPRINT_LENGTH]
+        with self._digests_lock:
+            self._digests[full_path] = (*key, digest)
+        return digest
+
+    def fingerprint(self, path: str) -> str:
+        """
+        URL 경로에 콘텐츠 해시를 붙입니다. (파일이 없거나 확장자가 없으면 그대로 반환)
+
+        Example:
+            "/js/common.js" -> "/js/common.3f2a9c01b4de.js"
+        """
+        stem, ext = posixpath.splitext(path)
+        if not ext:
+            return path
+        digest = self.digest(os.path.normpath(path.lstrip("/")))
+        if digest is None:
+            return path
+        return f"{stem}.{digest}{ext}"
+
+    # ============================================================
+    # 요청 처리
+    # ============================================================
+
+    async def get_response(self, path: str, scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope) # 405
+
+        request_headers = Headers(scope=scope)
+        try:
+            resolved = await anyio.to_thread.run_sync(self._resolve, path, request_headers.get("accept-encoding", ""))
+        except OSError:
+            resolved = None # 권한/경로 길이 오류 등은 기본 처리(401/404)에 맡김
+        if resolved is None:
+            return await super().get_response(path, scope)
+
+        headers = {"Cache-Control": resolved.cache_control}
+        if resolved.vary:
+            headers["Vary"] = "Accept-Encoding"
+        if resolved.encoding is not None:
+            headers["Content-Encoding"] = resolved.encoding
+
+        # ETag/Last-Modified는 실제로 보내는 파일 기준 (인코딩별 표현마다 ETag가 다름)
+        response = FileResponse(
+            resolved.full_path,
+            stat_result=resolved.stat_result,
+            media_type=resolved.media_type,
+            headers=headers
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _resolve(self, path: str, accept_encoding: str) -> Optional[_ResolvedFile]:
+        """요청 경로 → 원본 파일(지문 제거) → 사전 압축 파일 선택 (파일이 아니면 None)"""
+        cache_control = REVALIDATE
+        full_path, stat_result = self.lookup_path(path)
+        if stat_result is None:
+            match = _FINGERPRINTED.match(path)
+            if match is None:
+                return None
+            original = match["stem"] + match["ext"]
+            full_path, stat_result = self.lookup_path(original)
+            if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+                return None
+            # 해시가 다르면 이전 버전 페이지가 요청한 URL이므로 현재 파일을 재검증 조건으로 제공
+            if self.digest(original) == match["digest"]:
+                cache_control = IMMUTABLE
+        if not stat.S_ISREG(stat_result.st_mode):
+            return None
+
+        media_type = guess_type(full_path)[0] or "text/plain"
+        compressible = is_compressible(media_type)
+        if compressible:
+            for encoding in encodings_for(accept_encoding):
+                try:
+                    sibling_stat = os.stat(full_path + PRECOMPRESSED_SUFFIXES[encoding])
+                except OSError:
+                    continue
+                if sibling_stat.st_mtime_ns >= stat_result.st_mtime_ns: # 원본 수정 후 재빌드하지 않은 파일은 무시
+                    return _ResolvedFile(
+                        full_path + PRECOMPRESSED_SUFFIXES[encoding], sibling_stat,
+                        media_type, encoding, cache_control, True
+                    )
+        return _ResolvedFile(full_path, stat_result, media_type, None, cache_control, compressible)
+
+
+# ============================================================
+# 템플릿 url_for 연동
+# ============================================================
+
+def _static_mount(app, name: str) -> Optional[PrecompressedStaticFiles]:
+    for route in app.routes:
+        if isinstance(route, Mount) and route.name == name and isinstance(route.app, PrecompressedStaticFiles):
+            return route.app
+    return None
+
+
+def install_static_url_for(templates) -> None:
+    """
+    템플릿의 url_for를 감싸 PrecompressedStaticFiles 마운트의 경로에 콘텐츠 해시 지문을 붙입니다.
+    - url_for('static', path='/js/common.js') → /static/js/common.<hash>.js
+    - 다른 라우트 이름이나 일반 StaticFiles 마운트는 기존 url_for와 같습니다.
+
+    Args:
+        templates (Jinja2Templates): 템플릿 객체.
+    """
+    original = templates.env.globals["url_for"]
+
+    @pass_context
+    def url_for(context: dict, name: str, /, **path_params):
+        path = path_params.get("path")
+        if path is not None:
+            static_files = _static_mount(context["request"].app, name)
+            if static_files is not None:
+                path_params["path"] = static_files.fingerprint(path)
+        return original(context, name, **path_params)
+
+    templates.env.globals["url_for"] = url_for
+
+
+# ============================================================
+# 빌드: 사전 압축 파일 생성
+# ============================================================
+
+def precompress_directory(directory: Path, min_size: int = COMPRESSION_MIN_SIZE, clean: bool = False) -> List[dict]:
+    """
+    디렉터리의 텍스트 계열 정적 파일마다 최고 압축 수준의 .gz(및 brotli 모듈이 있으면 .br) 파일을 만듭니다.
+    - 최신 압축 파일이 이미 있으면 건너뜁니다.
+    - 압축해도 원본보다 충분히 작지 않으면(90% 이상) 만들지 않습니다.
+
+    Args:
+        directory (Path): 정적 파일 디렉터리.
+        min_size (int): 이 크기 미만의 파일은 압축하지 않습니다.
+        clean (bool): True이면 기존 .br/.gz 파일을 지우기만 합니다.
+
+    Returns:
+        List[dict]: 파일별 결과 [{"path", "size", "gzip", "br"}] (생성/유지한 압축 파일 크기, 없으면 None)
+    """
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    levels = {"gzip": 9, "br": 11}
+    results = []
+
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file() or path.suffix in (".br", ".gz"):
+            continue
+        media_type = guess_type(str(path))[0] or ""
+        if not is_compressible(media_type):
+            continue
+
+        source_stat = path.stat()
+        result = {"path": path.relative_to(directory).as_posix(), "size": source_stat.st_size, "gzip": None, "br": None}
+        for encoding in ("gzip", "br"):
+            sibling = path.with_name(path.name + PRECOMPRESSED_SUFFIXES[encoding])
+            if clean or source_stat.st_size < min_size or encoding not in encodings:
+                if clean and sibling.exists():
+                    sibling.unlink()
+                continue
+            if sibling.exists() and sibling.stat().st_mtime_ns >= source_stat.st_mtime_ns:
+                result[encoding] = sibling.stat().st_size
+                continue
+
+            data = compress(path.read_bytes(), encoding, levels[encoding])
+            if len(data) >= source_stat.st_size * 0.9:
+                if sibling.exists():
+                    sibling.unlink() # 오래된 압축 파일이 원본 대신 나가지 않도록 삭제
+                continue
+            sibling.write_bytes(data)
+            result[encoding] = len(data)
+        results.append(result)
+    return results
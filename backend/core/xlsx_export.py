@@ -0,0 +1,221 @@
+# backend/core/xlsx_export.py
+#
+# 엑셀(.xlsx) 내보내기를 스트리밍 응답으로 보내기 위한 헬퍼를 정의합니다.
+# - openpyxl write_only 모드: 행은 시트별 임시 파일로 바로 기록되므로 행 수와 무관하게 메모리 사용량이 일정합니다.
+# - 통합 문서 생성/압축(zip)은 전용 작업 스레드에서 실행하고, 만들어진 바이트를 크기 제한 큐로 넘겨 청크 단위로 전송합니다.
+#   (응답 전체를 메모리나 디스크 파일로 모은 뒤 보내지 않음, Content-Length 없는 chunked 전송)
+# - 동시에 생성하는 통합 문서 수를 XLSX_EXPORT_WORKERS로 제한합니다.
+#
+
+import os
+import queue
+import re
+import threading
+from typing import Callable, Iterator, Optional, Set
+from urllib.parse import quote
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# 응답 청크 크기 / 작성 스레드가 전송보다 앞서 쌓아 둘 수 있는 최대 청크 수 (느린 클라이언트에서도 메모리 상한 ≈ 1MB)
+XLSX_CHUNK_SIZE = 64 * 1024
+XLSX_MAX_PENDING_CHUNKS = 16
+
+# 동시에 생성할 수 있는 통합 문서 수 (초과 요청은 슬롯이 빌 때까지 대기)
+XLSX_EXPORT_WORKERS = max(1, int(os.getenv("XLSX_EXPORT_WORKERS", "2")))
+_worker_slots = threading.BoundedSemaphore(XLSX_EXPORT_WORKERS)
+
+# 큐 대기 중 취소(클라이언트 연결 종료) 여부를 확인하는 주기 (초)
+_CANCEL_POLL_SECONDS = 0.5
+
+# 시트 이름 제한 (엑셀 규칙: 31자, []:*?/\ 사용 불가)
+SHEET_TITLE_MAX_LENGTH = 31
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+_INVALID_FILENAME_CHARS = re.compile(r'[\\/:*?"<>|\r\n]')
+
+_DONE = object() # 생성 완료 표시
+
+HEADER_FONT = Font(bold=True)
+NUMBER_FORMAT = "#,##0"
+
+
+class _ExportCancelled(Exception):
+    """클라이언트가 연결을 끊어 생성을 중단함"""
+
+
+class _ChunkQueueWriter:
+    """
+    wb.save()가 쓰는 바이트를 XLSX_CHUNK_SIZE 단위로 모아 큐에 넣는 쓰기 전용(seek 불가) 파일 객체.
+    - zipfile은 seek할 수 없는 출력에도 쓸 수 있으므로(data descriptor 사용) 임시 파일로 모으지 않습니다.
+    - 큐가 가득 차면(전송이 느리면) 작성 스레드가 대기합니다.
+    """
+
+    def __init__(self, chunks: queue.Queue, cancelled: threading.Event, chunk_size: int):
+        self._chunks = chunks
+        self._cancelled = cancelled
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._aborted = False
+
+    def write(self, data) -> int:
+        if self._aborted: # 중단 후 ZipFile 정리(__del__ → close)가 쓰는 나머지 바이트는 버림
+            return len(data)
+        self._buffer += data
+        while len(self._buffer) >= self._chunk_size:
+            self.put(bytes(self._buffer[:self._chunk_size]))
+            del self._buffer[:self._chunk_size]
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def finish(self) -> None:
+        if self._buffer:
+            self.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def put(self, item) -> None:
+        while True:
+            if self._cancelled.is_set():
+                self._aborted = True
+                raise _ExportCancelled()
+            try:
+                self._chunks.put(item, timeout=_CANCEL_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+
+def _discard_temp_files(wb: Workbook) -> None:
+    """생성이 중단된 경우 write_only 시트의 임시 파일을 지웁니다. (정상 저장 시에는 openpyxl이 이미 삭제)"""
+    for ws in wb.worksheets:
+        writer = getattr(ws, "_writer", None)
+        if writer is None or not os.path.exists(writer.out):
+            continue
+        try:
+            writer.close()
+            writer.cleanup()
+        except (OSError, ValueError):
+            pass
+
+
+def stream_workbook(build: Callable[[Workbook], None], chunk_size: int = XLSX_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    write_only 통합 문서를 작업 스레드에서 만들며 .xlsx 바이트를 청크 단위로 생성합니다. (StreamingResponse 본문용)
+    - build(wb)는 작업 스레드에서 실행되므로 DB 조회가 필요하면 전용 세션을 열고 닫아야 합니다.
+    - 소비하지 않고 닫히면(클라이언트 연결 종료) 작업 스레드는 다음 청크를 넣을 때 중단하고 임시 파일을 정리합니다.
+    - 생성 중 오류는 이미 응답 헤더가 전송된 뒤이므로 스트림을 중단(연결 종료)하는 방식으로 전달됩니다.
+      (존재 여부 등 검증은 응답 시작 전에 핸들러에서 끝내야 합니다)
+
+    Args:
+        build (Callable[[Workbook], None]): write_only 통합 문서에 시트와 행을 추가하는 함수.
+        chunk_size (int): 응답 청크 크기.
+
+    Yields:
+        bytes: .xlsx 파일 바이트 청크.
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=XLSX_MAX_PENDING_CHUNKS)
+    cancelled = threading.Event()
+
+    def run() -> None:
+        writer = _ChunkQueueWriter(chunks, cancelled, chunk_size)
+        wb = Workbook(write_only=True)
+        result = _DONE
+        try:
+            with _worker_slots:
+                if cancelled.is_set():
+                    return
+                build(wb)
+                wb.save(writer)
+                writer.finish()
+        except _ExportCancelled:
+            return
+        except Exception as e:
+            print(f"[XlsxExport Warning] workbook build failed: {e}")
+            result = e
+        finally:
+            _discard_temp_files(wb)
+        try:
+            writer.put(result)
+        except _ExportCancelled:
+            pass
+
+    worker = threading.Thread(target=run, name="xlsx-export", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        cancelled.set()
+
+
+# ============================================================
+# 셀/시트/파일명 헬퍼
+# ============================================================
+
+def header_cell(ws, value) -> WriteOnlyCell:
+    """굵은 글씨 헤더 셀"""
+    cell = WriteOnlyCell(ws, value=value)
+    cell.font = HEADER_FONT
+    return cell
+
+
+def number_cell(ws, value, bold: bool = False) -> WriteOnlyCell:
+    """천 단위 구분 숫자 셀"""
+    cell = WriteOnlyCell(ws, value=value)
+    cell.number_format = NUMBER_FORMAT
+    if bold:
+        cell.font = HEADER_FONT
+    return cell
+
+
+def text_cell(ws, value: Optional[str]) -> WriteOnlyCell:
+    """
+    사용자 입력 문자열 셀. '='로 시작해도 수식으로 해석하지 않고 문자열로 저장합니다. (수식 주입 방지)
+    """
+    cell = WriteOnlyCell(ws, value=value)
+    if isinstance(value, str) and value.startswith("="):
+        cell.data_type = "s"
+    return cell
+
+
+def sheet_title(name: Optional[str], used: Set[str], default: str = "Sheet") -> str:
+    """
+    엑셀 규칙에 맞는 고유한 시트 이름을 만듭니다. (금지 문자 제거, 31자 제한, 중복 시 ' (2)' 접미사)
+
+    Args:
+        name (Optional[str]): 원하는 시트 이름.
+        used (Set[str]): 이미 사용한 시트 이름 (소문자). 결과가 추가됩니다.
+        default (str): 이름이 비어 있을 때 사용할 이름.
+    """
+    base = _INVALID_SHEET_CHARS.sub(" ", name or "").strip().strip("'") or default
+    base = base[:SHEET_TITLE_MAX_LENGTH]
+    title, number = base, 1
+    while title.lower() in used:
+        number += 1
+        suffix = f" ({number})"
+        title = base[:SHEET_TITLE_MAX_LENGTH - len(suffix)] + suffix
+    used.add(title.lower())
+    return title
+
+
+def xlsx_download_headers(filename: str) -> dict:
+    """
+    .xlsx 다운로드 응답 헤더. (한글 파일명은 RFC 5987 filename*로 전달, ASCII 대체 이름 포함)
+
+    Args:
+        filename (str): 확장자를 포함한 파일명.
+    """
+    filename = _INVALID_FILENAME_CHARS.sub("_", filename).strip() or "export.xlsx"
+    fallback = filename if filename.isascii() else "export" + os.path.splitext(filename)[1]
+    return {
+        "Content-Disposition": f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}",
+        "Cache-Control": "no-store" # 다운로드 파일은 캐시하지 않음
+    }
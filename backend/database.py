@@ -1,9 +1,13 @@
 # backend/core/database.py
 import os
+import time
 from pathlib import Path
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from backend.core.metrics import registry, db_pool_checkout_seconds, db_pool_checkout_timeouts_total
 
 # 1. 절대 경로로 프로젝트 루트 찾기
 # 현재 파일: .../backend/core/database.py -> .parent(core) -> .parent(backend) -> .parent(root)
@@ -17,14 +21,36 @@ DB_DIR.mkdir(exist_ok=True)
 # 2. SQLite URL 설정
 # 리눅스 환경에서는 sqlite:////절대경로 (슬래시 4개)가 가장 안전합니다.
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}" # 비동기 읽기 경로 (aiosqlite 드라이버)
 
 # [중요] 앱 실행 시 터미널에서 이 경로가 아까 alembic이 건드린 경로와 같은지 확인하세요!
 print(f"[*] 연결된 실제 DB 경로: {DB_PATH}")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
+# 3. SQLite 런타임 프로필 (환경변수로 조정 가능)
+# - journal_mode=WAL: 쓰기 중에도 읽기가 막히지 않음 (DB 파일에 영구 저장되는 설정)
+# - synchronous=NORMAL: WAL 모드에서 안전하면서 커밋마다 fsync 하지 않음
+# - busy_timeout: 잠금 충돌 시 즉시 "database is locked" 대신 지정 시간(ms)까지 대기
+# - cache_size: 음수면 KiB 단위 페이지 캐시 크기 (연결당)
+# - mmap_size: 메모리 맵 I/O 크기 (바이트)
+# - temp_store: 임시 테이블/정렬 버퍼 위치 (MEMORY | FILE | DEFAULT)
+SQLITE_PROFILE = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")), # 64 MiB
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))), # 256 MiB
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+# 읽기 전용 연결 풀 크기 (GET 핸들러용)
+READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "8"))
+# 풀 크기를 넘는 동시 조회 시 추가로 여는 연결 수 (-1: 제한 없음)
+# - 동기 핸들러는 응답 직렬화/세션 정리 단계에서 스레드풀 슬롯을 기다리는 동안에도 연결을 잡고 있으므로,
+#   연결 수를 스레드풀보다 작게 묶으면 연결을 기다리는 스레드들과 서로 막혀 풀 타임아웃까지 멈출 수 있습니다.
+READ_POOL_MAX_OVERFLOW = int(os.getenv("DB_READ_MAX_OVERFLOW", "-1"))
+
+# 주요 조회 핸들러의 비동기 세션 사용 여부 (false면 기존 동기 세션 + 스레드풀 경로로 동작, 부하 비교용)
+ASYNC_READ_HANDLERS = os.getenv("DB_ASYNC_HANDLERS", "true").lower() in ("1", "true", "yes")
 
 # SQLite 외래키 활성화
 @event.listens_for(Engine, "connect")
@@ -33,12 +59,139 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
     cursor.execute("PRAGMA foreign_keys=ON")
     cursor.close()
 
+def apply_sqlite_profile(dbapi_connection, profile: dict, read_only: bool = False) -> None:
+    """
+    연결 단위 SQLite PRAGMA 프로필을 적용합니다.
+    - 읽기 전용 연결은 journal_mode를 바꾸지 않고 query_only로 쓰기를 차단합니다.
+    """
+    cursor = dbapi_connection.cursor()
+    if not read_only:
+        cursor.execute(f"PRAGMA journal_mode={profile['journal_mode']}")
+    cursor.execute(f"PRAGMA synchronous={profile['synchronous']}")
+    cursor.execute(f"PRAGMA busy_timeout={int(profile['busy_timeout'])}")
+    cursor.execute(f"PRAGMA cache_size={int(profile['cache_size'])}")
+    cursor.execute(f"PRAGMA mmap_size={int(profile['mmap_size'])}")
+    cursor.execute(f"PRAGMA temp_store={profile['temp_store']}")
+    if read_only:
+        cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+class _TimedCheckoutMixin:
+    """연결 풀 대기 시간(db_pool_checkout_seconds)과 대기 시간 초과 횟수를 기록하는 풀 믹스인"""
+    pool_name = "default" # 메트릭 레이블 (엔진 생성 후 지정)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            db_pool_checkout_timeouts_total.inc(pool=self.pool_name)
+            raise
+        db_pool_checkout_seconds.observe(time.perf_counter() - started, pool=self.pool_name)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate() # engine.dispose() 시 새 풀로 교체되어도 레이블 유지
+        pool.pool_name = self.pool_name
+        return pool
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+def create_writer_engine(url: str, profile: dict = SQLITE_PROFILE):
+    """
+    쓰기용 엔진을 생성합니다.
+    - 연결 1개짜리 풀이므로 쓰기 트랜잭션은 풀에서 순서대로 대기합니다. (SQLite 단일 writer와 일치)
+    """
+    writer = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=30
+    )
+    event.listen(writer, "connect", lambda conn, record: apply_sqlite_profile(conn, profile))
+    writer.pool.pool_name = "writer"
+    return writer
+
+def create_reader_engine(
+    url: str,
+    profile: dict = SQLITE_PROFILE,
+    pool_size: int = READ_POOL_SIZE,
+    max_overflow: int = READ_POOL_MAX_OVERFLOW
+):
+    """읽기 전용(query_only) 연결 풀 엔진을 생성합니다. (WAL 모드에서 쓰기와 동시에 읽기 가능)"""
+    reader = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=TimedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=30
+    )
+    event.listen(reader, "connect", lambda conn, record: apply_sqlite_profile(conn, profile, read_only=True))
+    reader.pool.pool_name = "reader"
+    return reader
+
+def create_async_reader_engine(url: str, profile: dict = SQLITE_PROFILE, pool_size: int = READ_POOL_SIZE):
+    """
+    비동기(aiosqlite) 읽기 전용 연결 풀 엔진을 생성합니다.
+    - 쿼리 대기 중 이벤트 루프를 막지 않으므로 스레드풀 슬롯을 점유하지 않습니다.
+    - 연결 대기도 이벤트 루프에서 이루어지므로 풀 크기를 그대로 동시 조회 수 상한으로 사용합니다.
+    """
+    reader = create_async_engine(
+        url,
+        poolclass=TimedAsyncAdaptedQueuePool, # aiosqlite 파일 DB 기본값(NullPool) 대신 연결 재사용
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_timeout=30
+    )
+    # PRAGMA는 동기 엔진 어댑터의 connect 이벤트에서 적용합니다.
+    event.listen(reader.sync_engine, "connect", lambda conn, record: apply_sqlite_profile(conn, profile, read_only=True))
+    reader.sync_engine.pool.pool_name = "async_reader"
+    return reader
+
+engine = create_writer_engine(SQLALCHEMY_DATABASE_URL)
+read_engine = create_reader_engine(SQLALCHEMY_DATABASE_URL)
+async_read_engine = create_async_reader_engine(ASYNC_DATABASE_URL)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
+def _collect_pool_metrics():
+    """메트릭 조회 시점의 연결 풀 상태 (사용 중 연결 수 / 풀 크기)"""
+    pools = [engine.pool, read_engine.pool, async_read_engine.sync_engine.pool]
+    return [
+        ("db_pool_connections_in_use", "gauge", "Database connections currently checked out.",
+         [({"pool": pool.pool_name}, pool.checkedout()) for pool in pools]),
+        ("db_pool_size", "gauge", "Configured database pool size (excluding overflow).",
+         [({"pool": pool.pool_name}, pool.size()) for pool in pools]),
+    ]
+
+registry.register_collector("db_pools", _collect_pool_metrics)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_read_db():
+    """조회(GET) 핸들러용 읽기 전용 세션 의존성"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    """조회 핸들러용 비동기 읽기 전용 세션(AsyncSession) 의존성"""
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -3,16 +3,26 @@ from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from core.config import templates, BASE_DIR
 
 from service.router import router as service_router
 from api.router import router as api_router
+from backend.database import async_read_engine
+from backend.core.sql_profiler import SQLProfilerMiddleware
+from backend.core.metrics import MetricsMiddleware
+from backend.core.compression import CompressionMiddleware
+from backend.core.static_files import PrecompressedStaticFiles, install_static_url_for
 
 app = FastAPI()
 
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    """종료 시 비동기(aiosqlite) 연결을 닫습니다. (연결마다 전용 스레드가 있어 닫지 않으면 프로세스가 종료되지 않음)"""
+    await async_read_engine.dispose()
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # 개발 환경
@@ -21,12 +31,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 본문 br/gzip 압축 (COMPRESSION_MIN_SIZE 이상 텍스트 응답, COMPRESSION=false로 비활성화)
+app.add_middleware(CompressionMiddleware)
+
+# 요청별 쿼리 수/DB 시간 Server-Timing 헤더 및 N+1 경고 (SQL_PROFILER=false로 비활성화)
+app.add_middleware(SQLProfilerMiddleware)
+
+# 요청 수/처리 중 요청/라우트별 지연 시간·본문 크기 메트릭 (조회: GET /api/v1/admin/metrics, 로컬 전용)
+app.add_middleware(MetricsMiddleware)
+
 
 BASE_DIR = Path(__file__).resolve().parent
 
-app.mount("/static", StaticFiles(directory=str(BASE_DIR / "frontend" / "static")), name="static")
-app.mount("/assets", StaticFiles(directory=str(BASE_DIR / "frontend" / "assets")), name="assets")
+app.mount("/static", PrecompressedStaticFiles(directory=str(BASE_DIR / "frontend" / "static")), name="static")
+app.mount("/assets", PrecompressedStaticFiles(directory=str(BASE_DIR / "frontend" / "assets")), name="assets")
 templates = Jinja2Templates(directory=str(BASE_DIR / "frontend"))
+install_static_url_for(templates)
 
 
 
@@ -5,6 +5,7 @@ from backend.database import Base
 # 기존 모델
 from .maker import Maker
 from .resources import Resources
+from .resources_tombstone import ResourcesTombstone
 from .certification import Certification
 from .machine import Machine
 from .machine_resources import MachineResources
@@ -27,6 +28,7 @@ __all__ = [
     # 기존 모델
     "Maker", 
     "Resources", 
+    "ResourcesTombstone",
     "Certification",
     "Machine",
     "MachineResources",
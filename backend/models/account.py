@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, TIMESTAMP, ForeignKey, Enum
+from sqlalchemy import Column, String, TIMESTAMP, ForeignKey, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -24,5 +24,10 @@ class Account(Base):
     # [추가] 관계 설정
     role = relationship("Role", backref="accounts")
     
+    # e_mail은 UNIQUE 제약조건의 자동 인덱스를 사용합니다.
+    __table_args__ = (
+        Index("ix_account_phone_number", "phone_number"), # 전화번호 중복 확인
+    )
+    
     def __repr__(self):
         return f"<Account(id='{self.id}', name='{self.name}')>"
\ No newline at end of file
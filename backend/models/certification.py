@@ -1,5 +1,5 @@
 # SYNEX+QUOTATION/Server/app/models/certification.py
-from sqlalchemy import Column, Integer, String, Boolean, Text, ForeignKeyConstraint, TIMESTAMP
+from sqlalchemy import Column, Integer, String, Boolean, Text, ForeignKeyConstraint, TIMESTAMP, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from backend.database import Base
@@ -36,6 +36,7 @@ class Certification(Base):
             ['resources_id', 'maker_id'],
             ['resources.id', 'resources.maker_id']
         ),
+        Index("ix_certification_resources_id_maker_id", "resources_id", "maker_id"), # 부품 ⟕ 인증 조인 (카탈로그 적재)
     )
     
     def __repr__(self):
@@ -1,6 +1,6 @@
 # app/models/detailed.py
 
-from sqlalchemy import Column, String, TIMESTAMP, Text, ForeignKey
+from sqlalchemy import Column, String, TIMESTAMP, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -25,5 +25,9 @@ class Detailed(Base):
     general = relationship("General", back_populates="detaileds")
     detailed_resources = relationship("DetailedResources", back_populates="detailed", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_detailed_general_id", "general_id"), # General 상세의 연관 문서 조회
+    )
+    
     def __repr__(self):
         return f"<Detailed(id='{self.id}', general_id='{self.general_id}')>"
\ No newline at end of file
@@ -1,8 +1,8 @@
 #app/models/general.py
 
-from sqlalchemy import Column, String, TIMESTAMP, Text
+from sqlalchemy import Column, String, TIMESTAMP, Text, Index, Integer
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 from sqlalchemy.orm import relationship
 import uuid
 from backend.database import Base
@@ -17,6 +17,8 @@ class General(Base):
     creator = Column(String(25), nullable=False)
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
     updated_at = Column(TIMESTAMP, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
+    # 수정할 때마다 1씩 증가 (ORM/Core UPDATE 모두) — updated_at은 초 단위라 같은 초 안의 연속 수정을 구분할 수 없으므로 ETag는 이 값을 사용
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=literal_column("version") + 1)
     description = Column(Text, nullable=True)
     
     # Relationships
@@ -24,5 +26,9 @@ class General(Base):
     detaileds = relationship("Detailed", back_populates="general", cascade="all, delete-orphan")
     price_compares = relationship("PriceCompare", back_populates="general", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_general_created_at_id", "created_at", "id"), # 목록: 생성일 내림차순 + Keyset
+    )
+    
     def __repr__(self):
         return f"<General(id='{self.id}', name='{self.name}')>"
\ No newline at end of file
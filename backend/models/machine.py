@@ -1,8 +1,8 @@
 # app/models/machine.py (수정 버전)
 
-from sqlalchemy import Column, String, Integer, Text, TIMESTAMP
+from sqlalchemy import Column, String, Integer, Text, TIMESTAMP, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 from sqlalchemy.orm import relationship
 import uuid
 from backend.database import Base
@@ -19,6 +19,8 @@ class Machine(Base):
     description = Column(Text, nullable=True)
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
     updated_at = Column(TIMESTAMP, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
+    # 수정할 때마다 1씩 증가 (ORM/Core UPDATE 모두) — updated_at은 초 단위라 같은 초 안의 연속 수정을 구분할 수 없으므로 ETag는 이 값을 사용
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=literal_column("version") + 1)
     
     # Relationships
     machine_resources = relationship("MachineResources", back_populates="machine", cascade="all, delete-orphan")
@@ -26,5 +28,9 @@ class Machine(Base):
     # 💡 [추가] price_compare_machine과의 관계
     price_compare_machines = relationship("PriceCompareMachine", back_populates="machine", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        Index("ix_machine_updated_at_id", "updated_at", "id"), # 목록: 수정일 내림차순 + Keyset
+    )
+    
     def __repr__(self):
         return f"<Machine(id='{self.id}', name='{self.name}')>"
\ No newline at end of file
@@ -1,5 +1,5 @@
 # app/models/machine_resources.py
-from sqlalchemy import Column, String, Integer, ForeignKeyConstraint
+from sqlalchemy import Column, String, Integer, ForeignKeyConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from backend.database import Base
@@ -55,6 +55,7 @@ class MachineResources(Base):
             ['maker_id', 'resources_id'],
             ['resources.maker_id', 'resources.id']
         ),
+        Index("ix_machine_resources_machine_id_order_index", "machine_id", "order_index"), # 견적서 자재 목록 (표시 순서 정렬)
     )
     
     def __repr__(self):
@@ -1,5 +1,5 @@
 # SYNEX+QUOTATION/Server/app/models/maker.py
-from sqlalchemy import Column, String, TIMESTAMP
+from sqlalchemy import Column, String, TIMESTAMP, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from backend.database import Base
@@ -15,5 +15,10 @@ class Maker(Base):
     # Relationships
     resources = relationship("Resources", back_populates="maker")
     
+    __table_args__ = (
+        Index("ix_maker_name", "name"), # 제조사명으로 조회 (부품 등록/중복 확인)
+        Index("ix_maker_created_at_id", "created_at", "id"), # 목록: 생성일 내림차순 + Keyset
+    )
+    
     def __repr__(self):
         return f"<Maker(id='{self.id}', name='{self.name}')>"
\ No newline at end of file
@@ -1,8 +1,8 @@
 #app/models/price_compare.py
 
-from sqlalchemy import Column, String, TIMESTAMP, Text, ForeignKey
+from sqlalchemy import Column, String, TIMESTAMP, Text, ForeignKey, Index, Integer
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 from sqlalchemy.orm import relationship
 import uuid
 from backend.database import Base
@@ -19,12 +19,22 @@ class PriceCompare(Base):
     creator = Column(String(25), nullable=False)
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
     updated_at = Column(TIMESTAMP, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
+    # 수정할 때마다 1씩 증가 (ORM/Core UPDATE 모두) — updated_at은 초 단위라 같은 초 안의 연속 수정을 구분할 수 없으므로 ETag는 이 값을 사용
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=literal_column("version") + 1)
     description = Column(Text, nullable=True)
     
     # Relationships
     general = relationship("General", back_populates="price_compares")
-    price_compare_resources = relationship("PriceCompareResources", back_populates="price_compare", cascade="all, delete-orphan")
+    # 상세 화면/엑셀 내보내기가 같은 행 순서로 Unit을 묶도록 PK 순서(장비 → Unit → 품목)로 적재 (PK 인덱스 순서와 같아 정렬 비용 없음)
+    price_compare_resources = relationship(
+        "PriceCompareResources", back_populates="price_compare", cascade="all, delete-orphan",
+        order_by="(PriceCompareResources.machine_id, PriceCompareResources.major, PriceCompareResources.minor)"
+    )
     price_compare_machines = relationship("PriceCompareMachine", back_populates="price_compare", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_price_compare_general_id", "general_id"), # General 상세의 연관 문서 조회
+    )
+    
     def __repr__(self):
         return f"<PriceCompare(id='{self.id}', general_id='{self.general_id}')>"
\ No newline at end of file
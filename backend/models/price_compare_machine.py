@@ -1,6 +1,6 @@
 # app/models/price_compare_machine.py
 
-from sqlalchemy import Column, ForeignKeyConstraint, ForeignKey
+from sqlalchemy import Column, ForeignKeyConstraint, ForeignKey, Index, TIMESTAMP
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from backend.database import Base
@@ -13,6 +13,9 @@ class PriceCompareMachine(Base):
     
     # PK, FK to machine
     machine_id = Column(UUID(as_uuid=True), ForeignKey('machine.id', ondelete="CASCADE"), primary_key=True) 
+
+    # 장비 BOM이 바뀌어 이 비교서의 해당 장비 원가 행을 다시 계산해야 하는 시점 (NULL: 최신 상태)
+    stale_since = Column(TIMESTAMP, nullable=True)
     
     # Relationships
     price_compare = relationship("PriceCompare", back_populates="price_compare_machines")
@@ -30,6 +33,7 @@ class PriceCompareMachine(Base):
             ['machine.id'],
             ondelete='CASCADE'
         ),
+        Index("ix_price_compare_machine_machine_id", "machine_id"), # 장비 삭제 시 CASCADE 대상 조회, BOM 변경 시 참조 비교서 조회 (역방향 간선)
     )
 
     def __repr__(self):
@@ -1,5 +1,5 @@
 # app/models/price_compare_resources.py
-from sqlalchemy import Column, String, Integer, Text, ForeignKeyConstraint, Float
+from sqlalchemy import Column, String, Integer, Text, ForeignKeyConstraint, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from backend.database import Base
@@ -42,6 +42,7 @@ class PriceCompareResources(Base):
             ['machine.id'],
             ondelete='CASCADE'
         ),
+        Index("ix_price_compare_resources_machine_id", "machine_id"), # 장비 삭제 시 CASCADE 대상 조회
     )
 
     def __repr__(self):
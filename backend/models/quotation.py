@@ -1,6 +1,6 @@
 # app/models/quotation.py
 
-from sqlalchemy import Column, String, Integer, Text, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, String, Integer, Text, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -32,5 +32,9 @@ class Quotation(Base):
     general = relationship("General", back_populates="quotations")
     quotation_resources = relationship("QuotationResources", back_populates="quotation", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_quotation_general_id", "general_id"), # General 상세의 연관 문서 조회
+    )
+    
     def __repr__(self):
         return f"<Quotation(id='{self.id}', title='{self.title}')>"
\ No newline at end of file
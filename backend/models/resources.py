@@ -1,5 +1,5 @@
 # SYNEX+QUOTATION/Server/app/models/resources.py (수정 후)
-from sqlalchemy import Column, String, Integer, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, String, Integer, ForeignKey, TIMESTAMP, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from backend.database import Base
@@ -28,5 +28,10 @@ class Resources(Base):
     maker = relationship("Maker", back_populates="resources")
     certification = relationship("Certification", back_populates="resource", uselist=False)
     
+    __table_args__ = (
+        # PK는 (id, maker_id) 순서이므로 제조사별 조회/정렬용 역순 인덱스 (제조사별 max(id)는 인덱스만으로 처리)
+        Index("ix_resources_maker_id_id", "maker_id", "id"),
+    )
+    
     def __repr__(self):
         return f"<Resources(id='{self.id}', maker_id='{self.maker_id}', name='{self.name}')>"
\ No newline at end of file
@@ -0,0 +1,23 @@
+# app/models/resources_tombstone.py
+from sqlalchemy import Column, Integer, String, TIMESTAMP, Index
+from sqlalchemy.sql import func
+from backend.database import Base
+
+class ResourcesTombstone(Base):
+    """삭제된 부품(Resources) 기록 (카탈로그 증분 동기화용 tombstone 로그)"""
+    __tablename__ = "resources_tombstone"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # 삭제된 부품 키 (FK 없음: 원본 행은 이미 삭제됨)
+    resources_id = Column(String(6), nullable=False)
+    maker_id = Column(String(4), nullable=False)
+    
+    deleted_at = Column(TIMESTAMP, server_default=func.current_timestamp(), nullable=False)
+    
+    __table_args__ = (
+        Index("ix_resources_tombstone_deleted_at", "deleted_at"),
+    )
+    
+    def __repr__(self):
+        return f"<ResourcesTombstone(maker_id='{self.maker_id}', resources_id='{self.resources_id}', deleted_at='{self.deleted_at}')>"
@@ -6,6 +6,9 @@
 let pageMode = 'create'; // create, view
 let generalId = null;
 
+// 연관 문서 한 번에 조회할 개수 (API 최대값)
+const RELATED_PAGE_SIZE = 1000;
+
 // ============================================================================
 // 페이지 초기화
 // ============================================================================
@@ -104,11 +107,20 @@ async function loadRelationsData(id) {
     tableContainer.innerHTML = '';
     
     try {
-        const response = await fetch(`/api/v1/quotation/general/${id}?include_relations=true`);
-        if (!response.ok) throw new Error('연관 데이터 로드 실패');
-        
-        const data = await response.json();
-        const items = data.related_documents || data.items || [];
+        // 연관 문서는 페이지 단위로 내려오므로 related_next_cursor가 없을 때까지 이어서 조회
+        const items = [];
+        let data = {};
+        let cursor = null;
+        do {
+            const params = new URLSearchParams({ include_relations: 'true', related_limit: RELATED_PAGE_SIZE });
+            if (cursor) params.set('related_cursor', cursor);
+            const response = await fetch(`/api/v1/quotation/general/${id}?${params}`);
+            if (!response.ok) throw new Error('연관 데이터 로드 실패');
+            
+            data = await response.json();
+            items.push(...(data.related_documents || data.items || []));
+            cursor = data.related_next_cursor;
+        } while (cursor);
 
         // [보완] 이미지(image_ce0fb6.png)의 구분값인 '비교 견적서'를 포함하여 체크
         const hasPriceCompare = items.some(item => 
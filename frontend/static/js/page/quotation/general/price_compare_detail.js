@@ -296,6 +296,17 @@ function initUIByMode() {
     } else {
         notes.contentEditable = "false";
         footer.innerHTML = `<button class="btn btn-secondary btn-lg" onclick="window.history.back()">목록으로</button>
+                            <button class="btn btn-success btn-lg" onclick="downloadExcel()">엑셀 다운로드</button>
                             <button class="btn btn-primary btn-lg" onclick="location.href='?mode=edit'">수정하기</button>`;
     }
-}
\ No newline at end of file
+}
+
+/**
+ * 엑셀 다운로드 (화면의 관리비 비율을 그대로 적용)
+ */
+function downloadExcel() {
+    const mgmtRate = parseFloat(document.querySelector('.mgmt-rate')?.textContent) || 0;
+    const profitRate = parseFloat(document.querySelector('.profit-rate')?.textContent) || 0;
+    const params = new URLSearchParams({ management_rate: mgmtRate, profit_rate: profitRate });
+    window.location.href = `/api/v1/quotation/price_compare/${priceCompareId}/export?${params}`;
+}
@@ -1890,19 +1890,21 @@ async function loadImportMachines() {
 
     try {
         const results = [];
-        let skip = 0;
+        let cursor = null;
         const limit = 100;
 
+        // next_cursor를 따라 페이지를 이어서 조회 (총 개수 계산 생략)
         while (true) {
-            const resp = await fetch(`/api/v1/quotation/machine/search?search=${encodeURIComponent(query)}&skip=${skip}&limit=${limit}`);
+            let url = `/api/v1/quotation/machine/search?search=${encodeURIComponent(query)}&limit=${limit}&count=none`;
+            if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
+            const resp = await fetch(url);
             if (!resp.ok) throw new Error('템플릿 목록 조회 실패');
             const data = await resp.json();
             const items = data.items || [];
             results.push(...items);
 
-            const total = data.total || 0;
-            skip += limit;
-            if (skip >= total) break;
+            cursor = data.next_cursor;
+            if (!cursor) break;
         }
 
         // 템플릿만 필터링: [TEMPLATE] prefix & 중복 정리된 [DUPLICATE] 제외
@@ -2,7 +2,7 @@
 //
 // 장비 견적서 상세 페이지(machine_detail.html)의 클라이언트 측 JavaScript 로직을 정의합니다.
 // - URL에서 견적서 ID를 추출하여 해당 견적서의 상세 정보를 API로 로드합니다.
-// - 로드된 데이터를 화면에 렌더링하고, 관련 버튼(목록, 수정, PDF 다운로드)의 동작을 정의합니다.
+// - 로드된 데이터를 화면에 렌더링하고, 관련 버튼(목록, 수정, 엑셀/PDF 다운로드)의 동작을 정의합니다.
 //
 
 // --- 전역 변수 선언 및 초기화 ---
@@ -236,6 +236,11 @@ function editMachine() {
     window.location.href = `/service/quotation/machine/form?mode=edit&id=${machineId}`; // 수정 모드 페이지로 이동
 }
 
+// 엑셀 다운로드 (서버에서 .xlsx 파일을 스트리밍으로 생성)
+function downloadExcel() {
+    window.location.href = `/api/v1/quotation/machine/${machineId}/export`; // Content-Disposition: attachment 이므로 페이지 이동 없이 다운로드
+}
+
 // PDF 다운로드 (미구현)
 function downloadPDF() {
     alert('PDF 다운로드 기능은 구현 예정입니다.'); // 기능 구현 예정 알림
@@ -8,12 +8,16 @@ from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 # backend 폴더의 설정을 그대로 가져옵니다.
 from backend.core.config import templates, BASE_DIR
 from backend.service.router import router as service_router
 from backend.api.router import router as api_router
+from backend.database import async_read_engine
+from backend.core.sql_profiler import SQLProfilerMiddleware
+from backend.core.metrics import MetricsMiddleware
+from backend.core.compression import CompressionMiddleware
+from backend.core.static_files import PrecompressedStaticFiles
 
 # =======================================================================================================================================
 # FAST API APPLICATION INITIALIZING SECTION
@@ -30,6 +34,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 본문 br/gzip 압축 (COMPRESSION_MIN_SIZE 이상 텍스트 응답, COMPRESSION=false로 비활성화)
+app.add_middleware(CompressionMiddleware)
+
+# 요청별 쿼리 수/DB 시간 Server-Timing 헤더 및 N+1 경고 (SQL_PROFILER=false로 비활성화)
+app.add_middleware(SQLProfilerMiddleware)
+
+# 요청 수/처리 중 요청/라우트별 지연 시간·본문 크기 메트릭 (조회: GET /api/v1/admin/metrics, 로컬 전용)
+app.add_middleware(MetricsMiddleware)
+
 # =======================================================================================================================================
 # DIR SET SECTION
 # =======================================================================================================================================
@@ -38,8 +51,8 @@ app.add_middleware(
 sys.path.insert(0, str(BASE_DIR))
 
 FRONTEND_DIR = BASE_DIR / "frontend"
-app.mount("/static", StaticFiles(directory=str(FRONTEND_DIR / "static")), name="static")
-app.mount("/assets", StaticFiles(directory=str(FRONTEND_DIR / "assets")), name="assets")
+app.mount("/static", PrecompressedStaticFiles(directory=str(FRONTEND_DIR / "static")), name="static")
+app.mount("/assets", PrecompressedStaticFiles(directory=str(FRONTEND_DIR / "assets")), name="assets")
 
 # templates는 backend.core.config에서 이미 정의된 것을 사용하므로 중복 선언하지 않아도 됩니다.
 
@@ -50,6 +63,11 @@ app.mount("/assets", StaticFiles(directory=str(FRONTEND_DIR / "assets")), name="
 app.include_router(api_router, prefix="/api")
 app.include_router(service_router, prefix="/service", tags=["service"])
 
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    """종료 시 비동기(aiosqlite) 연결을 닫습니다. (연결마다 전용 스레드가 있어 닫지 않으면 프로세스가 종료되지 않음)"""
+    await async_read_engine.dispose()
+
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
     return templates.TemplateResponse("template/home.html", {"request": request})
@@ -66,9 +84,11 @@ async def register_page(request: Request):
 # PY WEB VIEW, SET AND RUN SECTION
 # =======================================================================================================================================
 
+# log_level="info"를 유지하여 DB 연결 경로 등을 터미널에서 계속 모니터링합니다.
+server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=8000, log_level="info"))
+
 def run_fastapi():
-    # log_level="info"를 유지하여 DB 연결 경로 등을 터미널에서 계속 모니터링합니다.
-    uvicorn.run(app, host="127.0.0.1", port=8000, log_level="info")
+    server.run()
 
 if __name__ == "__main__":
     # 서버 기동
@@ -85,4 +105,8 @@ if __name__ == "__main__":
     )
     
     # 리눅스 환경에서 GTK 에러 방지를 위해 GUI 엔진 자동 선택을 맡깁니다.
-    webview.start(gui='qt')
\ No newline at end of file
+    webview.start(gui='qt')
+
+    # 창이 닫히면 서버를 정상 종료하여 shutdown 이벤트(비동기 DB 연결 정리)를 실행합니다.
+    server.should_exit = True
+    t.join(timeout=10)
\ No newline at end of file
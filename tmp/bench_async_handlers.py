@@ -0,0 +1,159 @@
+# bench_async_handlers.py
+#
+# 목적:
+# - 주요 조회 핸들러(부품 목록/검색, 장비 상세)의 비동기 세션 경로와 동기 세션(스레드풀) 경로를
+#   동시 부하 상황에서 비교합니다.
+#   1) sync: DB_ASYNC_HANDLERS=false (기존 방식, 요청마다 스레드풀 슬롯 점유)
+#   2) async: DB_ASYNC_HANDLERS=true (AsyncSession + aiosqlite, 쿼리 대기 중 이벤트 루프 양보)
+# - 배경 부하로 동기 핸들러(장비 목록 대량 조회)를 스레드풀 크기보다 많이 동시에 호출해 슬롯을 고갈시키고,
+#   그동안 주요 조회 핸들러의 처리량/지연 시간을 측정합니다.
+#
+# 사용:
+#   python tmp/bench_async_handlers.py [측정 시간(초)] [스레드풀 크기]
+#
+# 주의:
+# - 실제 DB를 건드리지 않도록 임시 SQLite 파일 DB를 만들어 측정합니다.
+# - 설정은 import 시점에 읽히므로 모드별로 하위 프로세스를 실행합니다.
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+MAKER_COUNT = 20
+PARTS_PER_MAKER = 500
+MACHINE_COUNT = 200
+BOM_SIZE = 60 # 장비당 자재 수
+FOREGROUND_CLIENTS = 8 # 주요 조회 핸들러 동시 요청 수
+BACKGROUND_CLIENTS = 24 # 배경 부하(동기 핸들러) 동시 요청 수
+
+
+def seed(path: str) -> None:
+    from sqlalchemy import create_engine, insert
+    from backend.database import Base
+    from backend.models import Machine, MachineResources, Maker, Resources
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(0)
+    with engine.begin() as conn:
+        conn.execute(insert(Maker), [{"id": f"M{m:03d}", "name": f"Maker {m}"} for m in range(MAKER_COUNT)])
+        conn.execute(insert(Resources), [
+            {
+                "id": f"{p:06d}", "maker_id": f"M{m:03d}", "major": f"MAJ{p % 9}", "minor": f"MIN{p % 31}",
+                "name": f"Part {m}-{p} 모터", "unit": "ea", "solo_price": p, "display_order": p
+            }
+            for m in range(MAKER_COUNT) for p in range(PARTS_PER_MAKER)
+        ])
+        machine_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(MACHINE_COUNT)]
+        conn.execute(insert(Machine), [
+            {"id": machine_id, "name": f"Machine {i}", "creator": "bench"} for i, machine_id in enumerate(machine_ids)
+        ])
+        rows = []
+        for machine_id in machine_ids:
+            for order, p in enumerate(rng.sample(range(MAKER_COUNT * PARTS_PER_MAKER), BOM_SIZE)):
+                rows.append({
+                    "machine_id": machine_id, "maker_id": f"M{p // PARTS_PER_MAKER:03d}",
+                    "resources_id": f"{p % PARTS_PER_MAKER:06d}", "solo_price": p, "quantity": 1, "order_index": order
+                })
+        conn.execute(insert(MachineResources), rows)
+    engine.dispose()
+    with open(path + ".ids", "w") as f:
+        f.write("\n".join(str(machine_id) for machine_id in machine_ids))
+
+
+async def run_mode(path: str, duration: float, threads: int) -> None:
+    """하위 프로세스에서 실행: 임시 DB에 엔진을 다시 바인딩하고 ASGI 앱에 직접 부하를 줍니다."""
+    import anyio.to_thread
+    import httpx
+    from fastapi import FastAPI
+    import backend.database as database
+
+    database.SessionLocal.configure(bind=database.create_writer_engine(f"sqlite:///{path}"))
+    database.ReadSessionLocal.configure(bind=database.create_reader_engine(f"sqlite:///{path}"))
+    async_engine = database.create_async_reader_engine(f"sqlite+aiosqlite:///{path}")
+    database.AsyncReadSessionLocal.configure(bind=async_engine)
+    from backend.api.router import router as api_router
+
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api")
+    anyio.to_thread.current_default_thread_limiter().total_tokens = threads
+
+    with open(path + ".ids") as f:
+        machine_ids = f.read().split()
+
+    stop = asyncio.Event()
+    stats = {"fg": [], "fg_errors": 0, "bg": 0}
+
+    async def foreground(client: httpx.AsyncClient, n: int):
+        rng = random.Random(n)
+        while not stop.is_set():
+            kind = rng.randrange(3)
+            started = time.perf_counter()
+            if kind == 0:
+                r = await client.get("/api/v1/parts", params={"limit": 50, "maker_id": f"M{rng.randrange(MAKER_COUNT):03d}"})
+            elif kind == 1:
+                r = await client.post("/api/v1/parts/search", json={"query": f"Part {rng.randrange(MAKER_COUNT)}-", "search_fields": ["name"], "limit": 20})
+            else:
+                r = await client.get(f"/api/v1/quotation/machine/{rng.choice(machine_ids)}")
+            if r.status_code == 200:
+                stats["fg"].append(time.perf_counter() - started)
+            else:
+                stats["fg_errors"] += 1
+
+    async def background(client: httpx.AsyncClient):
+        while not stop.is_set():
+            r = await client.get("/api/v1/quotation/machine/", params={"limit": 100, "count": "exact"})
+            if r.status_code == 200:
+                stats["bg"] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        await client.get("/api/v1/parts", params={"limit": 1}) # 카탈로그 적재 (측정 제외)
+        tasks = [asyncio.create_task(background(client)) for _ in range(BACKGROUND_CLIENTS)]
+        tasks += [asyncio.create_task(foreground(client, n)) for n in range(FOREGROUND_CLIENTS)]
+        await asyncio.sleep(duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+    await async_engine.dispose() # aiosqlite 연결 스레드 종료 (미종료 시 프로세스가 끝나지 않음)
+
+    latencies = sorted(stats["fg"]) or [0.0]
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    label = "async" if database.ASYNC_READ_HANDLERS else "sync"
+    print(
+        f"{label:<6} {len(stats['fg']) / duration:>10.1f} {p50:>8.2f} {p99:>8.2f} "
+        f"{stats['fg_errors']:>8} {stats['bg'] / duration:>8.1f}"
+    )
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        asyncio.run(run_mode(sys.argv[2], float(sys.argv[3]), int(sys.argv[4])))
+        return
+
+    duration = sys.argv[1] if len(sys.argv) > 1 else "5"
+    threads = sys.argv[2] if len(sys.argv) > 2 else "8"
+    path = os.path.join(tempfile.mkdtemp(), "bench_async.db")
+    seed(path)
+
+    print(f"{'mode':<6} {'fg req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'fg_errs':>8} {'bg req/s':>8}")
+    for flag in ("false", "true"):
+        env = dict(os.environ, DB_ASYNC_HANDLERS=flag)
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", path, duration, threads],
+            env=env, capture_output=True, text=True
+        )
+        # 결과 행만 출력합니다. (DB 경로 안내 등 import 시 출력 제외)
+        lines = [line for line in result.stdout.splitlines() if line.startswith(("sync", "async"))]
+        print("\n".join(lines) or result.stderr)
+
+
+if __name__ == "__main__":
+    main()
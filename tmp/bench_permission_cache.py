@@ -0,0 +1,119 @@
+# bench_permission_cache.py
+#
+# 목적:
+# - RBACRoute 인가 검사 비용을 권한 캐시 적용 전/후로 비교합니다.
+#   1) uncached: 기존 방식 (요청마다 Account 조회 + role_permission ⋈ Permission 조회)
+#   2) cold: 매 검사 전 캐시 무효화 (매트릭스 적재 + 계정 조회)
+#   3) warm: 캐시 적재 후 반복 검사 (딕셔너리/집합 조회만)
+#
+# 사용:
+#   python tmp/bench_permission_cache.py [반복 횟수]
+#
+# 주의:
+# - 실제 DB를 건드리지 않도록 임시 SQLite 파일 DB에 역할/권한/계정을 생성해 측정합니다.
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from backend.database import Base
+from backend.models import Account, Permission, Role, role_permission
+from backend.core.permission_cache import PermissionCache
+
+RESOURCES = ["parts", "maker", "machine", "general", "account"]
+ACTIONS = ["create", "read", "update", "delete"]
+ACCOUNT_COUNT = 200
+
+
+def setup_db():
+    path = os.path.join(tempfile.mkdtemp(), "bench_rbac.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    db = Session()
+    permissions = [Permission(resource=r, action=a, description=f"{r} {a}") for r in RESOURCES for a in ACTIONS]
+    admin = Role(name="ADMIN", description="System ADMIN", permissions=permissions)
+    user = Role(name="USER", description="System USER", permissions=[p for p in permissions if p.action in ("read", "create")])
+    db.add_all([admin, user])
+    db.flush()
+    for i in range(ACCOUNT_COUNT):
+        db.add(Account(
+            id=f"user{i:04d}", pwd="x", name=f"U{i}", department="D", position="P",
+            phone_number=f"010{i:08d}", e_mail=f"user{i}@example.com",
+            role_id=(admin if i % 10 == 0 else user).id
+        ))
+    db.commit()
+    db.close()
+    return engine, Session
+
+
+def uncached_check(db, account_id, resource, action) -> bool:
+    """캐시 적용 전 RBACRoute의 인가 검사 (쿼리 2회)"""
+    account = db.query(Account).filter(Account.id == account_id).first()
+    if not account or not account.role_id:
+        return False
+    return (
+        db.query(role_permission)
+        .join(Permission, role_permission.c.permission_id == Permission.id)
+        .filter(
+            role_permission.c.role_id == account.role_id,
+            Permission.resource == resource,
+            Permission.action == action
+        )
+        .first()
+    ) is not None
+
+
+def cached_check(cache, db, account_id, resource, action) -> bool:
+    role_id = cache.get_account_role(db, account_id)
+    return bool(role_id) and cache.role_has_permission(db, role_id, resource, action)
+
+
+def run(label, iterations, fn, engine):
+    queries = {"n": 0}
+
+    def count(conn, cursor, statement, params, context, executemany):
+        queries["n"] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    started = time.perf_counter()
+    for i in range(iterations):
+        fn(f"user{i % ACCOUNT_COUNT:04d}", RESOURCES[i % len(RESOURCES)], ACTIONS[i % len(ACTIONS)])
+    elapsed = time.perf_counter() - started
+    event.remove(engine, "before_cursor_execute", count)
+    print(f"{label:<10} {iterations:>8} {elapsed * 1e6 / iterations:>12.1f} {queries['n'] / iterations:>10.2f}")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    engine, Session = setup_db()
+    db = Session()
+    cache = PermissionCache()
+
+    def cold(account_id, resource, action):
+        cache.invalidate()
+        return cached_check(cache, db, account_id, resource, action)
+
+    # 결과가 동일한지 먼저 확인합니다.
+    for i in range(ACCOUNT_COUNT):
+        account_id = f"user{i:04d}"
+        for resource in RESOURCES:
+            for action in ACTIONS:
+                assert uncached_check(db, account_id, resource, action) == cached_check(cache, db, account_id, resource, action)
+
+    print(f"{'mode':<10} {'checks':>8} {'us/check':>12} {'queries':>10}")
+    run("uncached", iterations, lambda *args: uncached_check(db, *args), engine)
+    run("cold", iterations, cold, engine)
+    cache.invalidate()
+    run("warm", iterations, lambda *args: cached_check(cache, db, *args), engine)
+    print(cache.stats())
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
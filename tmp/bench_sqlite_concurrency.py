@@ -0,0 +1,130 @@
+# bench_sqlite_concurrency.py
+#
+# 목적:
+# - 저장(쓰기 트랜잭션)이 계속 진행되는 동안의 읽기 처리량을 SQLite 설정별로 비교합니다.
+#   1) default: 기존 방식 (기본 엔진 1개, rollback journal, 읽기/쓰기 같은 풀)
+#   2) profile: backend.database의 런타임 프로필 (WAL + 읽기 전용 풀 + 단일 writer 연결)
+#
+# 사용:
+#   python tmp/bench_sqlite_concurrency.py [측정 시간(초)] [읽기 스레드 수]
+#
+# 주의:
+# - 실제 DB를 건드리지 않도록 임시 SQLite 파일 DB를 만들어 측정합니다.
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.exc import OperationalError
+from backend.database import Base, create_reader_engine, create_writer_engine
+from backend.models import Maker, Resources
+
+MAKER_COUNT = 20
+PARTS_PER_MAKER = 1000
+SAVE_BATCH = 500 # 저장 1회당 수정할 부품 수
+
+
+def seed(url: str) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Maker), [{"id": f"M{m:03d}", "name": f"Maker {m}"} for m in range(MAKER_COUNT)])
+        conn.execute(insert(Resources), [
+            {
+                "id": f"{p:06d}", "maker_id": f"M{m:03d}", "major": f"MAJ{p % 9}", "minor": f"MIN{p % 31}",
+                "name": f"Part {m}-{p}", "unit": "ea", "solo_price": p, "display_order": p
+            }
+            for m in range(MAKER_COUNT) for p in range(PARTS_PER_MAKER)
+        ])
+    engine.dispose()
+
+
+def run(label: str, read_engine, write_engine, duration: float, readers: int) -> None:
+    stop = threading.Event()
+    stats = {"reads": 0, "read_errors": 0, "saves": 0, "save_errors": 0, "read_latency": []}
+    lock = threading.Lock()
+
+    def reader():
+        page_query = (
+            select(Resources.id, Resources.name, Resources.solo_price, Maker.name)
+            .join(Maker, Resources.maker_id == Maker.id)
+            .order_by(Resources.id)
+            .limit(100)
+        )
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with read_engine.connect() as conn:
+                    # 제조사별 부품 한 페이지 조회 (목록 화면과 비슷한 짧은 읽기)
+                    maker_id = f"M{random.randrange(MAKER_COUNT):03d}"
+                    conn.execute(page_query.where(Resources.maker_id == maker_id)).fetchall()
+                with lock:
+                    stats["reads"] += 1
+                    stats["read_latency"].append(time.perf_counter() - started)
+            except OperationalError:
+                with lock:
+                    stats["read_errors"] += 1
+
+    def writer():
+        while not stop.is_set():
+            maker_id = f"M{random.randrange(MAKER_COUNT):03d}"
+            try:
+                with write_engine.begin() as conn:
+                    conn.execute(
+                        update(Resources)
+                        .where(Resources.maker_id == maker_id, Resources.display_order < SAVE_BATCH)
+                        .values(solo_price=Resources.solo_price + 1)
+                    )
+                with lock:
+                    stats["saves"] += 1
+            except OperationalError:
+                with lock:
+                    stats["save_errors"] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies = sorted(stats["read_latency"]) or [0.0]
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(
+        f"{label:<8} {stats['reads'] / duration:>10.1f} {p50:>8.2f} {p99:>8.2f} "
+        f"{stats['read_errors']:>8} {stats['saves'] / duration:>8.1f} {stats['save_errors']:>8}"
+    )
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    print(f"{'mode':<8} {'reads/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'r_errs':>8} {'saves/s':>8} {'w_errs':>8}")
+
+    # 1) default: 기존 database.py와 같은 기본 엔진 (journal_mode=DELETE, sqlite3 기본 대기 5초)
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_default.db')}"
+    seed(url)
+    default_engine = create_engine(url, connect_args={"check_same_thread": False})
+    run("default", default_engine, default_engine, duration, readers)
+    default_engine.dispose()
+
+    # 2) profile: WAL + 읽기 전용 풀 + 단일 writer 연결
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_profile.db')}"
+    seed(url)
+    write_engine = create_writer_engine(url)
+    read_engine = create_reader_engine(url, pool_size=readers)
+    run("profile", read_engine, write_engine, duration, readers)
+    write_engine.dispose()
+    read_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
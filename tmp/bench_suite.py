@@ -0,0 +1,272 @@
+# bench_suite.py
+#
+# 목적:
+# - 실제 API 엔드포인트를 TestClient로 프로세스 안에서 호출해 시나리오별 지연 시간(p50/p95)과 요청당 쿼리 수를 기록합니다.
+# - 결과를 JSON으로 저장하고 이전 결과(--baseline)와 비교해, p95가 허용 범위를 넘게 늘거나 쿼리 수가 늘면
+#   실패(종료 코드 1)합니다. (커밋 간 성능 회귀 확인용)
+# - 데이터는 tmp/generate_dataset.py로 만든 DB를 사용합니다. (원본은 건드리지 않도록 임시 복사본에서 실행)
+#
+# 사용:
+#   python tmp/generate_dataset.py --scale medium --out /tmp/bench_medium.db
+#   python tmp/bench_suite.py --db /tmp/bench_medium.db --output /tmp/bench_before.json
+#   (코드 변경 후)
+#   python tmp/bench_suite.py --db /tmp/bench_medium.db --baseline /tmp/bench_before.json
+#
+#   --db 대신 --scale을 지정하면 같은 seed로 임시 DB를 생성해 사용합니다.
+#
+# 주의:
+# - 저장 시나리오(장비 저장, 내정가 생성)는 복사본 DB에 기록되므로 반복 실행해도 원본 데이터는 그대로입니다.
+# - 측정값은 같은 PC/같은 데이터셋에서 비교해야 의미가 있습니다.
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# p95가 이 값(ms) 이하로만 늘어난 경우는 측정 잡음으로 보고 회귀로 판정하지 않습니다.
+MIN_REGRESSION_MS = 2.0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="API 엔드포인트 벤치마크 (p50/p95, 요청당 쿼리 수)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--db", help="generate_dataset.py로 생성한 DB 파일")
+    source.add_argument("--scale", choices=["small", "medium", "large"], help="임시 DB를 생성해 사용")
+    parser.add_argument("--seed", type=int, default=42, help="--scale 사용 시 데이터 seed")
+    parser.add_argument("--iterations", type=int, default=30, help="시나리오별 측정 횟수")
+    parser.add_argument("--warmup", type=int, default=3, help="시나리오별 측정 전 예열 횟수")
+    parser.add_argument("--only", help="이름에 이 문자열이 포함된 시나리오만 실행")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="p95 허용 증가율 (기본 0.25 = 25%%)")
+    return parser.parse_args()
+
+
+def prepare_database(args, workdir: str) -> str:
+    """측정용 DB 복사본 경로를 반환합니다."""
+    path = os.path.join(workdir, "bench.db")
+    if args.scale:
+        subprocess.run(
+            [sys.executable, os.path.join(ROOT_DIR, "tmp", "generate_dataset.py"),
+             "--scale", args.scale, "--seed", str(args.seed), "--out", path],
+            check=True
+        )
+        return path
+    source = sqlite3.connect(args.db)
+    target = sqlite3.connect(path)
+    source.backup(target) # WAL에 남은 내용까지 포함한 일관된 복사본
+    target.close()
+    source.close()
+    return path
+
+
+def sample_ids(path: str) -> dict:
+    """시나리오에 사용할 ID를 DB에서 고릅니다. (같은 DB면 항상 같은 ID)"""
+    conn = sqlite3.connect(path)
+    try:
+        boms = conn.execute(
+            "SELECT machine_id, COUNT(*) FROM machine_resources GROUP BY machine_id ORDER BY COUNT(*), machine_id"
+        ).fetchall()
+        if not boms:
+            raise SystemExit("장비 BOM 데이터가 없습니다. generate_dataset.py로 생성한 DB를 지정하세요.")
+        median_machine, median_size = boms[len(boms) // 2]
+        largest_machine, largest_size = boms[-1]
+        part = conn.execute("SELECT id, maker_id, name FROM resources ORDER BY maker_id, id LIMIT 1 OFFSET 7").fetchone()
+        general_id, price_compare_id = conn.execute(
+            "SELECT general_id, id FROM price_compare ORDER BY general_id LIMIT 1"
+        ).fetchone()
+        machine_body_rows = conn.execute(
+            "SELECT resources_id, maker_id, solo_price, quantity, display_major, display_minor, display_model_name, "
+            "display_maker_name, display_unit FROM machine_resources WHERE machine_id = ? ORDER BY order_index",
+            (median_machine,)
+        ).fetchall()
+        machine_name = conn.execute("SELECT name FROM machine WHERE id = ?", (median_machine,)).fetchone()[0]
+        machine_ids = [row[0] for row in boms[:3]]
+    finally:
+        conn.close()
+
+    columns = ("resources_id", "maker_id", "solo_price", "quantity", "display_major", "display_minor",
+               "display_model_name", "display_maker_name", "display_unit")
+    return {
+        "median_machine": str(uuid.UUID(median_machine)), "median_bom": median_size,
+        "largest_machine": str(uuid.UUID(largest_machine)), "largest_bom": largest_size,
+        "part": {"id": part[0], "maker_id": part[1], "search": part[2].split()[0]},
+        "general_id": str(uuid.UUID(general_id)),
+        "price_compare_id": str(uuid.UUID(price_compare_id)),
+        "price_compare_machines": [str(uuid.UUID(m)) for m in machine_ids],
+        "machine_body": {
+            "name": machine_name, "description": "bench",
+            "resources": [dict(zip(columns, row)) for row in machine_body_rows]
+        },
+    }
+
+
+def build_scenarios(ids: dict) -> list:
+    """(이름, 메서드, URL, 요청 바디) 목록"""
+    part = ids["part"]
+    return [
+        ("parts.list", "GET", "/api/v1/parts?limit=100", None),
+        ("parts.list.1000", "GET", "/api/v1/parts?limit=1000", None),
+        ("parts.list.filtered", "GET", f"/api/v1/parts?limit=100&maker_id={part['maker_id']}&ul=true", None),
+        ("parts.search", "POST", "/api/v1/parts/search", {"query": part["search"], "search_fields": ["name", "maker_name"], "limit": 20}),
+        ("parts.search.ranked", "POST", "/api/v1/parts/search", {"query": part["search"], "search_fields": ["name", "id", "maker_name"], "limit": 20, "mode": "ranked"}),
+        ("parts.detail", "GET", f"/api/v1/parts/{part['id']}/{part['maker_id']}", None),
+        ("maker.list", "GET", "/api/v1/maker?limit=100", None),
+        ("machine.list", "GET", "/api/v1/quotation/machine/?limit=50", None),
+        (f"machine.detail.median({ids['median_bom']})", "GET", f"/api/v1/quotation/machine/{ids['median_machine']}", None),
+        (f"machine.detail.largest({ids['largest_bom']})", "GET", f"/api/v1/quotation/machine/{ids['largest_machine']}", None),
+        (f"machine.save({ids['median_bom']})", "PUT", f"/api/v1/quotation/machine/{ids['median_machine']}", ids["machine_body"]),
+        ("general.list", "GET", "/api/v1/quotation/general?limit=50", None),
+        ("general.detail", "GET", f"/api/v1/quotation/general/{ids['general_id']}", None),
+        ("price_compare.detail", "GET", f"/api/v1/quotation/price_compare/{ids['price_compare_id']}", None),
+        ("price_compare.create(3)", "POST", "/api/v1/quotation/price_compare",
+         {"general_id": ids["general_id"], "creator": "bench", "machine_ids": ids["price_compare_machines"]}),
+    ]
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """최근접 순위(nearest-rank) 백분위수"""
+    index = max(0, min(len(sorted_values) - 1, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def run_scenarios(client, scenarios: list, iterations: int, warmup: int) -> dict:
+    from backend.core.sql_profiler import collect_profiles
+
+    results = {}
+    for name, method, url, body in scenarios:
+        for _ in range(warmup):
+            response = client.request(method, url, json=body)
+            if response.status_code >= 400:
+                raise SystemExit(f"{name}: HTTP {response.status_code} {response.text[:300]}")
+
+        latencies, queries, db_ms = [], [], []
+        for _ in range(iterations):
+            with collect_profiles() as profiles:
+                started = time.perf_counter()
+                client.request(method, url, json=body)
+                latencies.append((time.perf_counter() - started) * 1000)
+            queries.append(profiles[0].statements if profiles else 0)
+            db_ms.append(profiles[0].db_seconds * 1000 if profiles else 0.0)
+
+        latencies.sort()
+        db_ms.sort()
+        results[name] = {
+            "p50_ms": round(percentile(latencies, 0.50), 3),
+            "p95_ms": round(percentile(latencies, 0.95), 3),
+            "max_ms": round(latencies[-1], 3),
+            "mean_ms": round(sum(latencies) / len(latencies), 3),
+            "db_p50_ms": round(percentile(db_ms, 0.50), 3),
+            "queries": max(queries),
+        }
+        r = results[name]
+        print(f"{name:<32} p50 {r['p50_ms']:>9.2f}  p95 {r['p95_ms']:>9.2f}  db p50 {r['db_p50_ms']:>8.2f}  queries {r['queries']:>3}")
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> int:
+    """이전 결과와 비교해 회귀 항목 수를 반환합니다."""
+    regressions = 0
+    print(f"\n{'scenario':<32} {'p95 base':>9} {'p95 now':>9} {'change':>8}  queries")
+    for name, current in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"{name:<32} {'-':>9} {current['p95_ms']:>9.2f} {'new':>8}")
+            continue
+        change = (current["p95_ms"] - base["p95_ms"]) / base["p95_ms"] if base["p95_ms"] else 0.0
+        slower = change > tolerance and current["p95_ms"] - base["p95_ms"] > MIN_REGRESSION_MS
+        more_queries = current["queries"] > base["queries"]
+        flag = "  <-- REGRESSION" if slower or more_queries else ""
+        regressions += bool(flag)
+        print(
+            f"{name:<32} {base['p95_ms']:>9.2f} {current['p95_ms']:>9.2f} {change:>+8.0%}  "
+            f"{base['queries']} -> {current['queries']}{flag}"
+        )
+    return regressions
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="bench_suite_")
+    path = prepare_database(args, workdir)
+    ids = sample_ids(path)
+
+    # 앱 모듈이 임시 DB를 사용하도록 세션 팩토리를 다시 바인딩합니다.
+    import backend.database as database
+    writer = database.create_writer_engine(f"sqlite:///{path}")
+    reader = database.create_reader_engine(f"sqlite:///{path}")
+    async_reader = database.create_async_reader_engine(f"sqlite+aiosqlite:///{path}")
+    database.SessionLocal.configure(bind=writer)
+    database.ReadSessionLocal.configure(bind=reader)
+    database.AsyncReadSessionLocal.configure(bind=async_reader)
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from backend.api.router import router as api_router
+    from backend.core.sql_profiler import SQLProfilerMiddleware
+
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api")
+    app.add_middleware(SQLProfilerMiddleware)
+
+    scenarios = build_scenarios(ids)
+    if args.only:
+        scenarios = [s for s in scenarios if args.only in s[0]]
+
+    print(f"[*] bench db: {args.db or args.scale} (iterations={args.iterations}, warmup={args.warmup})\n")
+    try:
+        with TestClient(app) as client:
+            results = run_scenarios(client, scenarios, args.iterations, args.warmup)
+            client.portal.call(async_reader.dispose) # aiosqlite 연결 스레드 정리 (종료 대기 방지)
+    finally:
+        writer.dispose()
+        reader.dispose()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "git": git_revision(),
+            "dataset": args.db or f"{args.scale} (seed={args.seed})",
+            "iterations": args.iterations,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n[*] saved: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"[*] baseline: {baseline['meta'].get('git')} ({baseline['meta'].get('dataset')})")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{regressions} scenario(s) regressed")
+            sys.exit(1)
+        print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
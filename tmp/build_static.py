@@ -0,0 +1,63 @@
+# build_static.py
+#
+# 목적:
+# - frontend/static, frontend/assets의 텍스트 계열 파일(JS/CSS/SVG 등)마다 사전 압축 파일(.gz, brotli 설치 시 .br)을 만듭니다.
+# - 서버(PrecompressedStaticFiles)는 요청마다 압축하지 않고 이 파일을 그대로 보냅니다.
+# - 원본을 수정한 뒤 다시 실행하지 않으면 오래된 압축 파일은 무시되고 요청 시 압축(CompressionMiddleware)됩니다.
+#
+# 사용:
+#   python tmp/build_static.py           (배포/패키징 전에 실행)
+#   python tmp/build_static.py --clean   (생성한 .br/.gz 파일 삭제)
+#
+# 주의:
+# - 생성 파일은 .gitignore 대상입니다. (빌드 산출물)
+import argparse
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from backend.core.compression import brotli
+from backend.core.config import FRONTEND_DIR
+from backend.core.static_files import precompress_directory
+
+STATIC_DIRS = ("static", "assets")
+
+
+def format_size(size):
+    return "-" if size is None else f"{size / 1024:.1f}K"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="정적 파일 사전 압축(.gz/.br) 생성")
+    parser.add_argument("--clean", action="store_true", help="생성한 .br/.gz 파일 삭제")
+    args = parser.parse_args()
+
+    if brotli is None and not args.clean:
+        print("[BuildStatic Warning] brotli 모듈이 없어 .gz 파일만 생성합니다. (pip install brotli)")
+
+    total = {"size": 0, "gzip": 0, "br": 0}
+    for name in STATIC_DIRS:
+        results = precompress_directory(FRONTEND_DIR / name, clean=args.clean)
+        if args.clean:
+            print(f"{name}: 압축 파일 삭제 완료")
+            continue
+        for result in results:
+            print(
+                f"{name}/{result['path']:<60} {format_size(result['size']):>8} "
+                f"gz {format_size(result['gzip']):>8}  br {format_size(result['br']):>8}"
+            )
+            total["size"] += result["size"]
+            total["gzip"] += result["gzip"] or result["size"]
+            total["br"] += result["br"] or result["gzip"] or result["size"]
+
+    if not args.clean:
+        print(
+            f"\n합계 {format_size(total['size'])} → gzip {format_size(total['gzip'])}"
+            + (f", br {format_size(total['br'])}" if brotli is not None else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
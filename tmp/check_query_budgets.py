@@ -0,0 +1,135 @@
+# check_query_budgets.py
+#
+# 목적:
+# - 주요 엔드포인트의 요청당 쿼리 수를 고정(예산)하여, 지연 로딩 등으로 쿼리가 늘어나면 실패(종료 코드 1)합니다.
+# - backend.core.sql_profiler.query_budget 헬퍼를 사용합니다. (요청별 프로파일 기준)
+# - 다음 경우도 실패로 처리합니다. (CI에서 종료 코드로 판단)
+#   · 시드 데이터 생성 요청 실패 / 검사 요청이 4xx·5xx 또는 예외
+#   · 요청 프로파일이 기록되지 않음 (미들웨어가 빠지면 쿼리 수 0으로 통과하지 않도록)
+#   · 장비 상세/저장의 쿼리 수가 자재 수(BOM_SIZES)에 따라 달라짐 (자재별 지연 로딩은 예산 안이어도 실패)
+#
+# 사용:
+#   python tmp/check_query_budgets.py
+#
+# 주의:
+# - 실제 DB를 건드리지 않도록 임시 SQLite 파일 DB를 만들어 검사합니다.
+# - 예산은 부품 수/자재 수와 무관해야 합니다. (BOM_SIZES의 각 크기에서 같은 구문 수여야 정상)
+import os
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import backend.database as database
+
+path = os.path.join(tempfile.mkdtemp(), "check_budgets.db")
+database.SessionLocal.configure(bind=database.create_writer_engine(f"sqlite:///{path}"))
+database.ReadSessionLocal.configure(bind=database.create_reader_engine(f"sqlite:///{path}"))
+async_engine = database.create_async_reader_engine(f"sqlite+aiosqlite:///{path}")
+database.AsyncReadSessionLocal.configure(bind=async_engine)
+
+import backend.models # noqa: F401 (테이블 등록)
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.api.router import router as api_router
+from backend.core.sql_profiler import SQLProfilerMiddleware, query_budget
+
+# 장비 견적서 자재 수. BOM_INVARIANT 항목은 크기마다 실행하여 구문 수가 모두 같은지 확인합니다.
+BOM_SIZES = (30, 600)
+BOM_INVARIANT = {"장비 상세", "장비 저장"}
+
+# (설명, 메서드, 경로 생성 함수, 요청 바디 생성 함수, 요청당 최대 쿼리 수)
+BUDGETS = [
+    ("부품 목록", "GET", lambda d: "/api/v1/parts?limit=20", None, 1),
+    ("부품 검색", "POST", lambda d: "/api/v1/parts/search", lambda d: {"query": "모터", "search_fields": ["name"], "limit": 20}, 1),
+    ("부품 단건", "GET", lambda d: f"/api/v1/parts/{d['part']['id']}/{d['part']['maker_id']}", None, 1),
+    ("장비 목록", "GET", lambda d: "/api/v1/quotation/machine/?limit=20", None, 2),
+    ("장비 상세", "GET", lambda d: f"/api/v1/quotation/machine/{d['machine_id']}", None, 2),
+    ("장비 저장", "PUT", lambda d: f"/api/v1/quotation/machine/{d['machine_id']}", lambda d: d["machine_body"], 5),
+    ("견적 상세", "GET", lambda d: f"/api/v1/quotation/general/{d['general_id']}", None, 2),
+    ("내정가 상세", "GET", lambda d: f"/api/v1/quotation/price_compare/{d['price_compare_id']}", None, 3),
+]
+
+
+def _json(response) -> dict:
+    """시드 요청 응답 본문 (실패하면 즉시 중단)"""
+    if response.status_code >= 400:
+        raise SystemExit(f"seed failed: {response.request.method} {response.request.url.path} -> HTTP {response.status_code} {response.text[:200]}")
+    return response.json()
+
+
+def seed(client: TestClient) -> dict:
+    makers = [_json(client.post("/api/v1/maker", json={"name": f"Maker {i}"})) for i in range(3)]
+    parts = [
+        _json(client.post("/api/v1/parts/", json={
+            "maker_name": makers[i % 3]["name"], "major_category": "MAJ", "minor_category": "MIN",
+            "name": f"Part {i} 모터", "unit": "ea", "solo_price": 100 + i
+        }))
+        for i in range(max(BOM_SIZES))
+    ]
+    boms = {}
+    for size in BOM_SIZES:
+        machine_body = {
+            "name": f"Machine {size}", "manufacturer": "x", "client": "c", "creator": "check", "description": "",
+            "resources": [
+                {"resources_id": p["id"], "maker_id": p["maker_id"], "solo_price": 10, "quantity": 1, "display_order": i}
+                for i, p in enumerate(parts[:size])
+            ]
+        }
+        machine_id = _json(client.post("/api/v1/quotation/machine/", json=machine_body))["id"]
+        boms[size] = {"machine_id": machine_id, "machine_body": machine_body}
+    machine_id = boms[BOM_SIZES[0]]["machine_id"]
+    general_id = _json(client.post("/api/v1/quotation/general", json={"name": "G", "client": "c", "creator": "check"}))["id"]
+    price_compare_id = _json(client.post(
+        "/api/v1/quotation/price_compare", json={"general_id": general_id, "creator": "check", "machine_ids": [machine_id]}
+    ))["id"]
+    return {
+        "part": parts[0], **boms[BOM_SIZES[0]], "boms": boms,
+        "general_id": general_id, "price_compare_id": price_compare_id
+    }
+
+
+def main():
+    database.Base.metadata.create_all(database.SessionLocal.kw["bind"])
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api")
+    app.add_middleware(SQLProfilerMiddleware)
+
+    failures = 0
+    cases = 0
+    with TestClient(app) as client:
+        data = seed(client)
+        client.get("/api/v1/parts?limit=1") # 카탈로그 적재 (예산 제외)
+        for label, method, url, body, budget in BUDGETS:
+            sizes = BOM_SIZES if label in BOM_INVARIANT else (None,)
+            used_by_size = {}
+            for size in sizes:
+                cases += 1
+                name = label if size is None else f"{label} (BOM {size})"
+                case = data if size is None else {**data, **data["boms"][size]}
+                try:
+                    with query_budget(budget) as profiles:
+                        response = client.request(method, url(case), json=body(case) if body else None)
+                        assert response.status_code < 400, f"{name}: HTTP {response.status_code} {response.text[:200]}"
+                    assert len(profiles) == 1, f"{name}: expected 1 request profile, got {len(profiles)} (SQLProfilerMiddleware not recording?)"
+                    used = profiles[0].statements
+                    used_by_size[size] = used
+                    print(f"ok   {name:<18} {used:>3} / {budget} queries")
+                except Exception as e:
+                    failures += 1
+                    message = str(e) if isinstance(e, AssertionError) else f"{type(e).__name__}: {e}"
+                    print(f"FAIL {name:<18}\n{message}")
+            if len(set(used_by_size.values())) > 1:
+                cases += 1
+                failures += 1
+                print(f"FAIL {label:<18}\nstatement count depends on BOM size: {used_by_size}")
+
+    if failures:
+        print(f"\n{failures} / {cases} case(s) failed")
+        sys.exit(1)
+    print(f"\nall {cases} cases within budget")
+
+
+if __name__ == "__main__":
+    main()
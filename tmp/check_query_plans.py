@@ -0,0 +1,204 @@
+# check_query_plans.py
+#
+# 목적:
+# - 주요 엔드포인트가 실행하는 쿼리의 EXPLAIN QUERY PLAN을 검사해, 인덱스 없이 테이블 전체를 훑는(SCAN) 쿼리가
+#   생기면 실패(종료 코드 1)합니다. (인덱스 마이그레이션 회귀 검사)
+# - 스키마는 Base.metadata가 아닌 Alembic 마이그레이션(head)으로 만들어 마이그레이션 자체도 함께 검증합니다.
+# - 각 검사 항목은 실제 CRUD 함수를 호출하고, 그때 실행된 SQL을 가로채 같은 파라미터로 실행 계획을 확인합니다.
+# - 다음 경우도 실패로 처리합니다. (CI에서 종료 코드로 판단)
+#   · 검사 함수가 예외를 던짐 / 실행 계획 조회 실패
+#   · SELECT가 하나도 잡히지 않음 (캐시 등으로 쿼리가 사라지면 검사가 아무것도 확인하지 않으므로)
+#
+# 사용:
+#   python tmp/check_query_plans.py [-v]   (-v: 모든 쿼리의 실행 계획 출력)
+#
+# 주의:
+# - 실제 DB를 건드리지 않도록 임시 SQLite 파일 DB를 만들어 검사합니다.
+import os
+import re
+import sys
+import tempfile
+import uuid
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from backend.models import (
+    Account, Certification, Detailed, General, Machine, MachineResources, Maker, PriceCompare, Quotation, Resources
+)
+from backend.api.v1.account import crud as account_crud
+from backend.api.v1.maker import crud as maker_crud
+from backend.api.v1.part import crud as part_crud
+from backend.api.v1.part.catalog import _catalog_query
+from backend.api.v1.quotation.general import crud as general_crud
+from backend.api.v1.quotation.machine import crud as machine_crud
+from backend.api.v1.quotation.price_compare import crud as price_compare_crud
+
+MAKER_COUNT = 20
+PARTS_PER_MAKER = 50
+MACHINE_COUNT = 50
+BOM_SIZE = 20
+GENERAL_COUNT = 30
+
+# 인덱스 없는 전체 테이블 스캔 (예: "SCAN machine", "SCAN TABLE machine AS m")
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+
+# 실제 테이블 이름 (서브쿼리/UNION 결과 같은 중간 결과 스캔은 이미 인덱스로 걸러진 행이므로 제외)
+TABLE_NAMES = set(General.metadata.tables)
+
+
+def is_full_scan(detail: str) -> bool:
+    match = FULL_SCAN.match(detail)
+    return bool(match) and match.group(1) in TABLE_NAMES
+
+
+def migrate(path: str) -> None:
+    config = Config(os.path.join(ROOT_DIR, "backend", "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT_DIR, "backend", "alembic"))
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    command.upgrade(config, "head")
+
+
+def seed(engine) -> dict:
+    machine_ids = [uuid.uuid4() for _ in range(MACHINE_COUNT)]
+    general_ids = [uuid.uuid4() for _ in range(GENERAL_COUNT)]
+    price_compare_ids = [uuid.uuid4() for _ in range(GENERAL_COUNT)]
+    with engine.begin() as conn:
+        conn.execute(insert(Maker), [{"id": f"M{m:03d}", "name": f"Maker {m}"} for m in range(MAKER_COUNT)])
+        parts = [(f"M{m:03d}", f"{p:06d}") for m in range(MAKER_COUNT) for p in range(1, PARTS_PER_MAKER + 1)]
+        conn.execute(insert(Resources), [
+            {"id": p, "maker_id": m, "major": "MAJ", "minor": "MIN", "name": f"Part {m}-{p}", "unit": "ea",
+             "solo_price": 100, "display_order": i}
+            for i, (m, p) in enumerate(parts)
+        ])
+        conn.execute(insert(Certification), [
+            {"resources_id": p, "maker_id": m, "ul": True, "ce": False, "kc": False} for m, p in parts[::3]
+        ])
+        conn.execute(insert(Machine), [{"id": mid, "name": f"Machine {i}", "creator": "check"} for i, mid in enumerate(machine_ids)])
+        conn.execute(insert(MachineResources), [
+            {"machine_id": mid, "maker_id": m, "resources_id": p, "solo_price": 100, "quantity": 1, "order_index": order}
+            for i, mid in enumerate(machine_ids)
+            for order, (m, p) in enumerate(parts[i * BOM_SIZE:(i + 1) * BOM_SIZE])
+        ])
+        conn.execute(insert(General), [{"id": gid, "name": f"General {i}", "creator": "check"} for i, gid in enumerate(general_ids)])
+        for i, gid in enumerate(general_ids):
+            conn.execute(insert(PriceCompare).values(id=price_compare_ids[i], general_id=gid, creator="check"))
+            conn.execute(insert(Quotation).values(id=uuid.uuid4(), general_id=gid, creator="check", title=f"Q{i}"))
+            conn.execute(insert(Detailed).values(id=uuid.uuid4(), general_id=gid, creator="check"))
+        conn.execute(insert(Account), [
+            {"id": f"user{i:03d}", "pwd": "x", "name": f"U{i}", "department": "D", "position": "P",
+             "phone_number": f"010{i:08d}", "e_mail": f"user{i}@example.com"}
+            for i in range(100)
+        ])
+    return {"machine_ids": machine_ids, "general_ids": general_ids, "price_compare_ids": price_compare_ids}
+
+
+def build_cases(data: dict) -> list:
+    """(검사 이름, fn(db)) 목록. fn은 해당 엔드포인트가 사용하는 CRUD 함수를 그대로 호출합니다."""
+    machine_id = data["machine_ids"][0]
+    general_id = data["general_ids"][0]
+
+    def machine_list_next_page(db):
+        _, machines = machine_crud.get_machines(db, limit=10, count="none")
+        from backend.core.pagination import encode_cursor
+        machine_crud.get_machines(db, limit=10, cursor=encode_cursor(machines[-1].updated_at, machines[-1].id), count="none")
+
+    def general_list_next_page(db):
+        _, generals = general_crud.get_generals(db, limit=10, count="none")
+        from backend.core.pagination import encode_cursor
+        general_crud.get_generals(db, limit=10, cursor=encode_cursor(generals[-1].created_at, generals[-1].id), count="none")
+
+    def general_related_next_page(db):
+        first = general_crud.get_general_with_relations(db, general_id, limit=1)
+        general_crud.get_related_documents(db, general_id, limit=1, cursor=first["related_next_cursor"])
+
+    return [
+        ("GET /machine (목록 + 커서)", machine_list_next_page),
+        ("GET /machine/{id} (자재 상세)", lambda db: machine_crud.get_machine_resources_detail(db, machine_id)),
+        ("PUT /machine/{id} (BOM 비교 조회)", lambda db: machine_crud.sync_machine_resources(db, machine_id, [])),
+        ("GET /general (목록 + 커서)", general_list_next_page),
+        ("GET /general/{id} (연관 문서)", lambda db: general_crud.get_general_with_relations(db, general_id)),
+        ("GET /general/{id} (연관 문서 + 커서)", general_related_next_page),
+        ("GET /general/{id} (조건부 요청 버전)", lambda db: general_crud.get_general_version(db, general_id)),
+        ("GET /machine/{id} (조건부 요청 버전)", lambda db: machine_crud.get_machine_version(db, machine_id)),
+        ("GET /price_compare/{id} (조건부 요청 버전)", lambda db: price_compare_crud.get_price_compare_version(db, data["price_compare_ids"][0])),
+        ("POST /price_compare (BOM 집계)", lambda db: price_compare_crud.calculate_initial_resources(db, data["machine_ids"][:3])),
+        ("POST /parts (제조사명 조회)", lambda db: part_crud.get_maker_by_name(db, "Maker 3")),
+        ("POST /parts (다음 부품 ID)", lambda db: part_crud.get_next_parts_id(db, "M003")),
+        ("PUT /parts (카탈로그 단건 갱신)", lambda db: _catalog_query(db).filter(Resources.maker_id == "M003", Resources.id == "000007").first()),
+        ("GET /maker (목록)", lambda db: maker_crud.get_makers(db, limit=10, count="none")),
+        ("POST /maker (이름 중복 확인)", lambda db: maker_crud.get_maker_by_name(db, "Maker 5")),
+        ("POST /account/check (중복 확인)", lambda db: account_crud.check_account_exists(db, id="nobody", e_mail="user7@example.com", phone_number="01000000007")),
+        ("POST /account/register (이메일 조회)", lambda db: account_crud.get_account_by_email(db, "user7@example.com")),
+        ("POST /account/register (전화번호 조회)", lambda db: account_crud.get_account_by_phone(db, "01000000007")),
+    ]
+
+
+def main():
+    verbose = "-v" in sys.argv[1:]
+    path = os.path.join(tempfile.mkdtemp(), "check_plans.db")
+    migrate(path)
+    engine = create_engine(f"sqlite:///{path}")
+    data = seed(engine)
+    Session = sessionmaker(bind=engine)
+
+    captured = []
+
+    def capture(conn, cursor, statement, params, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, params))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    failures = 0
+    cases = build_cases(data)
+    for label, fn in cases:
+        captured.clear()
+        case_failed = False
+        lines = []
+        db = Session()
+        try:
+            fn(db)
+        except Exception as e:
+            case_failed = True
+            lines.append(f"    !! {type(e).__name__}: {e}")
+        finally:
+            db.rollback() # 검사용 호출이 만든 변경은 버립니다.
+            db.close()
+        statements = list(captured)
+        if not statements and not case_failed:
+            case_failed = True
+            lines.append("    !! no SELECT captured (nothing to check)")
+
+        with engine.connect() as conn:
+            for statement, params in statements:
+                try:
+                    plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params).fetchall()
+                except Exception as e:
+                    case_failed = True
+                    lines.append("    " + " ".join(statement.split())[:160])
+                    lines.append(f"      !! EXPLAIN failed: {e}")
+                    continue
+                scans = [row[3] for row in plan if is_full_scan(row[3])]
+                if scans:
+                    case_failed = True
+                if scans or verbose:
+                    lines.append("    " + " ".join(statement.split())[:160])
+                    lines.extend(f"      {'!!' if is_full_scan(row[3]) else '  '} {row[3]}" for row in plan)
+        failures += case_failed
+        print(f"{'FAIL' if case_failed else 'ok  '} {label} ({len(statements)} queries)")
+        for line in lines:
+            print(line)
+
+    engine.dispose()
+    if failures:
+        print(f"\n{failures} / {len(cases)} case(s) failed")
+        sys.exit(1)
+    print(f"\nall {len(cases)} cases use indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+# generate_dataset.py
+#
+# 목적:
+# - 벤치마크/부하 검사용 합성 데이터로 새 SQLite DB를 채웁니다. (tmp/data.xlsx, 실행 중인 서버 불필요)
+# - 규모(scale)별로 제조사/부품(인증 포함)/장비(BOM 50~800행)/견적(General)과 내정가·견적서·세부내역서를 만듭니다.
+#     small : 부품 1천,  장비 100,   견적 50
+#     medium: 부품 1만,  장비 1천,   견적 300
+#     large : 부품 10만, 장비 1만,   견적 2천 (BOM 행 약 400만, 수 분 소요)
+# - 같은 --seed면 같은 데이터(ID 포함)가 만들어지므로 커밋 간 벤치마크 비교에 사용할 수 있습니다.
+# - 스키마는 Alembic 마이그레이션(head)으로 만들고, 대량 적재는 sqlite3 executemany로 직접 기록합니다.
+#   (UUID는 CHAR(32) hex, 시각은 CURRENT_TIMESTAMP와 같은 "YYYY-MM-DD HH:MM:SS" 형식으로 앱과 동일하게 저장)
+#
+# 사용:
+#   python tmp/generate_dataset.py --scale small --out tmp/bench_small.db
+#   python tmp/generate_dataset.py --scale medium --machines 3000 --bom-max 400 --out /tmp/custom.db
+#
+# 주의:
+# - --out 파일이 이미 있으면 --force 없이는 덮어쓰지 않습니다. (실제 DB 경로를 지정하지 마세요)
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from alembic import command
+from alembic.config import Config
+
+SCALES = {
+    "small": {"makers": 20, "parts": 1_000, "machines": 100, "generals": 50},
+    "medium": {"makers": 100, "parts": 10_000, "machines": 1_000, "generals": 300},
+    "large": {"makers": 500, "parts": 100_000, "machines": 10_000, "generals": 2_000},
+}
+
+MAJORS = {
+    "제어": ["PLC", "HMI", "인버터", "서보", "릴레이"],
+    "전장": ["차단기", "케이블", "단자대", "덕트", "커넥터"],
+    "기구": ["실린더", "가이드", "베어링", "볼트", "브라켓"],
+    "공압": ["밸브", "레귤레이터", "피팅", "튜브", "필터"],
+    "센서": ["근접센서", "광센서", "압력센서", "온도센서", "엔코더"],
+}
+UNITS = ["ea", "m", "set", "box"]
+LABOR_MINORS = ["설계", "제작", "조립", "시운전"]
+LABOR_RATIO = 0.03 # BOM 행 중 인건비 표시(display_major="인건비") 비율
+CERTIFIED_RATIO = 0.35 # 인증 정보가 있는 부품 비율
+CHUNK = 20_000 # executemany 묶음 크기
+BASE_TIME = datetime(2024, 1, 1, 9, 0, 0)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def migrate(path: str) -> None:
+    config = Config(os.path.join(ROOT_DIR, "backend", "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT_DIR, "backend", "alembic"))
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    command.upgrade(config, "head")
+
+
+def stamp(minutes: float) -> str:
+    return (BASE_TIME + timedelta(minutes=minutes)).strftime(TIMESTAMP_FORMAT)
+
+
+def new_id(rng: random.Random) -> str:
+    """재현 가능한 UUID4 (CHAR(32) hex 저장 형식)"""
+    return uuid.UUID(int=rng.getrandbits(128), version=4).hex
+
+
+def insert_rows(conn: sqlite3.Connection, table: str, columns: tuple, rows) -> int:
+    """행 이터러블을 CHUNK 단위로 나눠 INSERT 합니다. (대용량 BOM도 메모리에 모두 올리지 않음)"""
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    count = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= CHUNK:
+            conn.executemany(sql, batch)
+            count += len(batch)
+            batch.clear()
+    if batch:
+        conn.executemany(sql, batch)
+        count += len(batch)
+    return count
+
+
+def generate(path: str, makers: int, parts: int, machines: int, generals: int, bom_min: int, bom_max: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    migrate(path)
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA synchronous=OFF") # 적재 중에는 fsync 생략 (끝나면 앱 프로필로 되돌림)
+    counts = {}
+
+    # 1. 제조사
+    maker_rows = [(f"M{m + 1:03d}", f"Maker {m + 1:03d}", stamp(m), stamp(m)) for m in range(makers)]
+    counts["maker"] = insert_rows(conn, "maker", ("id", "name", "created_at", "updated_at"), maker_rows)
+
+    # 2. 부품 (제조사별 000001부터 순번) + 인증
+    part_list = [] # (maker_id, id, major, minor, name, unit, price, maker_name)
+    next_number = [0] * makers
+    for i in range(parts):
+        m = rng.randrange(makers)
+        next_number[m] += 1
+        major = rng.choice(list(MAJORS))
+        minor = rng.choice(MAJORS[major])
+        part_list.append((
+            maker_rows[m][0], f"{next_number[m]:06d}", major, minor,
+            f"{minor}-{rng.randrange(100, 9999)} {rng.choice(['A', 'B', 'C', 'S', 'X'])}{i % 97}",
+            rng.choice(UNITS), rng.randrange(500, 2_000_000, 100), maker_rows[m][1]
+        ))
+    counts["resources"] = insert_rows(
+        conn, "resources",
+        ("maker_id", "id", "major", "minor", "name", "unit", "solo_price", "display_order", "created_at", "updated_at"),
+        ((p[0], p[1], p[2], p[3], p[4], p[5], p[6], i, stamp(i / 10), stamp(i / 10)) for i, p in enumerate(part_list))
+    )
+    counts["certification"] = insert_rows(
+        conn, "certification", ("resources_id", "maker_id", "ul", "ce", "kc", "etc", "created_at", "updated_at"),
+        (
+            (p[1], p[0], rng.random() < 0.5, rng.random() < 0.5, rng.random() < 0.7, None, stamp(i / 10), stamp(i / 10))
+            for i, p in enumerate(part_list) if rng.random() < CERTIFIED_RATIO
+        )
+    )
+
+    # 3. 장비 + BOM (장비별 서로 다른 부품, 표시 순서대로)
+    machine_ids = [new_id(rng) for _ in range(machines)]
+    machine_names = {}
+    machine_boms = {} # machine_id -> [(display_major, display_minor, solo_price * quantity)] (내정가 집계용)
+    bom_rows = 0
+
+    def bom_lines():
+        nonlocal bom_rows
+        for mid in machine_ids:
+            lines = []
+            size = min(rng.randint(bom_min, bom_max), len(part_list))
+            for order, p in enumerate(rng.sample(part_list, size)):
+                quantity = rng.randint(1, 20)
+                if rng.random() < LABOR_RATIO:
+                    display_major, display_minor = "인건비", rng.choice(LABOR_MINORS)
+                else:
+                    display_major, display_minor = p[2], p[3]
+                lines.append((display_major, display_minor, p[6] * quantity))
+                yield (mid, p[0], p[1], p[6], quantity, order, display_major, display_minor, p[4], p[7], p[5])
+            machine_boms[mid] = lines
+            bom_rows += size
+
+    machine_rows = []
+    for i, mid in enumerate(machine_ids):
+        machine_names[mid] = f"장비 {i + 1:05d}"
+        created = i * 30
+        machine_rows.append((
+            mid, machine_names[mid], f"제조사 {i % 17}", f"고객사 {i % 53}", f"user{i % 25:03d}",
+            None, None, stamp(created), stamp(created + rng.randint(0, 60 * 24 * 30))
+        ))
+    counts["machine"] = insert_rows(
+        conn, "machine",
+        ("id", "name", "manufacturer", "client", "creator", "price", "description", "created_at", "updated_at"),
+        machine_rows
+    )
+    insert_rows(
+        conn, "machine_resources",
+        ("machine_id", "maker_id", "resources_id", "solo_price", "quantity", "order_index",
+         "display_major", "display_minor", "display_model_name", "display_maker_name", "display_unit"),
+        bom_lines()
+    )
+    counts["machine_resources"] = bom_rows
+    conn.executemany(
+        "UPDATE machine SET price = ? WHERE id = ?",
+        [(sum(line[2] for line in machine_boms[mid]), mid) for mid in machine_ids]
+    )
+
+    # 4. 견적(General)별 내정가(장비 1~5대) / 견적서 / 세부내역서
+    general_rows, pc_rows, pcm_rows, pcr_rows = [], [], [], []
+    quotation_rows, quotation_resource_rows, detailed_rows, detailed_resource_rows = [], [], [], []
+    for g in range(generals):
+        gid = new_id(rng)
+        created = g * 120
+        general_rows.append((gid, f"견적 {g + 1:05d}", f"고객사 {g % 53}", f"user{g % 25:03d}", stamp(created), stamp(created), None))
+
+        pc_id = new_id(rng)
+        pc_rows.append((pc_id, gid, f"user{g % 25:03d}", stamp(created + 10), stamp(created + 10), None))
+        for mid in rng.sample(machine_ids, min(rng.randint(1, 5), len(machine_ids))):
+            pcm_rows.append((pc_id, mid))
+            aggregated = {}
+            for display_major, display_minor, price in machine_boms[mid]:
+                key = ("인건비", display_minor) if display_major == "인건비" else ("자재비", display_major)
+                aggregated[key] = aggregated.get(key, 0) + price
+            for (major, minor), price in aggregated.items():
+                pcr_rows.append((pc_id, mid, major, minor, price, "식", 1, price, "식", 1, 0.0, machine_names[mid]))
+
+        quotation_id = new_id(rng)
+        quotation_rows.append((quotation_id, gid, f"user{g % 25:03d}", f"견적서 {g + 1:05d}", None, f"고객사 {g % 53}",
+                               None, None, stamp(created + 20), stamp(created + 20), None, None))
+        for n in range(rng.randint(5, 20)):
+            quotation_resource_rows.append((quotation_id, f"항목 {n + 1:02d}", None, rng.randint(1, 5), "식", rng.randrange(10_000, 50_000_000, 1000), None))
+
+        detailed_id = new_id(rng)
+        detailed_rows.append((detailed_id, gid, f"user{g % 25:03d}", stamp(created + 30), stamp(created + 30), None))
+        for major in rng.sample(list(MAJORS), rng.randint(2, len(MAJORS))):
+            for minor in rng.sample(MAJORS[major], rng.randint(1, len(MAJORS[major]))):
+                detailed_resource_rows.append((detailed_id, major, minor, "식", rng.randrange(10_000, 5_000_000, 1000), 1, None))
+
+    counts["general"] = insert_rows(conn, "general", ("id", "name", "client", "creator", "created_at", "updated_at", "description"), general_rows)
+    counts["price_compare"] = insert_rows(conn, "price_compare", ("id", "general_id", "creator", "created_at", "updated_at", "description"), pc_rows)
+    counts["price_compare_machine"] = insert_rows(conn, "price_compare_machine", ("price_compare_id", "machine_id"), pcm_rows)
+    counts["price_compare_resources"] = insert_rows(
+        conn, "price_compare_resources",
+        ("price_compare_id", "machine_id", "major", "minor", "cost_solo_price", "cost_unit", "cost_compare",
+         "quotation_solo_price", "quotation_unit", "quotation_compare", "upper", "description"),
+        pcr_rows
+    )
+    counts["quotation"] = insert_rows(
+        conn, "quotation",
+        ("id", "general_id", "creator", "title", "price", "client", "pic_name", "pic_position",
+         "created_at", "updated_at", "description_1", "description_2"),
+        quotation_rows
+    )
+    counts["quotation_resources"] = insert_rows(
+        conn, "quotation_resources", ("quotation_id", "name", "spac", "compare", "unit", "solo_price", "description"), quotation_resource_rows
+    )
+    counts["detailed"] = insert_rows(conn, "detailed", ("id", "general_id", "creator", "created_at", "updated_at", "description"), detailed_rows)
+    counts["detailed_resources"] = insert_rows(
+        conn, "detailed_resources", ("detailed_id", "major", "minor", "unit", "solo_price", "compare", "description"), detailed_resource_rows
+    )
+
+    conn.commit()
+    conn.execute("PRAGMA journal_mode=WAL") # 앱 런타임 프로필과 같은 저널 모드로 저장
+    conn.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 데이터로 새 SQLite DB를 생성합니다.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="기본 규모 (개별 옵션으로 덮어쓰기 가능)")
+    parser.add_argument("--out", required=True, help="생성할 DB 파일 경로")
+    parser.add_argument("--force", action="store_true", help="기존 파일 덮어쓰기")
+    parser.add_argument("--makers", type=int)
+    parser.add_argument("--parts", type=int)
+    parser.add_argument("--machines", type=int)
+    parser.add_argument("--generals", type=int)
+    parser.add_argument("--bom-min", type=int, default=50, help="장비당 최소 BOM 행 수")
+    parser.add_argument("--bom-max", type=int, default=800, help="장비당 최대 BOM 행 수")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    size = dict(SCALES[args.scale])
+    for key in size:
+        if getattr(args, key) is not None:
+            size[key] = getattr(args, key)
+    if size["makers"] > 999:
+        parser.error("제조사 ID 형식(M001~M999)상 --makers는 999 이하여야 합니다.")
+    if args.bom_min > args.bom_max:
+        parser.error("--bom-min은 --bom-max 이하여야 합니다.")
+
+    out = os.path.abspath(args.out)
+    if os.path.exists(out):
+        if not args.force:
+            parser.error(f"{out} 파일이 이미 있습니다. (덮어쓰려면 --force)")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(out + suffix):
+                os.remove(out + suffix)
+
+    started = time.perf_counter()
+    counts = generate(out, bom_min=args.bom_min, bom_max=args.bom_max, seed=args.seed, **size)
+    print(f"[*] {out} ({args.scale}, seed={args.seed}) - {time.perf_counter() - started:.1f}s")
+    for table, count in counts.items():
+        print(f"    {table:<24} {count:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# import_catalog.py
+#
+# 목적:
+# - 카탈로그 엑셀(tmp/data.xlsx)의 제조사/부품/템플릿 시트를 서버 없이 DB에 직접 가져옵니다.
+# - POST /api/v1/import/catalog 와 같은 엔진(backend.api.v1.importer.crud)을 사용합니다. (단일 트랜잭션, 행별 API 호출 없음)
+# - tmp/register_makers.py → register_parts.py → register_templates.py 를 차례로 실행하던 작업을 대체합니다.
+#
+# 사용:
+#   python tmp/import_catalog.py                      (tmp/data.xlsx 가져오기)
+#   python tmp/import_catalog.py path/to/file.xlsx --dry-run
+#   python tmp/import_catalog.py --no-templates --no-create-parts --strict
+import argparse
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import backend.models # noqa: F401 (테이블 등록)
+from backend.database import SessionLocal
+from backend.api.v1.importer.crud import import_catalog_workbook
+from backend.api.v1.quotation.price_compare.crud import refresh_stale_price_compares
+
+EXCEL_FILE_PATH = os.path.join(ROOT_DIR, "tmp", "data.xlsx")
+
+
+def format_counts(counts):
+    return ", ".join(f"{key} {value}" for key, value in counts.items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카탈로그 엑셀 가져오기 (제조사/부품/템플릿)")
+    parser.add_argument("path", nargs="?", default=EXCEL_FILE_PATH, help="엑셀(.xlsx) 파일 경로")
+    parser.add_argument("--dry-run", action="store_true", help="결과만 출력하고 반영하지 않음")
+    parser.add_argument("--no-templates", action="store_true", help="템플릿 시트를 가져오지 않음")
+    parser.add_argument("--no-create-parts", action="store_true", help="템플릿의 미등록 부품을 자동 생성하지 않음")
+    parser.add_argument("--strict", action="store_true", help="매칭 실패 행이 있는 템플릿은 등록하지 않음")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as f:
+            result, stale_ids = import_catalog_workbook(
+                db,
+                f,
+                dry_run=args.dry_run,
+                include_templates=not args.no_templates,
+                auto_create_parts=not args.no_create_parts,
+                strict=args.strict
+            )
+    finally:
+        db.close()
+
+    print(f"{'[DRY RUN] ' if result['dry_run'] else ''}{args.path} ({result['elapsed_ms']}ms)")
+    print("시트:", ", ".join(f"{s['name']}({s['kind']})" for s in result["sheets"]))
+    print("제조사:", format_counts(result["makers"]))
+    print("부품:", format_counts(result["parts"]))
+    for template in result["templates"]:
+        print(
+            f"템플릿 {template['name']}: {template['action']} "
+            f"(자재 {template['resource_count']}, 미매칭 {template['missing_count']}, 부품 생성 {template['created_parts']})"
+        )
+    if result["error_count"]:
+        print(f"\n오류 {result['error_count']}건:")
+        for error in result["errors"]:
+            print(f"  [{error['sheet']}] {error['row'] or '-'}행: {error['message']}")
+
+    if stale_ids:
+        print(f"\n내정가 비교서 {len(stale_ids)}건 재계산")
+        refresh_stale_price_compares(stale_ids)
+
+
+if __name__ == "__main__":
+    main()
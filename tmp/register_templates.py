@@ -25,6 +25,7 @@ API_BASE_URL = "http://localhost:8000/api/v1"
 MACHINE_API_URL = f"{API_BASE_URL}/quotation/machine/"
 MACHINE_SEARCH_URL = f"{API_BASE_URL}/quotation/machine/search"
 PARTS_LIST_URL = f"{API_BASE_URL}/parts"
+PARTS_EXPORT_URL = f"{API_BASE_URL}/parts/export"
 PARTS_CREATE_URL = f"{API_BASE_URL}/parts"
 MAKER_CREATE_URL = f"{API_BASE_URL}/maker"
 
@@ -116,6 +117,16 @@ def get_json(url: str) -> dict:
         return json.loads(body)
 
 
+def iter_ndjson(url: str):
+    """NDJSON 응답을 한 줄씩 읽어 dict로 반환합니다. (전체 본문을 메모리에 올리지 않음)"""
+    req = urllib.request.Request(url, headers={"Accept": "application/x-ndjson"})
+    with urllib.request.urlopen(req, timeout=300) as resp:
+        for raw in resp:
+            line = raw.decode("utf-8", errors="replace").strip()
+            if line:
+                yield json.loads(line)
+
+
 def post_json(url: str, payload: dict) -> tuple[int, str]:
     data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
     req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
@@ -250,49 +261,36 @@ def create_part_from_template_row(parts_index: dict, row_payload: dict) -> dict
     return part
 
 
-def find_existing_machine_id_by_name(machine_name: str) -> str | None:
-    # API 제한: limit <= 100
-    skip = 0
-    limit = 100
+def iter_machine_search(machine_name: str):
+    """search API 결과를 next_cursor를 따라 끝까지 조회합니다. (총 개수 계산 생략, API 제한: limit <= 100)"""
+    cursor = None
     while True:
-        query = urllib.parse.urlencode({"search": machine_name, "skip": skip, "limit": limit})
-        url = f"{MACHINE_SEARCH_URL}?{query}"
-        try:
-            data = get_json(url)
-        except Exception:
-            return None
+        params = {"search": machine_name, "limit": 100, "count": "none"}
+        if cursor:
+            params["cursor"] = cursor
+        data = get_json(f"{MACHINE_SEARCH_URL}?{urllib.parse.urlencode(params)}")
+        yield from data.get("items") or []
+        cursor = data.get("next_cursor")
+        if not cursor:
+            break
+
 
-        items = data.get("items") or []
-        for item in items:
+def find_existing_machine_id_by_name(machine_name: str) -> str | None:
+    try:
+        for item in iter_machine_search(machine_name):
             if (item.get("name") or "").strip() == machine_name.strip():
                 return item.get("id")
-
-        total = int(data.get("total", 0) or 0)
-        skip += limit
-        if skip >= total:
-            break
+    except Exception:
+        return None
     return None
 
 
 def find_exact_machines_by_name(machine_name: str) -> list[dict]:
     """search API로 후보를 가져온 뒤 name이 정확히 같은 것만 반환합니다."""
-    matched: list[dict] = []
-    skip = 0
-    limit = 100
-    while True:
-        query = urllib.parse.urlencode({"search": machine_name, "skip": skip, "limit": limit})
-        url = f"{MACHINE_SEARCH_URL}?{query}"
-        data = get_json(url)
-        items = data.get("items") or []
-        for item in items:
-            if (item.get("name") or "").strip() == machine_name.strip():
-                matched.append(item)
-
-        total = int(data.get("total", 0) or 0)
-        skip += limit
-        if skip >= total:
-            break
-    return matched
+    return [
+        item for item in iter_machine_search(machine_name)
+        if (item.get("name") or "").strip() == machine_name.strip()
+    ]
 
 
 def parse_dt(value: str) -> datetime:
@@ -345,50 +343,37 @@ def fetch_all_parts_index() -> dict:
     by_maker_model_loose: dict[tuple[str, str], dict] = {}
     by_major_minor_empty_name: dict[tuple[str, str, str], dict] = {}
 
-    skip = 0
-    limit = 1000
-    total = None
-
-    while total is None or skip < total:
-        query = urllib.parse.urlencode({"skip": skip, "limit": limit})
-        url = f"{PARTS_LIST_URL}?{query}"
-        data = get_json(url)
-
-        total = int(data.get("total", 0))
-        items = data.get("items", []) or []
-
-        for item in items:
-            maker_name = clean_maker_name(item.get("maker_name"))
-            major = clean_value(item.get("major_category"))
-            minor = clean_value(item.get("minor_category"))
-            name = clean_value(item.get("name"))
-
-            part_payload = {
-                "maker_id": item.get("maker_id"),
-                "resources_id": item.get("id"),
-                "solo_price": item.get("solo_price", 0) or 0,
-                "unit": item.get("unit") or "",
-                "name": item.get("name") or "",  # [추가] 이름 정보 저장
-            }
-
-            # 1) maker + model (가장 안정적인 매칭)
-            maker_k = normalize_key(maker_name)
-            name_k = normalize_key(name)
-            if maker_k and name_k:
-                key = (maker_k, name_k)
-                by_maker_model.setdefault(key, part_payload)
-
-                key_loose = (normalize_loose(maker_name), normalize_loose(name))
-                if all(key_loose):
-                    by_maker_model_loose.setdefault(key_loose, part_payload)
-
-            # 2) 집계/인건비 같은 name="" 항목은 major+minor로 매칭
-            if not name_k and major and minor:
-                key_mm = (normalize_key(major), normalize_key(minor), normalize_key(name))
-                if key_mm[0] and key_mm[1]:
-                    by_major_minor_empty_name.setdefault(key_mm, part_payload)
+    # 전체 부품을 NDJSON 스트리밍 내보내기로 한 번에 읽습니다. (페이지 순회 불필요)
+    for item in iter_ndjson(PARTS_EXPORT_URL):
+        maker_name = clean_maker_name(item.get("maker_name"))
+        major = clean_value(item.get("major_category"))
+        minor = clean_value(item.get("minor_category"))
+        name = clean_value(item.get("name"))
+
+        part_payload = {
+            "maker_id": item.get("maker_id"),
+            "resources_id": item.get("id"),
+            "solo_price": item.get("solo_price", 0) or 0,
+            "unit": item.get("unit") or "",
+            "name": item.get("name") or "",  # [추가] 이름 정보 저장
+        }
 
-        skip += limit
+        # 1) maker + model (가장 안정적인 매칭)
+        maker_k = normalize_key(maker_name)
+        name_k = normalize_key(name)
+        if maker_k and name_k:
+            key = (maker_k, name_k)
+            by_maker_model.setdefault(key, part_payload)
+
+            key_loose = (normalize_loose(maker_name), normalize_loose(name))
+            if all(key_loose):
+                by_maker_model_loose.setdefault(key_loose, part_payload)
+
+        # 2) 집계/인건비 같은 name="" 항목은 major+minor로 매칭
+        if not name_k and major and minor:
+            key_mm = (normalize_key(major), normalize_key(minor), normalize_key(name))
+            if key_mm[0] and key_mm[1]:
+                by_major_minor_empty_name.setdefault(key_mm, part_payload)
 
     return {
         "by_maker_model": by_maker_model,